@@ -1,7 +1,8 @@
 import logging
 import random
-from typing import Callable, List
+from typing import Awaitable, Callable, List, Optional
 
+import httpx
 import requests
 
 from app.models.ip_info import IPInfo
@@ -13,14 +14,28 @@ logger = logging.getLogger(__name__)
 class IPResolver:
     """
     A class to fetch the public IP address using various API endpoints.
+
+    The lookup is available as a blocking method and as a coroutine for the
+    asyncio serving path. When an ipinfo.io-compatible URL is given, such as a
+    self-hosted lookup service or a local stand-in, only that URL is queried.
     """
 
-    def __init__(self, timeout: int = 5):
-        self.api_functions: List[Callable[[], IPInfo]] = [
-            self.get_ipinfo,
-            self.get_ipwhois,
-            self.get_ipapi,
+    IPINFO_URL = "https://ipinfo.io/json"
+    IPWHOIS_URL = "https://ipwho.is/"
+    IPAPI_URL = "https://api.ipapi.is/"
+
+    def __init__(self, timeout: int = 5, url: Optional[str] = None):
+        self.ipinfo_url = url or self.IPINFO_URL
+        self.api_functions: List[Callable[[], IPInfo]] = [self.get_ipinfo]
+        self.async_api_functions: List[Callable[[], Awaitable[IPInfo]]] = [
+            self.get_ipinfo_async
         ]
+        if url is None:
+            self.api_functions += [self.get_ipwhois, self.get_ipapi]
+            self.async_api_functions += [
+                self.get_ipwhois_async,
+                self.get_ipapi_async,
+            ]
         self.timeout = timeout
 
     def get_json_response(self, url: str) -> dict:
@@ -48,8 +63,10 @@ class IPResolver:
         Returns:
         IPInfo: The public IP address and additional information.
         """
-        url = "https://ipinfo.io/json"
-        data = self.get_json_response(url)
+        return self.parse_ipinfo(self.get_json_response(self.ipinfo_url))
+
+    @staticmethod
+    def parse_ipinfo(data: dict) -> IPInfo:
         location = data.get("loc", "").split(",")
         latitude = float(location[0]) if location and len(location) > 1 else None
         longitude = float(location[1]) if location and len(location) > 1 else None
@@ -71,8 +88,10 @@ class IPResolver:
         Returns:
         IPInfo: The public IP address and additional information.
         """
-        url = "https://ipwho.is/"
-        data = self.get_json_response(url)
+        return self.parse_ipwhois(self.get_json_response(self.IPWHOIS_URL))
+
+    @staticmethod
+    def parse_ipwhois(data: dict) -> IPInfo:
         return IPInfo(
             ip=data.get("ip"),
             hostname=None,  # ipwho.is does not provide hostname
@@ -91,8 +110,10 @@ class IPResolver:
         Returns:
         IPInfo: The public IP address and additional information.
         """
-        url = "https://api.ipapi.is/"
-        data = self.get_json_response(url)
+        return self.parse_ipapi(self.get_json_response(self.IPAPI_URL))
+
+    @staticmethod
+    def parse_ipapi(data: dict) -> IPInfo:
         location = data.get("location", {})
         return IPInfo(
             ip=data.get("ip"),
@@ -115,6 +136,49 @@ class IPResolver:
         selected_function = random.choice(self.api_functions)
         return selected_function()
 
+    async def get_json_response_async(self, url: str) -> dict:
+        """
+        Make an HTTP GET request to the given URL without blocking the event loop
+        and return the JSON response.
+
+        Parameters:
+        url (str): The URL to make the request to.
+
+        Returns:
+        dict: The JSON response.
+        """
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(url)
+                response.raise_for_status()
+                return response.json()
+        except httpx.HTTPError as e:
+            logger.error("Error fetching data from URL: %s", url, exc_info=True)
+            raise e
+
+    async def get_ipinfo_async(self) -> IPInfo:
+        """Asynchronous variant of get_ipinfo."""
+        return self.parse_ipinfo(await self.get_json_response_async(self.ipinfo_url))
+
+    async def get_ipwhois_async(self) -> IPInfo:
+        """Asynchronous variant of get_ipwhois."""
+        return self.parse_ipwhois(await self.get_json_response_async(self.IPWHOIS_URL))
+
+    async def get_ipapi_async(self) -> IPInfo:
+        """Asynchronous variant of get_ipapi."""
+        return self.parse_ipapi(await self.get_json_response_async(self.IPAPI_URL))
+
+    async def get_public_ip_info_async(self) -> IPInfo:
+        """
+        Get the public IP address and additional information by randomly selecting
+        an API endpoint, without blocking the event loop.
+
+        Returns:
+        IPInfo: The public IP address and additional information.
+        """
+        selected_function = random.choice(self.async_api_functions)
+        return await selected_function()
+
 
 # if __name__ == "__main__":
 #     try:
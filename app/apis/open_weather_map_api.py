@@ -1,10 +1,13 @@
 import logging
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+import httpx
 import requests
 
 from app.config.config import Config
+from app.models.deadline import Deadline
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -13,16 +16,50 @@ logger = logging.getLogger(__name__)
 class OpenWeatherMapAPI:
     """
     A class to interact with the OpenWeatherMap API.
+
+    Every request is available as a blocking method and as an ``_async`` coroutine
+    for the asyncio serving path. The coroutines of all instances share one
+    ``httpx.AsyncClient`` so connections are reused across requests.
     """
 
-    GEOCODE_URL = "http://api.openweathermap.org/geo/1.0/direct"
-    WEATHER_URL = "https://api.openweathermap.org/data/3.0/onecall"
-    OVERVIEW_URL = "https://api.openweathermap.org/data/3.0/onecall/overview"
-    SUMMARY_URL = "https://api.openweathermap.org/data/3.0/onecall/day_summary"
+    _async_client: Optional[httpx.AsyncClient] = None
+
+    GEOCODE_PATH = "/geo/1.0/direct"
+    WEATHER_PATH = "/data/3.0/onecall"
+    OVERVIEW_PATH = "/data/3.0/onecall/overview"
+    SUMMARY_PATH = "/data/3.0/onecall/day_summary"
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, timeout: int = 10):
         self.api_key = api_key
+        self.timeout = timeout
         self.config = Config()
+        # OWM_BASE_URL points the API at a mirror or a local stand-in
+        base_url = self.config.owm_base_url.rstrip("/")
+        self.geocode_url = base_url + self.GEOCODE_PATH
+        self.weather_url = base_url + self.WEATHER_PATH
+        self.overview_url = base_url + self.OVERVIEW_PATH
+        self.summary_url = base_url + self.SUMMARY_PATH
+
+    @staticmethod
+    @contextmanager
+    def timed_call(operation: str):
+        """
+        Observes the duration of an OpenWeatherMap call as the OWM call stage of
+        the request metrics, and traces it as a span of the request.
+
+        Parameters:
+        operation (str): Name of the API operation, e.g. "geocode".
+        """
+        # pylint: disable=import-outside-toplevel
+        # Imported on use, since the services package imports this module
+        from app.services.telemetry.metrics_registry import (
+            STAGE_OWM_CALL,
+            MetricsRegistry,
+        )
+        from app.services.telemetry.tracer import Tracer
+
+        with MetricsRegistry().stage(STAGE_OWM_CALL), Tracer.span(f"owm.{operation}"):
+            yield
 
     def geocode_location(self, location: str) -> Dict[str, Any]:
         """
@@ -37,9 +74,13 @@ class OpenWeatherMapAPI:
         params = {"q": location, "limit": 1, "appid": self.api_key}
         try:
             headers = {"Content-Type": "application/json"}
-            response = requests.get(
-                self.GEOCODE_URL, params=params, headers=headers, timeout=10
-            )
+            with self.timed_call("geocode"):
+                response = requests.get(
+                    self.geocode_url,
+                    params=params,
+                    headers=headers,
+                    timeout=Deadline.current_timeout(self.timeout),
+                )
             # logger.info(response.url)
             response.raise_for_status()
             data = response.json()
@@ -78,7 +119,12 @@ class OpenWeatherMapAPI:
             "appid": self.api_key,
         }
         try:
-            response = requests.get(self.WEATHER_URL, params=params, timeout=10)
+            with self.timed_call("onecall"):
+                response = requests.get(
+                    self.weather_url,
+                    params=params,
+                    timeout=Deadline.current_timeout(self.timeout),
+                )
             response.raise_for_status()
             data = response.json()
             # logger.info("Weather data retrieved successfully: %s", data)
@@ -107,7 +153,12 @@ class OpenWeatherMapAPI:
             "units": Config().units,
         }
         try:
-            response = requests.get(self.OVERVIEW_URL, params=params, timeout=10)
+            with self.timed_call("overview"):
+                response = requests.get(
+                    self.overview_url,
+                    params=params,
+                    timeout=Deadline.current_timeout(self.timeout),
+                )
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -148,9 +199,164 @@ class OpenWeatherMapAPI:
             "date": date,
         }
         try:
-            response = requests.get(self.SUMMARY_URL, params=params, timeout=10)
+            with self.timed_call("day_summary"):
+                response = requests.get(
+                    self.summary_url,
+                    params=params,
+                    timeout=Deadline.current_timeout(self.timeout),
+                )
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             logger.error("Error fetching weather summary data: %s", e, exc_info=True)
             return {}
+
+    @classmethod
+    def _get_async_client(cls) -> httpx.AsyncClient:
+        if cls._async_client is None:
+            cls._async_client = httpx.AsyncClient()
+        return cls._async_client
+
+    @classmethod
+    async def aclose(cls):
+        """
+        Closes the shared asynchronous HTTP client.
+        """
+        client, cls._async_client = cls._async_client, None
+        if client is not None:
+            await client.aclose()
+
+    async def _get_json_async(
+        self,
+        operation: str,
+        url: str,
+        params: Dict[str, Any],
+        headers: Dict[str, str] = None,
+    ) -> Any:
+        with self.timed_call(operation):
+            response = await self._get_async_client().get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=Deadline.current_timeout(self.timeout),
+            )
+        response.raise_for_status()
+        return response.json()
+
+    async def geocode_location_async(self, location: str) -> Dict[str, Any]:
+        """
+        Geocode a location to get latitude and longitude without blocking the event loop.
+
+        Parameters:
+        location (str): The location to geocode.
+
+        Returns:
+        Dict[str, Any]: Geocoded location data.
+        """
+        params = {"q": location, "limit": 1, "appid": self.api_key}
+        try:
+            data = await self._get_json_async(
+                "geocode",
+                self.geocode_url,
+                params,
+                headers={"Content-Type": "application/json"},
+            )
+            if data:
+                logger.info("Geocoded location data retrieved successfully: %s", data)
+                return data[0]
+            logger.error("No geocoding data found for location: %s", location)
+            return {}
+        except httpx.HTTPError as e:
+            logger.error(
+                "Error fetching geocoding data from OpenWeatherMap", exc_info=True
+            )
+            raise e
+
+    async def get_weather_async(self, lat: float, lon: float) -> Dict[str, Any]:
+        """
+        Fetch weather data for a specified latitude and longitude without blocking the event loop.
+
+        Parameters:
+        lat (float): Latitude.
+        lon (float): Longitude.
+
+        Returns:
+        Dict[str, Any]: Weather data.
+        """
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "units": self.config.units,
+            "appid": self.api_key,
+        }
+        try:
+            return await self._get_json_async("onecall", self.weather_url, params)
+        except httpx.HTTPError as e:
+            logger.error(
+                "Error fetching weather data from OpenWeatherMap", exc_info=True
+            )
+            raise e
+
+    async def get_overview_async(self, lat: float, lon: float) -> Dict[str, Any]:
+        """
+        Get the weather overview data for the specified latitude and longitude without blocking the event loop.
+
+        Parameters:
+        lat (float): Latitude of the location.
+        lon (float): Longitude of the location.
+
+        Returns:
+        Dict[str, Any]: The weather overview data.
+        """
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "appid": self.api_key,
+            "units": self.config.units,
+        }
+        try:
+            return await self._get_json_async("overview", self.overview_url, params)
+        except httpx.HTTPError as e:
+            logger.error("Error fetching weather overview data: %s", e, exc_info=True)
+            return {}
+
+    async def get_summary_async(
+        self, lat: float, lon: float, date: str = None
+    ) -> Dict[str, Any]:
+        """
+        Get the weather summary data for the specified latitude, longitude, and date without blocking the event loop.
+
+        Parameters:
+        lat (float): Latitude of the location.
+        lon (float): Longitude of the location.
+        date (str): Date for the weather summary in 'YYYY-MM-DD' format. Defaults to today's date if not provided.
+
+        Returns:
+        Dict[str, Any]: The weather summary data.
+        """
+        if date is None:
+            date = datetime.now().strftime("%Y-%m-%d")
+
+        # Validate the date format
+        try:
+            datetime.strptime(date, "%Y-%m-%d")
+        except ValueError as exc:
+            logger.error(
+                "Invalid date format: %s. Expected format is 'YYYY-MM-DD'.", date
+            )
+            raise ValueError(
+                "Invalid date format. Expected format is 'YYYY-MM-DD'."
+            ) from exc
+
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "appid": self.api_key,
+            "units": self.config.units,
+            "date": date,
+        }
+        try:
+            return await self._get_json_async("day_summary", self.summary_url, params)
+        except httpx.HTTPError as e:
+            logger.error("Error fetching weather summary data: %s", e, exc_info=True)
+            return {}
@@ -4,7 +4,40 @@ import os
 from dotenv import load_dotenv
 
 from app.apis.ip_resolver import IPResolver
-from app.helpers.constants import DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT
+from app.helpers.constants import (
+    DEFAULT_ADMISSION_RESERVE,
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_CIRCUIT_RESET_TIMEOUT,
+    DEFAULT_EXECUTOR_CALL_TIMEOUT,
+    DEFAULT_EXECUTOR_MAX_WORKERS,
+    DEFAULT_GENERATION_BUDGET,
+    DEFAULT_HEDGE_MAX_RATE,
+    DEFAULT_MODEL_CONFIGS_PATH,
+    DEFAULT_OWM_BASE_URL,
+    DEFAULT_PROFILE_CAPTURE_SECONDS,
+    DEFAULT_PROFILE_DIR,
+    DEFAULT_PROFILE_SAMPLE_INTERVAL,
+    DEFAULT_PROFILE_SLOW_SECONDS,
+    DEFAULT_REQUEST_BUDGET,
+    DEFAULT_ROUTING_BUDGET,
+    DEFAULT_ROUTING_LANGUAGE_MODEL,
+    DEFAULT_SEMANTIC_CACHE_PATH,
+    DEFAULT_SEMANTIC_CACHE_SIZE,
+    DEFAULT_SEMANTIC_CACHE_THRESHOLD,
+    DEFAULT_SEMANTIC_CACHE_TTL,
+    DEFAULT_SEMANTIC_CACHE_VOLATILE_TTL,
+    DEFAULT_SESSION_CONTEXT_TURNS,
+    DEFAULT_SESSION_IDLE_TIMEOUT,
+    DEFAULT_SESSION_MAX_COUNT,
+    DEFAULT_SERVER_HOST,
+    DEFAULT_SERVER_PORT,
+    DEFAULT_STANDARD_LANGUAGE_MODEL,
+    DEFAULT_TRACE_EXPORTER,
+    DEFAULT_TRACE_OTLP_ENDPOINT,
+    DEFAULT_TRACE_PATH,
+    DEFAULT_TRACE_SAMPLE_RATE,
+    DEFAULT_TRACE_SLOW_SECONDS,
+)
 from app.models import SingletonMeta
 
 
@@ -26,6 +59,7 @@ class Config(metaclass=SingletonMeta):
             self._public_location = None
             self._units = Config.get("UNITS")
             self._large_language_model = Config.get("LARGE_LANGUAGE_MODEL")
+            self._fast_language_model = Config.get("FAST_LANGUAGE_MODEL")
             self._personality = Config.get("ASSISTANT_PERSONALITY")
             self.load_location()
 
@@ -75,10 +109,185 @@ class Config(metaclass=SingletonMeta):
     def large_language_model(self):
         return self._large_language_model
 
+    @property
+    def fast_language_model(self):
+        return self._fast_language_model
+
+    @property
+    def standard_language_model(self):
+        return self.get("STANDARD_LANGUAGE_MODEL", DEFAULT_STANDARD_LANGUAGE_MODEL)
+
+    @property
+    def routing_language_model(self):
+        return self.get("ROUTING_LANGUAGE_MODEL", DEFAULT_ROUTING_LANGUAGE_MODEL)
+
     @property
     def personality(self):
         return self._personality
 
+    @property
+    def executor_max_workers(self):
+        return int(self.get("EXECUTOR_MAX_WORKERS", DEFAULT_EXECUTOR_MAX_WORKERS))
+
+    @property
+    def executor_call_timeout(self):
+        return float(self.get("EXECUTOR_CALL_TIMEOUT", DEFAULT_EXECUTOR_CALL_TIMEOUT))
+
+    @property
+    def request_budget(self):
+        return float(self.get("REQUEST_BUDGET", DEFAULT_REQUEST_BUDGET))
+
+    @property
+    def routing_budget(self):
+        return float(self.get("ROUTING_BUDGET", DEFAULT_ROUTING_BUDGET))
+
+    @property
+    def generation_budget(self):
+        return float(self.get("GENERATION_BUDGET", DEFAULT_GENERATION_BUDGET))
+
+    @property
+    def progressive_responses(self):
+        return self.get("PROGRESSIVE_RESPONSES", "true").lower() == "true"
+
+    @property
+    def streaming_responses(self):
+        return self.get("STREAMING_RESPONSES", "false").lower() == "true"
+
+    @property
+    def warmup_models(self):
+        return self.get("WARMUP_MODELS", "true").lower() == "true"
+
+    @property
+    def alexa_directive_endpoint(self):
+        return self.get("ALEXA_DIRECTIVE_ENDPOINT")
+
+    @property
+    def model_configs_path(self):
+        return self.get("MODEL_CONFIGS_PATH", DEFAULT_MODEL_CONFIGS_PATH)
+
+    @property
+    def ask_verify_requests(self):
+        return self.get("ASK_VERIFY_REQUESTS", "true").lower() == "true"
+
+    @property
+    def owm_base_url(self):
+        return self.get("OWM_BASE_URL", DEFAULT_OWM_BASE_URL)
+
+    @property
+    def ip_info_url(self):
+        return self.get("IP_INFO_URL")
+
+    @property
+    def search_url(self):
+        return self.get("SEARCH_URL")
+
+    @property
+    def session_max_count(self):
+        return int(self.get("SESSION_MAX_COUNT", DEFAULT_SESSION_MAX_COUNT))
+
+    @property
+    def session_idle_timeout(self):
+        return float(self.get("SESSION_IDLE_TIMEOUT", DEFAULT_SESSION_IDLE_TIMEOUT))
+
+    @property
+    def session_context_turns(self):
+        return int(self.get("SESSION_CONTEXT_TURNS", DEFAULT_SESSION_CONTEXT_TURNS))
+
+    @property
+    def admission_reserve(self):
+        return float(self.get("ADMISSION_RESERVE", DEFAULT_ADMISSION_RESERVE))
+
+    @property
+    def hedge_max_rate(self):
+        return float(self.get("HEDGE_MAX_RATE", DEFAULT_HEDGE_MAX_RATE))
+
+    @property
+    def circuit_failure_threshold(self):
+        return int(
+            self.get("CIRCUIT_FAILURE_THRESHOLD", DEFAULT_CIRCUIT_FAILURE_THRESHOLD)
+        )
+
+    @property
+    def circuit_reset_timeout(self):
+        return float(self.get("CIRCUIT_RESET_TIMEOUT", DEFAULT_CIRCUIT_RESET_TIMEOUT))
+
+    @property
+    def semantic_cache_path(self):
+        # An empty path keeps the cache in memory only
+        return self.get("SEMANTIC_CACHE_PATH", DEFAULT_SEMANTIC_CACHE_PATH) or None
+
+    @property
+    def semantic_cache_size(self):
+        return int(self.get("SEMANTIC_CACHE_SIZE", DEFAULT_SEMANTIC_CACHE_SIZE))
+
+    @property
+    def semantic_cache_threshold(self):
+        return float(
+            self.get("SEMANTIC_CACHE_THRESHOLD", DEFAULT_SEMANTIC_CACHE_THRESHOLD)
+        )
+
+    @property
+    def semantic_cache_ttl(self):
+        return float(self.get("SEMANTIC_CACHE_TTL", DEFAULT_SEMANTIC_CACHE_TTL))
+
+    @property
+    def semantic_cache_volatile_ttl(self):
+        return float(
+            self.get("SEMANTIC_CACHE_VOLATILE_TTL", DEFAULT_SEMANTIC_CACHE_VOLATILE_TTL)
+        )
+
+    @property
+    def trace_exporter(self):
+        return self.get("TRACE_EXPORTER", DEFAULT_TRACE_EXPORTER).lower()
+
+    @property
+    def trace_sample_rate(self):
+        return float(self.get("TRACE_SAMPLE_RATE", DEFAULT_TRACE_SAMPLE_RATE))
+
+    @property
+    def trace_slow_seconds(self):
+        return float(self.get("TRACE_SLOW_SECONDS", DEFAULT_TRACE_SLOW_SECONDS))
+
+    @property
+    def trace_path(self):
+        return self.get("TRACE_PATH", DEFAULT_TRACE_PATH)
+
+    @property
+    def trace_otlp_endpoint(self):
+        return self.get("TRACE_OTLP_ENDPOINT", DEFAULT_TRACE_OTLP_ENDPOINT)
+
+    @property
+    def metrics_dir(self):
+        return self.get("METRICS_DIR", "") or None
+
+    @property
+    def profiling(self):
+        return self.get("PROFILING", "false").lower() == "true"
+
+    @property
+    def profile_dir(self):
+        return self.get("PROFILE_DIR", DEFAULT_PROFILE_DIR)
+
+    @property
+    def profile_token(self):
+        return self.get("PROFILE_TOKEN", "")
+
+    @property
+    def profile_slow_seconds(self):
+        return float(self.get("PROFILE_SLOW_SECONDS", DEFAULT_PROFILE_SLOW_SECONDS))
+
+    @property
+    def profile_capture_seconds(self):
+        return float(
+            self.get("PROFILE_CAPTURE_SECONDS", DEFAULT_PROFILE_CAPTURE_SECONDS)
+        )
+
+    @property
+    def profile_sample_interval(self):
+        return float(
+            self.get("PROFILE_SAMPLE_INTERVAL", DEFAULT_PROFILE_SAMPLE_INTERVAL)
+        )
+
     def set_server_host(self, host):
         self._server = host
 
@@ -96,6 +305,6 @@ class Config(metaclass=SingletonMeta):
 
     def load_location(self):
         self.logger.info("Retieving public facing information.")
-        self._public_ip_info = IPResolver().get_public_ip_info()
+        self._public_ip_info = IPResolver(url=self.ip_info_url).get_public_ip_info()
         self.logger.info(self._public_ip_info)
         self._public_location = f"{self._public_ip_info.city}, {self._public_ip_info.region}, {self._public_ip_info.country}"
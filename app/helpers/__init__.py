@@ -1,5 +1,6 @@
 # app/helpers/__init__.py
 from .resource_loader import ResourceLoader
+from .thread_helpers import ThreadHelpers
 from .weather_helpers import WeatherHelpers
 
-__all__ = ["ResourceLoader", "WeatherHelpers"]
+__all__ = ["ResourceLoader", "ThreadHelpers", "WeatherHelpers"]
@@ -1,3 +1,47 @@
 # Define all your constants here
 DEFAULT_SERVER_HOST = "0.0.0.0"
 DEFAULT_SERVER_PORT = 8045
+DEFAULT_MODEL_CONFIGS_PATH = "config/nexa_ai_configs.json"
+DEFAULT_EXECUTOR_MAX_WORKERS = 4
+DEFAULT_EXECUTOR_CALL_TIMEOUT = 6.0
+# Alexa waits about 8 seconds for a response; keep a margin for the network
+DEFAULT_REQUEST_BUDGET = 7.0
+DEFAULT_ROUTING_BUDGET = 2.0
+DEFAULT_GENERATION_BUDGET = 2.5
+# Models of the standard latency tier and of function routing
+DEFAULT_STANDARD_LANGUAGE_MODEL = "llama3"
+DEFAULT_ROUTING_LANGUAGE_MODEL = "nexus"
+DEFAULT_SERVER_MODE = "development"
+DEFAULT_SERVER_THREADS = 4
+DEFAULT_MAX_REQUESTS = 1000
+DEFAULT_GRACEFUL_TIMEOUT = 30
+DEFAULT_SESSION_MAX_COUNT = 1000
+DEFAULT_SESSION_IDLE_TIMEOUT = 600.0
+DEFAULT_SESSION_CONTEXT_TURNS = 5
+# Time kept for the model call itself when waiting for a busy backend
+DEFAULT_ADMISSION_RESERVE = 1.0
+# Maximum fraction of requests to a model that may be duplicated to its hedge backend
+DEFAULT_HEDGE_MAX_RATE = 0.1
+# Consecutive failures after which a model backend is no longer called
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_RESET_TIMEOUT = 30.0
+# Answers to open questions reused for paraphrased questions
+DEFAULT_SEMANTIC_CACHE_PATH = "cache/answers.npz"
+DEFAULT_SEMANTIC_CACHE_SIZE = 1000
+DEFAULT_SEMANTIC_CACHE_THRESHOLD = 0.35
+DEFAULT_SEMANTIC_CACHE_TTL = 86400.0
+# Time-sensitive questions, e.g. about the news, are cached briefly
+DEFAULT_SEMANTIC_CACHE_VOLATILE_TTL = 300.0
+# Request tracing, off unless TRACE_EXPORTER is "jsonl" or "otlp"
+DEFAULT_TRACE_EXPORTER = "none"
+DEFAULT_TRACE_SAMPLE_RATE = 0.1
+DEFAULT_TRACE_SLOW_SECONDS = 0.0
+DEFAULT_TRACE_PATH = "traces/spans.jsonl"
+DEFAULT_TRACE_OTLP_ENDPOINT = "http://127.0.0.1:4318/v1/traces"
+# On-demand profiling, off unless PROFILING is true
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_PROFILE_SLOW_SECONDS = 0.0
+DEFAULT_PROFILE_CAPTURE_SECONDS = 30.0
+DEFAULT_PROFILE_SAMPLE_INTERVAL = 0.01
+# Upstream APIs, overridable to use a mirror or local stand-ins
+DEFAULT_OWM_BASE_URL = "https://api.openweathermap.org"
@@ -0,0 +1,51 @@
+import contextvars
+import logging
+from functools import wraps
+from typing import Any, Callable
+
+from flask import current_app, has_app_context
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class ThreadHelpers:
+    """
+    A static class offering utilities for running work on background threads.
+    """
+
+    @staticmethod
+    def with_context(func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap a callable so it runs with the context of the calling thread.
+
+        Worker threads do not inherit the Flask application context, which is needed
+        by ``render_template``, nor the caller's context variables, such as the
+        current request Deadline. Both are captured at wrap time and restored when
+        the wrapped callable runs on the worker thread.
+
+        Parameters:
+        func (Callable[..., Any]): The callable to wrap.
+
+        Returns:
+        Callable[..., Any]: The wrapped callable.
+        """
+        context = contextvars.copy_context()
+        app = (
+            current_app._get_current_object()  # pylint: disable=protected-access
+            if has_app_context()
+            else None
+        )
+
+        def run(*args, **kwargs):
+            if app is None:
+                return func(*args, **kwargs)
+            with app.app_context():
+                return func(*args, **kwargs)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # A copied context can only be entered by one thread at a time
+            return context.copy().run(run, *args, **kwargs)
+
+        return wrapper
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    A thread-safe LRU cache whose entries expire after a time-to-live.
+
+    With ``sliding`` enabled every read renews an entry's time-to-live, so entries
+    expire after being idle for the TTL instead of after being written.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept before the least recently used is evicted.
+        ttl (float): Default number of seconds an entry stays valid.
+        sliding (bool): Whether reads renew the time-to-live.
+        hits (int): Number of reads that found a valid entry.
+        misses (int): Number of reads that found none.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 128, ttl: float = 600.0, sliding: bool = False):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.sliding = sliding
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the cached value for the key, or the default if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key, self._MISSING)
+            if entry is self._MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            now = time.monotonic()
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self.hits += 1
+            if self.sliding:
+                self._entries[key] = (value, now + self.ttl)
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Stores a value, evicting the least recently used entry when the cache is full.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def setdefault(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for the key, storing the factory's result first if
+        the key is missing or expired. The check and the insert happen atomically.
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key, self._MISSING)
+            if entry is self._MISSING or entry[1] <= now:
+                entry = (factory(), now + self.ttl)
+            elif self.sliding:
+                entry = (entry[0], now + self.ttl)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return entry[0]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Removes the key and returns its value, or the default if it is missing.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, self._MISSING)
+        return default if entry is self._MISSING else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -133,6 +133,30 @@ class WeatherHelpers:
 
         return {"lat": lat, "lon": lon}
 
+    @staticmethod
+    async def geocode_location_async(
+        location: str, api: OpenWeatherMapAPI
+    ) -> Dict[str, float]:
+        """
+        Geocode the location to get latitude and longitude without blocking the event loop.
+
+        Parameters:
+        location (str): The location to geocode.
+        api (OpenWeatherMapAPI): Instance of OpenWeatherMapAPI to use for geocoding.
+
+        Returns:
+        Dict[str, float]: Dictionary containing latitude and longitude.
+        """
+        geocode_data = await api.geocode_location_async(location)
+        lat = geocode_data.get("lat")
+        lon = geocode_data.get("lon")
+
+        if not lat or not lon:
+            logger.error("Geocoding failed for location: %s", location)
+            raise ValueError(f"Geocoding failed for location: {location}")
+
+        return {"lat": lat, "lon": lon}
+
     @staticmethod
     def create_openai_prompt(
         weather_params: Dict[str, Optional[str]], weather_data: Dict[str, Any]
@@ -256,12 +280,15 @@ class WeatherHelpers:
         return prompt
 
     @staticmethod
-    def generate_overview_prompt(overview_data: Dict[str, Any]) -> str:
+    def generate_overview_prompt(
+        overview_data: Dict[str, Any], weather_condition: Optional[str] = None
+    ) -> str:
         """
         Generate an OpenAI prompt for the weather overview using a template.
 
         Parameters:
         overview_data (Dict[str, Any]): Dictionary containing the weather overview data.
+        weather_condition (Optional[str]): Weather condition the user asked about, e.g. "snow".
 
         Returns:
         str: OpenAI prompt string.
@@ -279,6 +306,7 @@ class WeatherHelpers:
                 date=date,
                 overview=overview,
                 unit_instructions=unit_instructions,
+                weather_condition=weather_condition,
             )
 
             logger.info("Generated OpenAI overview prompt: %s", prompt)
@@ -1,11 +1,21 @@
+import asyncio
 import logging
+import os
+import tempfile
 
+import yaml
 from flask import Flask
 from werkzeug.serving import run_simple
 
 from app.config.config import Config
+from app.helpers.resource_loader import ResourceLoader
 from app.models.command_line_args import CommandLineArgs
+from app.routes.metrics import register_metrics
+from app.routes.profiling import register_profiling
+from app.routes.status import status_bp
 from app.services.ai.ai_service_instance import AIServiceSingleton
+from app.services.telemetry.metrics_registry import MetricsRegistry
+from app.services.telemetry.profiler import Profiler
 from app.skill.intents import api_bp, register_skill_intents
 
 
@@ -37,16 +47,72 @@ class Host:
         self.logger = logging.getLogger(__name__)
         # Initialize Flask app
         self.app = Flask(__name__)
+        # Alexa request verification, only turned off to replay unsigned requests
+        self.app.config["ASK_VERIFY_REQUESTS"] = self.config.ask_verify_requests
         # Register blueprints
         self.app.register_blueprint(api_bp)
+        self.app.register_blueprint(status_bp)
+        # Serve the request metrics at /metrics
+        register_metrics(self.app)
+        # Profile live requests on demand, when PROFILING is on
+        register_profiling(self.app)
 
         register_skill_intents(self.app)
 
-        # Initialize AIService instance
-        AIServiceSingleton("config/nexa_ai_configs.json")
+        # Initialize AIService instance, with a hedge thread per request thread
+        ai_service = AIServiceSingleton(self.config.model_configs_path).instance
+        ai_service.hedger.set_max_workers(self.args.threads)
+
+        # Compile the skill templates up front so forked workers share them
+        self.preload_templates()
+
+    def preload_templates(self):
+        """
+        Compile the skill templates from templates.yaml into the Jinja cache.
+        """
+        content = ResourceLoader.load_resource_file(
+            os.path.join(self.app.root_path, "templates.yaml")
+        )
+        if not content:
+            return
+
+        template_names = yaml.safe_load(content) or {}
+        with self.app.app_context():
+            for name in template_names:
+                self.app.jinja_env.get_template(name)
+        self.logger.info("Preloaded %d templates", len(template_names))
+
+    def start_warmup(self):
+        """
+        Start keeping the models loaded, unless disabled with WARMUP_MODELS=false.
+        """
+        if self.config.warmup_models:
+            AIServiceSingleton.get_instance().warmup.start()
+
+    def start_worker(self):
+        """
+        Start the per-process work of a serving process: the model warm-up, the
+        metrics snapshots when the metrics are shared and, when PROFILING is on,
+        the signal handler starting a sampling capture.
+        """
+        self.start_warmup()
+        MetricsRegistry().start_snapshots()
+        Profiler().install_signal_handler()
 
     def run(self):
-        # Method to perform the main logic: Start Flask server
+        # Method to perform the main logic: Start the server for the selected mode
+        if self.args.mode == "production":
+            self.run_production()
+        elif self.args.mode == "async":
+            asyncio.run(self.run_async())
+        else:
+            self.run_development()
+
+    def run_development(self):
+        """
+        Serve the app with the single-process Werkzeug development server.
+        """
+        self.start_worker()
         run_simple(
             self.args.server,
             self.args.port,
@@ -54,6 +120,81 @@ class Host:
             use_debugger=self.config.get("DEBUG", False),
         )
 
+    def run_production(self):
+        """
+        Serve the app with a pre-forking Gunicorn server.
+
+        The app is loaded before the workers are forked, so the AIService and the
+        compiled templates are built once. Workers run multiple threads, finish
+        in-flight requests on shutdown, and are recycled after a number of requests.
+        Each worker starts its own warm-up thread and profiling signal handler once forked,
+        and shares its metrics through METRICS_DIR so any worker can be scraped.
+
+        Raises:
+            ValueError: If Gunicorn is not installed.
+        """
+        try:
+            # pylint: disable=import-outside-toplevel
+            from app.runtime.wsgi_server import WSGIServer
+        except ImportError as e:
+            raise ValueError(
+                "Production mode requires gunicorn: pip install gunicorn"
+            ) from e
+
+        workers = self.args.workers or 2 * (os.cpu_count() or 1) + 1
+        MetricsRegistry().share(
+            self.config.metrics_dir or tempfile.mkdtemp(prefix="nexa-metrics-")
+        )
+        options = {
+            "bind": f"{self.args.server}:{self.args.port}",
+            "workers": workers,
+            "threads": self.args.threads,
+            "worker_class": "gthread" if self.args.threads > 1 else "sync",
+            "preload_app": True,
+            "max_requests": self.args.max_requests,
+            "max_requests_jitter": self.args.max_requests // 10,
+            "graceful_timeout": self.args.graceful_timeout,
+            "post_worker_init": lambda worker: self.start_worker(),
+        }
+        self.logger.info(
+            "Starting production server on %s with %d workers x %d threads",
+            options["bind"],
+            workers,
+            self.args.threads,
+        )
+        WSGIServer(self.app, options).run()
+
+    async def run_async(self):
+        """
+        Serve the skill from an asyncio event loop with Uvicorn.
+
+        Requests are handled by the asynchronous intent handlers, so a single
+        process holds many in-flight requests without a thread per request.
+
+        Raises:
+            ValueError: If Uvicorn is not installed.
+        """
+        try:
+            # pylint: disable=import-outside-toplevel
+            import uvicorn
+
+            from app.runtime.asgi_app import ASGIApp
+        except ImportError as e:
+            raise ValueError("Async mode requires uvicorn: pip install uvicorn") from e
+
+        config = uvicorn.Config(
+            ASGIApp(self.app),
+            host=self.args.server,
+            port=self.args.port,
+            timeout_graceful_shutdown=self.args.graceful_timeout,
+            log_config=None,
+        )
+        self.logger.info(
+            "Starting async server on %s:%s", self.args.server, self.args.port
+        )
+        self.start_worker()
+        await uvicorn.Server(config).serve()
+
 
 # Example usage for running the script directly
 # if __name__ == "__main__":
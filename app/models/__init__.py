@@ -1,8 +1,24 @@
 # app/models/__init__.py
+from .ai.batch_result import BatchResult
 from .ai.model_config import ModelConfig
 from .ai.model_configs import ModelConfigs
+from .ai.output_budget import OutputBudget
 from .command_line_args import CommandLineArgs
+from .deadline import Deadline
+from .function_call import FunctionCall
 from .ip_info import IPInfo
+from .session_state import SessionState
 from .singleton import SingletonMeta
 
-__all__ = ["SingletonMeta", "CommandLineArgs", "ModelConfig", "ModelConfigs", "IPInfo"]
+__all__ = [
+    "SingletonMeta",
+    "CommandLineArgs",
+    "ModelConfig",
+    "ModelConfigs",
+    "BatchResult",
+    "OutputBudget",
+    "IPInfo",
+    "FunctionCall",
+    "Deadline",
+    "SessionState",
+]
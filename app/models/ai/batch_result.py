@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class BatchResult:
+    """
+    Data model for the outcome of one prompt of a batch.
+
+    Attributes:
+        text (Optional[str]): The response text, None if the prompt failed.
+        error (Optional[str]): Why the prompt failed, None if it succeeded.
+        latency (float): Number of seconds the prompt took, including retries on fallbacks.
+    """
+
+    text: Optional[str] = field(default=None)
+    error: Optional[str] = field(default=None)
+    latency: float = field(default=0.0)
+
+    @property
+    def ok(self) -> bool:
+        """Returns True when the prompt was answered."""
+        return self.error is None
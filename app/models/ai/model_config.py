@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import List, Optional
 from urllib.parse import urlparse
 
 
@@ -14,6 +14,11 @@ class ModelConfig:
         api_key (str): API key for authentication.
         model (str): Model identifier.
         key (Optional[str]): Optional unique key for the model configuration.
+        max_concurrency (Optional[int]): Maximum number of concurrent requests to the backend, unlimited if not set.
+        max_queue (int): Maximum number of requests waiting for the backend when max_concurrency is reached.
+        hedge_to (Optional[str]): Model name or key of the backend a slow request is duplicated to, not hedged if not set.
+        fallbacks (List[str]): Model names or keys a failed request is retried on, in order.
+        keep_alive (Optional[float]): Seconds the backend keeps the model loaded while idle, primed only at startup if not set.
     """
 
     description: str
@@ -21,6 +26,11 @@ class ModelConfig:
     api_key: str
     model: str
     key: Optional[str] = field(default=None)
+    max_concurrency: Optional[int] = field(default=None)
+    max_queue: int = field(default=0)
+    hedge_to: Optional[str] = field(default=None)
+    fallbacks: List[str] = field(default_factory=list)
+    keep_alive: Optional[float] = field(default=None)
 
     def __post_init__(self):
         self.base_url = self.validate_url(self.base_url)
@@ -1,22 +1,30 @@
 from typing import Dict, List
 
 from app.models.ai.model_config import ModelConfig
+from app.models.ai.replica_balancer import ReplicaBalancer
 
 
 class ModelConfigs:
     """
     Data model for a list of model configurations.
 
+    Configurations that share a model name or key are equivalent replicas. A
+    lookup returns one of them, chosen by the ReplicaBalancer from the latency
+    and errors recorded for each replica.
+
     Attributes:
         configs (List[ModelConfig]): List of model configurations.
+        balancer (ReplicaBalancer): Chooses between replicas of the same model.
     """
 
     def __init__(self, configs: List[Dict[str, str]]):
         self.configs = [ModelConfig(**config) for config in configs]
+        self.balancer = ReplicaBalancer()
 
     def get_model_config(self, identifier: str) -> ModelConfig:
         """
         Retrieves a specific model configuration by model name or key, case-insensitively.
+        When several configurations match, the balancer chooses between them.
 
         Args:
             identifier (str): The model name or key of the model to retrieve.
@@ -24,15 +32,41 @@ class ModelConfigs:
         Returns:
             ModelConfig: The model configuration matching the identifier.
         """
+        return self.balancer.choose(self.get_replicas(identifier))
+
+    def get_replicas(self, identifier: str) -> List[ModelConfig]:
+        """
+        Retrieves every model configuration matching a model name or key, case-insensitively.
+
+        Args:
+            identifier (str): The model name or key of the model to retrieve.
+
+        Returns:
+            List[ModelConfig]: The matching model configurations, in file order.
+        """
         identifier_lower = identifier.lower()
-        for config in self.configs:
-            if config.model.lower() == identifier_lower or (
-                config.key and config.key.lower() == identifier_lower
-            ):
-                return config
-        raise ValueError(
-            f"Model or key '{identifier}' not found in the configurations."
-        )
+        replicas = [
+            config
+            for config in self.configs
+            if config.model.lower() == identifier_lower
+            or (config.key and config.key.lower() == identifier_lower)
+        ]
+        if not replicas:
+            raise ValueError(
+                f"Model or key '{identifier}' not found in the configurations."
+            )
+        return replicas
+
+    def record_result(self, model_config: ModelConfig, latency: float, success: bool):
+        """
+        Records the outcome of a call so later lookups can avoid slow or failing replicas.
+
+        Args:
+            model_config (ModelConfig): The model configuration that was called.
+            latency (float): Number of seconds the call took.
+            success (bool): Whether the call returned a response.
+        """
+        self.balancer.record(model_config, latency, success)
 
     @classmethod
     def from_dict_list(cls, configs: List[Dict[str, str]]) -> "ModelConfigs":
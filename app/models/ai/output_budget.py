@@ -0,0 +1,98 @@
+import math
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Sentence boundaries: a terminal punctuation mark followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass
+class OutputBudget:
+    """
+    Data model for the length of the answer a prompt template asks for.
+
+    The budget is enforced twice: ``max_tokens`` stops the generation shortly
+    after the requested length, with some headroom so the model can finish its
+    sentence, and ``truncate`` cuts the answer back to the whole sentences that
+    fit in the requested length. A length in seconds of speech is converted to
+    words at the speaking rate of Alexa.
+
+    Attributes:
+        max_words (Optional[int]): Maximum number of words of the answer.
+        max_characters (Optional[int]): Maximum number of characters of the answer.
+        max_seconds (Optional[float]): Maximum number of seconds of speech of the answer.
+        stop (List[str]): Stop sequences sent with the request.
+    """
+
+    max_words: Optional[int] = field(default=None)
+    max_characters: Optional[int] = field(default=None)
+    max_seconds: Optional[float] = field(default=None)
+    stop: List[str] = field(default_factory=list)
+
+    # Speaking rate of Alexa, about 150 words per minute
+    WORDS_PER_SECOND = 2.5
+    TOKENS_PER_WORD = 1.4
+    CHARACTERS_PER_TOKEN = 3.0
+    # Room for the model to finish the sentence it is in when the budget runs out
+    HEADROOM = 1.5
+
+    @property
+    def word_limit(self) -> Optional[int]:
+        """Returns the maximum number of words, or None when the words are not limited."""
+        limits = []
+        if self.max_words is not None:
+            limits.append(self.max_words)
+        if self.max_seconds is not None:
+            limits.append(math.floor(self.max_seconds * self.WORDS_PER_SECOND))
+        return min(limits) if limits else None
+
+    @property
+    def max_tokens(self) -> Optional[int]:
+        """Returns the max_tokens for the request, or None when the length is not limited."""
+        limits = []
+        if self.word_limit is not None:
+            limits.append(self.word_limit * self.TOKENS_PER_WORD)
+        if self.max_characters is not None:
+            limits.append(self.max_characters / self.CHARACTERS_PER_TOKEN)
+        if not limits:
+            return None
+        return math.ceil(min(limits) * self.HEADROOM)
+
+    def fits(self, text: str) -> bool:
+        """Returns True when the text is within the budget."""
+        word_limit = self.word_limit
+        return (word_limit is None or len(text.split()) <= word_limit) and (
+            self.max_characters is None or len(text) <= self.max_characters
+        )
+
+    def truncate(self, text: str, cut_off: bool = False) -> str:
+        """
+        Cuts the text back to the whole sentences that fit in the budget.
+
+        The first sentence is always kept, so an answer is never cut in the middle
+        of a sentence and never emptied.
+
+        Args:
+            text (str): The generated answer.
+            cut_off (bool): Whether the generation was stopped by max_tokens, in which
+                case a trailing unfinished sentence is dropped as well.
+
+        Returns:
+            str: The truncated answer.
+        """
+        sentences = SENTENCE_BOUNDARY.split(text.strip())
+        if (
+            cut_off
+            and len(sentences) > 1
+            and not sentences[-1].endswith((".", "!", "?"))
+        ):
+            sentences.pop()
+
+        kept = sentences[:1]
+        for sentence in sentences[1:]:
+            candidate = " ".join(kept + [sentence])
+            if not self.fits(candidate):
+                break
+            kept.append(sentence)
+        return " ".join(kept)
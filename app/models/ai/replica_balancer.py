@@ -0,0 +1,189 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.ai.model_config import ModelConfig
+
+
+@dataclass
+class ReplicaStats:
+    """
+    Data model for the observed health of a single model endpoint.
+
+    Attributes:
+        latency (Optional[float]): Exponentially weighted moving average of the call latency in seconds.
+        error_rate (float): Exponentially weighted moving average of failed calls, between 0 and 1.
+        consecutive_failures (int): Number of failed calls since the last success.
+        ejected_until (float): Monotonic time until which the endpoint is not selected.
+        calls (int): Number of recorded calls.
+        failures (int): Number of recorded failed calls.
+        ejections (int): Number of times the endpoint was ejected.
+    """
+
+    latency: Optional[float] = field(default=None)
+    error_rate: float = field(default=0.0)
+    consecutive_failures: int = field(default=0)
+    ejected_until: float = field(default=0.0)
+    calls: int = field(default=0)
+    failures: int = field(default=0)
+    ejections: int = field(default=0)
+
+
+class ReplicaBalancer:
+    """
+    Selects one of several equivalent model endpoints using power-of-two-choices.
+
+    Two endpoints are sampled at random and the one with the lower expected cost
+    is chosen, where the cost is the latency EWMA inflated by the error rate
+    EWMA. Endpoints without observations cost nothing, so new endpoints are
+    tried first; endpoints that failed before ever answering are costed at
+    ``PROBE_LATENCY``, so they are still probed now and then. An endpoint that
+    fails several calls in a row is ejected for a while, and its error rate is
+    forgotten when it comes back, so it is probed again; when every endpoint of
+    a group is ejected they are all considered again rather than failing the
+    request.
+
+    Attributes:
+        alpha (float): Weight of the newest observation in the moving averages.
+        eject_failures (int): Consecutive failures after which an endpoint is ejected.
+        eject_seconds (float): Number of seconds an ejected endpoint is skipped.
+    """
+
+    # Assumed latency, in seconds, of an endpoint that has not answered yet
+    PROBE_LATENCY = 2.0
+
+    def __init__(
+        self, alpha: float = 0.3, eject_failures: int = 3, eject_seconds: float = 30.0
+    ):
+        self.alpha = alpha
+        self.eject_failures = eject_failures
+        self.eject_seconds = eject_seconds
+        self.stats: Dict[Tuple[str, str], ReplicaStats] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def replica_id(model_config: ModelConfig) -> Tuple[str, str]:
+        """Returns the key identifying an endpoint: its base URL and model."""
+        return model_config.base_url, model_config.model
+
+    def choose(self, replicas: List[ModelConfig]) -> ModelConfig:
+        """
+        Chooses the endpoint to send a request to.
+
+        Args:
+            replicas (List[ModelConfig]): The equivalent endpoints, at least one.
+
+        Returns:
+            ModelConfig: The chosen endpoint.
+        """
+        if len(replicas) == 1:
+            return replicas[0]
+
+        now = time.monotonic()
+        with self._lock:
+            healthy = [
+                replica
+                for replica in replicas
+                if not self._is_ejected(self._get_stats(replica), now)
+            ] or replicas
+            if len(healthy) == 1:
+                return healthy[0]
+            first, second = random.sample(healthy, 2)
+            return first if self._cost(first) <= self._cost(second) else second
+
+    def record(self, model_config: ModelConfig, latency: float, success: bool):
+        """
+        Records the outcome of a call to an endpoint.
+
+        Args:
+            model_config (ModelConfig): The endpoint that was called.
+            latency (float): Number of seconds the call took.
+            success (bool): Whether the call returned a response.
+        """
+        with self._lock:
+            stats = self._get_stats(model_config)
+            stats.calls += 1
+            stats.error_rate += self.alpha * (
+                (0.0 if success else 1.0) - stats.error_rate
+            )
+            if success:
+                stats.consecutive_failures = 0
+                stats.latency = (
+                    latency
+                    if stats.latency is None
+                    else stats.latency + self.alpha * (latency - stats.latency)
+                )
+                return
+
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.eject_failures:
+                stats.ejected_until = time.monotonic() + self.eject_seconds
+                stats.ejections += 1
+                stats.consecutive_failures = 0
+
+    def expected_latency(self, replicas: List[ModelConfig]) -> Optional[float]:
+        """
+        Returns the lowest latency EWMA of the replicas that are not ejected, or
+        None when none of them has answered yet.
+
+        Args:
+            replicas (List[ModelConfig]): The equivalent endpoints.
+        """
+        now = time.monotonic()
+        with self._lock:
+            latencies = [
+                stats.latency
+                for stats in (self._get_stats(replica) for replica in replicas)
+                if stats.latency is not None and not self._is_ejected(stats, now)
+            ]
+        return min(latencies, default=None)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the observed health of every endpoint that has been used.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                f"{model} @ {base_url}": {
+                    "latency": stats.latency,
+                    "error_rate": stats.error_rate,
+                    "ejected": stats.ejected_until > now,
+                    "calls": stats.calls,
+                    "failures": stats.failures,
+                    "ejections": stats.ejections,
+                }
+                for (base_url, model), stats in self.stats.items()
+            }
+
+    def _get_stats(self, model_config: ModelConfig) -> ReplicaStats:
+        key = self.replica_id(model_config)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = ReplicaStats()
+        return stats
+
+    @staticmethod
+    def _is_ejected(stats: ReplicaStats, now: float) -> bool:
+        if stats.ejected_until == 0.0:
+            return False
+        if stats.ejected_until > now:
+            return True
+        # The ejection is over: the endpoint starts again with a clean error rate
+        stats.ejected_until = 0.0
+        stats.error_rate = 0.0
+        stats.consecutive_failures = 0
+        return False
+
+    def _cost(self, model_config: ModelConfig) -> float:
+        stats = self._get_stats(model_config)
+        latency = stats.latency
+        if latency is None:
+            # Untried endpoints are explored first
+            if stats.error_rate == 0.0:
+                return 0.0
+            latency = self.PROBE_LATENCY
+        return latency / max(0.05, 1.0 - stats.error_rate)
@@ -1,6 +1,13 @@
 from dataclasses import dataclass
 
-from app.helpers.constants import DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT
+from app.helpers.constants import (
+    DEFAULT_GRACEFUL_TIMEOUT,
+    DEFAULT_MAX_REQUESTS,
+    DEFAULT_SERVER_HOST,
+    DEFAULT_SERVER_MODE,
+    DEFAULT_SERVER_PORT,
+    DEFAULT_SERVER_THREADS,
+)
 
 
 @dataclass
@@ -8,3 +15,8 @@ class CommandLineArgs:
     server: str = DEFAULT_SERVER_HOST
     port: int = DEFAULT_SERVER_PORT
     intent: str = None
+    mode: str = DEFAULT_SERVER_MODE
+    workers: int = None
+    threads: int = DEFAULT_SERVER_THREADS
+    max_requests: int = DEFAULT_MAX_REQUESTS
+    graceful_timeout: int = DEFAULT_GRACEFUL_TIMEOUT
@@ -0,0 +1,91 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar(
+    "current_deadline", default=None
+)
+
+
+class Deadline:
+    """
+    Time budget for handling a single request.
+
+    A deadline is created by the skill handler and passed down through the
+    services so every layer can size its timeouts from the time that is left.
+    Used as a context manager it also becomes the current deadline, which lets
+    code that does not receive it explicitly (API clients, routed functions)
+    look it up with ``Deadline.current()``.
+
+    Attributes:
+        budget (float): Total number of seconds available for the request.
+        expires_at (float): Monotonic time at which the budget is exhausted.
+
+    Example:
+        with Deadline(7.0) as deadline:
+            response = IntentsService.handle_request(payload, deadline)
+    """
+
+    MIN_TIMEOUT = 0.05
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+        self._token = None
+
+    def remaining(self) -> float:
+        """Returns the number of seconds left, never less than zero."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Returns True when no time is left."""
+        return self.remaining() <= 0.0
+
+    def can_fit(self, seconds: float) -> bool:
+        """Returns True when at least the given number of seconds is left."""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """
+        Returns a timeout for a blocking call that does not outlive the deadline.
+
+        Args:
+            cap (Optional[float]): Upper bound for the timeout, usually the call's own default.
+
+        Returns:
+            float: The timeout in seconds.
+        """
+        remaining = self.remaining()
+        if cap is not None:
+            remaining = min(cap, remaining)
+        return max(remaining, self.MIN_TIMEOUT)
+
+    @staticmethod
+    def current() -> Optional["Deadline"]:
+        """Returns the deadline of the request being handled, if any."""
+        return _current_deadline.get()
+
+    @staticmethod
+    def current_timeout(default: float) -> float:
+        """
+        Returns the default timeout capped by the current deadline, if there is one.
+
+        Args:
+            default (float): The timeout to use when no deadline is active.
+
+        Returns:
+            float: The timeout in seconds.
+        """
+        deadline = _current_deadline.get()
+        return default if deadline is None else deadline.timeout(default)
+
+    def __enter__(self) -> "Deadline":
+        self._token = _current_deadline.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_deadline.reset(self._token)
+        self._token = None
+
+    def __repr__(self):
+        return f"Deadline(budget={self.budget}, remaining={self.remaining():.3f})"
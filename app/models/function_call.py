@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
+
+
+@dataclass(frozen=True)
+class FunctionCall:
+    """
+    Data model for a single function call parsed from a routing model response.
+
+    Instances are immutable so they can be shared safely from the parser cache.
+
+    Attributes:
+        name (str): Name of the function to call.
+        args (Tuple[Any, ...]): Positional argument values.
+        kwargs (Tuple[Tuple[str, Any], ...]): Keyword arguments as (name, value) pairs.
+    """
+
+    name: str
+    args: Tuple[Any, ...] = field(default=())
+    kwargs: Tuple[Tuple[str, Any], ...] = field(default=())
+
+    def keyword_arguments(self) -> Dict[str, Any]:
+        """Returns the keyword arguments as a new dictionary."""
+        return dict(self.kwargs)
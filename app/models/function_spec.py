@@ -0,0 +1,140 @@
+import ast
+import inspect
+import textwrap
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+JSON_SCHEMA_TYPES = {
+    "str": "string",
+    "int": "integer",
+    "float": "number",
+    "bool": "boolean",
+    "list": "array",
+    "dict": "object",
+}
+
+
+@lru_cache(maxsize=64)
+def parse_signature(signature: str) -> inspect.Signature:
+    """
+    Parses a signature such as ``def web_search(search: str) -> str`` without
+    executing it. Only the parameter names, kinds and whether they have a
+    default are kept.
+    """
+    arguments = ast.parse(f"{signature}:\n    pass").body[0].args
+    positional = arguments.posonlyargs + arguments.args
+    defaults = [inspect.Parameter.empty] * (
+        len(positional) - len(arguments.defaults)
+    ) + [ast.unparse(default) for default in arguments.defaults]
+
+    parameters = [
+        inspect.Parameter(
+            argument.arg,
+            (
+                inspect.Parameter.POSITIONAL_ONLY
+                if argument in arguments.posonlyargs
+                else inspect.Parameter.POSITIONAL_OR_KEYWORD
+            ),
+            default=default,
+        )
+        for argument, default in zip(positional, defaults)
+    ]
+    if arguments.vararg:
+        parameters.append(
+            inspect.Parameter(arguments.vararg.arg, inspect.Parameter.VAR_POSITIONAL)
+        )
+    parameters.extend(
+        inspect.Parameter(
+            argument.arg,
+            inspect.Parameter.KEYWORD_ONLY,
+            default=(
+                inspect.Parameter.empty if default is None else ast.unparse(default)
+            ),
+        )
+        for argument, default in zip(arguments.kwonlyargs, arguments.kw_defaults)
+    )
+    if arguments.kwarg:
+        parameters.append(
+            inspect.Parameter(arguments.kwarg.arg, inspect.Parameter.VAR_KEYWORD)
+        )
+    return inspect.Signature(parameters)
+
+
+@dataclass
+class FunctionSpec:
+    """
+    Data model describing a function the routing model can call.
+
+    The loader is only invoked the first time the function is executed, so the
+    services backing a function are not imported or constructed at startup.
+
+    Attributes:
+        name (str): Name the routing model uses to call the function.
+        signature (str): Python signature shown to the routing model, e.g. ``def web_search(search: str) -> str``.
+        description (str): Docstring shown to the routing model.
+        loader (Callable[[], Callable[..., Any]]): Returns the callable that implements the function.
+        async_loader (Optional[Callable[[], Callable[..., Awaitable[Any]]]]): Returns a coroutine
+            function implementing the function for the asyncio path, if there is one.
+        timeout (Optional[float]): Maximum number of seconds the function may run.
+        cacheable (bool): Whether results can be reused for identical calls.
+        cache_ttl (float): Number of seconds a cached result stays valid.
+    """
+
+    name: str
+    signature: str
+    description: str
+    loader: Callable[[], Callable[..., Any]]
+    timeout: Optional[float] = field(default=None)
+    cacheable: bool = field(default=False)
+    cache_ttl: float = field(default=600.0)
+    async_loader: Optional[Callable[[], Callable[..., Awaitable[Any]]]] = field(
+        default=None
+    )
+
+    def __post_init__(self):
+        self.description = textwrap.dedent(self.description).strip()
+
+    def to_prompt(self) -> str:
+        """Returns the function definition block used in the routing prompt."""
+        docstring = textwrap.indent(self.description, "    ")
+        return f'Function:\n{self.signature}:\n    """\n{docstring}\n    """\n'
+
+    def to_signature(self) -> inspect.Signature:
+        """
+        Returns the signature declared to the routing model, which the calls it
+        writes are validated against. Parameters the implementation has beyond
+        it, such as a deadline, cannot be set by the model.
+        """
+        return parse_signature(self.signature)
+
+    def to_tool_schema(self) -> Dict[str, Any]:
+        """Returns an OpenAI-compatible tool schema derived from the signature."""
+        definition = ast.parse(f"{self.signature}:\n    pass").body[0]
+        arguments = definition.args.args
+        defaults_start = len(arguments) - len(definition.args.defaults)
+
+        properties = {}
+        required = []
+        for index, argument in enumerate(arguments):
+            annotation = (
+                ast.unparse(argument.annotation) if argument.annotation else "str"
+            )
+            properties[argument.arg] = {
+                "type": JSON_SCHEMA_TYPES.get(annotation, "string")
+            }
+            if index < defaults_start:
+                required.append(argument.arg)
+
+        return {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description.split("\n\n")[0],
+                "parameters": {
+                    "type": "object",
+                    "properties": properties,
+                    "required": required,
+                },
+            },
+        }
@@ -0,0 +1,69 @@
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Deque, Iterator, List, Optional, Tuple
+
+_current_session: ContextVar[Optional["SessionState"]] = ContextVar(
+    "current_session", default=None
+)
+
+
+@dataclass
+class SessionState:
+    """
+    Data model for the assistant state of a single Alexa session.
+
+    Each session keeps its own personality and the most recent turns of the
+    conversation, so concurrent users do not overwrite each other's state. While
+    a request of the session is handled the state is the current session, which
+    lets code that does not receive it explicitly look it up with
+    ``SessionState.current()``.
+
+    Attributes:
+        session_id (str): The Alexa session id.
+        personality (Optional[str]): The personality used as system role for this session.
+        context (Deque[Tuple[str, str]]): The most recent (utterance, response) turns.
+    """
+
+    session_id: str
+    personality: Optional[str] = field(default=None)
+    context: Deque[Tuple[str, str]] = field(default_factory=lambda: deque(maxlen=5))
+
+    def add_turn(self, utterance: str, response: str):
+        """Records a turn of the conversation, dropping the oldest when full."""
+        self.context.append((utterance, response))
+
+    @contextmanager
+    def activate(self) -> Iterator["SessionState"]:
+        """Makes this the current session for the duration of the block."""
+        token = _current_session.set(self)
+        try:
+            yield self
+        finally:
+            _current_session.reset(token)
+
+    @staticmethod
+    def current() -> Optional["SessionState"]:
+        """Returns the session of the request being handled, if any."""
+        return _current_session.get()
+
+    @staticmethod
+    def current_context() -> List[Tuple[str, str]]:
+        """
+        Returns the recorded (utterance, response) turns of the current session,
+        oldest first, or an empty list when there is no session.
+        """
+        session = _current_session.get()
+        return list(session.context) if session is not None else []
+
+    @staticmethod
+    def current_personality(default: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the personality of the current session, or the default when there
+        is no session or the session has no personality yet.
+        """
+        session = _current_session.get()
+        if session is None or session.personality is None:
+            return default
+        return session.personality
@@ -1,10 +1,32 @@
+import threading
+
+
 class SingletonMeta(type):
     """
     A Singleton metaclass that creates only one instance of the singleton class.
+
+    Instances are created lazily under a lock, so concurrent first calls from
+    several threads get the same instance. The lock is reentrant because
+    singletons construct other singletons in their initializers.
     """
+
     _instances = {}
+    _lock = threading.RLock()
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super().__call__(*args, **kwargs)
-        return cls._instances[cls]
+        instance = cls._instances.get(cls)
+        if instance is None:
+            with SingletonMeta._lock:
+                instance = cls._instances.get(cls)
+                if instance is None:
+                    instance = super().__call__(*args, **kwargs)
+                    cls._instances[cls] = instance
+        return instance
+
+    def reset_instance(cls):
+        """
+        Forgets the instance of the class, so the next call creates a new one.
+        Meant for tests: code that kept the previous instance goes on using it.
+        """
+        with SingletonMeta._lock:
+            cls._instances.pop(cls, None)
@@ -0,0 +1,4 @@
+from .metrics import metrics_bp, register_metrics
+from .status import status_bp
+
+__all__ = ["metrics_bp", "register_metrics", "status_bp"]
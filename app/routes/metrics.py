@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import List
+
+from flask import Blueprint, Flask, Response, before_render_template, template_rendered
+
+from app.services.ai.ai_service_instance import AIServiceSingleton
+from app.services.intent_processor_service import IntentProcessorService
+from app.services.telemetry.metrics_registry import (
+    CONTENT_TYPE,
+    STAGE_SECONDS,
+    STAGE_TEMPLATE_RENDER,
+    CollectedFamily,
+    MetricsRegistry,
+)
+
+# Prometheus scrape endpoint, served next to the skill endpoint
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def collect_caches() -> List[CollectedFamily]:
+    """Returns the hits, misses and hit ratio of the answer and function result caches."""
+    caches = {}
+    answer_cache = AIServiceSingleton.get_instance().get_answer_cache_metrics()
+    if answer_cache is not None:
+        caches["answers"] = (answer_cache["hits"], answer_cache["misses"])
+    result_cache = IntentProcessorService().action_executor_service.result_cache
+    caches["function_results"] = (result_cache.hits, result_cache.misses)
+
+    return [
+        (
+            "nexa_cache_hits_total",
+            "counter",
+            "Cache lookups answered from the cache.",
+            [({"cache": name}, hits) for name, (hits, _) in caches.items()],
+        ),
+        (
+            "nexa_cache_misses_total",
+            "counter",
+            "Cache lookups not answered from the cache.",
+            [({"cache": name}, misses) for name, (_, misses) in caches.items()],
+        ),
+        (
+            "nexa_cache_hit_ratio",
+            "gauge",
+            "Share of the cache lookups answered from the cache.",
+            [
+                ({"cache": name}, hits / (hits + misses))
+                for name, (hits, misses) in caches.items()
+                if hits + misses
+            ],
+        ),
+    ]
+
+
+def collect_backends() -> List[CollectedFamily]:
+    """Returns the model calls in flight and queued per limited backend."""
+    backends = AIServiceSingleton.get_instance().get_backend_metrics()
+    return [
+        (
+            "nexa_backend_in_flight",
+            "gauge",
+            "Model calls being served by the backend.",
+            [({"backend": url}, m["in_flight"]) for url, m in backends.items()],
+        ),
+        (
+            "nexa_backend_queue_depth",
+            "gauge",
+            "Model calls waiting for a backend slot.",
+            [({"backend": url}, m["queue_depth"]) for url, m in backends.items()],
+        ),
+    ]
+
+
+def instrument_templates(app: Flask, registry: MetricsRegistry):
+    """
+    Observes the rendering time of the app's templates as the template render stage.
+    """
+    rendering = threading.local()
+
+    def started(_sender, **_extra):
+        rendering.started = time.perf_counter()
+
+    def finished(_sender, **_extra):
+        started_at = getattr(rendering, "started", None)
+        if started_at is not None:
+            registry.observe(
+                STAGE_SECONDS,
+                time.perf_counter() - started_at,
+                (STAGE_TEMPLATE_RENDER,),
+            )
+            rendering.started = None
+
+    # The receivers are local functions, they must not be held weakly
+    before_render_template.connect(started, app, weak=False)
+    template_rendered.connect(finished, app, weak=False)
+
+
+def register_metrics(app: Flask):
+    """
+    Serves the metrics at /metrics and starts measuring the template rendering
+    and reading the cache and backend metrics at scrape time.
+    """
+    registry = MetricsRegistry()
+    registry.add_collector(collect_caches)
+    registry.add_collector(collect_backends)
+    instrument_templates(app, registry)
+    app.register_blueprint(metrics_bp)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Request counters by intent, in-flight gauges, stage latency histograms and
+    cache hit ratios, in the Prometheus text exposition format.
+    """
+    return Response(MetricsRegistry().render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,96 @@
+from typing import Optional, Tuple
+
+from flask import Blueprint, Flask, jsonify, request
+
+from app.services.telemetry.profiler import PROFILE_HEADER, Profiler
+
+# On-demand profiling, served next to the skill endpoint when PROFILING is on
+profiling_bp = Blueprint("profiling", __name__, url_prefix="/admin")
+
+# WSGI environ key of the profiling header
+PROFILE_ENVIRON_KEY = "HTTP_" + PROFILE_HEADER.upper().replace("-", "_")
+
+
+class ProfilingMiddleware:
+    """
+    WSGI middleware profiling the skill requests: it counts them for the
+    sampling capture and profiles those asking for it with the profiling header,
+    or all of them when slow requests are captured.
+    """
+
+    def __init__(self, wsgi_app, profiler: Profiler, path: str = "/"):
+        self.wsgi_app = wsgi_app
+        self.profiler = profiler
+        self.path = path
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO") != self.path:
+            return self.wsgi_app(environ, start_response)
+        with self.profiler.profile_request(environ.get(PROFILE_ENVIRON_KEY)):
+            return self.wsgi_app(environ, start_response)
+
+
+def start_capture(profiler: Profiler, args) -> Tuple[dict, int]:
+    """
+    Starts a sampling capture with the requests, seconds and interval given in
+    the query string, and returns the response body and status.
+    """
+    try:
+        max_requests = int(args.get("requests", 0))
+        seconds = float(args.get("seconds", 0)) or None
+        interval = float(args.get("interval", 0)) or None
+    except ValueError:
+        return {"error": "requests, seconds and interval must be numbers"}, 400
+    capture = profiler.start_capture(max_requests, seconds, interval)
+    if capture is None:
+        return {
+            "error": "A capture is already running",
+            "capture": profiler.capture.to_dict(),
+        }, 409
+    return {"capture": capture.to_dict()}, 202
+
+
+def handle_profile_request(
+    profiler: Profiler, method: str, token: Optional[str], args
+) -> Tuple[dict, int]:
+    """
+    Answers the admin profiling endpoint: GET returns the profiling state, POST
+    starts a sampling capture and DELETE stops it.
+    """
+    if not profiler.is_authorized(token):
+        return {"error": "Forbidden"}, 403
+    if method == "POST":
+        return start_capture(profiler, args)
+    if method == "DELETE":
+        profiler.stop_capture()
+    return profiler.metrics(), 200
+
+
+def register_profiling(app: Flask):
+    """
+    Serves the profiling endpoint at /admin/profile and profiles the skill
+    requests, when PROFILING is on. Otherwise nothing is installed, so the
+    requests do not pay for it.
+
+    Only the WSGI app is wrapped, which serves the development and production
+    modes. The ASGI app of the async mode does not go through wsgi_app: it
+    serves the endpoint and profiles its requests itself, see ASGIApp.
+    """
+    profiler = Profiler()
+    if not profiler.enabled:
+        return
+    app.wsgi_app = ProfilingMiddleware(app.wsgi_app, profiler)
+    app.register_blueprint(profiling_bp)
+
+
+@profiling_bp.route("/profile", methods=["GET", "POST", "DELETE"])
+def profile():
+    """
+    Sampling capture of the stacks of this process, for the next ``requests``
+    skill requests or ``seconds`` seconds. Requires PROFILE_TOKEN in the
+    X-Profile-Token header.
+    """
+    body, status = handle_profile_request(
+        Profiler(), request.method, request.headers.get(PROFILE_HEADER), request.args
+    )
+    return jsonify(body), status
@@ -0,0 +1,60 @@
+from flask import Blueprint, jsonify
+
+from app.services.ai.ai_service_instance import AIServiceSingleton
+from app.services.intent_processor_service import IntentProcessorService
+from app.services.telemetry.profiler import Profiler
+from app.services.telemetry.tracer import Tracer
+
+# Operational endpoints, served next to the skill endpoint
+status_bp = Blueprint("status", __name__, url_prefix="/status")
+
+
+def get_backend_status() -> dict:
+    """
+    Returns the admission metrics of the model backends, the health of the model
+    endpoints, the hedging counters, the circuit breaker states, the model
+    selections, the answer lengths per template, the warm-up state of the models,
+    the answer cache counters, the timeout counts of the routed functions and
+    the tracing and profiling state.
+    """
+    ai_service = AIServiceSingleton.get_instance()
+    executor = IntentProcessorService().action_executor_service
+    return {
+        "backends": ai_service.get_backend_metrics(),
+        "replicas": ai_service.get_replica_metrics(),
+        "hedging": ai_service.get_hedge_metrics(),
+        "circuits": ai_service.get_circuit_metrics(),
+        "model_selection": ai_service.get_selection_metrics(),
+        "output_lengths": ai_service.get_output_metrics(),
+        "warmup": ai_service.get_warmup_metrics(),
+        "answer_cache": ai_service.get_answer_cache_metrics(),
+        "function_timeouts": executor.get_timeout_counts(),
+        "tracing": Tracer().metrics(),
+        "profiling": Profiler().metrics(),
+    }
+
+
+@status_bp.route("/backends", methods=["GET"])
+def backends():
+    return jsonify(get_backend_status())
+
+
+@status_bp.route("/llm", methods=["GET"])
+def llm():
+    """
+    Token usage per model and template, with the latency, queue wait and time to
+    first token percentiles of every model.
+    """
+    return jsonify(AIServiceSingleton.get_instance().get_llm_metrics())
+
+
+@status_bp.route("/ready", methods=["GET"])
+def ready():
+    """
+    Readiness probe: 503 until the routing and answer models are loaded, so load
+    balancers hold traffic back from an instance that would answer cold.
+    """
+    warmup = AIServiceSingleton.get_instance().warmup
+    if warmup.is_ready():
+        return jsonify({"ready": True})
+    return jsonify({"ready": False, "cold_models": warmup.get_cold_models()}), 503
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl
+
+import aniso8601
+from flask import Flask
+from flask_ask import verifier
+
+from app.apis.open_weather_map_api import OpenWeatherMapAPI
+from app.routes.profiling import handle_profile_request
+from app.routes.status import get_backend_status
+from app.services.ai.ai_service_instance import AIServiceSingleton
+from app.services.response_service import ResponseService
+from app.services.telemetry.metrics_registry import CONTENT_TYPE, MetricsRegistry
+from app.services.telemetry.profiler import PROFILE_HEADER, Profiler
+from app.skill.async_intents import AsyncIntentDispatcher
+
+
+class ASGIApp:
+    """
+    ASGI application serving the Alexa skill on an asyncio event loop.
+
+    Requests are handled as coroutines by the AsyncIntentDispatcher, so one
+    process keeps many Alexa requests in flight without a thread per request.
+    Request verification follows the Flask-Ask settings of the Flask app
+    (ASK_VERIFY_REQUESTS, ASK_VERIFY_TIMESTAMP_DEBUG and ASK_APPLICATION_ID),
+    and every request runs inside the Flask app context so the skill templates
+    can be rendered. With PROFILING on, the skill requests are profiled and the
+    profiling endpoint is served at /admin/profile.
+
+    Attributes:
+        flask_app (Flask): The Flask app holding the configuration and templates.
+        dispatcher (AsyncIntentDispatcher): Dispatcher for the Alexa requests.
+        certificates (Dict[str, Any]): Verified signing certificates by URL.
+        profiler (Optional[Profiler]): Profiler of the requests, None when profiling is off.
+    """
+
+    def __init__(self, flask_app: Flask, path: str = "/"):
+        self.flask_app = flask_app
+        self.path = path
+        self.dispatcher = AsyncIntentDispatcher()
+        self.certificates: Dict[str, Any] = {}
+        self.profiler: Optional[Profiler] = Profiler() if Profiler().enabled else None
+        self.logger = logging.getLogger(__name__)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.handle_lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self.handle_http(scope, receive, send)
+
+    async def handle_lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await AIServiceSingleton.get_instance().aclose()
+                await OpenWeatherMapAPI.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def handle_http(self, scope, receive, send):
+        if scope["path"] == "/status/backends" and scope["method"] == "GET":
+            await self.send_json(send, 200, get_backend_status())
+            return
+        if scope["path"] == "/metrics" and scope["method"] == "GET":
+            await self.send_body(
+                send, 200, MetricsRegistry().render().encode("utf-8"), CONTENT_TYPE
+            )
+            return
+        headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope["headers"]
+        }
+        if scope["path"] == "/admin/profile" and self.profiler is not None:
+            body, status = handle_profile_request(
+                self.profiler,
+                scope["method"],
+                headers.get(PROFILE_HEADER.lower()),
+                dict(parse_qsl(scope["query_string"].decode("latin-1"))),
+            )
+            await self.send_json(send, status, body)
+            return
+        if scope["path"] != self.path:
+            await self.send_json(send, 404, {"error": "Not found"})
+            return
+        if scope["method"] != "POST":
+            await self.send_json(send, 405, {"error": "Method not allowed"})
+            return
+
+        body = await self.read_body(receive)
+        if self.profiler is None:
+            await self.handle_skill_request(headers, body, send)
+        else:
+            with self.profiler.profile_request(headers.get(PROFILE_HEADER.lower())):
+                await self.handle_skill_request(headers, body, send)
+
+    async def handle_skill_request(self, headers: Dict[str, str], body: bytes, send):
+        try:
+            envelope = json.loads(body)
+        except ValueError:
+            await self.send_json(send, 400, {"error": "Invalid JSON"})
+            return
+
+        with self.flask_app.app_context():
+            try:
+                await self.verify_request(headers, body, envelope)
+            except verifier.VerificationError as e:
+                self.logger.warning("Request verification failed: %s", e)
+                await self.send_json(send, 400, {"error": str(e)})
+                return
+
+            payload = await self.dispatcher.dispatch(envelope)
+
+        await self.send_json(send, 200, ResponseService.build_response_body(payload))
+
+    async def verify_request(self, headers: Dict[str, str], body: bytes, envelope):
+        """
+        Verifies the signature, timestamp and application id of an Alexa request.
+
+        Raises:
+            verifier.VerificationError: If the request fails verification.
+        """
+        config = self.flask_app.config
+        if not config.get("ASK_VERIFY_REQUESTS", True):
+            return
+
+        cert_url = headers.get("signaturecertchainurl")
+        signature = headers.get("signature")
+        if not cert_url or not signature:
+            raise verifier.VerificationError("Missing signature headers")
+
+        cert = self.certificates.get(cert_url)
+        if cert is None:
+            # Downloading the certificate blocks, keep it off the event loop
+            cert = await asyncio.to_thread(verifier.load_certificate, cert_url)
+            self.certificates[cert_url] = cert
+        verifier.verify_signature(cert, signature, body)
+
+        if not self.flask_app.debug or config.get("ASK_VERIFY_TIMESTAMP_DEBUG", False):
+            timestamp = aniso8601.parse_datetime(envelope["request"]["timestamp"])
+            verifier.verify_timestamp(timestamp)
+
+        application_ids = config.get("ASK_APPLICATION_ID")
+        if application_ids is not None:
+            application = (
+                envelope.get("context", {}).get("System", {}).get("application", {})
+            )
+            verifier.verify_application_id(
+                application.get("applicationId"), application_ids
+            )
+
+    @staticmethod
+    async def read_body(receive) -> bytes:
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        return body
+
+    @classmethod
+    async def send_json(cls, send, status: int, content: Dict[str, Any]):
+        body = json.dumps(content).encode("utf-8")
+        await cls.send_body(send, status, body, "application/json")
+
+    @staticmethod
+    async def send_body(send, status: int, body: bytes, content_type: str):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", content_type.encode("latin-1")),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
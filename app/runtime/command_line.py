@@ -1,6 +1,13 @@
 import argparse
 
-from app.helpers.constants import DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT
+from app.helpers.constants import (
+    DEFAULT_GRACEFUL_TIMEOUT,
+    DEFAULT_MAX_REQUESTS,
+    DEFAULT_SERVER_HOST,
+    DEFAULT_SERVER_MODE,
+    DEFAULT_SERVER_PORT,
+    DEFAULT_SERVER_THREADS,
+)
 from app.models import CommandLineArgs
 
 
@@ -23,7 +30,49 @@ class CommandLine:
             default="MyCustomIntent",
             help="Name of the custom intent",
         )
+        parser.add_argument(
+            "--mode",
+            "-m",
+            type=str,
+            choices=["development", "production", "async"],
+            default=DEFAULT_SERVER_MODE,
+            help="Serve with the development server, a pre-forking production server or an asyncio server",
+        )
+        parser.add_argument(
+            "--workers",
+            "-w",
+            type=int,
+            default=None,
+            help="Number of worker processes in production mode (default: 2 * CPU cores + 1)",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=DEFAULT_SERVER_THREADS,
+            help="Number of threads per worker in production mode",
+        )
+        parser.add_argument(
+            "--max-requests",
+            type=int,
+            default=DEFAULT_MAX_REQUESTS,
+            help="Recycle a worker after it handled this many requests (0 disables recycling)",
+        )
+        parser.add_argument(
+            "--graceful-timeout",
+            type=int,
+            default=DEFAULT_GRACEFUL_TIMEOUT,
+            help="Seconds workers get to finish in-flight requests on shutdown",
+        )
 
         args = parser.parse_args()
 
-        return CommandLineArgs(server=args.server, port=args.port, intent=args.intent)
+        return CommandLineArgs(
+            server=args.server,
+            port=args.port,
+            intent=args.intent,
+            mode=args.mode,
+            workers=args.workers,
+            threads=args.threads,
+            max_requests=args.max_requests,
+            graceful_timeout=args.graceful_timeout,
+        )
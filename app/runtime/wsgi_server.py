@@ -0,0 +1,33 @@
+from typing import Any, Dict
+
+from gunicorn.app.base import BaseApplication
+
+
+class WSGIServer(BaseApplication):
+    """
+    Pre-forking WSGI server that serves an already loaded Flask application.
+
+    The application is created before the workers are forked, so everything
+    built while loading it is shared by all workers.
+
+    Attributes:
+        application: The WSGI application to serve.
+        options (Dict[str, Any]): Gunicorn settings, e.g. ``bind`` or ``workers``.
+    """
+
+    def __init__(self, application, options: Dict[str, Any] = None):
+        self.application = application
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key.lower(), value)
+
+    def init(self, parser, opts, args):
+        # The settings come from the options, not from the command line
+        return None
+
+    def load(self):
+        return self.application
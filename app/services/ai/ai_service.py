@@ -1,13 +1,36 @@
 import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, List, Optional, Tuple
 
 import openai
 from flask import render_template
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from app.config.config import Config
 from app.helpers.resource_loader import ResourceLoader
+from app.models.ai.batch_result import BatchResult
 from app.models.ai.model_config import ModelConfig
 from app.models.ai.model_configs import ModelConfigs
+from app.models.ai.replica_balancer import ReplicaBalancer
+from app.models.deadline import Deadline
+from app.models.session_state import SessionState
+from app.services.ai.batch_runner import BatchRunner
+from app.services.ai.budgeted_output import BudgetedOutput
+from app.services.ai.circuit_breaker import CircuitBreaker
+from app.services.ai.concurrency_limiter import (
+    AdmissionRejectedError,
+    ConcurrencyLimiter,
+)
+from app.services.ai.fallback_chain import FallbackChain
+from app.services.ai.hedging import HedgePolicy, Hedger
+from app.services.ai.model_selector import ModelSelector
+from app.services.ai.semantic_cache import SemanticCache
+from app.services.ai.warmup_manager import WarmupManager
+from app.services.execution.function_registry import FunctionRegistry
+from app.services.telemetry.llm_telemetry import LLMTelemetry
+from app.services.telemetry.metrics_registry import STAGE_LLM_CALL, MetricsRegistry
+from app.services.telemetry.tracer import Tracer, traced
 
 
 class AIService:
@@ -16,8 +39,23 @@ class AIService:
 
     This class provides methods to interact with the OpenAI API, including fetching responses for given prompts
     with optimization techniques like memoization and parallel processing.
+
+    Every request method has an ``_async`` counterpart for the asyncio serving path.
+    Model calls go through the backend's ConcurrencyLimiter, the model's
+    CircuitBreaker and the Hedger, and fall back to the configured ``fallbacks``;
+    answers are kept within their template's output budget by BudgetedOutput.
     """
 
+    RAVEN_PROMPT = """
+        <human>:
+        {functions}
+        User Query: {query}
+
+        Please pick a function from the above function definitions that best answers the 
+        user query and fill in the appropriate arguments.
+        <human_end>
+        """
+
     def __init__(self, config_path: str):
         """
         Initializes the AIService with the provided model configurations.
@@ -27,6 +65,28 @@ class AIService:
         """
         self.config = Config()
         self.model_configs = self.load_configs(config_path)
+        self.async_clients: Dict[Tuple[str, str], AsyncOpenAI] = {}
+        self.limiters = self.create_limiters(self.model_configs)
+        self.breakers = self.create_breakers(self.model_configs)
+        self.fallbacks = FallbackChain(self.model_configs)
+        self.selector = ModelSelector(self.config, self.model_configs, self.breakers)
+        self.telemetry = LLMTelemetry()
+        self.output = BudgetedOutput(self.config, self.telemetry)
+        self.metrics = MetricsRegistry()
+        self.warmup = WarmupManager(
+            self.model_configs.configs, self.get_required_models()
+        )
+        self.answer_cache = self.create_answer_cache()
+        self.hedger = Hedger(
+            HedgePolicy(self.config.hedge_max_rate),
+            self.model_configs.get_model_config,
+        )
+        self.batches = BatchRunner(
+            self.model_configs,
+            self.limiters,
+            self.get_openai_response,
+            self.get_openai_response_async,
+        )
         # Configure logging
         self.logger = logging.getLogger(__name__)
 
@@ -69,6 +129,259 @@ class AIService:
 
     #     return memoized_func
 
+    @staticmethod
+    def create_limiters(model_configs: ModelConfigs) -> Dict[str, ConcurrencyLimiter]:
+        """
+        Creates a concurrency limiter for every backend that has a concurrency limit.
+
+        Args:
+            model_configs (ModelConfigs): The model configurations.
+
+        Returns:
+            Dict[str, ConcurrencyLimiter]: The limiters by backend base URL.
+        """
+        limits: Dict[str, Tuple[int, int]] = {}
+        for model_config in model_configs.configs:
+            if model_config.max_concurrency is None:
+                continue
+            max_concurrency, max_queue = limits.get(
+                model_config.base_url,
+                (model_config.max_concurrency, model_config.max_queue),
+            )
+            limits[model_config.base_url] = (
+                min(max_concurrency, model_config.max_concurrency),
+                min(max_queue, model_config.max_queue),
+            )
+        return {
+            base_url: ConcurrencyLimiter(base_url, max_concurrency, max_queue)
+            for base_url, (max_concurrency, max_queue) in limits.items()
+        }
+
+    def create_breakers(
+        self, model_configs: ModelConfigs
+    ) -> Dict[Tuple[str, str], CircuitBreaker]:
+        """
+        Creates a circuit breaker for every model configuration.
+
+        Args:
+            model_configs (ModelConfigs): The model configurations.
+
+        Returns:
+            Dict[Tuple[str, str], CircuitBreaker]: The breakers by base URL and model.
+        """
+        return {
+            ReplicaBalancer.replica_id(model_config): CircuitBreaker(
+                f"{model_config.model} @ {model_config.base_url}",
+                failure_threshold=self.config.circuit_failure_threshold,
+                reset_timeout=self.config.circuit_reset_timeout,
+            )
+            for model_config in model_configs.configs
+        }
+
+    def create_answer_cache(self) -> Optional[SemanticCache]:
+        """
+        Creates the cache of answers to open questions, or None when it is
+        disabled with a size of 0.
+        """
+        if self.config.semantic_cache_size <= 0:
+            return None
+        return SemanticCache(
+            path=self.config.semantic_cache_path,
+            max_entries=self.config.semantic_cache_size,
+            threshold=self.config.semantic_cache_threshold,
+            ttl=self.config.semantic_cache_ttl,
+            volatile_ttl=self.config.semantic_cache_volatile_ttl,
+        )
+
+    def get_required_models(self) -> Dict[str, List[ModelConfig]]:
+        """
+        Returns the replicas of the routing and answer models, which must be
+        loaded before the skill is ready, by model identifier.
+        """
+        required = {}
+        for model in self.selector.get_tier_models().values():
+            if not model or model in required:
+                continue
+            try:
+                required[model] = self.model_configs.get_replicas(model)
+            except ValueError:
+                continue
+        return required
+
+    @contextmanager
+    def circuit(self, model_config: ModelConfig):
+        """
+        Guards the model call made in the block with the model's circuit breaker.
+        Rejections by the admission control are not held against the backend.
+
+        Raises:
+            CircuitOpenError: If the model's circuit is open.
+        """
+        breaker = self.breakers[ReplicaBalancer.replica_id(model_config)]
+        breaker.before_call()
+        try:
+            yield
+        except AdmissionRejectedError:
+            breaker.record_skipped()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+
+    def get_admission_timeout(self, deadline: Deadline = None) -> Optional[float]:
+        """
+        Returns how long a request may wait for a busy backend, keeping the
+        admission reserve of the deadline for the model call itself.
+        """
+        if deadline is None:
+            return None
+        return max(0.0, deadline.remaining() - self.config.admission_reserve)
+
+    @contextmanager
+    def admission(self, model_config: ModelConfig, deadline: Deadline = None):
+        """
+        Holds a slot of the model's backend for the duration of the block.
+
+        Raises:
+            AdmissionRejectedError: If the backend's queue is full or no slot became free in time.
+        """
+        limiter = self.limiters.get(model_config.base_url)
+        if limiter is None:
+            yield
+            return
+        with limiter.slot(self.get_admission_timeout(deadline)):
+            yield
+
+    @asynccontextmanager
+    async def admission_async(
+        self, model_config: ModelConfig, deadline: Deadline = None
+    ):
+        """
+        Asynchronous variant of admission.
+
+        Raises:
+            AdmissionRejectedError: If the backend's queue is full or no slot became free in time.
+        """
+        limiter = self.limiters.get(model_config.base_url)
+        if limiter is None:
+            yield
+            return
+        async with limiter.slot_async(self.get_admission_timeout(deadline)):
+            yield
+
+    @contextmanager
+    def observe(self, model_config: ModelConfig):
+        """
+        Records the latency and outcome of the model call made in the block, so
+        later lookups can prefer fast and healthy replicas, and so the warm-up
+        manager knows when the model was last used. The duration is also
+        observed in the LLM call stage histogram.
+        """
+        started = time.monotonic()
+        try:
+            with self.metrics.stage(STAGE_LLM_CALL):
+                yield
+        except Exception:
+            self.model_configs.record_result(
+                model_config, time.monotonic() - started, success=False
+            )
+            raise
+        latency = time.monotonic() - started
+        self.model_configs.record_result(model_config, latency, success=True)
+        self.warmup.record(model_config, started, latency)
+
+    @staticmethod
+    def trace_call(model_config: ModelConfig, template: str = None):
+        """
+        Opens the span of a model call, from asking for a backend slot until the
+        answer is complete.
+        """
+        return Tracer.span(
+            "llm.call",
+            model=model_config.model,
+            backend=model_config.base_url,
+            template=template or "untemplated",
+        )
+
+    def get_backend_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the queue depth, wait time and rejection metrics of the limited backends.
+        """
+        return {
+            base_url: limiter.metrics() for base_url, limiter in self.limiters.items()
+        }
+
+    def get_replica_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the latency, error rate and ejection state of the model endpoints.
+        """
+        return self.model_configs.balancer.metrics()
+
+    def get_hedge_metrics(self) -> Dict[str, Any]:
+        """
+        Returns how often requests were hedged and which request answered first.
+        """
+        return self.hedger.policy.metrics()
+
+    def select_model(
+        self,
+        prompt_class: str,
+        deadline: Deadline = None,
+        preferred: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Chooses the model for a prompt from its class, the time left and the
+        health of the backends.
+
+        Args:
+            prompt_class (str): The class of the prompt, such as "acknowledgement" or "open_question".
+            deadline (Deadline, optional): The deadline of the request.
+            preferred (Optional[str]): Model to use instead of the tier's model when it fits.
+
+        Returns:
+            Optional[str]: The model identifier, or None when no model fits in the time left.
+        """
+        return self.selector.select(prompt_class, deadline, preferred)
+
+    def get_output_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the requested and the actual answer length per template.
+        """
+        return self.output.metrics()
+
+    def get_answer_cache_metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the size and hit rate of the answer cache, or None when it is disabled.
+        """
+        if self.answer_cache is None:
+            return None
+        return self.answer_cache.metrics()
+
+    def get_llm_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the token usage and latency distributions per model and template.
+        """
+        return self.telemetry.metrics()
+
+    def get_warmup_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns whether each model is loaded, and its priming and cold start counters.
+        """
+        return self.warmup.metrics()
+
+    def get_selection_metrics(self) -> Dict[str, int]:
+        """
+        Returns the number of times each model was selected per prompt class.
+        """
+        return self.selector.metrics()
+
+    def get_circuit_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the state of the circuit breaker of every model configuration.
+        """
+        return {breaker.name: breaker.metrics() for breaker in self.breakers.values()}
+
     def get_model_config(self, model_name: str) -> ModelConfig:
         """
         Retrieves a specific model configuration by model name.
@@ -84,9 +397,32 @@ class AIService:
             return config_model
         raise ValueError(f"Model {model_name} not found in the configurations.")
 
+    @staticmethod
+    def get_client_options(deadline: Deadline = None) -> dict:
+        """
+        Returns OpenAI client options that keep a request within the deadline.
+
+        Retries are disabled under a deadline since a retry would not fit anyway.
+
+        Args:
+            deadline (Deadline, optional): The deadline of the request being handled.
+
+        Returns:
+            dict: Keyword arguments for the OpenAI client.
+        """
+        if deadline is None:
+            return {}
+        return {"timeout": deadline.timeout(), "max_retries": 0}
+
     # @memoize
     def get_openai_response(
-        self, prompt, model_config: ModelConfig, system_role: str = None
+        self,
+        prompt,
+        model_config: ModelConfig,
+        system_role: str = None,
+        deadline: Deadline = None,
+        template: str = None,
+        raise_errors: bool = False,
     ):
         """
         Fetches response from OpenAI API for a given prompt using a specified model configuration and optional system role.
@@ -95,31 +431,82 @@ class AIService:
             prompt (str): The input prompt for the API.
             model_config (ModelConfig): The model configuration to use for the request.
             system_role (str, optional): The system role to include in the request.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+            template (str, optional): Name of the template the prompt was rendered from, whose output budget applies.
+            raise_errors (bool): Raise the error of the last model tried instead of returning None.
 
         Returns:
-            str: The response text from OpenAI API.
+            str: The response text from OpenAI API, or None if the request failed or the deadline passed.
         """
-        client = openai.OpenAI(
-            base_url=model_config.base_url,
-            api_key=model_config.api_key,
-        )
+        if deadline is None:
+            deadline = Deadline.current()
+        if deadline is not None and deadline.expired():
+            self.logger.warning(
+                "Deadline exceeded before calling model %s", model_config.model
+            )
+            if raise_errors:
+                raise TimeoutError(
+                    f"Deadline exceeded before calling {model_config.model}"
+                )
+            return None
 
         messages = []
         if system_role:
             messages.append({"role": "system", "content": system_role})
         messages.append({"role": "user", "content": prompt})
 
-        try:
+        def complete(link: ModelConfig) -> str:
+            if link.hedge_to:
+                return self.hedger.complete(
+                    self.get_completion, link, messages, deadline, template
+                )
+            return self.get_completion(link, messages, deadline, template)
+
+        return self.fallbacks.call(model_config, complete, deadline, raise_errors)
+
+    def get_completion(
+        self,
+        model_config: ModelConfig,
+        messages: list,
+        deadline: Deadline = None,
+        template: str = None,
+    ) -> str:
+        """
+        Sends a chat completion request to a model and returns the response text,
+        limited to the output budget of the prompt's template.
+
+        Raises:
+            CircuitOpenError: If the model's circuit is open.
+            AdmissionRejectedError: If the model's backend did not admit the request.
+        """
+        client = openai.OpenAI(
+            base_url=model_config.base_url,
+            api_key=model_config.api_key,
+            **self.get_client_options(deadline),
+        )
+        call = self.telemetry.start(model_config.model, template, messages)
+        with self.trace_call(model_config, template), self.circuit(
+            model_config
+        ), self.admission(model_config, deadline), self.observe(model_config):
+            call.admitted()
+            if self.output.should_stream(template):
+                return self.output.stream(client, call)
             response = client.chat.completions.create(
                 model=model_config.model,
                 messages=messages,
+                **self.output.options(template),
             )
-            return response.choices[0].message.content.strip()
-        except Exception as err:
-            print(f"Unexpected {err=}, {type(err)=}")
+        self.telemetry.finish(call, response.choices[0].message.content, response.usage)
+        return self.output.text(response, template)
 
+    @traced("ai.get_response")
     def get_response_with_model_name(
-        self, prompt: str, model_name: str, system_role: str = None
+        self,
+        prompt: str,
+        model_name: str,
+        system_role: str = None,
+        deadline: Deadline = None,
+        template: str = None,
     ) -> str:
         """
         Fetches response from OpenAI API for a given prompt using the specified model name and optional system role.
@@ -128,135 +515,96 @@ class AIService:
             prompt (str): The input prompt for the API.
             model_name (str): The name of the model to use for the request.
             system_role (str, optional): The system role to include in the request.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+            template (str, optional): Name of the template the prompt was rendered from, whose output budget applies.
 
         Returns:
             str: The response text from OpenAI API.
         """
         model_config = self.model_configs.get_model_config(model_name)
-        return self.get_openai_response(prompt, model_config, system_role)
+        return self.get_openai_response(
+            prompt, model_config, system_role, deadline, template
+        )
 
-    def get_raven_function_response(
+    def get_responses_batch(
         self,
-        prompt,
-        model_config: ModelConfig,
-    ):
+        prompts: List[str],
+        model_name: str,
+        system_role: str = None,
+        template: str = None,
+        deadline: Deadline = None,
+    ) -> List[BatchResult]:
+        """
+        Fetches the responses to independent prompts concurrently, within the
+        concurrency limits of the model's backends.
 
-        RAVEN_PROMPT = '''
-        <human>:
-        Function:
-        def ask_the_ai(query: str) -> str:
-            """
-            The user's non modified query does not contain the words 'web' or 'internet'
-            
-            Args:
-                query (str): The snon modified earch query string provided by the user where there is no specific referenct to use 'web' or 'internet'
-
-            Returns:
-                str: A comprehensive response generated by ai.
-            """
-
-        Function:
-        def web_search(search: str) -> str:
-            """
-            The user's non modified search contains the words 'web' or 'internet'
-
-            Args:
-                search (str): The non modified search string provided by the user where the search contains the words 'web' or 'internet' specifically.
-
-            Returns:
-                str: A comprehensive response generated by web or internet.
-            """
-
-        Function:
-        def get_weather_forecast(duration: str = "today", location: str = None, start_date: str = None, weather_condition: str = None) -> str:
-            """
-            Fetches weather data from the service API for the given duration starting from a specific date and filtered by weather condition.
-
-            Args:
-                duration (str): Specifies when the weather forecast is for.
-                                Accepted values are:
-                                - "today": Retrieves the weather forecast for the current day.
-                                - "tomorrow": Retrieves the weather forecast for the next day.
-                                - "week": Retrieves the weather forecast for the upcoming week.
-                                Note: If the weather service API does not support forecasts beyond today, 
-                                the function will return the forecast for today.
-                                Defaults to "today" if not provided.
-                                
-                location (str): Optional string specifying the location for the weather forecast. 
-                                Can be a city name, city name and country code, or city name and state code.
-                                Defaults to 'London' if not provided.
-                                Examples: 
-                                - "Nags Head"
-                                - "Paris, FR"
-                                - "New York, US"
-                                
-                start_date (str): Optional string specifying the start date for the weather forecast in the format 'YYYY-MM-DD'.
-                                Defaults to today's date if not provided.
-
-                weather_condition (str): Optional string specifying the type of weather condition to filter the forecast by.
-                                 Examples: "rain", "snow", "fog".
-                                 If not provided, forecasts for all weather conditions will be returned.
-
-                Returns:
-                    str: The weather data for the specified duration, location, start date, and weather condition.
-                        
-            """
-
-        Function:
-        def get_weather_temperature(when):
-            """
-            Fetches weather temperature from the service API for the given duration.
-
-            Args:
-            when : When is the temperature for: example ...for today
-
-            Returns:
-            str: The temperature data for when 
-            """
+        Args:
+            prompts (List[str]): The input prompts.
+            model_name (str): The name of the model to use for the requests.
+            system_role (str, optional): The system role to include in every request.
+            template (str, optional): Name of the template the prompts were rendered from, whose output budget applies.
+            deadline (Deadline, optional): The deadline of the whole batch. Defaults to the current deadline.
 
-        User Query: {query}
+        Returns:
+            List[BatchResult]: The result of every prompt, in the order of the prompts.
 
-        Please pick a function from the above function definitions that best answers the 
-        user query and fill in the appropriate arguments.
-        <human_end>
-        '''
+        Raises:
+            ValueError: If the model is not configured.
+        """
+        return self.batches.run(prompts, model_name, system_role, template, deadline)
 
-        try:
+    def get_raven_function_response(
+        self,
+        prompt,
+        model_config: ModelConfig,
+        deadline: Deadline = None,
+    ):
+        if deadline is None:
+            deadline = Deadline.current()
 
-            question = prompt
+        question = prompt
 
-            prompt_content = RAVEN_PROMPT.format(query=question)
+        prompt_content = self.RAVEN_PROMPT.format(
+            functions=FunctionRegistry().routing_prompt(), query=question
+        )
 
-            messages = []
-            messages.append({"role": "user", "content": prompt_content})
+        messages = []
+        messages.append({"role": "user", "content": prompt_content})
 
+        def complete(link: ModelConfig) -> str:
             client = OpenAI(
-                base_url=model_config.base_url,
-                api_key=model_config.api_key,
-            )
-            response = client.chat.completions.create(
-                model=model_config.model,
-                messages=messages,
-                stream=False,
-                temperature=0.001,
-                stop="<bot_end>",
+                base_url=link.base_url,
+                api_key=link.api_key,
+                **self.get_client_options(deadline),
             )
+            call = self.telemetry.start(link.model, "raven_prompt", messages)
+            with self.trace_call(link, "raven_prompt"), self.circuit(
+                link
+            ), self.admission(link, deadline), self.observe(link):
+                call.admitted()
+                response = client.chat.completions.create(
+                    model=link.model,
+                    messages=messages,
+                    stream=False,
+                    temperature=0.001,
+                    stop="<bot_end>",
+                )
             response_message = response.choices[0].message
+            self.telemetry.finish(call, response_message.content, response.usage)
             return response_message.content
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            for ss in messages:
-                message_stuff = f'Role: {ss["role"]}\nContent:{ss["content"]}\n'
-                print(message_stuff)
 
-        return None
+        return self.fallbacks.call(model_config, complete, deadline)
 
-    def get_function_for_utterance(self, utterance: str) -> str:
+    @traced("ai.get_function_for_utterance")
+    def get_function_for_utterance(
+        self, utterance: str, deadline: Deadline = None
+    ) -> str:
         """
         Calls the OpenAI API to get a function call string based on the given utterance.
 
         Parameters:
             utterance (str): The user's input as a string.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
 
         Returns:
             str: The function call string interpreted from the utterance.
@@ -267,11 +615,14 @@ class AIService:
             print(function_str)
         """
         self.logger.info("Calling OpenAI API for utterance: %s", utterance)
-        model = self.get_model_config("nexus")
-        response = self.get_raven_function_response(utterance, model_config=model)
+        model = self.get_model_config(self.select_model("routing"))
+        response = self.get_raven_function_response(
+            utterance, model_config=model, deadline=deadline
+        )
         self.logger.info("Utterance function: %s", response)
         return response
 
+    @traced("ai.ask_the_ai")
     def ask_the_ai(self, query: str) -> str:
         """
         The user's non modified query does not contain the words 'web' or 'internet'
@@ -282,35 +633,342 @@ class AIService:
         Returns:
             str: A comprehensive response generated by ai.
         """
-        model_identifier = self.config.large_language_model
-        system_role = self.config.personality
+        scope = SessionState.current_personality(self.config.personality) or ""
+        # A follow-up question depends on the earlier turns, so it is not cached
+        context = SessionState.current_context()
+        cache = self.answer_cache if not context else None
+        if cache is not None:
+            answer = cache.get(query, scope)
+            if answer is not None:
+                return answer
+
+        prompt = render_template("query_prompt", query=query, context=context)
+        answer = self.prompt_the_ai(
+            prompt, prompt_class="open_question", template="query_prompt"
+        )
+        if answer and cache is not None:
+            cache.put(query, answer, scope)
+        return answer
+
+    def prompt_the_ai(
+        self,
+        prompt: str,
+        prompt_class: str = "summary",
+        template: str = None,
+        deadline: Deadline = None,
+    ) -> str:
+        """
+        The user's non modified query does not contain the words 'web' or 'internet'
+
+        Args:
+            query (str): The snon modified earch query string provided by the user where there is no specific referenct to use 'web' or 'internet'
+            prompt_class (str, optional): The class of the prompt, which decides the latency tier of the model. Defaults to "summary".
+            template (str, optional): Name of the template the prompt was rendered from, whose output budget applies.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+
+        Returns:
+            str: A comprehensive response generated by ai, or None if no model fits in the time left.
+        """
+        if deadline is None:
+            deadline = Deadline.current()
+        model_identifier = self.select_model(prompt_class, deadline)
+        if model_identifier is None:
+            return None
+        system_role = SessionState.current_personality(self.config.personality)
 
-        prompt = render_template("query_prompt", query=query)
         response_text = self.get_response_with_model_name(
-            prompt, model_identifier, system_role
+            prompt, model_identifier, system_role, deadline, template
         )
         self.logger.info("Response for prompt '%s': %s", prompt, response_text)
         return response_text
 
-    def prompt_the_ai(self, prompt: str) -> str:
+    def get_async_client(
+        self, model_config: ModelConfig, deadline: Deadline = None
+    ) -> AsyncOpenAI:
         """
-        The user's non modified query does not contain the words 'web' or 'internet'
+        Returns the shared AsyncOpenAI client for the model's backend.
+
+        Under a deadline a copy of the client is returned that shares its connection
+        pool but uses the deadline's timeout and does not retry.
 
         Args:
-            query (str): The snon modified earch query string provided by the user where there is no specific referenct to use 'web' or 'internet'
+            model_config (ModelConfig): The model configuration to get the client for.
+            deadline (Deadline, optional): The deadline of the request being handled.
+
+        Returns:
+            AsyncOpenAI: The client.
+        """
+        key = (model_config.base_url, model_config.api_key)
+        client = self.async_clients.get(key)
+        if client is None:
+            client = AsyncOpenAI(
+                base_url=model_config.base_url, api_key=model_config.api_key
+            )
+            self.async_clients[key] = client
+
+        options = self.get_client_options(deadline)
+        return client.with_options(**options) if options else client
+
+    async def get_openai_response_async(
+        self,
+        prompt,
+        model_config: ModelConfig,
+        system_role: str = None,
+        deadline: Deadline = None,
+        template: str = None,
+        raise_errors: bool = False,
+    ):
+        """
+        Asynchronous variant of get_openai_response.
+
+        Args:
+            prompt (str): The input prompt for the API.
+            model_config (ModelConfig): The model configuration to use for the request.
+            system_role (str, optional): The system role to include in the request.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+            template (str, optional): Name of the template the prompt was rendered from, whose output budget applies.
+            raise_errors (bool): Raise the error of the last model tried instead of returning None.
+
+        Returns:
+            str: The response text from OpenAI API, or None if the request failed or the deadline passed.
+        """
+        if deadline is None:
+            deadline = Deadline.current()
+        if deadline is not None and deadline.expired():
+            self.logger.warning(
+                "Deadline exceeded before calling model %s", model_config.model
+            )
+            if raise_errors:
+                raise TimeoutError(
+                    f"Deadline exceeded before calling {model_config.model}"
+                )
+            return None
+
+        messages = []
+        if system_role:
+            messages.append({"role": "system", "content": system_role})
+        messages.append({"role": "user", "content": prompt})
+
+        async def complete(link: ModelConfig) -> str:
+            if link.hedge_to:
+                return await self.hedger.complete_async(
+                    self.get_completion_async, link, messages, deadline, template
+                )
+            return await self.get_completion_async(link, messages, deadline, template)
+
+        return await self.fallbacks.call_async(
+            model_config, complete, deadline, raise_errors
+        )
+
+    async def get_completion_async(
+        self,
+        model_config: ModelConfig,
+        messages: list,
+        deadline: Deadline = None,
+        template: str = None,
+    ) -> str:
+        """
+        Asynchronous variant of get_completion.
+
+        Raises:
+            CircuitOpenError: If the model's circuit is open.
+            AdmissionRejectedError: If the model's backend did not admit the request.
+        """
+        client = self.get_async_client(model_config, deadline)
+        call = self.telemetry.start(model_config.model, template, messages)
+        with self.trace_call(model_config, template), self.circuit(model_config):
+            async with self.admission_async(model_config, deadline):
+                with self.observe(model_config):
+                    call.admitted()
+                    if self.output.should_stream(template):
+                        return await self.output.stream_async(client, call)
+                    response = await client.chat.completions.create(
+                        model=model_config.model,
+                        messages=messages,
+                        **self.output.options(template),
+                    )
+        self.telemetry.finish(call, response.choices[0].message.content, response.usage)
+        return self.output.text(response, template)
+
+    @traced("ai.get_response")
+    async def get_response_with_model_name_async(
+        self,
+        prompt: str,
+        model_name: str,
+        system_role: str = None,
+        deadline: Deadline = None,
+        template: str = None,
+    ) -> str:
+        """
+        Asynchronous variant of get_response_with_model_name.
+
+        Args:
+            prompt (str): The input prompt for the API.
+            model_name (str): The name of the model to use for the request.
+            system_role (str, optional): The system role to include in the request.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+            template (str, optional): Name of the template the prompt was rendered from, whose output budget applies.
+
+        Returns:
+            str: The response text from OpenAI API.
+        """
+        model_config = self.model_configs.get_model_config(model_name)
+        return await self.get_openai_response_async(
+            prompt, model_config, system_role, deadline, template
+        )
+
+    async def get_responses_batch_async(
+        self,
+        prompts: List[str],
+        model_name: str,
+        system_role: str = None,
+        template: str = None,
+        deadline: Deadline = None,
+    ) -> List[BatchResult]:
+        """
+        Asynchronous variant of get_responses_batch.
+
+        Raises:
+            ValueError: If the model is not configured.
+        """
+        return await self.batches.run_async(
+            prompts, model_name, system_role, template, deadline
+        )
+
+    async def get_raven_function_response_async(
+        self,
+        prompt,
+        model_config: ModelConfig,
+        deadline: Deadline = None,
+    ):
+        """
+        Asynchronous variant of get_raven_function_response.
+        """
+        if deadline is None:
+            deadline = Deadline.current()
+
+        messages = [
+            {
+                "role": "user",
+                "content": self.RAVEN_PROMPT.format(
+                    functions=FunctionRegistry().routing_prompt(), query=prompt
+                ),
+            }
+        ]
+
+        async def complete(link: ModelConfig) -> str:
+            client = self.get_async_client(link, deadline)
+            call = self.telemetry.start(link.model, "raven_prompt", messages)
+            with self.trace_call(link, "raven_prompt"), self.circuit(link):
+                async with self.admission_async(link, deadline):
+                    with self.observe(link):
+                        call.admitted()
+                        response = await client.chat.completions.create(
+                            model=link.model,
+                            messages=messages,
+                            stream=False,
+                            temperature=0.001,
+                            stop="<bot_end>",
+                        )
+            content = response.choices[0].message.content
+            self.telemetry.finish(call, content, response.usage)
+            return content
+
+        return await self.fallbacks.call_async(model_config, complete, deadline)
+
+    @traced("ai.get_function_for_utterance")
+    async def get_function_for_utterance_async(
+        self, utterance: str, deadline: Deadline = None
+    ) -> str:
+        """
+        Asynchronous variant of get_function_for_utterance.
+
+        Parameters:
+            utterance (str): The user's input as a string.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+
+        Returns:
+            str: The function call string interpreted from the utterance.
+        """
+        self.logger.info("Calling OpenAI API for utterance: %s", utterance)
+        model = self.get_model_config(self.select_model("routing"))
+        response = await self.get_raven_function_response_async(
+            utterance, model_config=model, deadline=deadline
+        )
+        self.logger.info("Utterance function: %s", response)
+        return response
+
+    @traced("ai.ask_the_ai")
+    async def ask_the_ai_async(self, query: str) -> str:
+        """
+        Asynchronous variant of ask_the_ai.
+
+        Args:
+            query (str): The non modified search query string provided by the user.
 
         Returns:
             str: A comprehensive response generated by ai.
         """
-        model_identifier = self.config.large_language_model
-        system_role = self.config.personality
+        scope = SessionState.current_personality(self.config.personality) or ""
+        # A follow-up question depends on the earlier turns, so it is not cached
+        context = SessionState.current_context()
+        cache = self.answer_cache if not context else None
+        if cache is not None:
+            answer = cache.get(query, scope)
+            if answer is not None:
+                return answer
+
+        prompt = render_template("query_prompt", query=query, context=context)
+        answer = await self.prompt_the_ai_async(
+            prompt, prompt_class="open_question", template="query_prompt"
+        )
+        if answer and cache is not None:
+            cache.put(query, answer, scope)
+        return answer
 
-        response_text = self.get_response_with_model_name(
-            prompt, model_identifier, system_role
+    async def prompt_the_ai_async(
+        self,
+        prompt: str,
+        prompt_class: str = "summary",
+        template: str = None,
+        deadline: Deadline = None,
+    ) -> str:
+        """
+        Asynchronous variant of prompt_the_ai.
+
+        Args:
+            prompt (str): The prompt to send to the model.
+            prompt_class (str, optional): The class of the prompt, which decides the latency tier of the model. Defaults to "summary".
+            template (str, optional): Name of the template the prompt was rendered from, whose output budget applies.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+
+        Returns:
+            str: A comprehensive response generated by ai, or None if no model fits in the time left.
+        """
+        if deadline is None:
+            deadline = Deadline.current()
+        model_identifier = self.select_model(prompt_class, deadline)
+        if model_identifier is None:
+            return None
+        response_text = await self.get_response_with_model_name_async(
+            prompt,
+            model_identifier,
+            SessionState.current_personality(self.config.personality),
+            deadline,
+            template,
         )
         self.logger.info("Response for prompt '%s': %s", prompt, response_text)
         return response_text
 
+    async def aclose(self):
+        """
+        Closes the shared asynchronous clients.
+        """
+        clients = list(self.async_clients.values())
+        self.async_clients.clear()
+        for client in clients:
+            await client.close()
+
 
 # def main():
 #     api = AIService()
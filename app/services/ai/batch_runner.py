@@ -0,0 +1,176 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.helpers.thread_helpers import ThreadHelpers
+from app.models.ai.batch_result import BatchResult
+from app.models.ai.model_configs import ModelConfigs
+from app.models.deadline import Deadline
+from app.services.ai.concurrency_limiter import ConcurrencyLimiter
+
+# Sends a prompt to a model: prompt, model configuration, system role, deadline,
+# template and raise_errors, like AIService.get_openai_response
+Responder = Callable[..., Optional[str]]
+AsyncResponder = Callable[..., Awaitable[Optional[str]]]
+
+
+class BatchRunner:
+    """
+    Sends independent prompts to a model concurrently.
+
+    At most as many prompts as the model's backends have slots are in flight at
+    once, so a batch does not fill the admission queues ahead of user requests.
+    Each prompt is retried on the model's fallbacks like a single request, and
+    its error is returned in its result instead of failing the batch.
+
+    Attributes:
+        model_configs (ModelConfigs): The model configurations.
+        limiters (Dict[str, ConcurrencyLimiter]): The concurrency limiters by backend base URL.
+        respond (Responder): Sends a prompt to a model.
+        respond_async (AsyncResponder): Asynchronous variant of respond.
+    """
+
+    # Prompts of a batch in flight at once, for backends without a concurrency limit
+    MAX_CONCURRENCY = 8
+
+    def __init__(
+        self,
+        model_configs: ModelConfigs,
+        limiters: Dict[str, ConcurrencyLimiter],
+        respond: Responder,
+        respond_async: AsyncResponder,
+    ):
+        self.model_configs = model_configs
+        self.limiters = limiters
+        self.respond = respond
+        self.respond_async = respond_async
+
+    def concurrency(self, model_name: str) -> int:
+        """
+        Returns how many prompts of a batch may be in flight at once: the slots of
+        the model's backends, at most MAX_CONCURRENCY.
+
+        Raises:
+            ValueError: If the model is not configured.
+        """
+        slots = 0
+        for base_url in {
+            replica.base_url for replica in self.model_configs.get_replicas(model_name)
+        }:
+            limiter = self.limiters.get(base_url)
+            slots += limiter.max_concurrency if limiter else self.MAX_CONCURRENCY
+        return min(slots, self.MAX_CONCURRENCY)
+
+    def run(
+        self,
+        prompts: List[str],
+        model_name: str,
+        system_role: str = None,
+        template: str = None,
+        deadline: Deadline = None,
+    ) -> List[BatchResult]:
+        """
+        Fetches the responses to independent prompts concurrently.
+
+        Args:
+            prompts (List[str]): The input prompts.
+            model_name (str): The name of the model to use for the requests.
+            system_role (str, optional): The system role to include in every request.
+            template (str, optional): Name of the template the prompts were rendered from, whose output budget applies.
+            deadline (Deadline, optional): The deadline of the whole batch. Defaults to the current deadline.
+
+        Returns:
+            List[BatchResult]: The result of every prompt, in the order of the prompts.
+
+        Raises:
+            ValueError: If the model is not configured.
+        """
+        if not prompts:
+            return []
+        workers = min(len(prompts), self.concurrency(model_name))
+        get_result = ThreadHelpers.with_context(self.result)
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="model-batch"
+        ) as pool:
+            futures = [
+                pool.submit(
+                    get_result, prompt, model_name, system_role, template, deadline
+                )
+                for prompt in prompts
+            ]
+        return [future.result() for future in futures]
+
+    async def run_async(
+        self,
+        prompts: List[str],
+        model_name: str,
+        system_role: str = None,
+        template: str = None,
+        deadline: Deadline = None,
+    ) -> List[BatchResult]:
+        """
+        Asynchronous variant of run.
+
+        Raises:
+            ValueError: If the model is not configured.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency(model_name))
+
+        async def get_result(prompt: str) -> BatchResult:
+            async with semaphore:
+                return await self.result_async(
+                    prompt, model_name, system_role, template, deadline
+                )
+
+        return list(await asyncio.gather(*(get_result(prompt) for prompt in prompts)))
+
+    def result(
+        self,
+        prompt: str,
+        model_name: str,
+        system_role: str = None,
+        template: str = None,
+        deadline: Deadline = None,
+    ) -> BatchResult:
+        """Fetches the response to one prompt of a batch, catching its error."""
+        started = time.monotonic()
+        try:
+            text = self.respond(
+                prompt,
+                self.model_configs.get_model_config(model_name),
+                system_role,
+                deadline,
+                template,
+                raise_errors=True,
+            )
+        except Exception as e:
+            return BatchResult(
+                error=f"{type(e).__name__}: {e}", latency=time.monotonic() - started
+            )
+        return BatchResult(text=text, latency=time.monotonic() - started)
+
+    async def result_async(
+        self,
+        prompt: str,
+        model_name: str,
+        system_role: str = None,
+        template: str = None,
+        deadline: Deadline = None,
+    ) -> BatchResult:
+        """Asynchronous variant of result."""
+        started = time.monotonic()
+        try:
+            text = await self.respond_async(
+                prompt,
+                self.model_configs.get_model_config(model_name),
+                system_role,
+                deadline,
+                template,
+                raise_errors=True,
+            )
+        except Exception as e:
+            return BatchResult(
+                error=f"{type(e).__name__}: {e}", latency=time.monotonic() - started
+            )
+        return BatchResult(text=text, latency=time.monotonic() - started)
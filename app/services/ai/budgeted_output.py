@@ -0,0 +1,164 @@
+import time
+from typing import Any, Dict, Optional
+
+from openai import AsyncOpenAI, OpenAI
+
+from app.config.config import Config
+from app.services.ai.output_budgets import OutputBudgets
+from app.services.ai.sentence_collector import SentenceCollector
+from app.services.telemetry.llm_telemetry import LLMCall, LLMTelemetry
+
+
+class BudgetedOutput:
+    """
+    Keeps the answers to prompts rendered from a template within the template's
+    output budget.
+
+    Requests are sent with the budget's max_tokens and stop sequences, and their
+    answers are cut back to the whole sentences that fit in the budget. With
+    streaming responses enabled the answer is streamed instead, and the stream is
+    closed as soon as the budget is met, which also stops the generation on the
+    backend.
+
+    Attributes:
+        config (Config): Application configuration.
+        budgets (OutputBudgets): The output budgets and the telemetry of their answers.
+        telemetry (LLMTelemetry): Telemetry the streamed model calls are finished in.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        telemetry: LLMTelemetry,
+        budgets: Optional[OutputBudgets] = None,
+    ):
+        self.config = config
+        self.telemetry = telemetry
+        self.budgets = budgets or OutputBudgets()
+
+    def options(self, template: str = None) -> dict:
+        """
+        Returns the max_tokens and stop sequences for a prompt rendered from a template.
+
+        Args:
+            template (str, optional): Name of the template the prompt was rendered from.
+
+        Returns:
+            dict: Keyword arguments for the chat completion request.
+        """
+        budget = self.budgets.get(template)
+        if budget is None:
+            return {}
+        options = {"max_tokens": budget.max_tokens}
+        if budget.stop:
+            options["stop"] = budget.stop
+        return options
+
+    def should_stream(self, template: str = None) -> bool:
+        """Returns True when the answer to a prompt is streamed and stopped at its output budget."""
+        return (
+            self.config.streaming_responses and self.budgets.get(template) is not None
+        )
+
+    def text(self, response, template: str = None) -> str:
+        """
+        Returns the text of a chat completion, truncated to the output budget of
+        the prompt's template. A completion without content has an empty text.
+        """
+        choice = response.choices[0]
+        return self.budgets.apply(
+            template,
+            (choice.message.content or "").strip(),
+            cut_off=choice.finish_reason == "length",
+        )
+
+    def stream(self, client: OpenAI, call: LLMCall) -> str:
+        """
+        Streams a chat completion and stops it once the output budget of the
+        prompt's template is met.
+
+        Closing the stream closes the connection, which makes the backend stop
+        generating the rest of the answer.
+
+        Args:
+            client (OpenAI): The client of the model's backend.
+            call (LLMCall): The timed call, holding the model, the template and the messages.
+
+        Returns:
+            str: The whole sentences of the answer that fit in the budget.
+        """
+        collector = SentenceCollector(self.budgets.get(call.template))
+        finish_reason = None
+        stream = client.chat.completions.create(
+            model=call.model,
+            messages=call.messages,
+            stream=True,
+            **self.options(call.template),
+        )
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                if not choice.delta.content:
+                    continue
+                call.first_token()
+                if collector.feed(choice.delta.content):
+                    break
+        finally:
+            stream.close()
+        return self.finish_stream(collector, call, finish_reason)
+
+    async def stream_async(self, client: AsyncOpenAI, call: LLMCall) -> str:
+        """
+        Asynchronous variant of stream. The stream is also closed when the call is
+        cancelled, for example when it lost a hedge.
+        """
+        collector = SentenceCollector(self.budgets.get(call.template))
+        finish_reason = None
+        stream = await client.chat.completions.create(
+            model=call.model,
+            messages=call.messages,
+            stream=True,
+            **self.options(call.template),
+        )
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                if not choice.delta.content:
+                    continue
+                call.first_token()
+                if collector.feed(choice.delta.content):
+                    break
+        finally:
+            await stream.close()
+        return self.finish_stream(collector, call, finish_reason)
+
+    def finish_stream(
+        self,
+        collector: SentenceCollector,
+        call: LLMCall,
+        finish_reason: Optional[str],
+    ) -> str:
+        """Records the length and timing of a streamed answer and returns its text."""
+        cut_off = finish_reason == "length"
+        text = collector.finish(cut_off)
+        sent = call.admitted_at or call.started
+        self.budgets.record_stream(
+            call.template,
+            call.first_token_at - sent if call.first_token_at is not None else None,
+            time.monotonic() - sent if collector.full else None,
+        )
+        self.budgets.record(call.template, collector.generated, text, cut_off)
+        self.telemetry.finish(call, collector.generated)
+        return text
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the requested and the actual answer length per template.
+        """
+        return self.budgets.metrics()
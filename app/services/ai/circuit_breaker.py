@@ -0,0 +1,131 @@
+import threading
+import time
+from typing import Any, Dict
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised when a request is not sent to a backend because its circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a backend that keeps failing.
+
+    The breaker starts closed and opens after ``failure_threshold`` consecutive
+    failures. While it is open every request fails fast. After ``reset_timeout``
+    seconds it becomes half-open and lets a single probe request through: a
+    successful probe closes the breaker, a failed one opens it again. A probe
+    that never reports back is replaced by a new one after another
+    ``reset_timeout``.
+
+    Attributes:
+        name (str): Name of the backend, used in the metrics and errors.
+        failure_threshold (int): Consecutive failures after which the breaker opens.
+        reset_timeout (float): Number of seconds the breaker stays open before a probe.
+
+    Example:
+        breaker = CircuitBreaker("llama3 @ http://localhost:11434/v1")
+        breaker.before_call()
+        try:
+            response = client.chat.completions.create(...)
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at = None
+        self._opened = 0
+        self._short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        """Returns the state of the breaker: closed, open or half_open."""
+        with self._lock:
+            return self._get_state(time.monotonic())
+
+    def _get_state(self, now: float) -> str:
+        # Must be called with the lock held
+        if self._state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_started_at = None
+        return self._state
+
+    def before_call(self):
+        """
+        Admits a request to the backend.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with a probe in flight.
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._get_state(now)
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and (
+                self._probe_started_at is None
+                or now - self._probe_started_at >= self.reset_timeout
+            ):
+                self._probe_started_at = now
+                return
+            self._short_circuited += 1
+            raise CircuitOpenError(f"{self.name}: circuit is {state}")
+
+    def record_success(self):
+        """Records a successful request, closing the breaker."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._probe_started_at = None
+
+    def record_skipped(self):
+        """
+        Records a request that was admitted but never reached the backend, e.g.
+        rejected by the admission control. It says nothing about the backend, so
+        the state is kept, but a half-open probe is released for the next request.
+        """
+        with self._lock:
+            self._probe_started_at = None
+
+    def record_failure(self):
+        """Records a failed request, opening the breaker if it failed too often."""
+        with self._lock:
+            self._consecutive_failures += 1
+            if (
+                self._state == self.HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+            ):
+                if self._state != self.OPEN:
+                    self._opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started_at = None
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Returns the state of the breaker and how often it opened and failed fast.
+        """
+        with self._lock:
+            return {
+                "state": self._get_state(time.monotonic()),
+                "consecutive_failures": self._consecutive_failures,
+                "opened": self._opened,
+                "short_circuited": self._short_circuited,
+            }
@@ -0,0 +1,225 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Optional
+
+
+class AdmissionRejectedError(RuntimeError):
+    """
+    Raised when a request is not admitted to a backend because its queue is full
+    or no slot became free in time.
+    """
+
+
+class _Waiter:
+    """
+    A queued request. A slot is handed over to the waiter by setting ``granted``
+    before waking it, so a released slot cannot be taken by a newcomer first.
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.granted = False
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+
+    def wake(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class ConcurrencyLimiter:
+    """
+    Limits the number of concurrent requests to a model backend and bounds the
+    number of requests waiting for a slot.
+
+    Requests beyond ``max_concurrency`` wait in a FIFO queue. When
+    ``max_queue`` requests are already waiting, a new request is rejected
+    immediately instead of queueing, and a waiting request gives up when its
+    timeout expires. Slots can be acquired from threads and from coroutines.
+
+    Attributes:
+        name (str): Name of the backend, used in the metrics.
+        max_concurrency (int): Maximum number of requests in flight.
+        max_queue (int): Maximum number of requests waiting for a slot.
+
+    Example:
+        limiter = ConcurrencyLimiter("http://localhost:11434/v1", max_concurrency=4, max_queue=8)
+        with limiter.slot(timeout=2.0):
+            response = client.chat.completions.create(...)
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int = 0):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: "deque[_Waiter]" = deque()
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._queued = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _try_enter(self, waiter_factory) -> Optional[_Waiter]:
+        """
+        Takes a free slot or enqueues a waiter. Returns None when a slot was taken.
+        Must be called with the lock held.
+        """
+        if self._in_flight < self.max_concurrency and not self._waiters:
+            self._in_flight += 1
+            self._admitted += 1
+            return None
+        if len(self._waiters) >= self.max_queue:
+            self._rejected += 1
+            raise AdmissionRejectedError(
+                f"{self.name}: {self._in_flight} requests in flight and "
+                f"{len(self._waiters)} queued"
+            )
+        waiter = waiter_factory()
+        self._waiters.append(waiter)
+        self._queued += 1
+        return waiter
+
+    def _finish_wait(self, waiter: _Waiter, started: float):
+        """
+        Records the outcome of a wait. Must be called with the lock held.
+
+        Raises:
+            AdmissionRejectedError: If the waiter was not granted a slot in time.
+        """
+        waited = time.monotonic() - started
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        if waiter.granted:
+            self._admitted += 1
+            return
+        self._waiters.remove(waiter)
+        self._timed_out += 1
+        raise AdmissionRejectedError(
+            f"{self.name}: no slot became free within {waited:.2f}s"
+        )
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Acquires a slot, waiting for at most the timeout.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait, or None to wait indefinitely.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the timeout expired.
+        """
+        with self._lock:
+            waiter = self._try_enter(_Waiter)
+        if waiter is None:
+            return
+
+        started = time.monotonic()
+        waiter.event.wait(timeout)
+        with self._lock:
+            self._finish_wait(waiter, started)
+
+    async def acquire_async(self, timeout: Optional[float] = None):
+        """
+        Asynchronous variant of acquire.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait, or None to wait indefinitely.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the timeout expired.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiter = self._try_enter(lambda: _Waiter(loop))
+        if waiter is None:
+            return
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._release_locked()
+                else:
+                    self._waiters.remove(waiter)
+            raise
+        with self._lock:
+            self._finish_wait(waiter, started)
+
+    def release(self):
+        """
+        Releases a slot, handing it to the longest waiting request if there is one.
+        """
+        with self._lock:
+            self._release_locked()
+
+    def _release_locked(self):
+        if self._waiters:
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            waiter.wake()
+        else:
+            self._in_flight -= 1
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None):
+        """
+        Holds a slot for the duration of the block.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the timeout expired.
+        """
+        self.acquire(timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def slot_async(self, timeout: Optional[float] = None):
+        """
+        Asynchronous variant of slot.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the timeout expired.
+        """
+        await self.acquire_async(timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Returns the current queue depth, the counters and the wait times.
+        """
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": len(self._waiters),
+                "admitted": self._admitted,
+                "queued": self._queued,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "average_wait": (
+                    self._total_wait / self._queued if self._queued else 0.0
+                ),
+                "max_wait": self._max_wait,
+            }
@@ -0,0 +1,122 @@
+import logging
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from app.models.ai.model_config import ModelConfig
+from app.models.ai.model_configs import ModelConfigs
+from app.models.deadline import Deadline
+from app.services.ai.circuit_breaker import CircuitOpenError
+from app.services.ai.concurrency_limiter import AdmissionRejectedError
+
+T = TypeVar("T")
+
+
+class FallbackChain:
+    """
+    Retries a failed model call on the models listed in the configuration's
+    ``fallbacks``, in order, while the deadline allows.
+
+    A call fails when the model's circuit is open, when its backend did not admit
+    the request, or when the request itself failed.
+
+    Attributes:
+        model_configs (ModelConfigs): The model configurations the fallbacks are looked up in.
+    """
+
+    def __init__(self, model_configs: ModelConfigs):
+        self.model_configs = model_configs
+        self.logger = logging.getLogger(__name__)
+
+    def links(self, model_config: ModelConfig) -> List[ModelConfig]:
+        """
+        Returns the model configuration followed by its fallbacks, in order.
+        """
+        chain = [model_config]
+        for identifier in model_config.fallbacks:
+            try:
+                fallback = self.model_configs.get_model_config(identifier)
+            except ValueError as e:
+                self.logger.warning(
+                    "Ignoring fallback of %s: %s", model_config.model, e
+                )
+                continue
+            if fallback not in chain:
+                chain.append(fallback)
+        return chain
+
+    def call(
+        self,
+        model_config: ModelConfig,
+        call: Callable[[ModelConfig], T],
+        deadline: Deadline = None,
+        raise_errors: bool = False,
+    ) -> Optional[T]:
+        """
+        Calls a model, retrying on its fallbacks when the call fails.
+
+        Args:
+            model_config (ModelConfig): The model configuration to call first.
+            call (Callable[[ModelConfig], T]): Sends the request to a model configuration.
+            deadline (Deadline, optional): The deadline of the request.
+            raise_errors (bool): Raise the last error instead of returning None when every model failed.
+
+        Returns:
+            Optional[T]: The result of the first successful call, or None if every model failed or the deadline passed.
+
+        Raises:
+            Exception: The error of the last model tried, or TimeoutError if the deadline passed, with raise_errors.
+        """
+        error = None
+        for link in self.links(model_config):
+            if deadline is not None and deadline.expired():
+                self.logger.warning(
+                    "Deadline exceeded before calling model %s", link.model
+                )
+                error = TimeoutError(f"Deadline exceeded before calling {link.model}")
+                break
+            try:
+                return call(link)
+            except CircuitOpenError as e:
+                self.logger.info("Skipping model %s: %s", link.model, e)
+                error = e
+            except AdmissionRejectedError as e:
+                self.logger.warning("Request to %s rejected: %s", link.model, e)
+                error = e
+            except Exception as err:
+                self.logger.error("Request to %s failed: %r", link.model, err)
+                error = err
+        if raise_errors and error is not None:
+            raise error
+        return None
+
+    async def call_async(
+        self,
+        model_config: ModelConfig,
+        call: Callable[[ModelConfig], Awaitable[T]],
+        deadline: Deadline = None,
+        raise_errors: bool = False,
+    ) -> Optional[T]:
+        """
+        Asynchronous variant of call.
+        """
+        error = None
+        for link in self.links(model_config):
+            if deadline is not None and deadline.expired():
+                self.logger.warning(
+                    "Deadline exceeded before calling model %s", link.model
+                )
+                error = TimeoutError(f"Deadline exceeded before calling {link.model}")
+                break
+            try:
+                return await call(link)
+            except CircuitOpenError as e:
+                self.logger.info("Skipping model %s: %s", link.model, e)
+                error = e
+            except AdmissionRejectedError as e:
+                self.logger.warning("Request to %s rejected: %s", link.model, e)
+                error = e
+            except Exception as err:
+                self.logger.error("Request to %s failed: %r", link.model, err)
+                error = err
+        if raise_errors and error is not None:
+            raise error
+        return None
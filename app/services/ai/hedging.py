@@ -0,0 +1,342 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.helpers.thread_helpers import ThreadHelpers
+from app.models.ai.model_config import ModelConfig
+from app.models.deadline import Deadline
+
+# Sends a chat completion to a model: (model_config, messages, deadline, template)
+Completion = Callable[[ModelConfig, list, Optional[Deadline], Optional[str]], str]
+AsyncCompletion = Callable[
+    [ModelConfig, list, Optional[Deadline], Optional[str]], Awaitable[str]
+]
+
+
+class HedgePolicy:
+    """
+    Decides when a slow model request is hedged and keeps the hedging metrics.
+
+    A request to a model with a ``hedge_to`` backend is duplicated to that backend
+    when the primary has not answered within its p95 latency. The p95 is computed
+    from the most recent successful primary requests as seen by the caller,
+    including the time spent waiting for a worker or a backend slot. Hedges are
+    paid for from a budget that grows by ``max_rate`` with every hedgeable request
+    and is capped at ``burst``, so at most that fraction of the requests is ever
+    sent twice, even while a backend stalls.
+
+    Attributes:
+        max_rate (float): Maximum fraction of hedgeable requests that may be hedged.
+        burst (float): Maximum number of hedges that may be saved up.
+        window (int): Number of recent latencies the p95 is computed from.
+        min_samples (int): Number of latencies needed before a model is hedged.
+
+    Example:
+        delay = policy.hedge_delay(model_config)
+        if delay is not None and primary_still_running_after(delay) and policy.try_hedge(model_config):
+            send_to_secondary()
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        burst: float = 5.0,
+        window: int = 100,
+        min_samples: int = 20,
+    ):
+        self.max_rate = max_rate
+        self.burst = burst
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._latencies: Dict[Tuple[str, str], deque] = {}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def _key(model_config: ModelConfig) -> Tuple[str, str]:
+        return model_config.base_url, model_config.model
+
+    def track(self, model_config: ModelConfig, future):
+        """
+        Records the latency of a primary request once it completes successfully,
+        even if its response is no longer waited for.
+
+        Args:
+            model_config (ModelConfig): The model the request was sent to.
+            future: The concurrent.futures.Future or asyncio.Future of the request.
+        """
+        started = time.monotonic()
+
+        def done(future):
+            if not future.cancelled() and future.exception() is None:
+                self.record_latency(model_config, time.monotonic() - started)
+
+        future.add_done_callback(done)
+
+    def record_latency(self, model_config: ModelConfig, latency: float):
+        """Records the latency of a successful request to a model."""
+        with self._lock:
+            latencies = self._latencies.get(self._key(model_config))
+            if latencies is None:
+                latencies = self._latencies[self._key(model_config)] = deque(
+                    maxlen=self.window
+                )
+            latencies.append(latency)
+
+    def hedge_delay(self, model_config: ModelConfig) -> Optional[float]:
+        """
+        Returns the p95 latency of a model, or None while too few calls were recorded.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(self._key(model_config), ()))
+        if len(latencies) < self.min_samples:
+            return None
+        return latencies[math.ceil(0.95 * len(latencies)) - 1]
+
+    def start(self, model_config: ModelConfig):
+        """Counts a hedgeable request and adds its share to the hedge budget."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.max_rate)
+            self._count(model_config, "requests")
+
+    def can_hedge(self) -> bool:
+        """Whether the budget holds a hedge, without taking it."""
+        with self._lock:
+            return self._tokens >= 1.0
+
+    def try_hedge(self, model_config: ModelConfig) -> bool:
+        """
+        Takes a hedge from the budget.
+
+        Returns:
+            bool: True if the request may be hedged, False if the budget is spent.
+        """
+        with self._lock:
+            if self._tokens < 1.0:
+                self._count(model_config, "budget_exhausted")
+                return False
+            self._tokens -= 1.0
+            self._count(model_config, "hedged")
+            return True
+
+    def finish(self, model_config: ModelConfig, hedge_won: bool):
+        """Records which of the two requests of a hedged call answered first."""
+        with self._lock:
+            self._count(model_config, "hedge_wins" if hedge_won else "primary_wins")
+
+    def _count(self, model_config: ModelConfig, name: str):
+        # Must be called with the lock held
+        metrics = self._metrics.setdefault(
+            model_config.model,
+            {
+                "requests": 0,
+                "hedged": 0,
+                "budget_exhausted": 0,
+                "hedge_wins": 0,
+                "primary_wins": 0,
+            },
+        )
+        metrics[name] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Returns the hedging counters by primary model and the remaining budget.
+        """
+        with self._lock:
+            return {
+                "budget": self._tokens,
+                "models": {
+                    model: dict(counters) for model, counters in self._metrics.items()
+                },
+            }
+
+
+class Hedger:
+    """
+    Sends hedged model requests: when the primary request has not answered
+    within the model's p95 latency, the same request is also sent to the
+    model's ``hedge_to`` backend and the first answer is used, within the
+    budget of the HedgePolicy.
+
+    The primary runs on the request thread whenever it cannot be hedged: while
+    too few latencies are known or the budget is spent. A synchronous request
+    cannot be interrupted, so a primary that may be hedged runs on a thread
+    started for it instead, and the request thread waits for whichever answers
+    first. Only the hedges run on a shared pool, sized from the threads of the
+    serving process, so a primary never waits in a queue. The request that
+    lost runs to completion in the background; its client timeout keeps it
+    within the deadline. Asynchronous requests are tasks, and the one that
+    lost is cancelled.
+
+    Attributes:
+        policy (HedgePolicy): Decides when a request is hedged and keeps the metrics.
+        max_workers (int): Number of threads of the hedge pool, fixed once the first hedge is sent.
+
+    Example:
+        hedger = Hedger(HedgePolicy(0.1), model_configs.get_model_config)
+        text = hedger.complete(self.get_completion, model_config, messages, deadline, template)
+    """
+
+    def __init__(
+        self,
+        policy: HedgePolicy,
+        get_model_config: Callable[[str], ModelConfig],
+        max_workers: int = 4,
+    ):
+        self.policy = policy
+        self.get_model_config = get_model_config
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def set_max_workers(self, threads: int):
+        """Sizes the hedge pool from the number of request threads of the process."""
+        self.max_workers = max(1, threads)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="model-hedge"
+                )
+            return self._pool
+
+    @staticmethod
+    def _start_primary(complete: Completion, *args) -> Future:
+        # The primary runs on a thread of its own, so it never waits for a worker
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+
+        def run():
+            try:
+                future.set_result(complete(*args))
+            except BaseException as e:  # pylint: disable=broad-except
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="model-primary", daemon=True).start()
+        return future
+
+    def complete(
+        self,
+        complete: Completion,
+        model_config: ModelConfig,
+        messages: list,
+        deadline: Deadline = None,
+        template: str = None,
+    ) -> str:
+        """
+        Sends a chat completion request to a model and, if it is slower than its
+        p95 latency, also to its hedge backend, returning the first response.
+
+        Raises:
+            AdmissionRejectedError: If no backend admitted the request.
+        """
+        self.policy.start(model_config)
+        delay = self.policy.hedge_delay(model_config)
+        if delay is None or not self.policy.can_hedge():
+            started = time.monotonic()
+            result = complete(model_config, messages, deadline, template)
+            self.policy.record_latency(model_config, time.monotonic() - started)
+            return result
+
+        complete = ThreadHelpers.with_context(complete)
+        primary = self._start_primary(
+            complete, model_config, messages, deadline, template
+        )
+        self.policy.track(model_config, primary)
+        done, _ = wait([primary], timeout=delay)
+        if done or (deadline is not None and deadline.expired()):
+            return primary.result()
+        if not self.policy.try_hedge(model_config):
+            return primary.result()
+
+        hedge_config = self.get_model_config(model_config.hedge_to)
+        self.logger.info(
+            "Hedging request to %s after %.2fs with %s",
+            model_config.model,
+            delay,
+            hedge_config.model,
+        )
+        hedge = self._get_pool().submit(
+            complete, hedge_config, messages, deadline, template
+        )
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        first, second = (primary, hedge) if primary in done else (hedge, primary)
+        if first.exception() is not None:
+            # The first request failed, use whatever the other one returns
+            first, second = second, first
+        second.cancel()
+        result = first.result()
+        self.policy.finish(model_config, hedge_won=first is hedge)
+        return result
+
+    async def complete_async(
+        self,
+        complete: AsyncCompletion,
+        model_config: ModelConfig,
+        messages: list,
+        deadline: Deadline = None,
+        template: str = None,
+    ) -> str:
+        """
+        Asynchronous variant of complete. The slower request is cancelled as soon
+        as the other one has answered.
+
+        Raises:
+            AdmissionRejectedError: If no backend admitted the request.
+        """
+        self.policy.start(model_config)
+        delay = self.policy.hedge_delay(model_config)
+        if delay is None:
+            started = time.monotonic()
+            result = await complete(model_config, messages, deadline, template)
+            self.policy.record_latency(model_config, time.monotonic() - started)
+            return result
+
+        primary = asyncio.ensure_future(
+            complete(model_config, messages, deadline, template)
+        )
+        self.policy.track(model_config, primary)
+        hedge = None
+        try:
+            try:
+                return await asyncio.wait_for(asyncio.shield(primary), delay)
+            except asyncio.TimeoutError:
+                pass
+
+            if (
+                deadline is not None and deadline.expired()
+            ) or not self.policy.try_hedge(model_config):
+                return await primary
+
+            hedge_config = self.get_model_config(model_config.hedge_to)
+            self.logger.info(
+                "Hedging request to %s after %.2fs with %s",
+                model_config.model,
+                delay,
+                hedge_config.model,
+            )
+            hedge = asyncio.ensure_future(
+                complete(hedge_config, messages, deadline, template)
+            )
+            done, _ = await asyncio.wait(
+                [primary, hedge], return_when=asyncio.FIRST_COMPLETED
+            )
+            first, second = (primary, hedge) if primary in done else (hedge, primary)
+            if first.exception() is not None:
+                # The first request failed, use whatever the other one returns
+                first, second = second, first
+            result = await first
+            self.policy.finish(model_config, hedge_won=first is hedge)
+            return result
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
@@ -0,0 +1,169 @@
+import logging
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from app.config.config import Config
+from app.models.ai.model_configs import ModelConfigs
+from app.models.ai.replica_balancer import ReplicaBalancer
+from app.models.deadline import Deadline
+from app.services.ai.circuit_breaker import CircuitBreaker
+
+# Latency tiers, from the most capable to the fastest model
+TIERS = ("large", "standard", "fast")
+
+# Latency tier of each class of prompt
+PROMPT_TIERS = {
+    # Short canned acknowledgements: stop, cancel, goodbye, session ended
+    "acknowledgement": "fast",
+    # Conversational turns: launch, help, fallback
+    "conversation": "standard",
+    # Summaries of data that was already fetched: weather, web search, aggregation
+    "summary": "standard",
+    # Open-ended questions answered from the model's own knowledge
+    "open_question": "large",
+    # Function routing, served by the function calling model
+    "routing": "routing",
+}
+
+
+class ModelSelector:
+    """
+    Chooses the model a prompt is sent to from its class, the time left and the
+    health of the backends.
+
+    Every prompt class has a latency tier in PROMPT_TIERS, and every tier a model
+    identifier in the configuration. The tier's model is used unless its circuit
+    is open or its expected latency does not fit in the time left, in which case
+    the next faster tier is tried. A tier without a configured model, such as the
+    fast tier when FAST_LANGUAGE_MODEL is unset, falls back to the standard
+    tier's model. When every model that fits is down, the first
+    of them is used anyway so its fallbacks are tried. The expected latency is twice the model's
+    latency average, capped at the generation budget, and the generation budget
+    itself while the model has not answered yet; a fast model that has not
+    answered yet is assumed to fit.
+
+    Attributes:
+        config (Config): Application configuration, holding the tier models and the generation budget.
+        model_configs (ModelConfigs): The model configurations and their replica statistics.
+        breakers (Dict[Tuple[str, str], CircuitBreaker]): Circuit breakers by base URL and model.
+        selections (Counter): Number of selections per prompt class and model.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        model_configs: ModelConfigs,
+        breakers: Dict[Tuple[str, str], CircuitBreaker],
+    ):
+        self.config = config
+        self.model_configs = model_configs
+        self.breakers = breakers
+        self.selections: Counter = Counter()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def get_tier_models(self) -> Dict[str, Optional[str]]:
+        """Returns the model identifier of every tier, None for tiers without one."""
+        return {
+            "large": self.config.large_language_model,
+            "standard": self.config.standard_language_model,
+            "fast": self.config.fast_language_model,
+            "routing": self.config.routing_language_model,
+        }
+
+    def get_candidates(
+        self, prompt_class: str, preferred: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Returns the models a prompt class may be served by, as (model, tier) pairs
+        in order of preference.
+        """
+        tier = PROMPT_TIERS.get(prompt_class, "standard")
+        tier_models = self.get_tier_models()
+        if tier not in TIERS:
+            return [(preferred or tier_models[tier], tier)]
+
+        candidates = [(preferred, tier)] if preferred else []
+        for candidate_tier in TIERS[TIERS.index(tier) :]:
+            model = tier_models[candidate_tier]
+            if model and all(model != known for known, _ in candidates):
+                candidates.append((model, candidate_tier))
+        # A tier without a model of its own is served by the standard tier
+        standard = tier_models["standard"]
+        if not tier_models[tier] and all(standard != known for known, _ in candidates):
+            candidates.append((standard, "standard"))
+        return candidates
+
+    def select(
+        self,
+        prompt_class: str,
+        deadline: Deadline = None,
+        preferred: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Chooses the model for a prompt.
+
+        Args:
+            prompt_class (str): The class of the prompt, a key of PROMPT_TIERS.
+            deadline (Deadline, optional): The deadline of the request.
+            preferred (Optional[str]): Model to use instead of the tier's model when it fits.
+
+        Returns:
+            Optional[str]: The model identifier, or None when no model fits in the time left.
+        """
+        candidates = self.get_candidates(prompt_class, preferred)
+        if PROMPT_TIERS.get(prompt_class) == "routing":
+            return self._count(prompt_class, candidates[0][0])
+
+        # Used when every model that fits is down, so its fallbacks are still tried
+        unavailable = None
+        for model, tier in candidates:
+            try:
+                replicas = self.model_configs.get_replicas(model)
+            except ValueError:
+                self.logger.warning(
+                    "Model %s of tier %s is not configured", model, tier
+                )
+                continue
+            if deadline is not None and not deadline.can_fit(
+                self.get_required_time(replicas, tier)
+            ):
+                self.logger.info(
+                    "%.2fs left, too little for model %s", deadline.remaining(), model
+                )
+                continue
+            if self.is_available(replicas):
+                return self._count(prompt_class, model)
+            self.logger.info("Skipping model %s, its circuit is open", model)
+            unavailable = unavailable or model
+
+        if unavailable is not None:
+            return self._count(prompt_class, unavailable)
+        self.logger.info("No model fits the time left for a %s prompt", prompt_class)
+        return None
+
+    def is_available(self, replicas) -> bool:
+        """Returns True when the circuit of at least one replica is not open."""
+        return any(
+            self.breakers[ReplicaBalancer.replica_id(replica)].state
+            != CircuitBreaker.OPEN
+            for replica in replicas
+        )
+
+    def get_required_time(self, replicas, tier: str) -> float:
+        """Returns the number of seconds a generation with the replicas is expected to need."""
+        latency = self.model_configs.balancer.expected_latency(replicas)
+        if latency is None:
+            return 0.0 if tier == "fast" else self.config.generation_budget
+        return min(2 * latency, self.config.generation_budget)
+
+    def _count(self, prompt_class: str, model: str) -> str:
+        with self._lock:
+            self.selections[f"{prompt_class}:{model}"] += 1
+        return model
+
+    def metrics(self) -> Dict[str, int]:
+        """Returns the number of selections per prompt class and model."""
+        with self._lock:
+            return dict(self.selections)
@@ -0,0 +1,167 @@
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import yaml
+
+from app.helpers.resource_loader import ResourceLoader
+from app.models.ai.output_budget import OutputBudget
+
+# The budgets are declared next to the templates they belong to
+OUTPUT_BUDGETS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "output_budgets.yaml",
+)
+
+
+class OutputBudgets:
+    """
+    Output budgets of the prompt templates and the telemetry of their answers.
+
+    Budgets are loaded from ``output_budgets.yaml``, keyed by the name of the
+    template in ``templates.yaml``. For every answer generated from a named
+    template the length of the generated and of the spoken answer is recorded,
+    so the requested length can be compared with what the models produce. For
+    streamed answers the time to the first token and, when the stream was stopped
+    because the budget was met, the time to the budget are recorded as well.
+
+    Attributes:
+        budgets (Dict[str, OutputBudget]): The output budgets by template name.
+    """
+
+    def __init__(self, path: str = OUTPUT_BUDGETS_PATH):
+        self.budgets = self.load_budgets(path)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def load_budgets(path: str) -> Dict[str, OutputBudget]:
+        """
+        Loads the output budgets from a YAML file.
+
+        Args:
+            path (str): Path to the output budgets file.
+
+        Returns:
+            Dict[str, OutputBudget]: The output budgets by template name.
+        """
+        content = ResourceLoader.load_resource_file(path)
+        if not content:
+            return {}
+        entries = yaml.safe_load(content) or {}
+        return {name: OutputBudget(**entry) for name, entry in entries.items()}
+
+    def get(self, template: Optional[str]) -> Optional[OutputBudget]:
+        """Returns the output budget of a template, or None if it has none."""
+        if template is None:
+            return None
+        return self.budgets.get(template)
+
+    def apply(self, template: Optional[str], text: str, cut_off: bool = False) -> str:
+        """
+        Truncates an answer to the budget of its template and records its length.
+
+        Args:
+            template (Optional[str]): Name of the template the prompt was rendered from.
+            text (str): The generated answer.
+            cut_off (bool): Whether the generation was stopped by max_tokens.
+
+        Returns:
+            str: The answer to speak.
+        """
+        budget = self.get(template)
+        spoken = text if budget is None else budget.truncate(text, cut_off)
+        if template is not None:
+            self.record(template, text, spoken, cut_off)
+        return spoken
+
+    def record(self, template: str, generated: str, spoken: str, cut_off: bool):
+        """Records the length of a generated and of the spoken answer."""
+        with self._lock:
+            stats = self._get_stats(template)
+            stats["answers"] += 1
+            stats["generated_words"] += len(generated.split())
+            stats["spoken_words"] += len(spoken.split())
+            stats["spoken_characters"] += len(spoken)
+            stats["truncated"] += spoken != generated.strip()
+            stats["cut_off"] += cut_off
+
+    def record_stream(
+        self,
+        template: str,
+        time_to_first_token: Optional[float],
+        time_to_budget: Optional[float],
+    ):
+        """
+        Records the timing of a streamed answer.
+
+        Args:
+            template (str): Name of the template the prompt was rendered from.
+            time_to_first_token (Optional[float]): Seconds until the first token, None if none arrived.
+            time_to_budget (Optional[float]): Seconds until the budget was met, None if it was not.
+        """
+        with self._lock:
+            stats = self._get_stats(template)
+            stats["streamed"] += 1
+            if time_to_first_token is not None:
+                stats["first_tokens"] += 1
+                stats["time_to_first_token"] += time_to_first_token
+            if time_to_budget is not None:
+                stats["stopped_early"] += 1
+                stats["time_to_budget"] += time_to_budget
+
+    def _get_stats(self, template: str) -> Dict[str, float]:
+        # Must be called with the lock held
+        return self._stats.setdefault(
+            template,
+            {
+                "answers": 0,
+                "generated_words": 0,
+                "spoken_words": 0,
+                "spoken_characters": 0,
+                "truncated": 0,
+                "cut_off": 0,
+                "streamed": 0,
+                "first_tokens": 0,
+                "time_to_first_token": 0.0,
+                "stopped_early": 0,
+                "time_to_budget": 0.0,
+            },
+        )
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the requested and the average actual answer length per template.
+        """
+        with self._lock:
+            stats = {template: dict(values) for template, values in self._stats.items()}
+
+        metrics = {}
+        for template, values in stats.items():
+            budget = self.get(template) or OutputBudget()
+            answers = values["answers"]
+            metrics[template] = {
+                "max_words": budget.max_words,
+                "max_characters": budget.max_characters,
+                "max_seconds": budget.max_seconds,
+                "max_tokens": budget.max_tokens,
+                "answers": answers,
+                "average_generated_words": values["generated_words"] / answers,
+                "average_spoken_words": values["spoken_words"] / answers,
+                "average_spoken_characters": values["spoken_characters"] / answers,
+                "truncated": values["truncated"],
+                "cut_off": values["cut_off"],
+                "streamed": values["streamed"],
+                "average_time_to_first_token": (
+                    values["time_to_first_token"] / values["first_tokens"]
+                    if values["first_tokens"]
+                    else None
+                ),
+                "stopped_early": values["stopped_early"],
+                "average_time_to_budget": (
+                    values["time_to_budget"] / values["stopped_early"]
+                    if values["stopped_early"]
+                    else None
+                ),
+            }
+        return metrics
@@ -0,0 +1,420 @@
+import atexit
+import glob
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+# Words that do not change what is asked. Question words such as who or when
+# are kept, since they decide what kind of answer is expected.
+FILLER_WORDS = frozenset(
+    "a an the of in on at to for with and or is are was were be do does did "
+    "what how please alexa tell me about can could you would i want know look "
+    "up search into get give explain describe define".split()
+)
+
+# Questions whose answer changes over time
+TIME_SENSITIVE = re.compile(
+    r"\b(today|tonight|tomorrow|yesterday|now|current(ly)?|latest|recent|this "
+    r"(week|month|year)|weather|news|score|price|stock)\b",
+    re.IGNORECASE,
+)
+
+WORD = re.compile(r"[a-z0-9']+")
+
+# Words that carry no subject of their own, left out of the key terms
+COMMON_WORDS = frozenset(
+    "am be been being has have had having will shall should may might must by "
+    "from as that this these those it its they them he she his her their there "
+    "here we us our your my which whom whose who when where why how whats".split()
+)
+
+# Words of the same meaning in a question, mapped to one key term
+SYNONYMS = {
+    word: term
+    for term, words in {
+        "write": "writes wrote written writing writer author authored",
+        "paint": "paints painted painter",
+        "invent": "invents invented inventor",
+        "discover": "discovers discovered discoverer",
+        "found": "founded founder",
+        "direct": "directed director",
+        "compose": "composed composer",
+        "sing": "sings sang sung singer",
+        "build": "builds built builder",
+        "tall": "height high",
+        "far": "distance",
+        "old": "age",
+        "big": "large size",
+        "long": "length",
+        "many": "much number",
+        "mean": "means meaning definition",
+        "name": "named called call",
+        "start": "starts started begin began begun beginning",
+        "end": "ends ended finish finished",
+        "die": "dies died death",
+        "born": "birth",
+        "win": "wins won winner",
+    }.items()
+    for word in words.split()
+}
+
+# Question words that decide the kind of answer: a person, a time, a place...
+QUESTION_WORDS = frozenset(("who", "when", "where", "why", "how"))
+
+# Words after "how" that ask for a measure, as "what is the height" does
+MEASURES = frozenset(
+    "tall far old big long many much high large deep fast heavy".split()
+)
+
+
+class SemanticCache:
+    """
+    Caches answers by the meaning of the question rather than its exact words.
+
+    Questions are embedded locally with a hashing vectorizer over their words,
+    word pairs and character trigrams, so no model or network is needed. The
+    vectors are kept in a NumPy matrix and a question is answered from the cache
+    when the cosine similarity with a cached question reaches the threshold and
+    both have the same key terms: the numbers and the words naming what is asked
+    about, e.g. "1994" or "hamlet", must match exactly, since questions that
+    differ only in them look alike but have different answers. Common words are
+    not key terms, and words of the same meaning such as "wrote" and "author"
+    are the same term. When both questions have a question word such as who or
+    when, it must match too.
+
+    When the cache is full, the least recently used entry is replaced. Entries
+    are only reused within their scope, e.g. the personality that answered.
+
+    Every entry expires after ``ttl`` seconds, or ``volatile_ttl`` seconds for
+    time-sensitive questions such as the news or the score of a game; those are
+    not cached at all when ``volatile_ttl`` is 0. When a ``path`` is given, the
+    cache is loaded from the files next to it at startup, and every process
+    saves its own file, ``answers.<pid>.npz`` for ``answers.npz``, from a
+    background thread every SAVE_INTERVAL seconds and on exit.
+
+    Attributes:
+        path (Optional[str]): The file name the cache is persisted under, None to keep it in memory.
+        max_entries (int): Maximum number of cached answers.
+        threshold (float): Minimum cosine similarity of a cached question to reuse its answer.
+        ttl (float): Seconds an answer is cached.
+        volatile_ttl (float): Seconds the answer to a time-sensitive question is cached.
+
+    Example:
+        cache = SemanticCache(threshold=0.35)
+        cache.put("who wrote hamlet", "Hamlet was written by William Shakespeare.")
+        cache.get("tell me who wrote hamlet")
+    """
+
+    DIMENSIONS = 1024
+    # Seconds between two saves of a changed cache
+    SAVE_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 1000,
+        threshold: float = 0.35,
+        ttl: float = 86400.0,
+        volatile_ttl: float = 300.0,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self.volatile_ttl = volatile_ttl
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((max_entries, self.DIMENSIONS), dtype=np.float32)
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._scopes = np.zeros(max_entries, dtype=np.int64)
+        self._questions: List[str] = [""] * max_entries
+        self._answers: List[str] = [""] * max_entries
+        self._keys: List[Optional[Tuple[FrozenSet[str], FrozenSet[str]]]] = [
+            None
+        ] * max_entries
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._dirty = False
+        self._flusher_pid: Optional[int] = None
+        self.logger = logging.getLogger(__name__)
+        if path:
+            self.load()
+            atexit.register(self.save)
+
+    @classmethod
+    def embed(cls, text: str) -> np.ndarray:
+        """
+        Embeds a question as a unit vector of hashed words, word pairs and
+        character trigrams.
+        """
+        words = [
+            word for word in WORD.findall(text.lower()) if word not in FILLER_WORDS
+        ]
+        features = words + [" ".join(pair) for pair in zip(words, words[1:])]
+        for word in words:
+            padded = f" {word} "
+            features.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+
+        vector = np.zeros(cls.DIMENSIONS, dtype=np.float32)
+        for feature in features:
+            digest = zlib.crc32(feature.encode("utf-8"))
+            # The sign bit keeps colliding features from adding up
+            vector[digest % cls.DIMENSIONS] += 1.0 if digest & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def get_keys(text: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Returns the key terms of a question, which must match for a cached
+        answer to be reused, and its question words.
+        """
+        words = WORD.findall(text.lower())
+        terms = set()
+        question_words = set()
+        for position, word in enumerate(words):
+            if word in QUESTION_WORDS:
+                following = words[position + 1] if position + 1 < len(words) else ""
+                if word != "how" or following not in MEASURES:
+                    question_words.add(word)
+                continue
+            if word.endswith("'s"):
+                word = word[:-2]
+            if word in FILLER_WORDS or word in COMMON_WORDS:
+                continue
+            if word not in SYNONYMS and len(word) > 3 and word.endswith("s"):
+                # Plurals, though not words such as "glass"
+                word = word if word.endswith("ss") else word[:-1]
+            terms.add(SYNONYMS.get(word, word))
+        return frozenset(terms), frozenset(question_words)
+
+    @staticmethod
+    def _keys_match(
+        keys: Tuple[FrozenSet[str], FrozenSet[str]],
+        other: Tuple[FrozenSet[str], FrozenSet[str]],
+    ) -> bool:
+        (terms, question_words), (other_terms, other_question_words) = keys, other
+        if terms != other_terms:
+            return False
+        return (
+            not question_words
+            or not other_question_words
+            or (question_words == other_question_words)
+        )
+
+    def get_ttl(self, question: str) -> float:
+        """Returns the number of seconds the answer to a question may be cached."""
+        return self.volatile_ttl if TIME_SENSITIVE.search(question) else self.ttl
+
+    def get(self, question: str, scope: str = "") -> Optional[str]:
+        """
+        Returns the cached answer of the most similar question, or None when no
+        cached question is similar enough.
+
+        Args:
+            question (str): The question asked.
+            scope (str): Only answers cached with the same scope are returned.
+        """
+        vector = self.embed(question)
+        keys = self.get_keys(question)
+        now = time.time()
+        with self._lock:
+            index = self._find(vector, keys, self._scope_id(scope), now)
+            if index is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._last_used[index] = now
+            self.logger.info(
+                "Answering %r from the cache of %r", question, self._questions[index]
+            )
+            return self._answers[index]
+
+    def put(self, question: str, answer: str, scope: str = ""):
+        """
+        Caches the answer to a question, unless the question is too time-sensitive to cache.
+
+        Args:
+            question (str): The question asked.
+            answer (str): The answer to cache.
+            scope (str): The scope the answer may be reused in.
+        """
+        ttl = self.get_ttl(question)
+        if ttl <= 0 or not answer:
+            return
+        vector = self.embed(question)
+        keys = self.get_keys(question)
+        scope_id = self._scope_id(scope)
+        now = time.time()
+        with self._lock:
+            index = self._find(vector, keys, scope_id, now)
+            if index is None:
+                # A free or expired slot, else the least recently used entry
+                live = self._expires > now
+                index = int(np.argmin(np.where(live, self._last_used, -1.0)))
+                self._evictions += bool(live[index])
+            self._vectors[index] = vector
+            self._expires[index] = now + ttl
+            self._last_used[index] = now
+            self._scopes[index] = scope_id
+            self._questions[index] = question
+            self._answers[index] = answer
+            self._keys[index] = keys
+            self._dirty = True
+            if self.path and self._flusher_pid != os.getpid():
+                self._start_flusher()
+
+    def _start_flusher(self):
+        # Must be called with the lock held. Threads do not survive a fork, so
+        # every process starts its own, saving to its own file.
+        self._flusher_pid = os.getpid()
+        threading.Thread(
+            target=self._flush, name="answer-cache-flush", daemon=True
+        ).start()
+
+    def _flush(self):
+        while True:
+            time.sleep(self.SAVE_INTERVAL)
+            self.save()
+
+    @staticmethod
+    def _scope_id(scope: str) -> int:
+        return zlib.crc32(scope.encode("utf-8"))
+
+    def _find(
+        self,
+        vector: np.ndarray,
+        keys: Tuple[FrozenSet[str], FrozenSet[str]],
+        scope_id: int,
+        now: float,
+    ) -> Optional[int]:
+        # Must be called with the lock held
+        similarities = self._vectors @ vector
+        similarities[(self._expires <= now) | (self._scopes != scope_id)] = -1.0
+        candidates = np.flatnonzero(similarities >= self.threshold)
+        for index in candidates[np.argsort(similarities[candidates])[::-1]]:
+            if self._keys_match(keys, self._keys[index]):
+                return int(index)
+        return None
+
+    def get_files(self) -> List[str]:
+        """Returns the cache files saved by every process, ``answers.*.npz`` for ``answers.npz``."""
+        root, extension = os.path.splitext(self.path)
+        return sorted(glob.glob(f"{glob.escape(root)}.*{extension}")) + (
+            [self.path] if os.path.exists(self.path) else []
+        )
+
+    def get_process_file(self) -> str:
+        """Returns the file this process saves the cache to."""
+        root, extension = os.path.splitext(self.path)
+        return f"{root}.{os.getpid()}{extension}"
+
+    def load(self):
+        """
+        Loads the entries saved by every process, keeping the latest answer to
+        each question and the entries that expire last when there are more than
+        the cache holds. Files with nothing but expired entries are removed.
+        """
+        if not self.path:
+            return
+        entries: Dict[Tuple[int, str], Tuple[float, np.ndarray, str]] = {}
+        now = time.time()
+        for path in self.get_files():
+            try:
+                with np.load(path) as data:
+                    vectors = data["vectors"]
+                    expires = data["expires"]
+                    scopes = data["scopes"]
+                    questions = data["questions"].tolist()
+                    answers = data["answers"].tolist()
+            except (OSError, KeyError, ValueError) as e:
+                self.logger.warning("Could not load the answer cache %s: %s", path, e)
+                continue
+            if vectors.shape[1:] != (self.DIMENSIONS,):
+                self.logger.warning(
+                    "Ignoring the answer cache %s of another shape", path
+                )
+                continue
+            if not np.any(expires > now):
+                self._remove(path)
+                continue
+            for index in np.flatnonzero(expires > now):
+                key = (int(scopes[index]), questions[index])
+                if key not in entries or entries[key][0] < expires[index]:
+                    entries[key] = (
+                        float(expires[index]),
+                        vectors[index],
+                        answers[index],
+                    )
+
+        # The entries that expire last are kept when the cache shrank
+        kept = sorted(entries.items(), key=lambda entry: entry[1][0], reverse=True)
+        kept = kept[: self.max_entries]
+        with self._lock:
+            for slot, ((scope_id, question), (expires, vector, answer)) in enumerate(
+                kept
+            ):
+                self._vectors[slot] = vector
+                self._expires[slot] = expires
+                self._scopes[slot] = scope_id
+                self._last_used[slot] = now
+                self._questions[slot] = question
+                self._answers[slot] = answer
+                self._keys[slot] = self.get_keys(question)
+        if kept:
+            self.logger.info("Loaded %d cached answers from %s", len(kept), self.path)
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def save(self):
+        """Saves the unexpired entries to the file of this process, replacing it atomically."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            live = np.flatnonzero(self._expires > time.time())
+            data = {
+                "vectors": self._vectors[live],
+                "expires": self._expires[live],
+                "scopes": self._scopes[live],
+                "questions": np.array([self._questions[i] for i in live], dtype=str),
+                "answers": np.array([self._answers[i] for i in live], dtype=str),
+            }
+            self._dirty = False
+
+        path = self.get_process_file()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{path}.tmp"
+        try:
+            with open(temporary, "wb") as file:
+                np.savez(file, **data)
+            os.replace(temporary, path)
+        except OSError as e:
+            self.logger.warning("Could not save the answer cache %s: %s", path, e)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Returns the number of live entries, hits, misses and evictions."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": int(np.count_nonzero(self._expires > time.time())),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else None,
+                "evictions": self._evictions,
+            }
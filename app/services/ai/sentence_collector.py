@@ -0,0 +1,88 @@
+from typing import List
+
+from app.models.ai.output_budget import SENTENCE_BOUNDARY, OutputBudget
+
+
+class SentenceCollector:
+    """
+    Assembles the tokens of a streamed answer into the whole sentences that fit
+    in an output budget.
+
+    ``feed`` returns True as soon as the budget is met, that is when the sentence
+    being generated can no longer fit, so the caller can stop the stream instead
+    of waiting for the rest of the generation. The first sentence is always kept,
+    like with OutputBudget.truncate.
+
+    Attributes:
+        budget (OutputBudget): The output budget of the answer.
+        sentences (List[str]): The complete sentences that fit in the budget.
+        generated (str): All the text received so far.
+        full (bool): Whether the budget is met.
+
+    Example:
+        collector = SentenceCollector(budget)
+        for chunk in stream:
+            if collector.feed(chunk.choices[0].delta.content or ""):
+                stream.close()
+                break
+        text = collector.finish()
+    """
+
+    def __init__(self, budget: OutputBudget):
+        self.budget = budget
+        self.sentences: List[str] = []
+        self.generated = ""
+        self.full = False
+        self._pending = ""
+
+    def feed(self, text: str) -> bool:
+        """
+        Adds the next piece of the answer.
+
+        Args:
+            text (str): The text of the next streamed tokens.
+
+        Returns:
+            bool: True when the budget is met and the rest of the answer is not needed.
+        """
+        if self.full:
+            return True
+        self.generated += text
+        self._pending = (self._pending + text).lstrip()
+
+        # Everything before the last boundary is made of complete sentences
+        *complete, self._pending = SENTENCE_BOUNDARY.split(self._pending)
+        for sentence in complete:
+            if not self._accept(sentence):
+                self.full = True
+                return True
+        if self._pending and not self._fits(self._pending):
+            self.full = True
+        return self.full
+
+    def finish(self, cut_off: bool = False) -> str:
+        """
+        Returns the answer to speak once the stream has ended or was stopped.
+
+        Args:
+            cut_off (bool): Whether the generation was stopped by max_tokens, in which
+                case a trailing unfinished sentence is dropped.
+        """
+        pending = self._pending.strip()
+        if pending and not self.full:
+            unfinished = cut_off and not pending.endswith((".", "!", "?"))
+            if not (unfinished and self.sentences):
+                self._accept(pending)
+        return " ".join(self.sentences)
+
+    def _fits(self, sentence: str) -> bool:
+        # The first sentence is kept whatever its length
+        return not self.sentences or self.budget.fits(
+            " ".join(self.sentences + [sentence])
+        )
+
+    def _accept(self, sentence: str) -> bool:
+        if not self._fits(sentence):
+            return False
+        self.sentences.append(sentence)
+        return True
@@ -0,0 +1,304 @@
+import ipaddress
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from openai import OpenAI
+
+from app.models.ai.model_config import ModelConfig
+from app.models.ai.replica_balancer import ReplicaBalancer
+
+
+@dataclass
+class WarmupState:
+    """
+    Data model for the warm-up state of a single model endpoint.
+
+    Attributes:
+        model_config (ModelConfig): The model configuration of the endpoint.
+        last_used (Optional[float]): Monotonic time of the last successful request, None if none succeeded.
+        primes (int): Number of priming requests sent.
+        prime_failures (int): Number of priming requests that failed.
+        consecutive_failures (int): Number of priming requests that failed since the last success.
+        next_prime (float): Monotonic time before which the model is not primed again after a failure.
+        priming (bool): Whether a priming request is in flight.
+        cold_starts (int): Number of requests that found the model unloaded.
+        last_cold_start (Optional[float]): Latency in seconds of the last cold start.
+        max_cold_start (Optional[float]): Highest cold start latency in seconds.
+    """
+
+    model_config: ModelConfig
+    last_used: Optional[float] = field(default=None)
+    primes: int = field(default=0)
+    prime_failures: int = field(default=0)
+    consecutive_failures: int = field(default=0)
+    next_prime: float = field(default=0.0)
+    priming: bool = field(default=False)
+    cold_starts: int = field(default=0)
+    last_cold_start: Optional[float] = field(default=None)
+    max_cold_start: Optional[float] = field(default=None)
+
+
+class WarmupManager:
+    """
+    Keeps the models of local inference backends loaded.
+
+    Backends such as Ollama unload a model after it has been idle for a while,
+    and the next request waits for the model to load again. When started, the
+    manager sends a one-token priming request to every model served locally,
+    on this host or a private network, or with a ``keep_alive``, then primes
+    again every model with a ``keep_alive`` that has been idle for most of it.
+    Hosted APIs load nothing and are not primed. A model is hot while it was
+    used within its ``keep_alive``; a model without one stays hot once it
+    answered. At most PRIME_CONCURRENCY models are primed at a time, and a
+    model whose priming failed is retried with an exponential backoff, up to
+    MAX_BACKOFF.
+
+    The manager is ready once the primed required models, the routing and
+    answer models, are hot. A successful request that found its model cold is
+    counted as a cold start, with its latency.
+
+    Attributes:
+        required (Dict[str, List[ModelConfig]]): Replicas of the models that must be hot, by model identifier.
+        states (Dict[Tuple[str, str], WarmupState]): Warm-up state by base URL and model.
+    """
+
+    # Seconds between two checks for idle models
+    CHECK_INTERVAL = 5.0
+    # Share of the keep-alive after which an idle model is primed again
+    REFRESH_FRACTION = 0.8
+    # Loading a model from disk may take a while
+    PRIME_TIMEOUT = 120.0
+    # Models primed at the same time
+    PRIME_CONCURRENCY = 4
+    # Longest wait, in seconds, before priming a model that keeps failing again
+    MAX_BACKOFF = 300.0
+
+    def __init__(
+        self, model_configs: List[ModelConfig], required: Dict[str, List[ModelConfig]]
+    ):
+        self.required = required
+        self.states: Dict[Tuple[str, str], WarmupState] = {}
+        for model_config in model_configs:
+            self.states.setdefault(
+                ReplicaBalancer.replica_id(model_config), WarmupState(model_config)
+            )
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def should_prime(model_config: ModelConfig) -> bool:
+        """
+        Returns True for models with a ``keep_alive`` or served on this host or a
+        private network, by IP address, ``localhost`` or a single-label host
+        name such as a container's.
+        """
+        if model_config.keep_alive is not None:
+            return True
+        host = urlparse(model_config.base_url).hostname or ""
+        if host == "localhost" or "." not in host:
+            return True
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return address.is_loopback or address.is_private
+
+    def start(self):
+        """
+        Starts priming the models in a background thread. In a pre-forking server
+        this must be called in every worker, since threads do not survive a fork.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="model-warmup", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops priming the models."""
+        self._stop.set()
+
+    @property
+    def running(self) -> bool:
+        """Returns True while the models are being kept warm."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        required = {
+            ReplicaBalancer.replica_id(replica)
+            for replicas in self.required.values()
+            for replica in replicas
+        }
+        # The required models first, so the manager is ready as soon as possible
+        order = sorted(
+            (
+                replica_id
+                for replica_id, state in self.states.items()
+                if self.should_prime(state.model_config)
+            ),
+            key=lambda replica_id: replica_id not in required,
+        )
+        with ThreadPoolExecutor(
+            max_workers=self.PRIME_CONCURRENCY, thread_name_prefix="model-prime"
+        ) as pool:
+            while not self._stop.is_set():
+                for replica_id in order:
+                    if self._stop.is_set():
+                        break
+                    if self.is_due(replica_id):
+                        with self._lock:
+                            self.states[replica_id].priming = True
+                        pool.submit(self.prime, self.states[replica_id].model_config)
+                self._stop.wait(self.CHECK_INTERVAL)
+
+    def is_due(self, replica_id: Tuple[str, str]) -> bool:
+        """
+        Returns True when the model should be primed: it is not being primed nor
+        backing off after a failure, and it never answered or was idle for most
+        of its keep-alive.
+        """
+        with self._lock:
+            state = self.states[replica_id]
+            now = time.monotonic()
+            if state.priming or now < state.next_prime:
+                return False
+            if state.last_used is None:
+                return True
+            keep_alive = state.model_config.keep_alive
+            return (
+                keep_alive is not None
+                and now - state.last_used >= keep_alive * self.REFRESH_FRACTION
+            )
+
+    def prime(self, model_config: ModelConfig):
+        """
+        Sends a one-token request to a model so the backend loads it.
+
+        Failures are logged and the model is primed again after a backoff that
+        doubles with every consecutive failure.
+        """
+        client = OpenAI(
+            base_url=model_config.base_url,
+            api_key=model_config.api_key,
+            timeout=self.PRIME_TIMEOUT,
+            max_retries=0,
+        )
+        started = time.monotonic()
+        try:
+            client.chat.completions.create(
+                model=model_config.model,
+                messages=[{"role": "user", "content": "Hi"}],
+                max_tokens=1,
+            )
+        except Exception as e:
+            with self._lock:
+                state = self.states[ReplicaBalancer.replica_id(model_config)]
+                state.primes += 1
+                state.prime_failures += 1
+                state.consecutive_failures += 1
+                backoff = min(
+                    self.MAX_BACKOFF,
+                    self.CHECK_INTERVAL * 2 ** (state.consecutive_failures - 1),
+                )
+                state.next_prime = time.monotonic() + backoff
+                state.priming = False
+            self.logger.warning(
+                "Priming model %s at %s failed, retrying in %.1fs: %s",
+                model_config.model,
+                model_config.base_url,
+                backoff,
+                e,
+            )
+            return
+        latency = time.monotonic() - started
+        with self._lock:
+            state = self.states[ReplicaBalancer.replica_id(model_config)]
+            state.primes += 1
+            state.consecutive_failures = 0
+            state.priming = False
+        self.record(model_config, started, latency)
+        self.logger.info("Primed model %s in %.2fs", model_config.model, latency)
+
+    def record(self, model_config: ModelConfig, started: float, latency: float):
+        """
+        Records a successful request to a model, counting it as a cold start when
+        the model was not hot when the request started.
+
+        Args:
+            model_config (ModelConfig): The model configuration that was called.
+            started (float): Monotonic time the request started.
+            latency (float): Number of seconds the request took.
+        """
+        with self._lock:
+            state = self.states.get(ReplicaBalancer.replica_id(model_config))
+            if state is None:
+                return
+            if not self._is_hot(state, started):
+                state.cold_starts += 1
+                state.last_cold_start = latency
+                state.max_cold_start = max(state.max_cold_start or 0.0, latency)
+            state.last_used = max(state.last_used or 0.0, started + latency)
+
+    @staticmethod
+    def _is_hot(state: WarmupState, now: float) -> bool:
+        # Must be called with the lock held
+        if state.last_used is None:
+            return False
+        keep_alive = state.model_config.keep_alive
+        return keep_alive is None or now - state.last_used < keep_alive
+
+    def is_ready(self) -> bool:
+        """
+        Returns True when every required model has a hot replica, or when the
+        models are not kept warm.
+        """
+        return not self.running or not self.get_cold_models()
+
+    def get_cold_models(self) -> List[str]:
+        """
+        Returns the required models without a hot replica, among those that are
+        primed; a hosted model is always ready.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                identifier
+                for identifier, replicas in self.required.items()
+                if any(self.should_prime(replica) for replica in replicas)
+                and not any(
+                    self._is_hot(self.states[ReplicaBalancer.replica_id(replica)], now)
+                    for replica in replicas
+                )
+            ]
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns whether each model is hot, the priming counters and the cold starts.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                f"{state.model_config.model} @ {state.model_config.base_url}": {
+                    "hot": self._is_hot(state, now),
+                    "idle_seconds": (
+                        now - state.last_used if state.last_used is not None else None
+                    ),
+                    "keep_alive": state.model_config.keep_alive,
+                    "primes": state.primes,
+                    "prime_failures": state.prime_failures,
+                    "primed": self.should_prime(state.model_config),
+                    "cold_starts": state.cold_starts,
+                    "last_cold_start": state.last_cold_start,
+                    "max_cold_start": state.max_cold_start,
+                }
+                for state in self.states.values()
+            }
@@ -0,0 +1,4 @@
+# app/services/alexa/__init__.py
+from .progressive_response_service import ProgressiveResponseService
+
+__all__ = ["ProgressiveResponseService"]
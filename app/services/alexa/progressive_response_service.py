@@ -0,0 +1,90 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from xml.sax.saxutils import escape
+
+import requests
+
+from app.config.config import Config
+from app.models.singleton import SingletonMeta
+
+
+class ProgressiveResponseService(metaclass=SingletonMeta):
+    """
+    Service to send interim speech to the user through the Alexa Progressive
+    Response API while a slow intent is still being computed.
+
+    Directives are posted on a small background pool so the request thread keeps
+    working on the real answer while the interim speech is delivered.
+
+    Attributes:
+        config (Config): Application configuration.
+        timeout (float): Timeout in seconds for posting a directive.
+        pool (ThreadPoolExecutor): Pool the directives are posted from.
+    """
+
+    _is_initialized = False
+
+    def __init__(self, timeout: float = 2.0):
+        if not self._is_initialized:  # Prevent reinitialization
+            self.logger = logging.getLogger(__name__)
+            self.config = Config()
+            self.timeout = timeout
+            self.pool = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="progressive-response"
+            )
+            self._is_initialized = True
+
+    def send_speech(
+        self,
+        request_id: str,
+        api_endpoint: Optional[str],
+        api_access_token: Optional[str],
+        speech: str,
+    ) -> Optional[Future]:
+        """
+        Sends interim speech for the given Alexa request without blocking.
+
+        Parameters:
+            request_id (str): The id of the Alexa request being answered.
+            api_endpoint (Optional[str]): The Alexa API endpoint from the request context.
+                Overridden by the ALEXA_DIRECTIVE_ENDPOINT setting when set.
+            api_access_token (Optional[str]): The API access token from the request context.
+            speech (str): The interim speech.
+
+        Returns:
+            Optional[Future]: The future of the background post, or None if nothing was sent.
+
+        Example:
+            service = ProgressiveResponseService()
+            service.send_speech(request_id, api_endpoint, api_access_token, "Checking the forecast...")
+        """
+        endpoint = self.config.alexa_directive_endpoint or api_endpoint
+        if not self.config.progressive_responses or not endpoint or not request_id:
+            return None
+
+        url = f"{endpoint.rstrip('/')}/v1/directives"
+        payload = {
+            "header": {"requestId": request_id},
+            "directive": {
+                "type": "VoicePlayer.Speak",
+                "speech": f"<speak>{escape(speech)}</speak>",
+            },
+        }
+        headers = {"Content-Type": "application/json"}
+        if api_access_token:
+            headers["Authorization"] = f"Bearer {api_access_token}"
+
+        self.logger.info("Sending progressive response for request %s", request_id)
+        return self.pool.submit(self._post_directive, url, payload, headers)
+
+    def _post_directive(self, url: str, payload: dict, headers: dict) -> bool:
+        try:
+            response = requests.post(
+                url, json=payload, headers=headers, timeout=self.timeout
+            )
+            response.raise_for_status()
+            return True
+        except requests.RequestException as e:
+            self.logger.warning("Progressive response failed: %s", e)
+            return False
@@ -1,22 +1,31 @@
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 
-from duckduckgo_search import DDGS
+import httpx
+import requests
+from duckduckgo_search import AsyncDDGS, DDGS
 from flask import render_template
 
 from app.config.config import Config
+from app.models.deadline import Deadline
 from app.services.ai.ai_service_instance import AIServiceSingleton
 
 
 class BrowserService:
     """
     A service class to handle web searches.
+
+    ``web_search_async`` runs the same search and summary without blocking the event loop.
+
+    Searches go to DuckDuckGo, or to the SearXNG-compatible JSON endpoint set
+    in SEARCH_URL, such as a self-hosted SearXNG instance or a local stand-in.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, timeout: int = 10):
         if api_key is None:
             api_key = Config.get("SEARCH_API_KEY")
         self.api_key = api_key
+        self.timeout = timeout
         self.config = Config()
         # Set up logging
         self.logger = logging.getLogger(__name__)
@@ -37,9 +46,9 @@ class BrowserService:
             # results = DDGS().text(
             #     search, max_results=5
             # )  # Perform the search with a limit of 5 results
-            results = DDGS().text(
-                search, max_results=1
-            )  # Perform the search with a limit of 5 results
+            # Leave at least a second for the search itself
+            timeout = max(1, int(Deadline.current_timeout(self.timeout)))
+            results = self.search(search, timeout)
             if not results:
                 return "No results found."
 
@@ -59,7 +68,88 @@ class BrowserService:
             )
 
             ai_service = AIServiceSingleton().get_instance()
-            ai_response = ai_service.prompt_the_ai(prompt)
+            ai_response = ai_service.prompt_the_ai(
+                prompt, template="web_search_overview"
+            )
+
+            return ai_response.strip()
+        except Exception as e:
+            self.logger.error("Error performing web search: %s", e)
+            return "An error occurred while performing the web search."
+
+    def search(self, search: str, timeout: int) -> List[Dict[str, str]]:
+        """
+        Returns the top search result as DuckDuckGo-style dictionaries with a
+        title, href and body.
+
+        Args:
+            search (str): The search string.
+            timeout (int): Seconds the search may take.
+        """
+        if self.config.search_url is None:
+            return DDGS(timeout=timeout).text(search, max_results=1)
+
+        response = requests.get(
+            self.config.search_url,
+            params={"q": search, "format": "json"},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return self.parse_searxng(response.json())
+
+    async def search_async(self, search: str, timeout: int) -> List[Dict[str, str]]:
+        """
+        Asynchronous variant of search.
+        """
+        if self.config.search_url is None:
+            async with AsyncDDGS(timeout=timeout) as ddgs:
+                return await ddgs.atext(search, max_results=1)
+
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            response = await client.get(
+                self.config.search_url, params={"q": search, "format": "json"}
+            )
+            response.raise_for_status()
+            return self.parse_searxng(response.json())
+
+    @staticmethod
+    def parse_searxng(data: dict) -> List[Dict[str, str]]:
+        return [
+            {
+                "title": result.get("title", ""),
+                "href": result.get("url", ""),
+                "body": result.get("content", ""),
+            }
+            for result in data.get("results", [])[:1]
+        ]
+
+    async def web_search_async(self, search: str) -> str:
+        """
+        Asynchronous variant of web_search.
+
+        Args:
+            search (str): The non modified search string provided by the user where the search contains the words 'web' or 'internet' specifically.
+
+        Returns:
+            str: A comprehensive response generated by web or internet.
+        """
+        self.logger.info("Performing web search for query: %s", search)
+        try:
+            timeout = max(1, int(Deadline.current_timeout(self.timeout)))
+            results = await self.search_async(search, timeout)
+            if not results:
+                return "No results found."
+
+            result = results[0]
+            prompt = render_template(
+                "web_search_overview",
+                overview=f"Top result returned is titled: {result['title']}.  {result['body']}",
+            )
+
+            ai_service = AIServiceSingleton().get_instance()
+            ai_response = await ai_service.prompt_the_ai_async(
+                prompt, template="web_search_overview"
+            )
 
             return ai_response.strip()
         except Exception as e:
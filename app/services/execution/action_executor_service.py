@@ -1,43 +1,96 @@
+import asyncio
 import logging
-import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
+from typing import Dict, List, Optional
 
+from flask import render_template
+
+from app.config.config import Config
+from app.helpers.thread_helpers import ThreadHelpers
+from app.helpers.ttl_cache import TTLCache
+from app.models.deadline import Deadline
+from app.models.function_call import FunctionCall
 from app.models.intent_response import IntentResponse, IntentResponseDetails
 from app.services.ai.ai_service_instance import AIServiceSingleton
-from app.services.browser.browser_service import BrowserService
-from app.services.weather.weather_service import WeatherService
+from app.services.execution.function_call_parser import (
+    FunctionCallParser,
+    InvalidFunctionCallError,
+)
+from app.services.execution.function_registry import FunctionRegistry
+from app.services.telemetry.metrics_registry import (
+    STAGE_EXECUTOR_FUNCTION,
+    MetricsRegistry,
+)
+from app.services.telemetry.tracer import Tracer, traced
 
 
 class ActionExecutorService:
     """
     Service to execute a given function string.
 
+    Every call runs on a bounded thread pool under the timeout registered for its
+    function, capped by the request deadline, so a hung backend cannot hold the
+    request thread past Alexa's response window. A call that overruns is abandoned, answered with a degraded
+    response, and counted per function.
+
+    Routing responses may contain several calls for compound requests. Those calls
+    are independent of each other, so they run concurrently and their results are
+    aggregated into a single answer.
+
+    Functions are looked up in the FunctionRegistry, which imports and constructs
+    the backing services on first use. Results of cacheable functions are reused
+    for identical calls until their cache TTL expires.
+
+    ``execute_function_async`` is the asyncio counterpart: calls run as tasks on the
+    event loop and are cancelled when they overrun. Functions without an
+    asynchronous implementation run in a worker thread.
+
     Attributes:
-        function_map (dict): A mapping of function names to their corresponding functions.
+        registry (FunctionRegistry): Registry of the functions that may be executed.
+        parser (FunctionCallParser): Parser used to extract function calls from routing responses.
+        call_timeout (float): Default number of seconds a call may run when its function has no timeout.
+        pool (ThreadPoolExecutor): Bounded pool the calls run on.
+        result_cache (TTLCache): Results of cacheable function calls.
+        timeout_counts (Counter): Number of timed out calls per function name.
+        metrics (MetricsRegistry): Registry the function latencies are recorded in.
 
     Methods:
         execute_function(function_str: str) -> str: Executes the given function string and returns the result.
+        execute_function_async(function_str: str) -> str: Asynchronous variant of execute_function.
     """
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.weather_service = WeatherService()
-        self.web_service = BrowserService()
+        self.config = Config()
         self.ai_service = AIServiceSingleton.get_instance()
-        self.function_map = {
-            "get_weather_forecast": self.weather_service.get_weather_forecast,
-            "get_weather_temperature": self.weather_service.get_weather_temperature,
-            "ask_the_ai": self.ai_service.ask_the_ai,
-            "web_search": self.web_service.web_search,
-        }
+        self.registry = FunctionRegistry()
+        self.parser = FunctionCallParser()
+        self.call_timeout = self.config.executor_call_timeout
+        self.pool = ThreadPoolExecutor(
+            max_workers=self.config.executor_max_workers,
+            thread_name_prefix="action-executor",
+        )
+        self.result_cache = TTLCache(maxsize=128)
+        self.timeout_counts: Counter = Counter()
+        self._timeout_lock = threading.Lock()
+        self.metrics = MetricsRegistry()
 
-    def execute_function(self, function_str: str) -> IntentResponse:
+    @traced("action_executor.execute_function")
+    def execute_function(
+        self, function_str: str, deadline: Deadline = None
+    ) -> IntentResponse:
         """
-        Executes the given function string by extracting the function name and arguments,
-        then using a controlled environment to call the function.
+        Executes the given function string by extracting the function calls and their
+        arguments, then using a controlled environment to call the functions.
 
         Parameters:
             function_str (str): The function call string to be executed.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
 
         Returns:
             IntentResponse: The structured IntentResponse dataclass.
@@ -48,57 +101,437 @@ class ActionExecutorService:
             print(result)
         """
         self.logger.info("Executing function: %s", function_str)
+        if deadline is None:
+            deadline = Deadline.current()
+
+        # Extract function names and arguments
+        try:
+            calls = self.parser.parse_all(function_str)
+        except InvalidFunctionCallError as e:
+            self.logger.error("Invalid function call format: %s", e)
+            return self._failure_response(function_str, "Invalid function call format")
+
+        responses = self._execute_calls(function_str, calls, deadline)
+        if len(responses) == 1:
+            return responses[0]
+
+        return self._aggregate_responses(function_str, responses, deadline)
+
+    @traced("action_executor.execute_function")
+    async def execute_function_async(
+        self, function_str: str, deadline: Deadline = None
+    ) -> IntentResponse:
+        """
+        Asynchronous variant of execute_function. The calls run concurrently on the
+        event loop, and a call that overruns its timeout is cancelled.
+
+        Parameters:
+            function_str (str): The function call string to be executed.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+
+        Returns:
+            IntentResponse: The structured IntentResponse dataclass.
+        """
+        self.logger.info("Executing function: %s", function_str)
+        if deadline is None:
+            deadline = Deadline.current()
 
-        # Extract function name and arguments
-        match = re.match(r"Call:\s*(\w+)\((.*)\)", function_str)
-        if not match:
-            self.logger.error("Invalid function call format")
-            return IntentResponse(
-                request=function_str,
-                details=IntentResponseDetails(
-                    status="failure",
-                    data="Invalid function call format",
-                    timestamp=datetime.now().isoformat(),
-                ),
+        try:
+            calls = self.parser.parse_all(function_str)
+        except InvalidFunctionCallError as e:
+            self.logger.error("Invalid function call format: %s", e)
+            return self._failure_response(function_str, "Invalid function call format")
+
+        if len(calls) > 1:
+            self.logger.info("Executing %d function calls concurrently", len(calls))
+
+        responses = await asyncio.gather(
+            *(
+                self._execute_call_with_timeout(function_str, call, deadline)
+                for call in calls
             )
+        )
+        if len(responses) == 1:
+            return responses[0]
 
-        func_name = match.group(1)
-        func_args = match.group(2)
+        return await self._aggregate_responses_async(
+            function_str, list(responses), deadline
+        )
 
-        if func_name not in self.function_map:
+    def get_timeout_counts(self) -> Dict[str, int]:
+        """
+        Returns the number of timed out calls per function name.
+        """
+        with self._timeout_lock:
+            return dict(self.timeout_counts)
+
+    def _execute_call(self, function_str: str, call: FunctionCall) -> IntentResponse:
+        """
+        Executes a single parsed function call.
+
+        Parameters:
+            function_str (str): The function call string the call was parsed from.
+            call (FunctionCall): The parsed function call.
+
+        Returns:
+            IntentResponse: The structured IntentResponse dataclass.
+        """
+        func_name = call.name
+
+        if func_name not in self.registry:
             self.logger.error("Function %s is not allowed", func_name)
-            return IntentResponse(
-                request=function_str,
-                details=IntentResponseDetails(
-                    status="failure",
-                    data=f"Function {func_name} is not allowed",
-                    timestamp=datetime.now().isoformat(),
-                ),
+            return self._failure_response(
+                function_str, f"Function {func_name} is not allowed"
             )
 
+        cached_response = self._get_cached_response(function_str, call)
+        if cached_response is not None:
+            return cached_response
+
         try:
-            func = self.function_map[func_name]
-            # Convert the argument string into a dictionary
-            args_dict = eval(f"dict({func_args})")
-            func_result = func(**args_dict)
-            self.logger.info("Function executed successfully")
-            return IntentResponse(
-                request=function_str,
-                details=IntentResponseDetails(
-                    status="success",
-                    data=func_result,
-                    timestamp=datetime.now().isoformat(),
-                ),
+            func = self.registry.resolve(func_name)
+            # Validate the arguments against the signature declared to the model
+            bound_args = self.parser.bind(self.registry.get_spec(func_name), func, call)
+            with self.metrics.stage(STAGE_EXECUTOR_FUNCTION), Tracer.span(
+                "action_executor.call", function=func_name
+            ):
+                func_result = func(*bound_args.args, **bound_args.kwargs)
+            self.logger.info("Function %s executed successfully", func_name)
+            return self._store_result(function_str, call, func_result)
+        except Exception as e:
+            self.logger.error("Error executing function %s: %s", func_name, e)
+            return self._failure_response(function_str, str(e))
+
+    async def _execute_call_async(
+        self, function_str: str, call: FunctionCall
+    ) -> IntentResponse:
+        """
+        Asynchronous variant of _execute_call.
+
+        Parameters:
+            function_str (str): The function call string the call was parsed from.
+            call (FunctionCall): The parsed function call.
+
+        Returns:
+            IntentResponse: The structured IntentResponse dataclass.
+        """
+        func_name = call.name
+
+        if func_name not in self.registry:
+            self.logger.error("Function %s is not allowed", func_name)
+            return self._failure_response(
+                function_str, f"Function {func_name} is not allowed"
             )
+
+        cached_response = self._get_cached_response(function_str, call)
+        if cached_response is not None:
+            return cached_response
+
+        try:
+            func = self.registry.resolve_async(func_name)
+            if func is not None:
+                bound_args = self.parser.bind(
+                    self.registry.get_spec(func_name), func, call
+                )
+                with self.metrics.stage(STAGE_EXECUTOR_FUNCTION), Tracer.span(
+                    "action_executor.call", function=func_name
+                ):
+                    func_result = await func(*bound_args.args, **bound_args.kwargs)
+            else:
+                func = self.registry.resolve(func_name)
+                bound_args = self.parser.bind(
+                    self.registry.get_spec(func_name), func, call
+                )
+                with self.metrics.stage(STAGE_EXECUTOR_FUNCTION), Tracer.span(
+                    "action_executor.call", function=func_name
+                ):
+                    func_result = await asyncio.to_thread(
+                        func, *bound_args.args, **bound_args.kwargs
+                    )
+            self.logger.info("Function %s executed successfully", func_name)
+            return self._store_result(function_str, call, func_result)
         except Exception as e:
-            self.logger.error("Error executing function: %s", e)
-            return IntentResponse(
-                request=function_str,
-                details=IntentResponseDetails(
-                    status="failure", data=str(e), timestamp=datetime.now().isoformat()
-                ),
+            self.logger.error("Error executing function %s: %s", func_name, e)
+            return self._failure_response(function_str, str(e))
+
+    def _get_cached_response(
+        self, function_str: str, call: FunctionCall
+    ) -> Optional[IntentResponse]:
+        """
+        Returns the cached result of a cacheable call, if there is one.
+        """
+        if not self.registry.get_spec(call.name).cacheable:
+            return None
+
+        cache_key = self._cache_key(call)
+        cached_result = (
+            self.result_cache.get(cache_key) if cache_key is not None else None
+        )
+        if cached_result is None:
+            return None
+
+        self.logger.info("Using cached result for function %s", call.name)
+        return self._success_response(function_str, cached_result)
+
+    def _store_result(
+        self, function_str: str, call: FunctionCall, func_result
+    ) -> IntentResponse:
+        """
+        Caches the result of a cacheable call and wraps it in a success response.
+        """
+        spec = self.registry.get_spec(call.name)
+        cache_key = self._cache_key(call) if spec.cacheable else None
+        if cache_key is not None and self._is_cacheable_result(func_result):
+            self.result_cache.set(cache_key, func_result, ttl=spec.cache_ttl)
+        return self._success_response(function_str, func_result)
+
+    def _execute_calls(
+        self,
+        function_str: str,
+        calls: List[FunctionCall],
+        deadline: Optional[Deadline] = None,
+    ) -> List[IntentResponse]:
+        """
+        Runs the function calls on the thread pool, each under its own timeout.
+
+        Parameters:
+            function_str (str): The function call string the calls were parsed from.
+            calls (List[FunctionCall]): The parsed function calls.
+            deadline (Optional[Deadline]): The deadline of the request.
+
+        Returns:
+            List[IntentResponse]: The responses of the calls, in the order of the calls.
+        """
+        if len(calls) > 1:
+            self.logger.info("Executing %d function calls concurrently", len(calls))
+
+        started = time.monotonic()
+        execute_call = ThreadHelpers.with_context(self._execute_call)
+        futures = [self.pool.submit(execute_call, function_str, call) for call in calls]
+
+        return [
+            self._collect_result(function_str, call, future, started, deadline)
+            for call, future in zip(calls, futures)
+        ]
+
+    def _collect_result(
+        self,
+        function_str: str,
+        call: FunctionCall,
+        future: Future,
+        started: float,
+        deadline: Optional[Deadline] = None,
+    ) -> IntentResponse:
+        """
+        Waits for a submitted call until its timeout expires, abandoning it if it overruns.
+
+        Parameters:
+            function_str (str): The function call string the call was parsed from.
+            call (FunctionCall): The parsed function call.
+            future (Future): The future of the submitted call.
+            started (float): Monotonic time at which the call was submitted.
+            deadline (Optional[Deadline]): The deadline of the request.
+
+        Returns:
+            IntentResponse: The response of the call, or a degraded response if it timed out.
+        """
+        timeout = self._get_timeout(call.name)
+        remaining = max(0.0, started + timeout - time.monotonic())
+        if deadline is not None:
+            remaining = min(remaining, deadline.remaining())
+        try:
+            return future.result(timeout=remaining)
+        except FutureTimeoutError:
+            # The worker thread cannot be interrupted; the result is discarded when it finishes
+            future.cancel()
+            return self._timeout_response(function_str, call, timeout)
+
+    async def _execute_call_with_timeout(
+        self,
+        function_str: str,
+        call: FunctionCall,
+        deadline: Optional[Deadline] = None,
+    ) -> IntentResponse:
+        """
+        Runs a call on the event loop, cancelling it when it overruns its timeout.
+
+        Parameters:
+            function_str (str): The function call string the call was parsed from.
+            call (FunctionCall): The parsed function call.
+            deadline (Optional[Deadline]): The deadline of the request.
+
+        Returns:
+            IntentResponse: The response of the call, or a degraded response if it timed out.
+        """
+        timeout = self._get_timeout(call.name)
+        remaining = timeout
+        if deadline is not None:
+            remaining = min(remaining, deadline.remaining())
+        try:
+            return await asyncio.wait_for(
+                self._execute_call_async(function_str, call), timeout=remaining
+            )
+        except asyncio.TimeoutError:
+            return self._timeout_response(function_str, call, timeout)
+
+    def _timeout_response(
+        self, function_str: str, call: FunctionCall, timeout: float
+    ) -> IntentResponse:
+        with self._timeout_lock:
+            self.timeout_counts[call.name] += 1
+        self.logger.error(
+            "Function %s timed out after %.1f seconds", call.name, timeout
+        )
+        return IntentResponse(
+            request=function_str,
+            details=IntentResponseDetails(
+                status="timeout",
+                data=render_template("function_timeout_message"),
+                timestamp=datetime.now().isoformat(),
+            ),
+        )
+
+    def _get_timeout(self, func_name: str) -> float:
+        if func_name in self.registry:
+            timeout = self.registry.get_spec(func_name).timeout
+            if timeout:
+                return timeout
+        return self.call_timeout
+
+    def _aggregate_responses(
+        self,
+        function_str: str,
+        responses: List[IntentResponse],
+        deadline: Optional[Deadline] = None,
+    ) -> IntentResponse:
+        """
+        Combines the results of several function calls into one spoken answer.
+
+        The parts are merged by the AI when the deadline leaves enough time for a
+        generation, and simply joined otherwise.
+
+        Parameters:
+            function_str (str): The function call string the calls were parsed from.
+            responses (List[IntentResponse]): The responses of the individual calls.
+            deadline (Optional[Deadline]): The deadline of the request.
+
+        Returns:
+            IntentResponse: The aggregated IntentResponse dataclass.
+        """
+        parts = self._response_parts(responses)
+        if isinstance(parts, IntentResponse):
+            return parts
+
+        if len(parts) == 1:
+            data = parts[0]
+        elif deadline is not None and not deadline.can_fit(
+            self.config.generation_budget
+        ):
+            self.logger.info("Not enough time left to merge responses, joining them")
+            data = " ".join(parts)
+        else:
+            prompt = render_template("aggregate_prompt", parts=parts)
+            data = self.ai_service.prompt_the_ai(prompt, template="aggregate_prompt")
+
+        return self._success_response(function_str, data)
+
+    async def _aggregate_responses_async(
+        self,
+        function_str: str,
+        responses: List[IntentResponse],
+        deadline: Optional[Deadline] = None,
+    ) -> IntentResponse:
+        """
+        Asynchronous variant of _aggregate_responses.
+        """
+        parts = self._response_parts(responses)
+        if isinstance(parts, IntentResponse):
+            return parts
+
+        if len(parts) == 1:
+            data = parts[0]
+        elif deadline is not None and not deadline.can_fit(
+            self.config.generation_budget
+        ):
+            self.logger.info("Not enough time left to merge responses, joining them")
+            data = " ".join(parts)
+        else:
+            prompt = render_template("aggregate_prompt", parts=parts)
+            data = await self.ai_service.prompt_the_ai_async(
+                prompt, template="aggregate_prompt"
             )
 
+        return self._success_response(function_str, data)
+
+    def _response_parts(self, responses: List[IntentResponse]):
+        """
+        Returns the texts of the successful responses, or the response to answer
+        with when none of the calls succeeded.
+        """
+        parts = [self._response_text(response) for response in responses]
+        parts = [part for part in parts if part]
+        if parts:
+            return parts
+
+        for response in responses:
+            if response.details.status == "timeout":
+                return response
+        return self._failure_response(
+            responses[0].request,
+            "; ".join(str(response.details.data) for response in responses),
+        )
+
+    @staticmethod
+    def _response_text(response: IntentResponse) -> Optional[str]:
+        """
+        Extracts the text of a successful response.
+        """
+        if response.details.status != "success":
+            return None
+        return response.details.data
+
+    @staticmethod
+    def _cache_key(call: FunctionCall) -> Optional[FunctionCall]:
+        """
+        Returns the call as a cache key, or None when its arguments are not hashable.
+        """
+        try:
+            hash(call)
+        except TypeError:
+            return None
+        return call
+
+    @staticmethod
+    def _is_cacheable_result(func_result) -> bool:
+        if isinstance(func_result, IntentResponse):
+            return func_result.details.status == "success"
+        return bool(func_result)
+
+    @staticmethod
+    def _success_response(function_str: str, data) -> IntentResponse:
+        if isinstance(data, IntentResponse):
+            # The services answer with responses of their own, which keep their status
+            return IntentResponse(request=function_str, details=data.details)
+        return IntentResponse(
+            request=function_str,
+            details=IntentResponseDetails(
+                status="success",
+                data=data,
+                timestamp=datetime.now().isoformat(),
+            ),
+        )
+
+    @staticmethod
+    def _failure_response(function_str: str, message: str) -> IntentResponse:
+        return IntentResponse(
+            request=function_str,
+            details=IntentResponseDetails(
+                status="failure",
+                data=message,
+                timestamp=datetime.now().isoformat(),
+            ),
+        )
+
 
 # Example usage
 if __name__ == "__main__":
@@ -111,3 +544,9 @@ if __name__ == "__main__":
         "Call: get_weather_forecast(duration='week', weather_condition='snow')"
     )
     logging.info("Execution result: %s", result)
+
+    # Example with several independent calls
+    result = executor.execute_function(
+        "Call: get_weather_forecast(location='Paris, FR'); get_weather_forecast(location='London, GB')"
+    )
+    logging.info("Execution result: %s", result)
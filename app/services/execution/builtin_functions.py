@@ -0,0 +1,135 @@
+from functools import lru_cache
+
+from app.models.function_spec import FunctionSpec
+
+# Services are imported inside the loaders so they are only imported and
+# constructed when one of their functions is first called.
+
+
+@lru_cache(maxsize=None)
+def _weather_service():
+    from app.services.weather.weather_service import WeatherService
+
+    return WeatherService()
+
+
+@lru_cache(maxsize=None)
+def _browser_service():
+    from app.services.browser.browser_service import BrowserService
+
+    return BrowserService()
+
+
+def _ai_service():
+    from app.services.ai.ai_service_instance import AIServiceSingleton
+
+    return AIServiceSingleton.get_instance()
+
+
+def register_builtin_functions(registry):
+    """
+    Registers the functions that ship with the skill.
+
+    Args:
+        registry (FunctionRegistry): The registry to register the functions with.
+    """
+    registry.register(
+        FunctionSpec(
+            name="ask_the_ai",
+            signature="def ask_the_ai(query: str) -> str",
+            description="""
+            The user's non modified query does not contain the words 'web' or 'internet'
+
+            Args:
+                query (str): The snon modified earch query string provided by the user where there is no specific referenct to use 'web' or 'internet'
+
+            Returns:
+                str: A comprehensive response generated by ai.
+            """,
+            loader=lambda: _ai_service().ask_the_ai,
+            async_loader=lambda: _ai_service().ask_the_ai_async,
+            timeout=6.0,
+        )
+    )
+
+    registry.register(
+        FunctionSpec(
+            name="web_search",
+            signature="def web_search(search: str) -> str",
+            description="""
+            The user's non modified search contains the words 'web' or 'internet'
+
+            Args:
+                search (str): The non modified search string provided by the user where the search contains the words 'web' or 'internet' specifically.
+
+            Returns:
+                str: A comprehensive response generated by web or internet.
+            """,
+            loader=lambda: _browser_service().web_search,
+            async_loader=lambda: _browser_service().web_search_async,
+            timeout=6.0,
+            cacheable=True,
+        )
+    )
+
+    registry.register(
+        FunctionSpec(
+            name="get_weather_forecast",
+            signature='def get_weather_forecast(duration: str = "today", location: str = None, start_date: str = None, weather_condition: str = None) -> str',
+            description="""
+            Fetches weather data from the service API for the given duration starting from a specific date and filtered by weather condition.
+
+            Args:
+                duration (str): Specifies when the weather forecast is for.
+                                Accepted values are:
+                                - "today": Retrieves the weather forecast for the current day.
+                                - "tomorrow": Retrieves the weather forecast for the next day.
+                                - "week": Retrieves the weather forecast for the upcoming week.
+                                Note: If the weather service API does not support forecasts beyond today,
+                                the function will return the forecast for today.
+                                Defaults to "today" if not provided.
+
+                location (str): Optional string specifying the location for the weather forecast.
+                                Can be a city name, city name and country code, or city name and state code.
+                                Defaults to 'London' if not provided.
+                                Examples:
+                                - "Nags Head"
+                                - "Paris, FR"
+                                - "New York, US"
+
+                start_date (str): Optional string specifying the start date for the weather forecast in the format 'YYYY-MM-DD'.
+                                Defaults to today's date if not provided.
+
+                weather_condition (str): Optional string specifying the type of weather condition to filter the forecast by.
+                                 Examples: "rain", "snow", "fog".
+                                 If not provided, forecasts for all weather conditions will be returned.
+
+                Returns:
+                    str: The weather data for the specified duration, location, start date, and weather condition.
+            """,
+            loader=lambda: _weather_service().get_weather_forecast,
+            async_loader=lambda: _weather_service().get_weather_forecast_async,
+            timeout=5.0,
+            cacheable=True,
+        )
+    )
+
+    registry.register(
+        FunctionSpec(
+            name="get_weather_temperature",
+            signature="def get_weather_temperature(when)",
+            description="""
+            Fetches weather temperature from the service API for the given duration.
+
+            Args:
+            when : When is the temperature for: example ...for today
+
+            Returns:
+            str: The temperature data for when
+            """,
+            loader=lambda: _weather_service().get_weather_temperature,
+            async_loader=lambda: _weather_service().get_weather_temperature_async,
+            timeout=6.0,
+            cacheable=True,
+        )
+    )
@@ -0,0 +1,218 @@
+import ast
+import inspect
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Callable, List, Tuple
+
+from app.models.function_call import FunctionCall
+from app.models.function_spec import FunctionSpec
+
+
+class InvalidFunctionCallError(ValueError):
+    """
+    Raised when a routing response cannot be parsed into a valid function call.
+    """
+
+
+class FunctionCallParser:
+    """
+    Parser that turns routing model output such as
+    ``Call: get_weather_forecast(duration='today')<bot_end>`` into FunctionCalls.
+
+    Compound requests may produce several calls, either as several ``Call:`` lines
+    or as several call expressions separated by ``;`` or newlines.
+
+    A call ends at the next ``Call:``, ``Thought:`` or ``<bot_end>`` outside of a
+    string literal, so string arguments may contain those markers.
+
+    Arguments are extracted with ``ast`` and only literal values (strings, numbers,
+    booleans, None, and containers of those) are accepted, so model output is never
+    evaluated as code. Parsed results are kept in an LRU cache keyed by the raw
+    response string.
+
+    Methods:
+        parse(function_str: str) -> FunctionCall: Parses the first call of a routing response.
+        parse_all(function_str: str) -> Tuple[FunctionCall, ...]: Parses every call of a routing response.
+        bind(spec: FunctionSpec, func: Callable, call: FunctionCall) -> inspect.BoundArguments:
+            Validates the call against the declared signature and binds it to the function.
+    """
+
+    CALL_MARKER = "Call:"
+
+    # The string literals of a call body, skipped, and the markers ending it
+    BODY_TOKEN_PATTERN = re.compile(
+        r"(?P<string>'''.*?'''|\"\"\".*?\"\"\"|'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\")"
+        r"|(?P<marker><bot_end>|Thought:|Call:)",
+        re.DOTALL,
+    )
+
+    def __init__(self, cache_size: int = 256):
+        """
+        Initializes the parser.
+
+        Args:
+            cache_size (int): Maximum number of parsed responses to keep in the LRU cache.
+        """
+        self.logger = logging.getLogger(__name__)
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse)
+
+    def parse(self, function_str: str) -> FunctionCall:
+        """
+        Parses a routing response into a FunctionCall. When the response contains
+        several calls only the first one is returned.
+
+        Args:
+            function_str (str): The raw routing response.
+
+        Returns:
+            FunctionCall: The parsed function call.
+
+        Raises:
+            InvalidFunctionCallError: If the response does not contain a valid literal-only call.
+
+        Example:
+            parser = FunctionCallParser()
+            call = parser.parse("Call: web_search(search='nexa ai')<bot_end>")
+            print(call.name, call.keyword_arguments())
+        """
+        return self.parse_all(function_str)[0]
+
+    def parse_all(self, function_str: str) -> Tuple[FunctionCall, ...]:
+        """
+        Parses every function call contained in a routing response.
+
+        Args:
+            function_str (str): The raw routing response.
+
+        Returns:
+            Tuple[FunctionCall, ...]: The parsed function calls in the order they were emitted.
+
+        Raises:
+            InvalidFunctionCallError: If the response does not contain valid literal-only calls.
+
+        Example:
+            parser = FunctionCallParser()
+            calls = parser.parse_all(
+                "Call: get_weather_forecast(location='Paris'); get_weather_forecast(location='London')"
+            )
+            print([call.keyword_arguments() for call in calls])
+        """
+        if not function_str:
+            raise InvalidFunctionCallError("Invalid function call format")
+        return self._parse_cached(function_str.strip())
+
+    def cache_info(self):
+        """Returns the LRU cache statistics for parsed responses."""
+        return self._parse_cached.cache_info()
+
+    def cache_clear(self):
+        """Clears the parsed response cache."""
+        self._parse_cached.cache_clear()
+
+    def bind(
+        self, spec: FunctionSpec, func: Callable, call: FunctionCall
+    ) -> inspect.BoundArguments:
+        """
+        Validates the parsed arguments against the signature declared to the
+        routing model, then binds them to the target function's parameters.
+
+        Args:
+            spec (FunctionSpec): The registered function the call was written for.
+            func (Callable): The function that will be called.
+            call (FunctionCall): The parsed function call.
+
+        Returns:
+            inspect.BoundArguments: Arguments bound to the function's parameters.
+
+        Raises:
+            InvalidFunctionCallError: If the arguments do not match the declared signature.
+        """
+        args, kwargs = call.args, call.keyword_arguments()
+        try:
+            spec.to_signature().bind(*args, **kwargs)
+            return self._signature(func).bind(*args, **kwargs)
+        except TypeError as e:
+            raise InvalidFunctionCallError(
+                f"Invalid arguments for {call.name}: {e}"
+            ) from e
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _signature(func: Callable) -> inspect.Signature:
+        return inspect.signature(func)
+
+    def _parse(self, function_str: str) -> Tuple[FunctionCall, ...]:
+        calls = []
+        for body in self._call_bodies(function_str):
+            if body:
+                for node in self._parse_statements(body):
+                    calls.append(self._to_function_call(node))
+
+        if not calls:
+            raise InvalidFunctionCallError("Invalid function call format")
+
+        self.logger.debug("Parsed function calls: %s", calls)
+        return tuple(calls)
+
+    def _to_function_call(self, node: ast.stmt) -> FunctionCall:
+        if (
+            not isinstance(node, ast.Expr)
+            or not isinstance(node.value, ast.Call)
+            or not isinstance(node.value.func, ast.Name)
+        ):
+            raise InvalidFunctionCallError("Invalid function call format")
+
+        call_node = node.value
+        args = tuple(self._literal(arg) for arg in call_node.args)
+        kwargs = []
+        for keyword in call_node.keywords:
+            if keyword.arg is None:
+                raise InvalidFunctionCallError(
+                    "Unpacked keyword arguments are not allowed"
+                )
+            kwargs.append((keyword.arg, self._literal(keyword.value)))
+
+        return FunctionCall(name=call_node.func.id, args=args, kwargs=tuple(kwargs))
+
+    def _call_bodies(self, function_str: str) -> List[str]:
+        """
+        Returns the text following every ``Call:``, up to the next marker that is
+        not inside a string literal.
+        """
+        bodies = []
+        position = function_str.find(self.CALL_MARKER)
+        while position >= 0:
+            start = position + len(self.CALL_MARKER)
+            end = len(function_str)
+            for match in self.BODY_TOKEN_PATTERN.finditer(function_str, start):
+                if match.group("marker"):
+                    end = match.start()
+                    break
+            bodies.append(function_str[start:end].strip())
+            position = function_str.find(self.CALL_MARKER, end)
+        return bodies
+
+    @staticmethod
+    def _parse_statements(body: str) -> list:
+        """
+        Parses the call expressions, trimming any trailing text the model emitted
+        after the last closing parenthesis.
+        """
+        body = "\n".join(line.strip() for line in body.splitlines())
+        end = len(body)
+        while end > 0:
+            try:
+                return ast.parse(body[:end].strip()).body
+            except (SyntaxError, ValueError):
+                end = body.rfind(")", 0, end - 1) + 1
+        raise InvalidFunctionCallError("Invalid function call format")
+
+    @staticmethod
+    def _literal(node: ast.expr) -> Any:
+        try:
+            return ast.literal_eval(node)
+        except (ValueError, TypeError, SyntaxError) as e:
+            raise InvalidFunctionCallError(
+                f"Only literal arguments are allowed, got: {ast.dump(node)}"
+            ) from e
@@ -0,0 +1,136 @@
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.models.function_spec import FunctionSpec
+from app.models.singleton import SingletonMeta
+
+
+class FunctionRegistry(metaclass=SingletonMeta):
+    """
+    Registry of the functions the routing model can call.
+
+    The registry is the single source for the functions the executor may run, the
+    function definitions in the routing prompt, and the tool schemas. Functions are
+    resolved lazily: a function's loader runs on first use and the resulting
+    callable is kept for later calls.
+
+    Attributes:
+        specs (Dict[str, FunctionSpec]): Registered function specifications by name.
+    """
+
+    _is_initialized = False
+
+    def __init__(self):
+        if not self._is_initialized:  # Prevent reinitialization
+            self.logger = logging.getLogger(__name__)
+            self.specs: Dict[str, FunctionSpec] = {}
+            self._resolved: Dict[str, Callable[..., Any]] = {}
+            self._resolved_async: Dict[str, Callable[..., Awaitable[Any]]] = {}
+            self._lock = threading.Lock()
+            self._is_initialized = True
+
+            # Imported here so the built-in definitions can import the registry types
+            from app.services.execution.builtin_functions import (
+                register_builtin_functions,
+            )
+
+            register_builtin_functions(self)
+
+    def register(self, spec: FunctionSpec):
+        """
+        Registers a function, replacing any function with the same name.
+
+        Args:
+            spec (FunctionSpec): The function specification to register.
+        """
+        with self._lock:
+            self.specs[spec.name] = spec
+            self._resolved.pop(spec.name, None)
+            self._resolved_async.pop(spec.name, None)
+        self.logger.info("Registered function: %s", spec.name)
+
+    def get_spec(self, name: str) -> FunctionSpec:
+        """
+        Retrieves the specification of a registered function.
+
+        Args:
+            name (str): The function name.
+
+        Returns:
+            FunctionSpec: The function specification.
+
+        Raises:
+            KeyError: If no function with that name is registered.
+        """
+        return self.specs[name]
+
+    def resolve(self, name: str) -> Callable[..., Any]:
+        """
+        Returns the callable for a registered function, loading it on first use.
+
+        Args:
+            name (str): The function name.
+
+        Returns:
+            Callable[..., Any]: The callable implementing the function.
+
+        Raises:
+            KeyError: If no function with that name is registered.
+        """
+        func = self._resolved.get(name)
+        if func is not None:
+            return func
+
+        with self._lock:
+            func = self._resolved.get(name)
+            if func is None:
+                self.logger.info("Loading function: %s", name)
+                func = self.specs[name].loader()
+                self._resolved[name] = func
+        return func
+
+    def resolve_async(self, name: str) -> Optional[Callable[..., Awaitable[Any]]]:
+        """
+        Returns the coroutine function for a registered function, loading it on first use.
+
+        Args:
+            name (str): The function name.
+
+        Returns:
+            Optional[Callable[..., Awaitable[Any]]]: The coroutine function, or None if
+            the function has no asynchronous implementation.
+
+        Raises:
+            KeyError: If no function with that name is registered.
+        """
+        spec = self.specs[name]
+        if spec.async_loader is None:
+            return None
+
+        func = self._resolved_async.get(name)
+        if func is not None:
+            return func
+
+        with self._lock:
+            func = self._resolved_async.get(name)
+            if func is None:
+                self.logger.info("Loading async function: %s", name)
+                func = spec.async_loader()
+                self._resolved_async[name] = func
+        return func
+
+    def names(self) -> List[str]:
+        """Returns the names of the registered functions in registration order."""
+        return list(self.specs)
+
+    def routing_prompt(self) -> str:
+        """Returns the function definitions for the routing prompt."""
+        return "\n".join(spec.to_prompt() for spec in self.specs.values())
+
+    def tool_schemas(self) -> List[Dict[str, Any]]:
+        """Returns OpenAI-compatible tool schemas for the registered functions."""
+        return [spec.to_tool_schema() for spec in self.specs.values()]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
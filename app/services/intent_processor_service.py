@@ -2,12 +2,18 @@ import logging
 import random
 from datetime import datetime
 
+from flask import render_template
+
 from app.config.config import Config
+from app.models.deadline import Deadline
 from app.models.intent_response import IntentResponse, IntentResponseDetails
+from app.models.session_state import SessionState
 from app.models.singleton import SingletonMeta
 from app.services.ai.ai_service_instance import AIServiceSingleton
 from app.services.execution.action_executor_service import ActionExecutorService
 from app.services.formatting.action_response_service import ActionResponseService
+from app.services.telemetry.metrics_registry import STAGE_ROUTING, MetricsRegistry
+from app.services.telemetry.tracer import traced
 
 
 class IntentProcessorService(metaclass=SingletonMeta):
@@ -19,7 +25,11 @@ class IntentProcessorService(metaclass=SingletonMeta):
         ai_service (AIService): Instance of AIService to get function calls.
         action_executor_service (ActionExecutorService): Instance of ActionExecutorService to execute functions.
         action_response_service (ActionResponseService): Instance of ActionResponseService to format the response.
-        system_role (str): The personality description for the assistant.
+        metrics (MetricsRegistry): Registry the routing latency is recorded in.
+        system_role (str): The default personality description for the assistant, used outside of a session.
+
+    The personality chosen during a session is kept in the session's state, so
+    concurrent sessions each keep their own personality.
     """
 
     _is_initialized = False
@@ -31,6 +41,7 @@ class IntentProcessorService(metaclass=SingletonMeta):
             self.ai_service = AIServiceSingleton.get_instance()
             self.action_executor_service = ActionExecutorService()
             self.action_response_service = ActionResponseService()
+            self.metrics = MetricsRegistry()
             self.system_role = None
             self._is_initialized = True
 
@@ -43,15 +54,40 @@ class IntentProcessorService(metaclass=SingletonMeta):
 
     def set_personality(self, personality: str):
         """
-        Sets the personality of the assistant for the system role.
+        Sets the personality of the assistant for the system role of the current
+        session, or the default personality when no session is active.
 
         Args:
             personality (str): The personality description for the assistant.
         """
+        session = SessionState.current()
+        if session is not None:
+            session.personality = personality
+            self.logger.info(
+                "System role for session %s set to: %s",
+                session.session_id,
+                personality,
+            )
+            return
+
         self.system_role = personality
         self.config.set_personality(personality)
         self.logger.info("System role set to: %s", personality)
 
+    def get_system_role(self) -> str:
+        """
+        Returns the personality of the current session, choosing a random one for
+        a session that has none yet.
+
+        Returns:
+            str: The personality description for the assistant.
+        """
+        system_role = SessionState.current_personality(self.system_role)
+        if system_role is None:
+            self.set_random_personality()
+            system_role = SessionState.current_personality(self.system_role)
+        return system_role
+
     def set_random_personality(self):
         """
         Sets a random personality for the assistant.
@@ -103,41 +139,114 @@ class IntentProcessorService(metaclass=SingletonMeta):
         self.set_personality(personality)
 
     def get_ai_response(
-        self, prompt: str, model_identifier: str = None, system_role: str = None
+        self,
+        prompt: str,
+        model_identifier: str = None,
+        system_role: str = None,
+        deadline: Deadline = None,
+        fallback_template: str = None,
+        prompt_class: str = "conversation",
+        template: str = None,
     ) -> str:
         """
         Helper method to get response from AIService.
 
+        The model is chosen from the latency tier of the prompt class, falling back
+        to faster tiers when the deadline no longer leaves room for it or its
+        backend is down. When no response can be generated in time the fallback
+        template is rendered instead.
+
         Args:
             prompt (str): The input prompt for the API.
-            model_identifier (str, optional): The model identifier to use for the request. Defaults to a preset identifier.
-            system_role (str, optional): The system role to include in the request. Defaults to the instance's system_role.
+            model_identifier (str, optional): The model identifier to use for the request. Defaults to the model of the prompt class's tier.
+            system_role (str, optional): The system role to include in the request. Defaults to the session's personality.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+            fallback_template (str, optional): Template rendered when no response is available. Defaults to "unavailable_message".
+            prompt_class (str, optional): The class of the prompt, such as "acknowledgement" or "open_question". Defaults to "conversation".
+            template (str, optional): Name of the template the prompt was rendered from, whose output budget applies.
 
         Returns:
             str: The response text from the AIService.
         """
-        if model_identifier is None:
-            model_identifier = "llama3"  # Default model identifier
+        if deadline is None:
+            deadline = Deadline.current()
 
-        if self.system_role is None:
-            self.set_random_personality()
+        model_identifier = self.ai_service.select_model(
+            prompt_class, deadline, model_identifier
+        )
+        if model_identifier is None:
+            return render_template(fallback_template or "unavailable_message")
 
         if system_role is None:
-            system_role = self.system_role
+            system_role = self.get_system_role()
 
         response_text = self.ai_service.get_response_with_model_name(
-            prompt, model_identifier, system_role
+            prompt, model_identifier, system_role, deadline, template
+        )
+        self.logger.info("Response for prompt '%s': %s", prompt, response_text)
+        if not response_text:
+            return render_template(fallback_template or "unavailable_message")
+        return response_text
+
+    async def get_ai_response_async(
+        self,
+        prompt: str,
+        model_identifier: str = None,
+        system_role: str = None,
+        deadline: Deadline = None,
+        fallback_template: str = None,
+        prompt_class: str = "conversation",
+        template: str = None,
+    ) -> str:
+        """
+        Asynchronous variant of get_ai_response.
+
+        Args:
+            prompt (str): The input prompt for the API.
+            model_identifier (str, optional): The model identifier to use for the request. Defaults to the model of the prompt class's tier.
+            system_role (str, optional): The system role to include in the request. Defaults to the session's personality.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+            fallback_template (str, optional): Template rendered when no response is available. Defaults to "unavailable_message".
+            prompt_class (str, optional): The class of the prompt, such as "acknowledgement" or "open_question". Defaults to "conversation".
+            template (str, optional): Name of the template the prompt was rendered from, whose output budget applies.
+
+        Returns:
+            str: The response text from the AIService.
+        """
+        if deadline is None:
+            deadline = Deadline.current()
+
+        model_identifier = self.ai_service.select_model(
+            prompt_class, deadline, model_identifier
+        )
+        if model_identifier is None:
+            return render_template(fallback_template or "unavailable_message")
+
+        if system_role is None:
+            system_role = self.get_system_role()
+
+        response_text = await self.ai_service.get_response_with_model_name_async(
+            prompt, model_identifier, system_role, deadline, template
         )
         self.logger.info("Response for prompt '%s': %s", prompt, response_text)
+        if not response_text:
+            return render_template(fallback_template or "unavailable_message")
         return response_text
 
-    def process_utterance(self, utterance: str) -> IntentResponse:
+    @traced("intent_processor.process_utterance")
+    def process_utterance(
+        self, utterance: str, deadline: Deadline = None
+    ) -> IntentResponse:
         """
         Processes the given utterance by calling the AI service, executing the returned
         function, and formatting the response.
 
+        When the deadline does not leave room for both routing and generation, the
+        routing step is skipped and the utterance is answered by the AI directly.
+
         Parameters:
             utterance (str): The user's input as a string.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
 
         Returns:
             IntentResponse: The formatted response after processing the utterance.
@@ -148,12 +257,25 @@ class IntentProcessorService(metaclass=SingletonMeta):
             print(response)
         """
         self.logger.info("Processing utterance: %s", utterance)
+        if deadline is None:
+            deadline = Deadline.current()
+
         try:
-            function_str = self.ai_service.get_function_for_utterance(utterance)
+            if deadline is not None and not deadline.can_fit(
+                self.config.routing_budget + self.config.generation_budget
+            ):
+                return self.answer_directly(utterance, deadline)
+
+            with self.metrics.stage(STAGE_ROUTING):
+                function_str = self.ai_service.get_function_for_utterance(
+                    utterance, deadline
+                )
             self.logger.debug("Function string received: %s", function_str)
 
             if function_str:
-                result = self.action_executor_service.execute_function(function_str)
+                result = self.action_executor_service.execute_function(
+                    function_str, deadline
+                )
                 self.logger.debug("Result of function execution: %s", result)
 
                 formatted_response = self.action_response_service.format_response(
@@ -170,7 +292,7 @@ class IntentProcessorService(metaclass=SingletonMeta):
                     request=utterance,
                     details=IntentResponseDetails(
                         status="failure",
-                        data="No valid function returned for the utterance",
+                        data=render_template("unavailable_message"),
                         timestamp=datetime.now().isoformat(),
                     ),
                 )
@@ -186,3 +308,131 @@ class IntentProcessorService(metaclass=SingletonMeta):
                     timestamp=datetime.now().isoformat(),
                 ),
             )
+
+    @traced("intent_processor.process_utterance")
+    async def process_utterance_async(
+        self, utterance: str, deadline: Deadline = None
+    ) -> IntentResponse:
+        """
+        Asynchronous variant of process_utterance.
+
+        Parameters:
+            utterance (str): The user's input as a string.
+            deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+
+        Returns:
+            IntentResponse: The formatted response after processing the utterance.
+        """
+        self.logger.info("Processing utterance: %s", utterance)
+        if deadline is None:
+            deadline = Deadline.current()
+
+        try:
+            if deadline is not None and not deadline.can_fit(
+                self.config.routing_budget + self.config.generation_budget
+            ):
+                return await self.answer_directly_async(utterance, deadline)
+
+            with self.metrics.stage(STAGE_ROUTING):
+                function_str = await self.ai_service.get_function_for_utterance_async(
+                    utterance, deadline
+                )
+            self.logger.debug("Function string received: %s", function_str)
+
+            if not function_str:
+                self.logger.error(
+                    "No valid function returned for the utterance: %s", utterance
+                )
+                return IntentResponse(
+                    request=utterance,
+                    details=IntentResponseDetails(
+                        status="failure",
+                        data=render_template("unavailable_message"),
+                        timestamp=datetime.now().isoformat(),
+                    ),
+                )
+
+            result = await self.action_executor_service.execute_function_async(
+                function_str, deadline
+            )
+            self.logger.debug("Result of function execution: %s", result)
+
+            formatted_response = self.action_response_service.format_response(result)
+            self.logger.info("Formatted response: %s", formatted_response)
+
+            return formatted_response
+        except Exception as e:
+            self.logger.exception(
+                "Exception occurred while processing utterance: %s", utterance
+            )
+            return IntentResponse(
+                request=utterance,
+                details=IntentResponseDetails(
+                    status="error",
+                    data=str(e),
+                    timestamp=datetime.now().isoformat(),
+                ),
+            )
+
+    def answer_directly(self, utterance: str, deadline: Deadline) -> IntentResponse:
+        """
+        Answers the utterance with a single AI call, skipping the routing step.
+
+        Parameters:
+            utterance (str): The user's input as a string.
+            deadline (Deadline): The deadline of the request.
+
+        Returns:
+            IntentResponse: The response, or a timeout response if no answer fits in the deadline.
+        """
+        response_text = None
+        if deadline.can_fit(self.config.generation_budget):
+            self.logger.info(
+                "%.2fs left, answering without routing", deadline.remaining()
+            )
+            response_text = self.ai_service.ask_the_ai(utterance)
+
+        return self._direct_response(utterance, response_text)
+
+    async def answer_directly_async(
+        self, utterance: str, deadline: Deadline
+    ) -> IntentResponse:
+        """
+        Asynchronous variant of answer_directly.
+
+        Parameters:
+            utterance (str): The user's input as a string.
+            deadline (Deadline): The deadline of the request.
+
+        Returns:
+            IntentResponse: The response, or a timeout response if no answer fits in the deadline.
+        """
+        response_text = None
+        if deadline.can_fit(self.config.generation_budget):
+            self.logger.info(
+                "%.2fs left, answering without routing", deadline.remaining()
+            )
+            response_text = await self.ai_service.ask_the_ai_async(utterance)
+
+        return self._direct_response(utterance, response_text)
+
+    @staticmethod
+    def _direct_response(utterance: str, response_text: str) -> IntentResponse:
+        if not response_text:
+            return IntentResponse(
+                request=utterance,
+                details=IntentResponseDetails(
+                    status="timeout",
+                    data=render_template("unavailable_message"),
+                    timestamp=datetime.now().isoformat(),
+                ),
+            )
+
+        return IntentResponse(
+            request=utterance,
+            details=IntentResponseDetails(
+                status="success",
+                data=response_text,
+                timestamp=datetime.now().isoformat(),
+            ),
+        )
@@ -2,13 +2,50 @@ import logging
 
 from flask import render_template
 
-from app.config.config import Config
+from app.models.deadline import Deadline
+from app.models.session_state import SessionState
 from app.services.intent_processor_service import IntentProcessorService
 from app.services.weather.weather_service import WeatherService
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Requests answered by a prompted message:
+# (prompt template, fallback template, response type, prompt class)
+PROMPTED_MESSAGES = {
+    "AMAZON.FallbackIntent": (
+        "fallback_prompt",
+        "fallback_response",
+        "question",
+        "conversation",
+    ),
+    "GoodbyeIntent": (
+        "goodbye_prompt",
+        "goodbye_response",
+        "statement",
+        "acknowledgement",
+    ),
+    "AMAZON.HelpIntent": ("help_prompt", "help_response", "question", "conversation"),
+    "AMAZON.StopIntent": (
+        "stop_prompt",
+        "stop_response",
+        "statement",
+        "acknowledgement",
+    ),
+    "AMAZON.CancelIntent": (
+        "cancel_prompt",
+        "cancel_response",
+        "statement",
+        "acknowledgement",
+    ),
+    "SessionEndedRequest": (
+        "session_ended_prompt",
+        "session_ended_response",
+        "statement",
+        "acknowledgement",
+    ),
+}
+
 
 class IntentsService:
     system_role = None
@@ -21,76 +58,140 @@ class IntentsService:
         IntentProcessorService.initialize()
 
     @staticmethod
-    def handle_request(payload):
+    def handle_request(payload, deadline: Deadline = None):
         query = payload["request"]
         intents_processor = IntentProcessorService()
-        intent_response = intents_processor.process_utterance(query)
+        intent_response = intents_processor.process_utterance(query, deadline)
+        IntentsService.record_turn(query, intent_response)
         return {"type": "statement", "response": intent_response.details.data}
 
     @staticmethod
-    def get_launch_message():
+    def record_turn(query, intent_response):
+        """
+        Records an answered query in the conversation context of the current session.
+        """
+        session = SessionState.current()
+        if session is not None and intent_response.details.status == "success":
+            session.add_turn(query, intent_response.details.data)
+
+    @staticmethod
+    def get_launch_message(deadline: Deadline = None):
         intents_processor = IntentProcessorService()
         intents_processor.set_random_personality()
         prompt = render_template("launch_prompt")
         response_text = intents_processor.get_ai_response(
-            prompt, Config().large_language_model, intents_processor.system_role
+            prompt,
+            system_role=intents_processor.get_system_role(),
+            deadline=deadline,
+            fallback_template="launch_response",
+            template="launch_prompt",
         )
         return {"type": "question", "response": response_text}
 
     @staticmethod
-    def get_fallback_message():
-        prompt = render_template("fallback_prompt")
+    def get_prompted_message(intent_name: str, deadline: Deadline = None):
+        """
+        Answers the fallback, goodbye, help, stop, cancel and session ended
+        requests, which differ only in their templates, response type and prompt
+        class, with the fallback template when no model answers in time.
+        """
+        prompt_template, fallback_template, response_type, prompt_class = (
+            PROMPTED_MESSAGES[intent_name]
+        )
+        prompt = render_template(prompt_template)
         intents_processor = IntentProcessorService()
-        response_text = intents_processor.get_ai_response(prompt)
-        return {"type": "question", "response": response_text}
+        response_text = intents_processor.get_ai_response(
+            prompt,
+            deadline=deadline,
+            fallback_template=fallback_template,
+            prompt_class=prompt_class,
+            template=prompt_template,
+        )
+        return {"type": response_type, "response": response_text}
 
     @staticmethod
-    def get_goodbye_message():
-        prompt = render_template("goodbye_prompt")
+    def handle_weather_forecast(payload, deadline: Deadline = None):
+        service = WeatherService()
+        slot_info = payload["request"]
+        prompt = service.handle_weather_forecast(slot_info)
         intents_processor = IntentProcessorService()
-        response_text = intents_processor.get_ai_response(prompt)
+        response_text = intents_processor.get_ai_response(
+            prompt,
+            deadline=deadline,
+            prompt_class="summary",
+            template="weather_overview",
+        )
         return {"type": "statement", "response": response_text}
 
     @staticmethod
-    def get_help_message():
-        prompt = render_template("help_prompt")
-        intents_processor = IntentProcessorService()
-        response_text = intents_processor.get_ai_response(prompt)
-        return {"type": "question", "response": response_text}
+    def handle_weather_temperature(payload, deadline: Deadline = None):
+        service = WeatherService()
+        slot_info = payload["request"]
+        intent_response = service.handle_weather_temperature(slot_info, deadline)
+        return {"type": "statement", "response": intent_response.details.data}
 
     @staticmethod
-    def get_stop_message():
-        prompt = render_template("stop_prompt")
+    async def handle_request_async(payload, deadline: Deadline = None):
+        query = payload["request"]
         intents_processor = IntentProcessorService()
-        response_text = intents_processor.get_ai_response(prompt)
-        return {"type": "statement", "response": response_text}
+        intent_response = await intents_processor.process_utterance_async(
+            query, deadline
+        )
+        IntentsService.record_turn(query, intent_response)
+        return {"type": "statement", "response": intent_response.details.data}
 
     @staticmethod
-    def get_cancel_message():
-        prompt = render_template("cancel_prompt")
+    async def get_launch_message_async(deadline: Deadline = None):
         intents_processor = IntentProcessorService()
-        response_text = intents_processor.get_ai_response(prompt)
-        return {"type": "statement", "response": response_text}
+        intents_processor.set_random_personality()
+        prompt = render_template("launch_prompt")
+        response_text = await intents_processor.get_ai_response_async(
+            prompt,
+            system_role=intents_processor.get_system_role(),
+            deadline=deadline,
+            fallback_template="launch_response",
+            template="launch_prompt",
+        )
+        return {"type": "question", "response": response_text}
 
     @staticmethod
-    def get_session_ended_message():
-        prompt = render_template("session_ended_prompt")
+    async def get_prompted_message_async(intent_name: str, deadline: Deadline = None):
+        """
+        Asynchronous variant of get_prompted_message.
+        """
+        prompt_template, fallback_template, response_type, prompt_class = (
+            PROMPTED_MESSAGES[intent_name]
+        )
+        prompt = render_template(prompt_template)
         intents_processor = IntentProcessorService()
-        response_text = intents_processor.get_ai_response(prompt)
-        return {"type": "statement", "response": response_text}
+        response_text = await intents_processor.get_ai_response_async(
+            prompt,
+            deadline=deadline,
+            fallback_template=fallback_template,
+            prompt_class=prompt_class,
+            template=prompt_template,
+        )
+        return {"type": response_type, "response": response_text}
 
     @staticmethod
-    def handle_weather_forecast(payload):
+    async def handle_weather_forecast_async(payload, deadline: Deadline = None):
         service = WeatherService()
         slot_info = payload["request"]
-        prompt = service.handle_weather_forecast(slot_info)
+        prompt = await service.handle_weather_forecast_async(slot_info)
         intents_processor = IntentProcessorService()
-        response_text = intents_processor.get_ai_response(prompt)
+        response_text = await intents_processor.get_ai_response_async(
+            prompt,
+            deadline=deadline,
+            prompt_class="summary",
+            template="weather_overview",
+        )
         return {"type": "statement", "response": response_text}
 
     @staticmethod
-    def handle_weather_temperature(payload):
+    async def handle_weather_temperature_async(payload, deadline: Deadline = None):
         service = WeatherService()
         slot_info = payload["request"]
-        intent_response = service.handle_weather_temperature(slot_info)
+        intent_response = await service.handle_weather_temperature_async(
+            slot_info, deadline
+        )
         return {"type": "statement", "response": intent_response.details.data}
@@ -14,3 +14,21 @@ class ResponseService:
         else:
             # Default to statement if the type is not recognized
             return statement(response_text)
+
+    @staticmethod
+    def build_response_body(payload):
+        """
+        Builds the Alexa response body for a payload outside of Flask-Ask, as used by
+        the asyncio serving path. Like Flask-Ask, a question keeps the session open
+        and a statement ends it.
+        """
+        return {
+            "version": "1.0",
+            "response": {
+                "outputSpeech": {
+                    "type": "PlainText",
+                    "text": payload.get("response") or "",
+                },
+                "shouldEndSession": payload.get("type") != "question",
+            },
+        }
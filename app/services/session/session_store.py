@@ -0,0 +1,87 @@
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.config.config import Config
+from app.helpers.ttl_cache import TTLCache
+from app.models.session_state import SessionState
+from app.models.singleton import SingletonMeta
+
+
+class SessionStore(metaclass=SingletonMeta):
+    """
+    Store of the assistant state of the active Alexa sessions, keyed by session id.
+
+    The store is bounded: when it is full the least recently used session is
+    evicted, and a session that has been idle for longer than the idle timeout
+    is dropped.
+
+    Attributes:
+        config (Config): Application configuration.
+        sessions (TTLCache): Session states by session id.
+        max_turns (int): Number of conversation turns kept per session.
+    """
+
+    _is_initialized = False
+
+    def __init__(self):
+        if not self._is_initialized:  # Prevent reinitialization
+            self.logger = logging.getLogger(__name__)
+            self.config = Config()
+            self.sessions = TTLCache(
+                maxsize=self.config.session_max_count,
+                ttl=self.config.session_idle_timeout,
+                sliding=True,
+            )
+            self.max_turns = self.config.session_context_turns
+            self._is_initialized = True
+
+    def get(self, session_id: Optional[str]) -> Optional[SessionState]:
+        """
+        Returns the state of a session, creating it on first use.
+
+        Parameters:
+            session_id (Optional[str]): The Alexa session id.
+
+        Returns:
+            Optional[SessionState]: The session state, or None without a session id.
+        """
+        if not session_id:
+            return None
+        return self.sessions.setdefault(
+            session_id,
+            lambda: SessionState(session_id, context=deque(maxlen=self.max_turns)),
+        )
+
+    def end(self, session_id: Optional[str]):
+        """
+        Drops the state of an ended session.
+
+        Parameters:
+            session_id (Optional[str]): The Alexa session id.
+        """
+        if session_id and self.sessions.pop(session_id) is not None:
+            self.logger.info("Session %s ended", session_id)
+
+    @contextmanager
+    def session(self, session_id: Optional[str]) -> Iterator[Optional[SessionState]]:
+        """
+        Makes the state of a session the current session for the duration of the block.
+
+        Parameters:
+            session_id (Optional[str]): The Alexa session id.
+
+        Example:
+            with SessionStore().session(session_id) as session:
+                response = IntentsService.handle_request(payload, deadline)
+        """
+        state = self.get(session_id)
+        if state is None:
+            yield None
+            return
+        with state.activate():
+            yield state
+
+    def __len__(self):
+        return len(self.sessions)
@@ -0,0 +1,25 @@
+from .histogram import Histogram
+from .llm_telemetry import LLMCall, LLMTelemetry
+from .metrics_registry import MetricsRegistry, StageTimer
+from .profiler import Profiler, RequestProfile, SamplingCapture
+from .span_exporter import JsonlSpanExporter, OtlpSpanExporter, SpanExporter
+from .token_estimator import TokenEstimator
+from .tracer import Span, Tracer, traced
+
+__all__ = [
+    "Histogram",
+    "JsonlSpanExporter",
+    "LLMCall",
+    "LLMTelemetry",
+    "MetricsRegistry",
+    "OtlpSpanExporter",
+    "Profiler",
+    "RequestProfile",
+    "SamplingCapture",
+    "Span",
+    "SpanExporter",
+    "StageTimer",
+    "TokenEstimator",
+    "Tracer",
+    "traced",
+]
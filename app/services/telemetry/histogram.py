@@ -0,0 +1,132 @@
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence
+
+# Upper bounds in seconds, from fast cache hits to slow cold model loads, finer
+# within the 7 seconds Alexa waits for an answer
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    1.5,
+    2.0,
+    2.5,
+    3.0,
+    4.0,
+    5.0,
+    7.0,
+    10.0,
+    30.0,
+)
+
+# Upper bounds in tokens
+TOKEN_BUCKETS = (8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+
+class Histogram:
+    """
+    Counts observations in fixed buckets and estimates their quantiles.
+
+    Every bucket counts the observations up to its upper bound, plus one bucket
+    for the observations above the last bound. A histogram is not thread-safe;
+    its owner serializes the observations or keeps one histogram per thread and
+    merges them when reading.
+
+    Attributes:
+        bounds (Sequence[float]): Upper bounds of the buckets, in increasing order.
+        counts (List[int]): Number of observations per bucket, the last one above all bounds.
+        count (int): Number of observations.
+        sum (float): Sum of the observations.
+        min (Optional[float]): Smallest observation.
+        max (Optional[float]): Largest observation.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float):
+        """Adds an observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram"):
+        """Adds the observations of a histogram with the same bounds."""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates a quantile by interpolating within its bucket, None without
+        observations. The estimate is kept within the smallest and the largest
+        observation.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        estimate = self.max
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index < len(self.bounds):
+                    lower = self.bounds[index - 1] if index else 0.0
+                    upper = self.bounds[index]
+                    estimate = lower + (upper - lower) * (rank - seen) / count
+                break
+            seen += count
+        return min(max(estimate, self.min), self.max)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the count, the mean, the extremes and the p50, p95 and p99 estimates."""
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the buckets and totals, from which from_dict rebuilds the histogram."""
+        return {
+            "bounds": list(self.bounds),
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Histogram":
+        """Rebuilds a histogram from the dictionary returned by to_dict."""
+        histogram = cls(tuple(data["bounds"]))
+        histogram.counts = list(data["counts"])
+        histogram.count = data["count"]
+        histogram.sum = data["sum"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
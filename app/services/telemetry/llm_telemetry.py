@@ -0,0 +1,161 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.services.telemetry.histogram import TOKEN_BUCKETS, Histogram
+from app.services.telemetry.token_estimator import TokenEstimator
+
+
+class LLMCall:
+    """
+    Times a single model call, from the moment it asks for a backend slot until
+    its answer is complete.
+
+    Attributes:
+        model (str): Model identifier of the call.
+        template (Optional[str]): Name of the template the prompt was rendered from.
+        messages (List[Dict[str, str]]): The messages sent, for estimating the prompt tokens.
+        started (float): Monotonic time the call started.
+        admitted_at (Optional[float]): Monotonic time the backend admitted the call.
+        first_token_at (Optional[float]): Monotonic time of the first streamed token.
+    """
+
+    __slots__ = (
+        "model",
+        "template",
+        "messages",
+        "started",
+        "admitted_at",
+        "first_token_at",
+    )
+
+    def __init__(
+        self, model: str, template: Optional[str], messages: List[Dict[str, str]]
+    ):
+        self.model = model
+        self.template = template
+        self.messages = messages
+        self.started = time.monotonic()
+        self.admitted_at: Optional[float] = None
+        self.first_token_at: Optional[float] = None
+
+    def admitted(self):
+        """Marks the moment the backend admitted the call."""
+        self.admitted_at = time.monotonic()
+
+    def first_token(self):
+        """Marks the arrival of the first streamed token, once."""
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+
+
+class LLMTelemetry:
+    """
+    Token usage and latency distributions of the model calls.
+
+    Every successful call is recorded per model, with histograms of its total
+    latency, its wait for a backend slot and, for streamed calls, its time from
+    being admitted to the first token, and per template, with histograms of its prompt and
+    completion tokens. Token counts come from the usage reported by the backend,
+    or are estimated with the TokenEstimator when it reports none.
+
+    Example:
+        call = telemetry.start("llama3", "query_prompt", messages)
+        with admission(...):
+            call.admitted()
+            response = client.chat.completions.create(...)
+        telemetry.finish(call, response.choices[0].message.content, response.usage)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._templates: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def start(
+        model: str, template: Optional[str], messages: List[Dict[str, str]]
+    ) -> LLMCall:
+        """Starts timing a model call."""
+        return LLMCall(model, template, messages)
+
+    def finish(self, call: LLMCall, text: Optional[str], usage=None):
+        """
+        Records a completed model call.
+
+        Args:
+            call (LLMCall): The timed call.
+            text (Optional[str]): The generated text, used when the usage is not reported.
+            usage: The usage reported by the backend, if any.
+        """
+        finished = time.monotonic()
+        if usage is not None and usage.prompt_tokens is not None:
+            prompt_tokens = usage.prompt_tokens
+            completion_tokens = usage.completion_tokens or 0
+            estimated = False
+        else:
+            prompt_tokens = TokenEstimator.count_messages(call.messages)
+            completion_tokens = TokenEstimator.count(text or "")
+            estimated = True
+        admitted_at = call.admitted_at or call.started
+
+        with self._lock:
+            model = self._models.get(call.model)
+            if model is None:
+                model = self._models[call.model] = {
+                    "calls": 0,
+                    "estimated_calls": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "latency": Histogram(),
+                    "queue_wait": Histogram(),
+                    "time_to_first_token": Histogram(),
+                }
+            model["calls"] += 1
+            model["estimated_calls"] += estimated
+            model["prompt_tokens"] += prompt_tokens
+            model["completion_tokens"] += completion_tokens
+            model["latency"].observe(finished - call.started)
+            model["queue_wait"].observe(admitted_at - call.started)
+            if call.first_token_at is not None:
+                model["time_to_first_token"].observe(call.first_token_at - admitted_at)
+
+            name = call.template or "untemplated"
+            template = self._templates.get(name)
+            if template is None:
+                template = self._templates[name] = {
+                    "calls": 0,
+                    "prompt_tokens": Histogram(TOKEN_BUCKETS),
+                    "completion_tokens": Histogram(TOKEN_BUCKETS),
+                }
+            template["calls"] += 1
+            template["prompt_tokens"].observe(prompt_tokens)
+            template["completion_tokens"].observe(completion_tokens)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the token totals and latency percentiles per model, and the token
+        percentiles per template.
+        """
+        with self._lock:
+            return {
+                "models": {
+                    name: {
+                        key: (
+                            value.snapshot() if isinstance(value, Histogram) else value
+                        )
+                        for key, value in stats.items()
+                    }
+                    for name, stats in self._models.items()
+                },
+                "templates": {
+                    name: {
+                        "calls": stats["calls"],
+                        "prompt_tokens_total": int(stats["prompt_tokens"].sum),
+                        "completion_tokens_total": int(stats["completion_tokens"].sum),
+                        "prompt_tokens": stats["prompt_tokens"].snapshot(),
+                        "completion_tokens": stats["completion_tokens"].snapshot(),
+                    }
+                    for name, stats in self._templates.items()
+                },
+            }
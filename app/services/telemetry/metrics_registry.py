@@ -0,0 +1,489 @@
+import atexit
+import glob
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.models.singleton import SingletonMeta
+from app.services.telemetry.histogram import LATENCY_BUCKETS, Histogram
+
+# Metric families of the request pipeline
+REQUESTS_TOTAL = "nexa_requests_total"
+REQUEST_ERRORS_TOTAL = "nexa_request_errors_total"
+REQUESTS_IN_FLIGHT = "nexa_requests_in_flight"
+STAGE_SECONDS = "nexa_stage_seconds"
+
+# Stages of a request, the values of the "stage" label of STAGE_SECONDS
+STAGE_ALEXA_HANDLER = "alexa_handler"
+STAGE_ROUTING = "routing"
+STAGE_EXECUTOR_FUNCTION = "executor_function"
+STAGE_OWM_CALL = "owm_call"
+STAGE_LLM_CALL = "llm_call"
+STAGE_TEMPLATE_RENDER = "template_render"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# A sample of a collected family: its label values by name and its value
+Sample = Tuple[Dict[str, str], float]
+# A family produced by a collector: name, type, help text and samples
+CollectedFamily = Tuple[str, str, str, List[Sample]]
+
+
+class _Family:
+    __slots__ = ("name", "kind", "help", "label_names", "bounds")
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        help_text: str,
+        label_names: Sequence[str],
+        bounds: Optional[Sequence[float]],
+    ):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.bounds = bounds
+
+
+class _Shard:
+    # The values recorded by one thread, keyed by family name and label values
+    __slots__ = ("thread", "values", "histograms")
+
+    def __init__(self, thread: Optional[threading.Thread]):
+        self.thread = thread
+        self.values: Dict[tuple, float] = {}
+        self.histograms: Dict[tuple, Histogram] = {}
+
+
+class StageTimer:
+    """
+    Context manager observing the seconds spent in its block in a histogram,
+    whether the block succeeds or raises.
+    """
+
+    __slots__ = ("registry", "name", "labels", "started")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: tuple):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.started = 0.0
+
+    def __enter__(self) -> "StageTimer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(
+            self.name, time.perf_counter() - self.started, self.labels
+        )
+
+
+class MetricsRegistry(metaclass=SingletonMeta):
+    """
+    Counters, gauges and histograms of the request pipeline, served in the
+    Prometheus text exposition format.
+
+    Recording takes no lock: every thread records into its own shard, and the
+    shards are only summed when the metrics are scraped. A recording costs a
+    dictionary lookup and an addition, or a bucket search for histograms. The
+    shards of finished threads are folded into a retired shard at scrape time,
+    so short-lived worker threads do not lose their counts.
+
+    Gauges are recorded as increments and decrements, so an in-flight gauge
+    stays correct when another thread ends what one thread started. Values
+    that another service already keeps, such as cache counters or backend
+    queues, are read at scrape time by collectors instead.
+
+    With several worker processes, as with the production server, every process
+    writes a snapshot of its metrics to a shared directory every
+    SNAPSHOT_INTERVAL seconds and on exit, and a scrape adds up the snapshots of
+    the other processes to its own live metrics. The counters and histograms of
+    processes that exited are kept, their gauges dropped. Collected families
+    are reported per process, with a ``pid`` label.
+
+    Example:
+        metrics = MetricsRegistry()
+        metrics.inc(REQUESTS_TOTAL, ("WeatherIntent",))
+        with metrics.stage(STAGE_ROUTING):
+            function_str = ai_service.get_function_for_utterance(utterance)
+        text = metrics.render()
+    """
+
+    _is_initialized = False
+
+    # Seconds between two snapshots of a worker process's metrics
+    SNAPSHOT_INTERVAL = 5.0
+
+    def __init__(self):
+        if not self._is_initialized:  # Prevent reinitialization
+            self.logger = logging.getLogger(__name__)
+            self.directory: Optional[str] = None
+            self._snapshot_pid: Optional[int] = None
+            self._lock = threading.Lock()
+            self._local = threading.local()
+            self._shards: List[_Shard] = []
+            self._retired = _Shard(None)
+            self._families: Dict[str, _Family] = {}
+            self._collectors: List[Callable[[], Iterable[CollectedFamily]]] = []
+
+            self.declare(
+                REQUESTS_TOTAL, "counter", "Alexa requests handled.", ("intent",)
+            )
+            self.declare(
+                REQUEST_ERRORS_TOTAL,
+                "counter",
+                "Alexa requests whose handler raised an error.",
+                ("intent",),
+            )
+            self.declare(REQUESTS_IN_FLIGHT, "gauge", "Alexa requests being handled.")
+            self.declare(
+                STAGE_SECONDS,
+                "histogram",
+                "Seconds spent in each stage of a request.",
+                ("stage",),
+                LATENCY_BUCKETS,
+            )
+            self._is_initialized = True
+
+    def declare(
+        self,
+        name: str,
+        kind: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        bounds: Optional[Sequence[float]] = None,
+    ):
+        """
+        Declares a metric family.
+
+        Args:
+            name (str): Name of the family.
+            kind (str): "counter", "gauge" or "histogram".
+            help_text (str): Description of the family.
+            label_names (Sequence[str]): Names of its labels, in the order their values are passed.
+            bounds (Optional[Sequence[float]]): Bucket bounds of a histogram. Defaults to LATENCY_BUCKETS.
+        """
+        if kind not in ("counter", "gauge", "histogram"):
+            raise ValueError(f"Unknown metric type: {kind}")
+        if kind == "histogram" and bounds is None:
+            bounds = LATENCY_BUCKETS
+        self._families[name] = _Family(name, kind, help_text, label_names, bounds)
+
+    def add_collector(self, collector: Callable[[], Iterable[CollectedFamily]]):
+        """
+        Adds a callback returning families that are computed when the metrics are
+        scraped, as (name, type, help text, [(labels, value), ...]) tuples.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def inc(self, name: str, labels: tuple = (), amount: float = 1):
+        """Adds to a counter or a gauge."""
+        values = self._shard().values
+        key = (name, labels)
+        values[key] = values.get(key, 0) + amount
+
+    def dec(self, name: str, labels: tuple = (), amount: float = 1):
+        """Subtracts from a gauge."""
+        self.inc(name, labels, -amount)
+
+    def observe(self, name: str, value: float, labels: tuple = ()):
+        """Adds an observation to a histogram."""
+        histograms = self._shard().histograms
+        key = (name, labels)
+        histogram = histograms.get(key)
+        if histogram is None:
+            family = self._families.get(name)
+            histogram = histograms[key] = Histogram(
+                family.bounds if family is not None else LATENCY_BUCKETS
+            )
+        histogram.observe(value)
+
+    def time(self, name: str, labels: tuple = ()) -> StageTimer:
+        """Returns a context manager observing the seconds spent in its block."""
+        return StageTimer(self, name, labels)
+
+    def stage(self, stage: str) -> StageTimer:
+        """Returns a context manager observing the seconds spent in a request stage."""
+        return StageTimer(self, STAGE_SECONDS, (stage,))
+
+    @contextmanager
+    def request(self, intent: str):
+        """
+        Counts an Alexa request by intent, keeps it in the in-flight gauge while
+        it is handled, and observes the seconds its handler took.
+        """
+        labels = (intent,)
+        self.inc(REQUESTS_TOTAL, labels)
+        self.inc(REQUESTS_IN_FLIGHT)
+        try:
+            with self.stage(STAGE_ALEXA_HANDLER):
+                yield
+        except Exception:
+            self.inc(REQUEST_ERRORS_TOTAL, labels)
+            raise
+        finally:
+            self.dec(REQUESTS_IN_FLIGHT)
+
+    def collect(self) -> Tuple[Dict[tuple, float], Dict[tuple, Histogram]]:
+        """
+        Sums the shards of all threads, folding the shards of finished threads
+        into the retired shard.
+
+        Returns:
+            Tuple[Dict[tuple, float], Dict[tuple, Histogram]]: The counter and gauge
+            values and the histograms, keyed by family name and label values.
+        """
+        with self._lock:
+            live = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    live.append(shard)
+                else:
+                    # A finished thread no longer records, so its shard is stable
+                    self._merge(self._retired, shard.values, shard.histograms)
+            self._shards = live
+
+            totals = _Shard(None)
+            self._merge(totals, self._retired.values, self._retired.histograms)
+            for shard in live:
+                # Copying a dict is atomic, its owner may keep recording meanwhile
+                self._merge(totals, shard.values.copy(), shard.histograms.copy())
+        return totals.values, totals.histograms
+
+    @staticmethod
+    def _merge(
+        target: _Shard, values: Dict[tuple, float], histograms: Dict[tuple, Histogram]
+    ):
+        for key, value in values.items():
+            target.values[key] = target.values.get(key, 0) + value
+        for key, histogram in histograms.items():
+            merged = target.histograms.get(key)
+            if merged is None:
+                merged = target.histograms[key] = Histogram(histogram.bounds)
+            merged.merge(histogram)
+
+    def share(self, directory: str):
+        """
+        Shares the metrics of the worker processes through a directory, removing
+        the snapshots of an earlier run. Must be called before the workers are
+        forked, each of which then calls start_snapshots.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "metrics-*.json")):
+            os.remove(path)
+        self.directory = directory
+
+    def start_snapshots(self):
+        """
+        Writes the metrics of this process to the shared directory every
+        SNAPSHOT_INTERVAL seconds and on exit, when the metrics are shared.
+        """
+        if self.directory is None or self._snapshot_pid == os.getpid():
+            return
+        self._snapshot_pid = os.getpid()
+        atexit.register(self.write_snapshot)
+        threading.Thread(
+            target=self._write_snapshots, name="metrics-snapshot", daemon=True
+        ).start()
+
+    def _write_snapshots(self):
+        while True:
+            time.sleep(self.SNAPSHOT_INTERVAL)
+            self.write_snapshot()
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"metrics-{pid}.json")
+
+    def write_snapshot(self):
+        """Writes the metrics of this process to the shared directory, replacing its snapshot atomically."""
+        values, histograms = self.collect()
+        snapshot = {
+            "values": [
+                [name, list(labels), value] for (name, labels), value in values.items()
+            ],
+            "histograms": [
+                [name, list(labels), histogram.to_dict()]
+                for (name, labels), histogram in histograms.items()
+            ],
+            "collected": [list(family) for family in self._collect_families()],
+        }
+        path = self._snapshot_path(os.getpid())
+        temporary = f"{path}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as file:
+                json.dump(snapshot, file)
+            os.replace(temporary, path)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning("Could not write the metrics snapshot %s: %s", path, e)
+
+    def _read_snapshots(self) -> Iterable[Tuple[int, bool, Dict[str, Any]]]:
+        # The snapshots of the other processes, with whether the process is alive
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            try:
+                pid = int(os.path.basename(path)[len("metrics-") : -len(".json")])
+            except ValueError:
+                continue
+            if pid == os.getpid():
+                continue
+            try:
+                with open(path, encoding="utf-8") as file:
+                    snapshot = json.load(file)
+            except (OSError, ValueError) as e:
+                self.logger.warning(
+                    "Could not read the metrics snapshot %s: %s", path, e
+                )
+                continue
+            yield pid, self._is_alive(pid), snapshot
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            # The process exists but belongs to another user
+            return True
+        return True
+
+    def _collect_families(self) -> List[CollectedFamily]:
+        with self._lock:
+            collectors = list(self._collectors)
+        return [family for collector in collectors for family in collector()]
+
+    def _merge_processes(
+        self,
+        values: Dict[tuple, float],
+        histograms: Dict[tuple, Histogram],
+        collected: List[CollectedFamily],
+    ) -> Tuple[Dict[tuple, float], Dict[tuple, Histogram], List[CollectedFamily]]:
+        # Adds the snapshots of the other worker processes to the live metrics
+        totals = _Shard(None)
+        self._merge(totals, values, histograms)
+        processes = [(os.getpid(), collected)]
+        for pid, alive, snapshot in self._read_snapshots():
+            self._merge(
+                totals,
+                {
+                    (name, tuple(labels)): value
+                    for name, labels, value in snapshot["values"]
+                    if alive or self._kind(name) != "gauge"
+                },
+                {
+                    (name, tuple(labels)): Histogram.from_dict(histogram)
+                    for name, labels, histogram in snapshot["histograms"]
+                },
+            )
+            if alive:
+                processes.append((pid, snapshot["collected"]))
+
+        merged: Dict[str, CollectedFamily] = {}
+        for pid, families in processes:
+            for name, kind, help_text, samples in families:
+                family = merged.setdefault(name, (name, kind, help_text, []))
+                family[3].extend(
+                    ({**labels, "pid": str(pid)}, value) for labels, value in samples
+                )
+        return totals.values, totals.histograms, list(merged.values())
+
+    def _kind(self, name: str) -> Optional[str]:
+        family = self._families.get(name)
+        return family.kind if family is not None else None
+
+    def render(self) -> str:
+        """
+        Returns all metrics in the Prometheus text exposition format, of every
+        worker process when the metrics are shared.
+        """
+        values, histograms = self.collect()
+        collected = self._collect_families()
+        if self.directory is not None:
+            values, histograms, collected = self._merge_processes(
+                values, histograms, collected
+            )
+        families: Dict[str, List[str]] = {}
+
+        for (name, labels), value in sorted(values.items()):
+            family = self._families.get(name)
+            label_names = family.label_names if family is not None else ()
+            families.setdefault(name, []).append(
+                f"{name}{self._labels(label_names, labels)} {self._number(value)}"
+            )
+
+        for (name, labels), histogram in sorted(
+            histograms.items(), key=lambda item: item[0]
+        ):
+            family = self._families.get(name)
+            label_names = family.label_names if family is not None else ()
+            lines = families.setdefault(name, [])
+            cumulative = 0
+            for index, count in enumerate(histogram.counts):
+                cumulative += count
+                bound = (
+                    self._number(histogram.bounds[index])
+                    if index < len(histogram.bounds)
+                    else "+Inf"
+                )
+                bucket_labels = self._labels(label_names + ("le",), labels + (bound,))
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            series_labels = self._labels(label_names, labels)
+            lines.append(f"{name}_sum{series_labels} {self._number(histogram.sum)}")
+            lines.append(f"{name}_count{series_labels} {histogram.count}")
+
+        output = []
+        for name, lines in families.items():
+            family = self._families.get(name)
+            if family is not None:
+                output.append(f"# HELP {name} {family.help}")
+                output.append(f"# TYPE {name} {family.kind}")
+            output.extend(lines)
+
+        for name, kind, help_text, samples in collected:
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                output.append(
+                    f"{name}{self._labels(tuple(labels), tuple(labels.values()))} "
+                    f"{self._number(value)}"
+                )
+        return "\n".join(output) + "\n"
+
+    @staticmethod
+    def _labels(names: Sequence[str], values: Sequence) -> str:
+        if not names:
+            return ""
+        pairs = (
+            f'{name}="{MetricsRegistry._escape(value)}"'
+            for name, value in zip(names, values)
+        )
+        return "{" + ",".join(pairs) + "}"
+
+    @staticmethod
+    def _escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    @staticmethod
+    def _number(value: float) -> str:
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return "NaN"
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return repr(value) if isinstance(value, float) else str(value)
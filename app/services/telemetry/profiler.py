@@ -0,0 +1,358 @@
+import cProfile
+import hmac
+import itertools
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from app.config.config import Config
+from app.models.singleton import SingletonMeta
+
+# Header carrying PROFILE_TOKEN, on admin requests and on skill requests to profile
+PROFILE_HEADER = "X-Profile-Token"
+
+# Signal starting a sampling capture of PROFILE_CAPTURE_SECONDS, where supported
+CAPTURE_SIGNAL = getattr(signal, "SIGUSR2", None)
+
+
+class SamplingCapture:
+    """
+    Samples the stacks of every thread of the process at a fixed interval, from
+    a background thread, until a number of requests finished or a time elapsed,
+    and writes them as collapsed stacks: one line per distinct stack, with its
+    frames separated by semicolons, outermost first, and the number of samples.
+    The file can be turned into a flame graph by flamegraph.pl or speedscope.
+
+    The stacks are sampled by wall-clock time, so threads waiting on a model or
+    an upstream API show up as much as busy ones. The thread name is the root
+    frame of its stacks.
+
+    Attributes:
+        path (str): File the collapsed stacks are written to.
+        interval (float): Seconds between samples.
+        max_requests (int): Requests after which the capture stops, 0 for no limit.
+        seconds (float): Seconds after which the capture stops.
+        requests (int): Requests finished during the capture.
+        samples (int): Samples taken.
+        started (float): Wall clock time the capture started, in seconds since the epoch.
+    """
+
+    def __init__(self, path: str, interval: float, max_requests: int, seconds: float):
+        self.path = path
+        self.interval = interval
+        self.max_requests = max_requests
+        self.seconds = seconds
+        self.requests = 0
+        self.samples = 0
+        self.started = time.time()
+        self.stacks: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    def request_finished(self):
+        # Requests finish on several threads at once
+        with self._lock:
+            self.requests += 1
+            requests = self.requests
+        if self.max_requests and requests >= self.max_requests:
+            self.stop()
+
+    def _run(self):
+        deadline = time.monotonic() + self.seconds
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            if time.monotonic() >= deadline:
+                break
+            self.sample(own_id)
+        self.write()
+
+    def sample(self, own_id: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        # The only stdlib API returning the stacks of the other threads
+        frames_by_thread = sys._current_frames()  # pylint: disable=protected-access
+        for thread_id, frame in frames_by_thread.items():
+            if thread_id == own_id:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            frames.append(names.get(thread_id, str(thread_id)))
+            self.stacks[";".join(reversed(frames))] += 1
+        self.samples += 1
+
+    def write(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "running": self.is_running(),
+            "started": self.started,
+            "seconds": self.seconds,
+            "max_requests": self.max_requests,
+            "interval": self.interval,
+            "requests": self.requests,
+            "samples": self.samples,
+        }
+
+
+class RequestProfile:
+    """
+    Profiles one request with cProfile and saves the statistics when the
+    request was asked to be profiled or took at least PROFILE_SLOW_SECONDS.
+
+    cProfile profiles the whole thread, so in async mode the statistics also
+    hold the other requests served by the event loop meanwhile. Only one
+    request is profiled at a time; concurrent requests are only counted.
+    """
+
+    __slots__ = ("profiler", "requested", "_profile", "_started")
+
+    def __init__(self, profiler: "Profiler", requested: bool):
+        self.profiler = profiler
+        self.requested = requested
+        self._profile: Optional[cProfile.Profile] = None
+        self._started = 0.0
+
+    def __enter__(self) -> "RequestProfile":
+        if self.profiler._profiling.acquire(blocking=False):
+            self._profile = cProfile.Profile()
+            try:
+                self._profile.enable()
+            except ValueError:
+                # Another profiler, e.g. a debugger, holds the profiling hook
+                self._profile = None
+                self.profiler._profiling.release()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self._started
+        if self._profile is not None:
+            self._profile.disable()
+            self.profiler._profiling.release()
+            slow_seconds = self.profiler.slow_seconds
+            if self.requested or 0 < slow_seconds <= duration:
+                self.profiler.save_request_profile(self._profile, duration)
+        self.profiler.request_finished()
+
+
+class _NoProfile:
+    # Stands in for a request profile when the request is not profiled
+    __slots__ = ("profiler",)
+
+    def __init__(self, profiler: "Profiler"):
+        self.profiler = profiler
+
+    def __enter__(self) -> "_NoProfile":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.request_finished()
+
+
+class Profiler(metaclass=SingletonMeta):
+    """
+    Profiles the live requests on demand, to investigate a latency regression
+    where it happens.
+
+    - A sampling capture records the stacks of every thread for the next N
+      requests or T seconds, started from the admin endpoint or with SIGUSR2,
+      and writes them to PROFILE_DIR as collapsed stacks for a flame graph.
+    - A skill request carrying PROFILE_TOKEN in the X-Profile-Token header is
+      profiled with cProfile, and its statistics are written to PROFILE_DIR.
+    - With PROFILE_SLOW_SECONDS set, requests are profiled with cProfile, one
+      at a time, and the statistics of those that took at least that long are
+      written too.
+
+    Profiling is off unless PROFILING is true. The Host then installs no hooks,
+    so requests do not pay for it. With the production server every worker
+    process profiles itself: a capture started from the admin endpoint covers
+    the worker that answered, and the signal is sent to a worker's pid.
+
+    Attributes:
+        config (Config): Application configuration.
+        enabled (bool): Whether profiling is on.
+        directory (str): Directory the profiles are written to.
+        slow_seconds (float): Duration from which requests are profiled and saved, 0 to only profile on request.
+        capture (Optional[SamplingCapture]): The latest sampling capture.
+
+    Example:
+        profiler = Profiler()
+        profiler.start_capture(max_requests=100, seconds=60)
+        with profiler.profile_request(request.headers.get(PROFILE_HEADER)):
+            ...
+    """
+
+    _is_initialized = False
+
+    def __init__(self):
+        if not self._is_initialized:  # Prevent reinitialization
+            self.logger = logging.getLogger(__name__)
+            self.config = Config()
+            self.enabled = self.config.profiling
+            self.directory = self.config.profile_dir
+            self.token = self.config.profile_token
+            self.slow_seconds = self.config.profile_slow_seconds
+            self.capture: Optional[SamplingCapture] = None
+            self.saved_profiles = 0
+            self._lock = threading.Lock()
+            self._profiling = threading.Lock()
+            self._no_profile = _NoProfile(self)
+            self._profile_ids = itertools.count(1)
+            self._capture_requested = threading.Event()
+            self._signal_thread: Optional[threading.Thread] = None
+            self._is_initialized = True
+
+    def is_authorized(self, token: Optional[str]) -> bool:
+        """Whether a request carries the PROFILE_TOKEN, which must be set."""
+        return bool(self.token and token) and hmac.compare_digest(token, self.token)
+
+    def start_capture(
+        self,
+        max_requests: int = 0,
+        seconds: Optional[float] = None,
+        interval: Optional[float] = None,
+    ) -> Optional[SamplingCapture]:
+        """
+        Starts a sampling capture, unless one is running.
+
+        Args:
+            max_requests (int): Requests after which the capture stops, 0 for no limit.
+            seconds (Optional[float]): Seconds after which the capture stops, PROFILE_CAPTURE_SECONDS by default.
+            interval (Optional[float]): Seconds between samples, PROFILE_SAMPLE_INTERVAL by default.
+
+        Returns:
+            Optional[SamplingCapture]: The started capture, or None when one is already running.
+        """
+        with self._lock:
+            if self.capture is not None and self.capture.is_running():
+                return None
+            path = os.path.join(
+                self.directory,
+                f"sample-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.collapsed",
+            )
+            self.capture = SamplingCapture(
+                path,
+                interval or self.config.profile_sample_interval,
+                max_requests,
+                seconds or self.config.profile_capture_seconds,
+            )
+            self.capture.start()
+        self.logger.info(
+            "Sampling stacks to %s for %s requests or %.0f seconds",
+            path,
+            max_requests or "any number of",
+            self.capture.seconds,
+        )
+        return self.capture
+
+    def stop_capture(self):
+        """Stops the running sampling capture, which then writes its stacks."""
+        capture = self.capture
+        if capture is not None:
+            capture.stop()
+
+    def install_signal_handler(self):
+        """
+        Starts a sampling capture of PROFILE_CAPTURE_SECONDS on SIGUSR2. Must be
+        called from the main thread of the process.
+
+        The handler runs on the main thread between two bytecodes, possibly while
+        that thread holds the profiler's lock, so it only sets an event, and a
+        helper thread starts the capture.
+        """
+        if not self.enabled or CAPTURE_SIGNAL is None:
+            return
+        if self._signal_thread is None or not self._signal_thread.is_alive():
+            self._signal_thread = threading.Thread(
+                target=self._capture_on_signal, name="profile-signal", daemon=True
+            )
+            self._signal_thread.start()
+        signal.signal(
+            CAPTURE_SIGNAL, lambda signum, frame: self._capture_requested.set()
+        )
+        self.logger.info(
+            "Send signal %d to pid %d to sample its stacks", CAPTURE_SIGNAL, os.getpid()
+        )
+
+    def _capture_on_signal(self):
+        while True:
+            self._capture_requested.wait()
+            self._capture_requested.clear()
+            self.start_capture()
+
+    def profile_request(self, token: Optional[str] = None):
+        """
+        Returns the context profiling a request with cProfile, when the request
+        carries the PROFILE_TOKEN or slow requests are captured, and otherwise a
+        placeholder counting the request for the sampling capture.
+
+        Args:
+            token (Optional[str]): Value of the X-Profile-Token header of the request.
+        """
+        requested = self.is_authorized(token)
+        if requested or self.slow_seconds > 0:
+            return RequestProfile(self, requested)
+        return self._no_profile
+
+    def request_finished(self):
+        capture = self.capture
+        if capture is not None and capture.is_running():
+            capture.request_finished()
+
+    def save_request_profile(self, profile: cProfile.Profile, duration: float):
+        """Writes the statistics of a profiled request, readable with pstats or snakeviz."""
+        path = os.path.join(
+            self.directory,
+            f"request-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-"
+            f"{next(self._profile_ids)}-{int(duration * 1000)}ms.prof",
+        )
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(path)
+        except OSError as e:
+            self.logger.warning("Could not write the request profile %s: %s", path, e)
+            return
+        with self._lock:
+            self.saved_profiles += 1
+        self.logger.info("Request took %.3f s, profile written to %s", duration, path)
+
+    def metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the state of the latest sampling capture and the number of saved
+        request profiles, or None when profiling is off.
+        """
+        if not self.enabled:
+            return None
+        capture = self.capture
+        return {
+            "directory": self.directory,
+            "slow_seconds": self.slow_seconds,
+            "saved_request_profiles": self.saved_profiles,
+            "capture": capture.to_dict() if capture is not None else None,
+        }
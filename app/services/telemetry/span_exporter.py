@@ -0,0 +1,208 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+import requests
+
+
+class SpanExporter(ABC):
+    """
+    Exports finished spans from a background thread, so request threads only
+    hand them over to a queue.
+
+    Spans are written in batches of up to ``BATCH_SIZE`` spans, at least every
+    ``FLUSH_INTERVAL`` seconds. When the queue is full, for instance because
+    the collector is down, new spans are dropped and counted rather than
+    slowing down the requests. The thread is started on the first export, so
+    every forked worker process runs its own.
+
+    Subclasses implement ``write``.
+
+    Attributes:
+        exported (int): Number of spans written.
+        dropped (int): Number of spans dropped because the queue was full or the write failed.
+    """
+
+    BATCH_SIZE = 512
+    FLUSH_INTERVAL = 1.0
+    MAX_QUEUE = 10000
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.exported = 0
+        self.dropped = 0
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(self.MAX_QUEUE)
+        self._lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def export(self, spans: List[Dict[str, Any]]):
+        """Queues finished spans for export."""
+        self._ensure_running()
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+
+    def _ensure_running(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="span-exporter", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.BATCH_SIZE:
+                    batch.append(self._queue.get(timeout=self.FLUSH_INTERVAL))
+            except queue.Empty:
+                pass
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        try:
+            self.write(batch)
+            self.exported += len(batch)
+        except Exception as e:  # pylint: disable=broad-except
+            self.dropped += len(batch)
+            self.logger.warning("Could not export %d spans: %s", len(batch), e)
+
+    def flush(self):
+        """Writes the queued spans from the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_batch(batch)
+
+    @abstractmethod
+    def write(self, spans: List[Dict[str, Any]]):
+        """Writes a batch of spans."""
+
+    def metrics(self) -> Dict[str, int]:
+        """Returns the number of spans exported, dropped and waiting in the queue."""
+        return {
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+        }
+
+
+class JsonlSpanExporter(SpanExporter):
+    """
+    Appends the spans to a file, one JSON object per line.
+
+    Attributes:
+        path (str): The file the spans are appended to.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+    def write(self, spans: List[Dict[str, Any]]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lines = "".join(json.dumps(span, default=str) + "\n" for span in spans)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(lines)
+
+
+class OtlpSpanExporter(SpanExporter):
+    """
+    Sends the spans to an OpenTelemetry collector with the OTLP/HTTP JSON
+    protocol, e.g. a local collector or Jaeger listening on port 4318.
+
+    Attributes:
+        endpoint (str): URL of the collector's traces endpoint.
+        service_name (str): Service name reported in the resource of the spans.
+    """
+
+    TIMEOUT = 5.0
+    # OTLP span kinds
+    KIND_INTERNAL = 1
+    KIND_SERVER = 2
+    # OTLP status codes
+    STATUS_OK = 1
+    STATUS_ERROR = 2
+
+    def __init__(self, endpoint: str, service_name: str = "nexa"):
+        super().__init__()
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.session = requests.Session()
+
+    def write(self, spans: List[Dict[str, Any]]):
+        body = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            self._attribute("service.name", self.service_name)
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "nexa"},
+                            "spans": [self._otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        response = self.session.post(self.endpoint, json=body, timeout=self.TIMEOUT)
+        response.raise_for_status()
+
+    @classmethod
+    def _otlp_span(cls, span: Dict[str, Any]) -> Dict[str, Any]:
+        attributes = dict(span["attributes"])
+        if span["request_id"]:
+            attributes["alexa.request_id"] = span["request_id"]
+        start = int(span["start"] * 1e9)
+        otlp_span = {
+            "traceId": span["trace_id"],
+            "spanId": span["span_id"],
+            "name": span["name"],
+            "kind": cls.KIND_INTERNAL if span["parent_id"] else cls.KIND_SERVER,
+            "startTimeUnixNano": str(start),
+            "endTimeUnixNano": str(start + int(span["duration"] * 1e9)),
+            "attributes": [
+                cls._attribute(key, value) for key, value in attributes.items()
+            ],
+            "status": (
+                {"code": cls.STATUS_ERROR, "message": span["error"]}
+                if span["error"]
+                else {"code": cls.STATUS_OK}
+            ),
+        }
+        if span["parent_id"]:
+            otlp_span["parentSpanId"] = span["parent_id"]
+        return otlp_span
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        return {"key": key, "value": typed}
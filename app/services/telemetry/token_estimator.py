@@ -0,0 +1,39 @@
+import math
+import re
+from typing import Dict, List
+
+# Words and single punctuation marks
+PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+class TokenEstimator:
+    """
+    Estimates token counts offline for backends that do not report usage.
+
+    Every word or punctuation mark counts as one token per started four
+    characters, which is close to what BPE tokenizers produce for English text.
+    """
+
+    CHARACTERS_PER_TOKEN = 4
+    # Role and separator tokens around every chat message
+    TOKENS_PER_MESSAGE = 4
+    # Tokens that prime the assistant's reply
+    TOKENS_PER_REPLY = 2
+
+    @classmethod
+    def count(cls, text: str) -> int:
+        """Returns the estimated number of tokens of a text."""
+        if not text:
+            return 0
+        return sum(
+            math.ceil(len(piece) / cls.CHARACTERS_PER_TOKEN)
+            for piece in PIECES.findall(text)
+        )
+
+    @classmethod
+    def count_messages(cls, messages: List[Dict[str, str]]) -> int:
+        """Returns the estimated number of prompt tokens of chat messages."""
+        return cls.TOKENS_PER_REPLY + sum(
+            cls.TOKENS_PER_MESSAGE + cls.count(message.get("content") or "")
+            for message in messages
+        )
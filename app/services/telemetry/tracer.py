@@ -0,0 +1,304 @@
+import functools
+import inspect
+import logging
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config.config import Config
+from app.models.singleton import SingletonMeta
+from app.services.telemetry.span_exporter import (
+    JsonlSpanExporter,
+    OtlpSpanExporter,
+    SpanExporter,
+)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Trace:
+    """
+    The spans recorded while handling one Alexa request.
+
+    Attributes:
+        trace_id (str): Random 128-bit id of the trace, in hex.
+        request_id (Optional[str]): The Alexa request id.
+        sampled (bool): Whether the trace was picked by the sample rate.
+        spans (List[Span]): The finished spans.
+        exported (bool): Whether the trace was exported; spans that end later are exported on their own.
+    """
+
+    __slots__ = ("trace_id", "request_id", "sampled", "spans", "exported")
+
+    def __init__(self, request_id: Optional[str], sampled: bool):
+        self.trace_id = os.urandom(16).hex()
+        self.request_id = request_id
+        self.sampled = sampled
+        self.spans: List["Span"] = []
+        self.exported = False
+
+
+class Span:
+    """
+    A timed operation of a trace.
+
+    Attributes:
+        trace (Trace): The trace the span belongs to.
+        span_id (str): Random 64-bit id of the span, in hex.
+        parent_id (Optional[str]): Id of the enclosing span, None for the root span.
+        name (str): Name of the operation.
+        attributes (Dict[str, Any]): Details of the operation, such as the model called.
+        start (float): Wall clock time the span started, in seconds since the epoch.
+        duration (Optional[float]): Seconds the span took, None while it is open.
+        error (Optional[str]): The exception that ended the span, if any.
+    """
+
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_id",
+        "name",
+        "attributes",
+        "start",
+        "duration",
+        "error",
+        "_started",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        trace: Trace,
+        parent_id: Optional[str],
+        name: str,
+        attributes: Dict[str, Any],
+    ):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start = time.time()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self._started = time.perf_counter()
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        """Adds a detail to the span."""
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.duration = time.perf_counter() - self._started
+        if exc_value is not None:
+            self.error = f"{exc_type.__name__}: {exc_value}"
+        _current_span.reset(self._token)
+        Tracer().finish(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the span as a JSON-serializable dictionary."""
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "request_id": self.trace.request_id,
+            "name": self.name,
+            "start": self.start,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoSpan:
+    # Stands in for a span when the request is not traced
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class Tracer(metaclass=SingletonMeta):
+    """
+    Records spans of the Alexa requests and exports them to a JSONL file or to
+    an OpenTelemetry collector.
+
+    Every handler opens a root span carrying the Alexa request id, and the
+    services open child spans, which find their parent in a context variable
+    so the trace follows the request across threads and coroutines.
+
+    A request is traced with the probability TRACE_SAMPLE_RATE. With
+    TRACE_SLOW_SECONDS set, every request is recorded and the requests that
+    were not sampled are still exported when they took at least that long or
+    failed. When tracing is off or a request is not recorded, opening a span
+    costs a context variable lookup.
+
+    Attributes:
+        config (Config): Application configuration.
+        exporter (Optional[SpanExporter]): Exporter of the finished traces, None when tracing is off.
+        sample_rate (float): Fraction of the requests that are traced.
+        slow_seconds (float): Duration from which unsampled requests are exported, 0 to only export sampled ones.
+
+    Example:
+        tracer = Tracer()
+        with tracer.start_trace("WeatherIntent", request_id):
+            with tracer.span("weather.get_overview", location="Paris"):
+                ...
+    """
+
+    _is_initialized = False
+
+    def __init__(self):
+        if not self._is_initialized:  # Prevent reinitialization
+            self.logger = logging.getLogger(__name__)
+            self.config = Config()
+            self.exporter = self.create_exporter()
+            self.sample_rate = self.config.trace_sample_rate
+            self.slow_seconds = self.config.trace_slow_seconds
+            self._lock = threading.Lock()
+            self._traces = 0
+            self._kept = 0
+            self._is_initialized = True
+
+    def create_exporter(self) -> Optional[SpanExporter]:
+        """
+        Creates the exporter selected by TRACE_EXPORTER, or None when tracing is off.
+
+        Raises:
+            ValueError: If the exporter is not "none", "jsonl" or "otlp".
+        """
+        exporter = self.config.trace_exporter
+        if exporter == "none":
+            return None
+        if exporter == "jsonl":
+            self.logger.info("Writing traces to %s", self.config.trace_path)
+            return JsonlSpanExporter(self.config.trace_path)
+        if exporter == "otlp":
+            self.logger.info("Sending traces to %s", self.config.trace_otlp_endpoint)
+            return OtlpSpanExporter(self.config.trace_otlp_endpoint)
+        raise ValueError(f"Unknown trace exporter: {exporter}")
+
+    def start_trace(self, name: str, request_id: Optional[str] = None, **attributes):
+        """
+        Opens the root span of a request, or a placeholder when the request is not
+        recorded.
+
+        Args:
+            name (str): Name of the root span, usually the intent.
+            request_id (Optional[str]): The Alexa request id.
+            **attributes: Details of the request.
+        """
+        if self.exporter is None:
+            return NO_SPAN
+        sampled = random.random() < self.sample_rate
+        if not sampled and self.slow_seconds <= 0:
+            return NO_SPAN
+        if request_id:
+            attributes["alexa.request_id"] = request_id
+        return Span(Trace(request_id, sampled), None, name, attributes)
+
+    @staticmethod
+    def span(name: str, **attributes):
+        """
+        Opens a child span of the current span, or a placeholder when the request
+        is not recorded.
+        """
+        parent = _current_span.get()
+        if parent is None:
+            return NO_SPAN
+        return Span(parent.trace, parent.span_id, name, attributes)
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        """Returns the innermost open span of the request, if it is recorded."""
+        return _current_span.get()
+
+    def finish(self, span: Span):
+        """Adds a finished span to its trace, and exports the trace when it was the root span."""
+        trace = span.trace
+        with self._lock:
+            if trace.exported:
+                # The request already ended, e.g. an abandoned function call finished
+                finished = [span]
+            else:
+                trace.spans.append(span)
+                if span.parent_id is not None:
+                    return
+                keep = (
+                    trace.sampled
+                    or span.error is not None
+                    or span.duration >= self.slow_seconds
+                )
+                self._traces += 1
+                self._kept += keep
+                trace.exported = keep
+                finished, trace.spans = (trace.spans if keep else []), []
+        if finished:
+            self.exporter.export(
+                [finished_span.to_dict() for finished_span in finished]
+            )
+
+    def metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the number of recorded and exported traces and the exporter's
+        counters, or None when tracing is off.
+        """
+        if self.exporter is None:
+            return None
+        with self._lock:
+            return {
+                "sample_rate": self.sample_rate,
+                "slow_seconds": self.slow_seconds,
+                "recorded_traces": self._traces,
+                "exported_traces": self._kept,
+                "spans": self.exporter.metrics(),
+            }
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """
+    Decorates a function or coroutine function so every call is a child span of
+    the current span.
+
+    Args:
+        name (str): Name of the span.
+
+    Example:
+        @traced("weather.get_weather_forecast")
+        def get_weather_forecast(self, duration="today", location=None): ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with Tracer.span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
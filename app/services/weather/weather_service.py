@@ -1,12 +1,17 @@
+import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+from flask import render_template
 
 from app.apis.open_weather_map_api import OpenWeatherMapAPI
 from app.config.config import Config
 from app.helpers.weather_helpers import WeatherHelpers
+from app.models.deadline import Deadline
 from app.models.intent_response import IntentResponse, IntentResponseDetails
 from app.services.ai.ai_service_instance import AIServiceSingleton
+from app.services.telemetry.tracer import traced
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -15,6 +20,11 @@ logger = logging.getLogger(__name__)
 class WeatherService:
     """
     A service class to handle weather forecast processing.
+
+    The ``_async`` methods serve the asyncio request path; they issue independent
+    OpenWeatherMap requests concurrently instead of one after the other. Every
+    public method is traced as a span of the request. When no model can summarize
+    the weather in time, the canned weather_unavailable message is spoken instead.
     """
 
     def __init__(self, api_key: Optional[str] = None):
@@ -25,6 +35,7 @@ class WeatherService:
         self.api = OpenWeatherMapAPI(api_key)
         self.config = Config()
 
+    @traced("weather.handle_weather_forecast")
     def handle_weather_forecast(self, slots: Dict[str, Any]) -> str:
         """
         Handle the weather forecast by retrieving weather parameters from the slots object
@@ -74,15 +85,18 @@ class WeatherService:
         # Return the OpenAI prompt
         return openai_prompt
 
+    @traced("weather.get_weather_forecast")
     def get_weather_forecast(
         self,
         duration: str = "today",
         location: str = None,
         start_date: str = None,
         weather_condition: str = None,
+        deadline: Deadline = None,
     ) -> str:
         """
-        Fetches weather data from the service API for the given duration starting from a specific date and filtered by weather condition.
+        Fetches weather data from the service API for the given duration starting from a specific date and filtered by weather condition,
+        and has the AI turn it into the spoken forecast.
 
         Args:
             duration (str): Specifies when the weather forecast is for.
@@ -108,6 +122,7 @@ class WeatherService:
             weather_condition (str): Optional string specifying the type of weather condition to filter the forecast by.
                                      Examples: "rain", "snow", "fog".
                                      If not provided, forecasts for all weather conditions will be returned.
+            deadline (Deadline): Optional deadline of the request. Defaults to the current deadline.
 
         Returns:
             str: The weather data for the specified duration, location, start date, and weather condition.
@@ -121,53 +136,21 @@ class WeatherService:
         """
         if location is None:
             location = self.config.public_location  # Default location if none provided
-
-        if duration not in ["today", "tomorrow", "week"]:
-            return IntentResponse(
-                request="get_weather_forecast",
-                details=IntentResponseDetails(
-                    status="error",
-                    data="Unsupported duration value. Accepted values are 'today', 'tomorrow', and 'week'.",
-                    timestamp=datetime.now().isoformat(),
-                ),
-            )
-
         if start_date is None:
-            start_date = datetime.now().strftime(
-                "%Y-%m-%d"
-            )  # Default to today's date if not provided
+            start_date = datetime.now().strftime("%Y-%m-%d")
 
-        try:
-            datetime.strptime(start_date, "%Y-%m-%d")  # Validate date format
-        except ValueError:
-            return IntentResponse(
-                request="get_weather_forecast",
-                details=IntentResponseDetails(
-                    status="error",
-                    data="Invalid date format. Expected format is 'YYYY-MM-DD'.",
-                    timestamp=datetime.now().isoformat(),
-                ),
-            )
+        error_response = self._validate_arguments(
+            "get_weather_forecast", "duration", duration, start_date
+        )
+        if error_response is not None:
+            return error_response
 
         try:
-            # Determine location
-            lat = 0
-            lon = 0
-
-            if location == self.config.public_location:
-                ip_info = self.config.public_ip_info
-                lat = ip_info.latitude
-                lon = ip_info.longitude
-            else:
-                # Geocode the location to get latitude and longitude
-                geocode_data = WeatherHelpers.geocode_location(location, self.api)
-                lat = geocode_data.get("lat")
-                lon = geocode_data.get("lon")
-
+            lat, lon = self._get_coordinates(location)
             weather_overview = self.api.get_overview(lat, lon)
 
             openai_prompt = WeatherHelpers.generate_overview_prompt(
-                overview_data=weather_overview
+                overview_data=weather_overview, weather_condition=weather_condition
             )
             # response = requests.get(self.base_url, params=params, timeout=10)
             # response.raise_for_status()
@@ -195,14 +178,11 @@ class WeatherService:
             # )
             logger.info("Weather data fetched successfully.")
 
-            return IntentResponse(
-                request="get_weather_forecast",
-                details=IntentResponseDetails(
-                    status="success",
-                    data=openai_prompt,
-                    timestamp=datetime.now().isoformat(),
-                ),
+            ai_service = AIServiceSingleton().get_instance()
+            ai_response = ai_service.prompt_the_ai(
+                openai_prompt, template="weather_overview", deadline=deadline
             )
+            return self._summary_response("get_weather_forecast", ai_response)
 
         except ValueError as e:
             logger.error("Error fetching weather data: %s", e)
@@ -215,13 +195,17 @@ class WeatherService:
                 ),
             )
 
-    def handle_weather_temperature(self, slots: Dict[str, Any]) -> str:
+    @traced("weather.handle_weather_temperature")
+    def handle_weather_temperature(
+        self, slots: Dict[str, Any], deadline: Deadline = None
+    ) -> str:
         """
         Handle the weather temperature by retrieving weather parameters from the slots object
         and creating a human-readable OpenAI prompt.
 
         Parameters:
         slots (Dict[str, Any]): Dictionary containing slot data.
+        deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
 
         Returns:
         str: Human-readable weather forecast response.
@@ -233,7 +217,10 @@ class WeatherService:
         location = WeatherHelpers.determine_location(weather_params)
 
         return self.get_weather_temperature(
-            "today", location=location, start_date=weather_params["start_date"]
+            "today",
+            location=location,
+            start_date=weather_params["start_date"],
+            deadline=deadline,
         )
         # # Fetch weather data from OpenWeatherMap API
         # # weather_data = self.api.get_weather(lat, lon)
@@ -255,8 +242,13 @@ class WeatherService:
         # # Return the OpenAI prompt
         # return openai_prompt
 
+    @traced("weather.get_weather_temperature")
     def get_weather_temperature(
-        self, when: str = "today", location: str = None, start_date: str = None
+        self,
+        when: str = "today",
+        location: str = None,
+        start_date: str = None,
+        deadline: Deadline = None,
     ) -> str:
         """
         Fetches weather temperature from the service API for the given duration.
@@ -278,6 +270,7 @@ class WeatherService:
                             - "New York, US"
             start_date (str): Optional string specifying the start date for the temperature forecast in the format 'YYYY-MM-DD'.
                               Defaults to today's date if not provided.
+            deadline (Deadline): Optional deadline of the request. Defaults to the current deadline.
 
         Returns:
             str: The temperature data for the specified duration and location.
@@ -291,48 +284,254 @@ class WeatherService:
         """
         if location is None:
             location = self.config.public_location  # Default location if none provided
+        if start_date is None:
+            start_date = datetime.now().strftime("%Y-%m-%d")
+
+        error_response = self._validate_arguments(
+            "get_weather_temperature", "when", when, start_date
+        )
+        if error_response is not None:
+            return error_response
+
+        try:
+            lat, lon = self._get_coordinates(location)
+            weather_current = self.api.get_weather(lat, lon)
+            weather_summary = self.api.get_summary(lat, lon, start_date)
+
+            temperature_prompt = WeatherHelpers.generate_temperature_prompt(
+                current_data=weather_current, summary_data=weather_summary
+            )
+            logger.info(
+                "Temperature data fetched successfully for location: %s, when: %s",
+                location,
+                when,
+            )
 
-        if when.lower() not in ["today", "tomorrow", "week"]:
+            ai_service = AIServiceSingleton().get_instance()
+            ai_response = ai_service.prompt_the_ai(
+                temperature_prompt, template="weather_temperature", deadline=deadline
+            )
+            return self._summary_response("get_weather_temperature", ai_response)
+
+        except ValueError as e:
+            logger.error("Error fetching temperature data: %s", e)
             return IntentResponse(
                 request="get_weather_temperature",
                 details=IntentResponseDetails(
                     status="error",
-                    data="Unsupported when value. Accepted values are 'today', 'tomorrow', and 'week'.",
+                    data=f"Error fetching temperature data: {e}",
                     timestamp=datetime.now().isoformat(),
                 ),
             )
 
+    @staticmethod
+    def _summary_response(request: str, ai_response: Optional[str]) -> IntentResponse:
+        """
+        Returns the AI's spoken summary, or the canned weather_unavailable message
+        when no model answered: none fit the deadline or all of them failed.
+        """
+        if not ai_response:
+            logger.warning("No summary generated for %s", request)
+            return IntentResponse(
+                request=request,
+                details=IntentResponseDetails(
+                    status="timeout",
+                    data=render_template("weather_unavailable"),
+                    timestamp=datetime.now().isoformat(),
+                ),
+            )
+        return IntentResponse(
+            request=request,
+            details=IntentResponseDetails(
+                status="success",
+                data=ai_response.strip(),
+                timestamp=datetime.now().isoformat(),
+            ),
+        )
+
+    def _get_coordinates(self, location: str) -> Tuple[float, float]:
+        if location == self.config.public_location:
+            ip_info = self.config.public_ip_info
+            return ip_info.latitude, ip_info.longitude
+
+        # Geocode the location to get latitude and longitude
+        geocode_data = WeatherHelpers.geocode_location(location, self.api)
+        return geocode_data.get("lat"), geocode_data.get("lon")
+
+    async def _get_coordinates_async(self, location: str) -> Tuple[float, float]:
+        if location == self.config.public_location:
+            ip_info = self.config.public_ip_info
+            return ip_info.latitude, ip_info.longitude
+
+        geocode_data = await WeatherHelpers.geocode_location_async(location, self.api)
+        return geocode_data.get("lat"), geocode_data.get("lon")
+
+    @staticmethod
+    def _validate_arguments(
+        request: str, value_name: str, value: str, start_date: str
+    ) -> Optional[IntentResponse]:
+        """
+        Returns an error response when the duration or start date is not supported.
+        """
+        message = None
+        if value.lower() not in ["today", "tomorrow", "week"]:
+            message = f"Unsupported {value_name} value. Accepted values are 'today', 'tomorrow', and 'week'."
+        else:
+            try:
+                datetime.strptime(start_date, "%Y-%m-%d")  # Validate date format
+            except ValueError:
+                message = "Invalid date format. Expected format is 'YYYY-MM-DD'."
+
+        if message is None:
+            return None
+        return IntentResponse(
+            request=request,
+            details=IntentResponseDetails(
+                status="error",
+                data=message,
+                timestamp=datetime.now().isoformat(),
+            ),
+        )
+
+    @traced("weather.get_weather_forecast")
+    async def get_weather_forecast_async(
+        self,
+        duration: str = "today",
+        location: str = None,
+        start_date: str = None,
+        weather_condition: str = None,
+        deadline: Deadline = None,
+    ) -> IntentResponse:
+        """
+        Asynchronous variant of get_weather_forecast.
+
+        Args:
+            duration (str): Specifies when the weather forecast is for: "today", "tomorrow" or "week".
+            location (str): Optional location for the weather forecast. Defaults to the public ip_location.
+            start_date (str): Optional start date in the format 'YYYY-MM-DD'. Defaults to today's date.
+            weather_condition (str): Optional weather condition to filter the forecast by.
+            deadline (Deadline): Optional deadline of the request. Defaults to the current deadline.
+
+        Returns:
+            IntentResponse: The spoken weather forecast, or an error response.
+        """
+        if location is None:
+            location = self.config.public_location
         if start_date is None:
-            start_date = datetime.now().strftime(
-                "%Y-%m-%d"
-            )  # Default to today's date if not provided
+            start_date = datetime.now().strftime("%Y-%m-%d")
+
+        error_response = self._validate_arguments(
+            "get_weather_forecast", "duration", duration, start_date
+        )
+        if error_response is not None:
+            return error_response
 
         try:
-            datetime.strptime(start_date, "%Y-%m-%d")  # Validate date format
-        except ValueError:
+            lat, lon = await self._get_coordinates_async(location)
+            weather_overview = await self.api.get_overview_async(lat, lon)
+
+            openai_prompt = WeatherHelpers.generate_overview_prompt(
+                overview_data=weather_overview, weather_condition=weather_condition
+            )
+            logger.info("Weather data fetched successfully.")
+
+            ai_service = AIServiceSingleton().get_instance()
+            ai_response = await ai_service.prompt_the_ai_async(
+                openai_prompt, template="weather_overview", deadline=deadline
+            )
+            return self._summary_response("get_weather_forecast", ai_response)
+        except ValueError as e:
+            logger.error("Error fetching weather data: %s", e)
             return IntentResponse(
-                request="get_weather_temperature",
+                request="get_weather_forecast",
                 details=IntentResponseDetails(
                     status="error",
-                    data="Invalid date format. Expected format is 'YYYY-MM-DD'.",
+                    data="Error fetching weather data.",
                     timestamp=datetime.now().isoformat(),
                 ),
             )
 
-        try:
-            # Determine location
-            lat, lon = 0, 0
+    @traced("weather.handle_weather_forecast")
+    async def handle_weather_forecast_async(self, slots: Dict[str, Any]) -> str:
+        """
+        Asynchronous variant of handle_weather_forecast.
 
-            if location == self.config.public_location:
-                ip_info = self.config.public_ip_info
-                lat, lon = ip_info.latitude, ip_info.longitude
-            else:
-                # Geocode the location to get latitude and longitude
-                geocode_data = WeatherHelpers.geocode_location(location, self.api)
-                lat, lon = geocode_data.get("lat"), geocode_data.get("lon")
+        Parameters:
+        slots (Dict[str, Any]): Dictionary containing slot data.
 
-            weather_current = self.api.get_weather(lat, lon)
-            weather_summary = self.api.get_summary(lat, lon, start_date)
+        Returns:
+        str: Human-readable weather forecast response.
+        """
+        weather_params = WeatherHelpers.get_weather_parameters(slots)
+        location = WeatherHelpers.determine_location(weather_params)
+
+        lat, lon = await self._get_coordinates_async(location)
+        weather_overview = await self.api.get_overview_async(lat, lon)
+
+        return WeatherHelpers.generate_overview_prompt(overview_data=weather_overview)
+
+    @traced("weather.handle_weather_temperature")
+    async def handle_weather_temperature_async(
+        self, slots: Dict[str, Any], deadline: Deadline = None
+    ) -> IntentResponse:
+        """
+        Asynchronous variant of handle_weather_temperature.
+
+        Parameters:
+        slots (Dict[str, Any]): Dictionary containing slot data.
+        deadline (Deadline, optional): The deadline of the request. Defaults to the current deadline.
+
+        Returns:
+        IntentResponse: The temperature response.
+        """
+        weather_params = WeatherHelpers.get_weather_parameters(slots)
+        location = WeatherHelpers.determine_location(weather_params)
+
+        return await self.get_weather_temperature_async(
+            "today",
+            location=location,
+            start_date=weather_params["start_date"],
+            deadline=deadline,
+        )
+
+    @traced("weather.get_weather_temperature")
+    async def get_weather_temperature_async(
+        self,
+        when: str = "today",
+        location: str = None,
+        start_date: str = None,
+        deadline: Deadline = None,
+    ) -> IntentResponse:
+        """
+        Asynchronous variant of get_weather_temperature. The current weather and the
+        daily summary are fetched concurrently.
+
+        Args:
+            when (str): Specifies when the temperature forecast is for: "today", "tomorrow" or "week".
+            location (str): Optional location for the weather temperature. Defaults to the public ip_location.
+            start_date (str): Optional start date in the format 'YYYY-MM-DD'. Defaults to today's date.
+            deadline (Deadline): Optional deadline of the request. Defaults to the current deadline.
+
+        Returns:
+            IntentResponse: The temperature data for the specified duration and location.
+        """
+        if location is None:
+            location = self.config.public_location
+        if start_date is None:
+            start_date = datetime.now().strftime("%Y-%m-%d")
+
+        error_response = self._validate_arguments(
+            "get_weather_temperature", "when", when, start_date
+        )
+        if error_response is not None:
+            return error_response
+
+        try:
+            lat, lon = await self._get_coordinates_async(location)
+            weather_current, weather_summary = await asyncio.gather(
+                self.api.get_weather_async(lat, lon),
+                self.api.get_summary_async(lat, lon, start_date),
+            )
 
             temperature_prompt = WeatherHelpers.generate_temperature_prompt(
                 current_data=weather_current, summary_data=weather_summary
@@ -344,15 +543,10 @@ class WeatherService:
             )
 
             ai_service = AIServiceSingleton().get_instance()
-            ai_response = ai_service.prompt_the_ai(temperature_prompt)
-            return IntentResponse(
-                request="get_weather_temperature",
-                details=IntentResponseDetails(
-                    status="success",
-                    data=ai_response.strip(),
-                    timestamp=datetime.now().isoformat(),
-                ),
+            ai_response = await ai_service.prompt_the_ai_async(
+                temperature_prompt, template="weather_temperature", deadline=deadline
             )
+            return self._summary_response("get_weather_temperature", ai_response)
 
         except ValueError as e:
             logger.error("Error fetching temperature data: %s", e)
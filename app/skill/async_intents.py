@@ -0,0 +1,144 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from flask import render_template
+
+from app.config.config import Config
+from app.models.deadline import Deadline
+from app.services.alexa.progressive_response_service import (
+    ProgressiveResponseService,
+)
+from app.services.intents_service import PROMPTED_MESSAGES, IntentsService
+from app.services.session.session_store import SessionStore
+from app.services.telemetry.metrics_registry import MetricsRegistry
+from app.services.telemetry.tracer import Tracer
+
+# Set up a logger for this module
+logger = logging.getLogger(__name__)
+
+WEATHER_INTENTS = (
+    "AMAZON.SearchAction<object@WeatherForecast>",
+    "AMAZON.SearchAction<object@WeatherForecast[weatherCondition]>",
+    "WeatherIntent",
+)
+TEMPERATURE_INTENT = "AMAZON.SearchAction<object@WeatherForecast[temperature]>"
+
+
+class AsyncIntentDispatcher:
+    """
+    Dispatches Alexa request envelopes to the asynchronous intent handlers.
+
+    This is the asyncio counterpart of the Flask-Ask handlers in ``intents.py``:
+    the same intents are answered with the same templates, deadlines and
+    progressive responses, but every handler is a coroutine, so a single event
+    loop can keep many requests in flight while they wait on the backends.
+
+    The dispatcher expects to run inside a Flask app context so the templates
+    can be rendered.
+
+    Attributes:
+        config (Config): Application configuration.
+        sessions (SessionStore): Store of the per-session assistant state.
+        metrics (MetricsRegistry): Registry the requests are measured in.
+        tracer (Tracer): Tracer the requests are traced with.
+    """
+
+    def __init__(self):
+        self.config = Config()
+        self.sessions = SessionStore()
+        self.metrics = MetricsRegistry()
+        self.tracer = Tracer()
+
+    async def dispatch(self, envelope: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Handles an Alexa request envelope.
+
+        Parameters:
+            envelope (Dict[str, Any]): The parsed JSON body of the Alexa request.
+
+        Returns:
+            Dict[str, str]: The response payload with its "type" and "response" text.
+
+        Example:
+            dispatcher = AsyncIntentDispatcher()
+            payload = await dispatcher.dispatch(envelope)
+        """
+        request = envelope.get("request", {})
+        request_type = request.get("type")
+
+        session_id = envelope.get("session", {}).get("sessionId")
+        intent_name = (
+            request.get("intent", {}).get("name")
+            if request_type == "IntentRequest"
+            else request_type
+        ) or "unknown"
+
+        with self.metrics.request(intent_name), self.tracer.start_trace(
+            intent_name, request.get("requestId"), session_id=session_id
+        ), Deadline(self.config.request_budget) as deadline, self.sessions.session(
+            session_id
+        ):
+            if request_type == "LaunchRequest":
+                return await IntentsService.get_launch_message_async(deadline)
+
+            if request_type == "SessionEndedRequest":
+                try:
+                    return await IntentsService.get_prompted_message_async(
+                        request_type, deadline
+                    )
+                finally:
+                    self.sessions.end(session_id)
+
+            if request_type == "IntentRequest":
+                intent = request.get("intent", {})
+                handler = self._get_intent_handler(intent.get("name"))
+                if handler is not None:
+                    return await handler(envelope, intent.get("slots") or {}, deadline)
+
+            logger.warning("Unhandled request type %s", request_type)
+            return await IntentsService.get_prompted_message_async(
+                "AMAZON.FallbackIntent", deadline
+            )
+
+    def _get_intent_handler(
+        self, intent_name: Optional[str]
+    ) -> Optional[Callable[..., Awaitable[Dict[str, str]]]]:
+        if intent_name == self.config.intent:
+            return self._handle_query
+        if intent_name in WEATHER_INTENTS:
+            return self._handle_weather_forecast
+        if intent_name == TEMPERATURE_INTENT:
+            return self._handle_weather_temperature
+        if intent_name in PROMPTED_MESSAGES:
+            return lambda envelope, slots, deadline: (
+                IntentsService.get_prompted_message_async(intent_name, deadline)
+            )
+        return None
+
+    async def _handle_query(self, envelope, slots, deadline):
+        query = (slots.get("query") or {}).get("value")
+        self._send_progressive_response(envelope, "progressive_query")
+        return await IntentsService.handle_request_async({"request": query}, deadline)
+
+    async def _handle_weather_forecast(self, envelope, slots, deadline):
+        self._send_progressive_response(envelope, "progressive_weather")
+        return await IntentsService.handle_weather_forecast_async(
+            {"request": slots}, deadline
+        )
+
+    async def _handle_weather_temperature(self, envelope, slots, deadline):
+        self._send_progressive_response(envelope, "progressive_temperature")
+        return await IntentsService.handle_weather_temperature_async(
+            {"request": slots}, deadline
+        )
+
+    @staticmethod
+    def _send_progressive_response(envelope: Dict[str, Any], template_name: str):
+        # Let the user hear something while a slow intent is computed
+        system = envelope.get("context", {}).get("System", {})
+        ProgressiveResponseService().send_speech(
+            request_id=envelope.get("request", {}).get("requestId"),
+            api_endpoint=system.get("apiEndpoint"),
+            api_access_token=system.get("apiAccessToken"),
+            speech=render_template(template_name),
+        )
@@ -1,14 +1,22 @@
 import json
 import logging
 from collections import defaultdict
+from contextlib import contextmanager
 from typing import Any, Dict, Optional
 
-from flask import Blueprint
+from flask import Blueprint, render_template
 from flask_ask import Ask
 
 from app.config.config import Config
+from app.models.deadline import Deadline
+from app.services.alexa.progressive_response_service import (
+    ProgressiveResponseService,
+)
 from app.services.intents_service import IntentsService
+from app.services.session.session_store import SessionStore
 from app.services.response_service import ResponseService
+from app.services.telemetry.metrics_registry import MetricsRegistry
+from app.services.telemetry.tracer import Tracer
 
 # Create a Blueprint named "api"
 api_bp = Blueprint("api", __name__)
@@ -24,19 +32,55 @@ logger = logging.getLogger(__name__)
 def create_intent_handlers(app):
     config = Config()
 
+    sessions = SessionStore()
+
+    metrics = MetricsRegistry()
+
+    tracer = Tracer()
+
     # Initialize Flask-Ask with the Flask app and blueprint
     ask = Ask(app, "/", api_bp)
 
+    def current_session_id():
+        return getattr(ask.session, "sessionId", None)
+
+    @contextmanager
+    def handling(intent_name):
+        # Every request is measured and traced, and runs with its deadline and
+        # session state
+        with metrics.request(intent_name), tracer.start_trace(
+            intent_name,
+            getattr(ask.request, "requestId", None),
+            session_id=current_session_id(),
+        ), Deadline(config.request_budget) as deadline, sessions.session(
+            current_session_id()
+        ):
+            yield deadline
+
+    def send_progressive_response(template_name):
+        # Let the user hear something while a slow intent is computed
+        system = ask.context.System
+        ProgressiveResponseService().send_speech(
+            request_id=ask.request.requestId,
+            api_endpoint=getattr(system, "apiEndpoint", None),
+            api_access_token=getattr(system, "apiAccessToken", None),
+            speech=render_template(template_name),
+        )
+
     # Define the launch request handler
     @ask.launch
     def launch():
-        response_payload = IntentsService.get_launch_message()
+        with handling("LaunchRequest") as deadline:
+            response_payload = IntentsService.get_launch_message(deadline)
         return ResponseService.handle_response(response_payload)
 
     # Define the fallback intent handler
     @ask.intent("AMAZON.FallbackIntent")
     def fallback():
-        response_payload = IntentsService.get_fallback_message()
+        with handling("AMAZON.FallbackIntent") as deadline:
+            response_payload = IntentsService.get_prompted_message(
+                "AMAZON.FallbackIntent", deadline
+            )
         return ResponseService.handle_response(response_payload)
 
     # Define the custom intent handler dynamically
@@ -44,37 +88,55 @@ def create_intent_handlers(app):
     def custom_intent(query):
         user_request = query
         payload = {"request": user_request}
-        response_data = IntentsService.handle_request(payload)
+        with handling(config.intent) as deadline:
+            send_progressive_response("progressive_query")
+            response_data = IntentsService.handle_request(payload, deadline)
         return ResponseService.handle_response(response_data)
 
     # Define a handler for another intent (e.g., GoodbyeIntent)
     @ask.intent("GoodbyeIntent")
     def goodbye():
-        response_payload = IntentsService.get_goodbye_message()
+        with handling("GoodbyeIntent") as deadline:
+            response_payload = IntentsService.get_prompted_message(
+                "GoodbyeIntent", deadline
+            )
         return ResponseService.handle_response(response_payload)
 
     # Define a handler for session ended request handler
     @ask.session_ended
     def session_ended():
-        response_payload = IntentsService.get_session_ended_message()
+        with handling("SessionEndedRequest") as deadline:
+            response_payload = IntentsService.get_prompted_message(
+                "SessionEndedRequest", deadline
+            )
+        sessions.end(current_session_id())
         return ResponseService.handle_response(response_payload)
 
     # Define a handler for another custom intent (e.g., HelpIntent)
     @ask.intent("AMAZON.HelpIntent")
     def help_intent():
-        response_payload = IntentsService.get_help_message()
+        with handling("AMAZON.HelpIntent") as deadline:
+            response_payload = IntentsService.get_prompted_message(
+                "AMAZON.HelpIntent", deadline
+            )
         return ResponseService.handle_response(response_payload)
 
     # Define a handler for a custom intent (e.g., StopIntent)
     @ask.intent("AMAZON.StopIntent")
     def stop():
-        response_payload = IntentsService.get_stop_message()
+        with handling("AMAZON.StopIntent") as deadline:
+            response_payload = IntentsService.get_prompted_message(
+                "AMAZON.StopIntent", deadline
+            )
         return ResponseService.handle_response(response_payload)
 
     # Define a handler for a custom intent (e.g., CancelIntent)
     @ask.intent("AMAZON.CancelIntent")
     def cancel():
-        response_payload = IntentsService.get_cancel_message()
+        with handling("AMAZON.CancelIntent") as deadline:
+            response_payload = IntentsService.get_prompted_message(
+                "AMAZON.CancelIntent", deadline
+            )
         return ResponseService.handle_response(response_payload)
 
     # Define a handler for weather condition (e.g., CancelIntent)
@@ -83,7 +145,9 @@ def create_intent_handlers(app):
         request = ask.request
         intent = request.intent
         payload = {"request": intent.slots}
-        response_data = IntentsService.handle_weather_forecast(payload)
+        with handling("AMAZON.SearchAction<object@WeatherForecast>") as deadline:
+            send_progressive_response("progressive_weather")
+            response_data = IntentsService.handle_weather_forecast(payload, deadline)
         return ResponseService.handle_response(response_data)
 
     @ask.intent("AMAZON.SearchAction<object@WeatherForecast[weatherCondition]>")
@@ -91,7 +155,11 @@ def create_intent_handlers(app):
         request = ask.request
         intent = request.intent
         payload = {"request": intent.slots}
-        response_data = IntentsService.handle_weather_forecast(payload)
+        with handling(
+            "AMAZON.SearchAction<object@WeatherForecast[weatherCondition]>"
+        ) as deadline:
+            send_progressive_response("progressive_weather")
+            response_data = IntentsService.handle_weather_forecast(payload, deadline)
         return ResponseService.handle_response(response_data)
 
     @ask.intent("AMAZON.SearchAction<object@WeatherForecast[temperature]>")
@@ -99,7 +167,11 @@ def create_intent_handlers(app):
         request = ask.request
         intent = request.intent
         payload = {"request": intent.slots}
-        response_data = IntentsService.handle_weather_temperature(payload)
+        with handling(
+            "AMAZON.SearchAction<object@WeatherForecast[temperature]>"
+        ) as deadline:
+            send_progressive_response("progressive_temperature")
+            response_data = IntentsService.handle_weather_temperature(payload, deadline)
         return ResponseService.handle_response(response_data)
 
     @ask.intent("WeatherIntent")
@@ -107,7 +179,9 @@ def create_intent_handlers(app):
         request = ask.request
         intent = request.intent
         payload = {"request": intent.slots}
-        response_data = IntentsService.handle_weather_forecast(payload)
+        with handling("WeatherIntent") as deadline:
+            send_progressive_response("progressive_weather")
+            response_data = IntentsService.handle_weather_forecast(payload, deadline)
         return ResponseService.handle_response(response_data)
 
 
@@ -0,0 +1,111 @@
+"""
+Benchmark of the throughput of AIService.get_responses_batch compared with
+sending the same prompts one after the other.
+
+The model backend is the chat stand-in of ``benchmarks.standins``, answering
+after a fixed latency and serving a limited number of requests at once, like a
+local inference server, so the benchmark runs without network access.
+
+Usage:
+    python -m benchmarks.bench_batch_throughput --prompts 32 --latency 0.2 --slots 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+# The stand-in has no use for the answer cache, and must not write one
+os.environ.setdefault("SEMANTIC_CACHE_SIZE", "0")
+
+# pylint: disable=wrong-import-position
+from app.apis.ip_resolver import IPResolver
+from app.models.ip_info import IPInfo
+from app.services.ai.ai_service import AIService
+from benchmarks.standins import StandIn, chat_handler, start_server
+
+MODEL = "bench"
+
+
+def create_service(port: int, slots: int) -> AIService:
+    # The benchmark runs offline; the location is not used by the model calls
+    IPResolver.get_public_ip_info = lambda self: IPInfo(
+        ip="127.0.0.1",
+        hostname=None,
+        city="Benchmark",
+        region="Local",
+        country="XX",
+        latitude=0.0,
+        longitude=0.0,
+    )
+    configs = [
+        {
+            "description": "Benchmark stand-in",
+            "base_url": f"http://127.0.0.1:{port}/v1",
+            "api_key": "bench",
+            "model": MODEL,
+            "max_concurrency": slots,
+            "max_queue": slots,
+        }
+    ]
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+        json.dump(configs, file)
+    try:
+        return AIService(file.name)
+    finally:
+        os.unlink(file.name)
+
+
+def run_sequential(service: AIService, prompts: list) -> list:
+    return [service.batches.result(prompt, MODEL) for prompt in prompts]
+
+
+def run_batch(service: AIService, prompts: list) -> list:
+    return service.get_responses_batch(prompts, MODEL)
+
+
+def run_batch_async(service: AIService, prompts: list) -> list:
+    return asyncio.run(service.get_responses_batch_async(prompts, MODEL))
+
+
+SCENARIOS = {
+    "sequential": run_sequential,
+    "batch": run_batch,
+    "batch async": run_batch_async,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched prompts.")
+    parser.add_argument("--prompts", "-n", type=int, default=32)
+    parser.add_argument("--latency", "-l", type=float, default=0.2)
+    parser.add_argument("--slots", "-s", type=int, default=4)
+    parser.add_argument("--port", "-p", type=int, default=18090)
+    args = parser.parse_args()
+
+    server = start_server(
+        StandIn("chat", chat_handler, args.latency, slots=args.slots), args.port
+    )
+    service = create_service(args.port, args.slots)
+    prompts = [
+        f"Write a one sentence fact about the number {i}." for i in range(args.prompts)
+    ]
+    # Connection setup and the first latency samples are not part of the measurement
+    run_sequential(service, prompts[:2])
+
+    for name, run in SCENARIOS.items():
+        started = time.perf_counter()
+        results = run(service, prompts)
+        seconds = time.perf_counter() - started
+        errors = sum(not result.ok for result in results)
+        print(
+            f"{name:<12} {seconds:7.2f} s  {len(prompts) / seconds:7.1f} prompts/s  "
+            f"{errors} errors"
+        )
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+End-to-end latency benchmark of the skill.
+
+The Host app is booted in-process against the local stand-ins of
+``benchmarks.standins``, so the benchmark runs without network access. The
+recorded Alexa requests in ``benchmarks/data/alexa`` are replayed one corpus
+entry at a time, each with a fresh request id, session and timestamp, and the
+p50, p95 and p99 latency and the throughput are reported per entry.
+
+In ``sync`` mode the requests go through the Flask-Ask handlers with the Flask
+test client, from a pool of threads. In ``async`` mode they go through the
+ASGI app served by ``run.py --mode async``, as concurrent coroutines.
+
+The results are written to JSON. Passing the results of an earlier run with
+``--baseline`` prints the change of every percentile, to compare commits.
+
+Usage:
+    python -m benchmarks.bench_end_to_end --mode async --requests 100 --concurrency 10
+    python -m benchmarks.bench_end_to_end --latency chat=0.8 --errors owm=0.05 --output after.json --baseline before.json
+"""
+
+import argparse
+import asyncio
+import copy
+import glob
+import json
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.standins import (
+    DATA_DIR,
+    add_standin_arguments,
+    model_configs,
+    serve_standins,
+    standin_environment,
+)
+
+PERCENTILES = (50, 95, 99)
+
+
+def load_corpus(directory: str, names: Optional[List[str]] = None) -> Dict[str, dict]:
+    """Returns the recorded Alexa requests by file name, without the extension."""
+    corpus = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if names and name not in names:
+            continue
+        with open(path, encoding="utf-8") as file:
+            corpus[name] = json.load(file)
+    return corpus
+
+
+def fresh_request(envelope: dict) -> dict:
+    """Returns a copy of a recorded request with a new request id, session and timestamp."""
+    envelope = copy.deepcopy(envelope)
+    unique = uuid.uuid4().hex
+    envelope["session"]["sessionId"] = f"amzn1.echo-api.session.{unique}"
+    envelope["request"]["requestId"] = f"amzn1.echo-api.request.{unique}"
+    envelope["request"]["timestamp"] = datetime.now(timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%SZ"
+    )
+    return envelope
+
+
+def intent_of(envelope: dict) -> str:
+    request = envelope["request"]
+    return request.get("intent", {}).get("name") or request["type"]
+
+
+def percentile(values: List[float], percent: float) -> Optional[float]:
+    """Returns the nearest-rank percentile of the values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(latencies: List[float], errors: int, seconds: float) -> Dict[str, Any]:
+    summary = {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "seconds": round(seconds, 4),
+        "throughput": (
+            round((len(latencies) + errors) / seconds, 2) if seconds else None
+        ),
+        "mean": (round(sum(latencies) / len(latencies), 4) if latencies else None),
+    }
+    for percent in PERCENTILES:
+        value = percentile(latencies, percent)
+        summary[f"p{percent}"] = round(value, 4) if value is not None else None
+    return summary
+
+
+class SyncReplayer:
+    """Replays requests through the Flask-Ask handlers from a pool of threads."""
+
+    def __init__(self, app, concurrency: int):
+        self.app = app
+        self.pool = ThreadPoolExecutor(concurrency)
+        self.local = threading.local()
+
+    def send(self, envelope: dict) -> Optional[float]:
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        started = time.perf_counter()
+        response = client.post("/", json=fresh_request(envelope))
+        elapsed = time.perf_counter() - started
+        return elapsed if response.status_code == 200 else None
+
+    def replay(self, envelope: dict, count: int) -> List[Optional[float]]:
+        return list(self.pool.map(lambda _: self.send(envelope), range(count)))
+
+    def close(self):
+        self.pool.shutdown()
+
+
+class AsyncReplayer:
+    """Replays requests through the ASGI app as concurrent coroutines."""
+
+    def __init__(self, app, concurrency: int):
+        # pylint: disable=import-outside-toplevel
+        from app.runtime.asgi_app import ASGIApp
+
+        self.asgi_app = ASGIApp(app)
+        self.concurrency = concurrency
+        self.loop = asyncio.new_event_loop()
+
+    async def send(self, client, semaphore, envelope: dict) -> Optional[float]:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.post("/", json=fresh_request(envelope))
+            except httpx.HTTPError:
+                return None
+            elapsed = time.perf_counter() - started
+        return elapsed if response.status_code == 200 else None
+
+    async def replay_async(self, envelope: dict, count: int) -> List[Optional[float]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # A failing handler is answered with a 500 and counted as an error
+        transport = httpx.ASGITransport(app=self.asgi_app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://skill", timeout=None
+        ) as client:
+            return await asyncio.gather(
+                *(self.send(client, semaphore, envelope) for _ in range(count))
+            )
+
+    def replay(self, envelope: dict, count: int) -> List[Optional[float]]:
+        return self.loop.run_until_complete(self.replay_async(envelope, count))
+
+    def close(self):
+        self.loop.close()
+
+
+REPLAYERS = {"sync": SyncReplayer, "async": AsyncReplayer}
+
+
+def create_host(urls: Dict[str, str], intent: str):
+    """
+    Boots the Host app against the stand-ins.
+
+    The settings must be in the environment before the app's configuration is
+    first read, so the app is imported here.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+        json.dump(model_configs(urls), file)
+    os.environ.update(standin_environment(urls, file.name))
+    # Replayed requests are not signed
+    os.environ["ASK_VERIFY_REQUESTS"] = "false"
+    os.environ.setdefault("UNITS", "metric")
+    # Measure the request path; the caches and warm-up are benchmarked on their own
+    os.environ.setdefault("SEMANTIC_CACHE_SIZE", "0")
+    os.environ.setdefault("WARMUP_MODELS", "false")
+
+    # pylint: disable=import-outside-toplevel
+    from app.host import Host
+
+    try:
+        return Host(
+            Namespace(
+                server="127.0.0.1",
+                port=0,
+                intent=intent,
+                mode="development",
+                workers=0,
+                threads=1,
+                max_requests=0,
+                graceful_timeout=1,
+            )
+        )
+    finally:
+        os.unlink(file.name)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict):
+    """Prints the change of the latency percentiles and throughput from a baseline run."""
+    print(f"\nChange from {baseline.get('commit') or 'baseline'}:")
+    for name, summary in results["intents"].items():
+        before = baseline.get("intents", {}).get(name)
+        if before is None:
+            continue
+        changes = []
+        for key in [f"p{percent}" for percent in PERCENTILES] + ["throughput"]:
+            if summary[key] and before.get(key):
+                changes.append(f"{key} {(summary[key] / before[key] - 1) * 100:+6.1f}%")
+        print(f"{name:<22} {'  '.join(changes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the skill end to end.")
+    parser.add_argument("--mode", "-m", choices=sorted(REPLAYERS), default="async")
+    parser.add_argument("--requests", "-n", type=int, default=50)
+    parser.add_argument("--concurrency", "-c", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--corpus", default=os.path.join(DATA_DIR, "alexa"))
+    parser.add_argument(
+        "--only", nargs="*", help="Names of the corpus entries to replay."
+    )
+    parser.add_argument("--intent", default="NexaIntent")
+    add_standin_arguments(parser)
+    parser.add_argument("--output", "-o", default="bench_end_to_end.json")
+    parser.add_argument("--baseline", "-b")
+    args = parser.parse_args()
+    # The app logs every request and failed call; failures are counted instead
+    logging.basicConfig(level=logging.CRITICAL)
+
+    standins, urls, servers = serve_standins(args)
+    host = create_host(urls, args.intent)
+    corpus = load_corpus(args.corpus, args.only)
+    replayer = REPLAYERS[args.mode](host.app, args.concurrency)
+
+    results = {
+        "commit": git_commit(),
+        "mode": args.mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "intents": {},
+    }
+    all_latencies, all_errors, all_seconds = [], 0, 0.0
+    try:
+        for name, envelope in corpus.items():
+            # Connection setup and first use of the services are not measured
+            replayer.replay(envelope, args.warmup)
+            started = time.perf_counter()
+            outcomes = replayer.replay(envelope, args.requests)
+            seconds = time.perf_counter() - started
+
+            latencies = [outcome for outcome in outcomes if outcome is not None]
+            errors = len(outcomes) - len(latencies)
+            summary = {"intent": intent_of(envelope)}
+            summary.update(summarize(latencies, errors, seconds))
+            results["intents"][name] = summary
+            all_latencies += latencies
+            all_errors += errors
+            all_seconds += seconds
+            print(
+                f"{name:<22} p50 {summary['p50'] or 0:6.3f} s  "
+                f"p95 {summary['p95'] or 0:6.3f} s  p99 {summary['p99'] or 0:6.3f} s  "
+                f"{summary['throughput']:7.1f} req/s  {errors} errors"
+            )
+    finally:
+        replayer.close()
+        for server in servers:
+            server.should_exit = True
+
+    results["overall"] = summarize(all_latencies, all_errors, all_seconds)
+    results["standins"] = {name: s.metrics() for name, s in standins.items()}
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
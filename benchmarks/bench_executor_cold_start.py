@@ -0,0 +1,62 @@
+"""
+Benchmark of the import cost of ActionExecutorService with lazily registered
+functions, compared with also importing the services it used to import eagerly.
+
+Each measurement runs in a fresh interpreter so module caches do not interfere.
+
+Usage:
+    python -m benchmarks.bench_executor_cold_start --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MEASURE = """
+import json, resource, sys, time
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "duckduckgo_search": "duckduckgo_search" in sys.modules,
+}}))
+"""
+
+SCENARIOS = {
+    "lazy registry": "import app.services.execution.action_executor_service",
+    "eager services": (
+        "import app.services.execution.action_executor_service\n"
+        "import app.services.browser.browser_service\n"
+        "import app.services.weather.weather_service"
+    ),
+}
+
+
+def measure(imports: str) -> dict:
+    output = subprocess.check_output(
+        [sys.executable, "-c", MEASURE.format(imports=imports)], text=True
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark executor cold start.")
+    parser.add_argument("--repeat", "-r", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, imports in SCENARIOS.items():
+        runs = [measure(imports) for _ in range(args.repeat)]
+        seconds = statistics.median(run["seconds"] for run in runs)
+        rss = statistics.median(run["max_rss_kib"] for run in runs)
+        print(
+            f"{name:<16} {seconds * 1000:8.1f} ms  {rss / 1024:6.1f} MiB max RSS  "
+            f"duckduckgo_search loaded: {runs[0]['duckduckgo_search']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Micro-benchmark comparing the FunctionCallParser with the previous
+``re.match`` + ``eval`` routing path.
+
+Usage:
+    python -m benchmarks.bench_function_call_parser --number 20000
+"""
+
+import argparse
+import re
+import timeit
+
+from app.services.execution.function_call_parser import FunctionCallParser
+
+SAMPLES = [
+    "Call: get_weather_forecast(duration='today')",
+    "Call: get_weather_forecast(duration='week', location='Paris, FR', weather_condition='snow')<bot_end>",
+    "Call: ask_the_ai(query='who wrote hamlet')",
+    "Call: web_search(search='search the web for nexa ai')<bot_end>\nThought: done",
+    "Call:   get_weather_temperature(when='tomorrow')  ",
+]
+
+
+def eval_path(function_str: str):
+    # The implementation previously used by ActionExecutorService.execute_function
+    match = re.match(r"Call:\s*(\w+)\((.*)\)", function_str)
+    if not match:
+        return None
+    return match.group(1), eval(f"dict({match.group(2)})")  # pylint: disable=eval-used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark routing call parsing.")
+    parser.add_argument("--number", "-n", type=int, default=20000)
+    args = parser.parse_args()
+
+    call_parser = FunctionCallParser()
+
+    def run_eval():
+        for sample in SAMPLES:
+            eval_path(sample.split("<bot_end>", 1)[0].strip())
+
+    def run_parser_cold():
+        call_parser.cache_clear()
+        for sample in SAMPLES:
+            call_parser.parse(sample)
+
+    def run_parser_warm():
+        for sample in SAMPLES:
+            call_parser.parse(sample)
+
+    results = {
+        "eval": timeit.timeit(run_eval, number=args.number),
+        "parser (cold cache)": timeit.timeit(run_parser_cold, number=args.number),
+        "parser (warm cache)": timeit.timeit(run_parser_warm, number=args.number),
+    }
+
+    calls = args.number * len(SAMPLES)
+    baseline = results["eval"]
+    for name, elapsed in results.items():
+        print(
+            f"{name:<22} {elapsed * 1e6 / calls:8.2f} us/call "
+            f"({baseline / elapsed:5.2f}x vs eval)"
+        )
+
+
+if __name__ == "__main__":
+    main()
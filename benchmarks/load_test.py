@@ -0,0 +1,412 @@
+"""
+Load test of a running skill, to find how much traffic one instance sustains.
+
+Sessions of recorded Alexa requests are replayed against a server started with
+``run.py``: every session opens with the launch request, asks one or more of
+the other requests of the corpus and ends with the stop request, under one
+session id. The load is raised in steps, and every step reports the latency
+percentiles, throughput and error rate. The saturation knee is the first step
+where the error rate exceeds ``--max-error-rate``, the p95 latency exceeds
+``--knee-factor`` times the p95 of the first step, or the throughput stops
+following the users in the closed loop, growing less than half as fast. In
+the open loop a saturated skill queues the arriving requests, which shows as
+a rising latency and then as timeouts.
+
+Arrival modes:
+    open    Sessions arrive at random (Poisson) at a rate giving the target
+            requests per second, whether or not earlier requests have been
+            answered. Latencies of the first request of a session are measured
+            from the planned arrival, so a slow server is not hidden by a late
+            generator.
+    closed  A number of virtual users each run sessions back to back, waiting
+            for every answer and a think time before the next request.
+
+The skill must accept unsigned requests (ASK_VERIFY_REQUESTS=false). With the
+stand-ins of ``benchmarks.standins`` it runs without network access:
+
+Usage:
+    python -m benchmarks.standins --env-file standins.env &
+    env $(cat standins.env | xargs) python run.py --mode async --intent NexaIntent &
+    python -m benchmarks.load_test --arrival open --load 5:50 --steps 5 --step-seconds 30
+    python -m benchmarks.load_test --arrival closed --load 10:200 --steps 5 --think-time 1
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_end_to_end import load_corpus, percentile
+from benchmarks.standins import DATA_DIR
+
+SESSION_START = "launch"
+SESSION_END = "stop"
+
+
+class Record:
+    """The outcome of one request."""
+
+    __slots__ = ("name", "step", "started", "latency", "ok")
+
+    def __init__(self, name: str, step: int, started: float, latency: float, ok: bool):
+        self.name = name
+        self.step = step
+        self.started = started
+        self.latency = latency
+        self.ok = ok
+
+
+def summarize(records: List[Record], answered: int, seconds: float) -> Dict[str, Any]:
+    """
+    Returns the count, error rate and latency percentiles of the records, and the
+    throughput of the requests answered successfully within the seconds.
+    """
+    latencies = [record.latency for record in records if record.ok]
+    errors = len(records) - len(latencies)
+    summary = {
+        "requests": len(records),
+        "errors": errors,
+        "error_rate": round(errors / len(records), 4) if records else 0.0,
+        "throughput": round(answered / seconds, 2),
+    }
+    for percent in (50, 95, 99):
+        value = percentile(latencies, percent)
+        summary[f"p{percent}"] = round(value, 4) if value is not None else None
+    return summary
+
+
+def load_steps(load: str, steps: int) -> List[float]:
+    """Returns the load of every step, from a single value or a START:END ramp."""
+    start, _, end = load.partition(":")
+    start, end = float(start), float(end or start)
+    if steps <= 1 or start == end:
+        return [end]
+    return [start + (end - start) * index / (steps - 1) for index in range(steps)]
+
+
+def find_knee(
+    steps: List[Dict[str, Any]],
+    arrival: str,
+    knee_factor: float,
+    max_error_rate: float,
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns the first step at which the skill saturated, and the load of the step
+    before it, which is the highest load sustained.
+    """
+    baseline = steps[0]["p95"] if steps else None
+    for index, step in enumerate(steps):
+        reason = None
+        if step["error_rate"] > max_error_rate:
+            reason = f"error rate {step['error_rate']:.1%}"
+        elif baseline and step["p95"] and step["p95"] > knee_factor * baseline:
+            reason = f"p95 {step['p95']:.3f} s above {knee_factor:g}x {baseline:.3f} s"
+        elif arrival == "closed" and index > 0:
+            previous = steps[index - 1]
+            load_gain = step["load"] / previous["load"]
+            throughput_gain = step["throughput"] / max(previous["throughput"], 1e-9)
+            if load_gain > 1 and throughput_gain < 1 + (load_gain - 1) / 2:
+                reason = "throughput stopped growing with the users"
+        if reason is not None:
+            return {
+                "step": index,
+                "load": step["load"],
+                "sustained_load": steps[index - 1]["load"] if index else None,
+                "reason": reason,
+            }
+    return None
+
+
+class LoadTest:
+    """
+    Replays sessions of recorded Alexa requests against a skill.
+
+    Attributes:
+        url (str): URL of the skill endpoint.
+        corpus (Dict[str, dict]): Recorded requests by name, including "launch" and "stop".
+        intents_per_session (int): Requests asked between the launch and stop requests.
+        think_time (float): Average seconds a user waits between two requests.
+        timeout (float): Seconds after which a request counts as failed.
+        records (List[Record]): Outcome of every request sent so far.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        corpus: Dict[str, dict],
+        intents_per_session: int,
+        think_time: float,
+        timeout: float,
+        seed: int,
+    ):
+        self.url = url
+        self.corpus = corpus
+        self.intents = [
+            name for name in corpus if name not in (SESSION_START, SESSION_END)
+        ]
+        self.intents_per_session = intents_per_session
+        self.think_time = think_time
+        self.timeout = timeout
+        self.random = random.Random(seed)
+        self.records: List[Record] = []
+        self.step = 0
+        self.started = 0.0
+        self.in_flight = 0
+        self.client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def session_length(self) -> int:
+        return self.intents_per_session + 2
+
+    def session_steps(self) -> List[str]:
+        steps = [
+            self.random.choice(self.intents) for _ in range(self.intents_per_session)
+        ]
+        return [SESSION_START] + steps + [SESSION_END]
+
+    def build_request(self, name: str, session_id: str, new: bool) -> dict:
+        envelope = json.loads(json.dumps(self.corpus[name]))
+        envelope["session"]["sessionId"] = session_id
+        envelope["session"]["new"] = new
+        envelope["request"]["requestId"] = f"amzn1.echo-api.request.{uuid.uuid4().hex}"
+        envelope["request"]["timestamp"] = datetime.now(timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        )
+        return envelope
+
+    async def send(self, name: str, envelope: dict, planned: Optional[float] = None):
+        step = self.step
+        started = time.perf_counter()
+        self.in_flight += 1
+        try:
+            response = await self.client.post(self.url, json=envelope)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        finally:
+            self.in_flight -= 1
+        finished = time.perf_counter()
+        since = planned if planned is not None else started
+        self.records.append(
+            Record(name, step, since - self.started, finished - since, ok)
+        )
+
+    async def run_session(self, planned: Optional[float] = None):
+        session_id = f"amzn1.echo-api.session.{uuid.uuid4().hex}"
+        for index, name in enumerate(self.session_steps()):
+            if index:
+                await asyncio.sleep(self.think_time * self.random.uniform(0.5, 1.5))
+            await self.send(
+                name,
+                self.build_request(name, session_id, index == 0),
+                planned if index == 0 else None,
+            )
+
+    async def open_loop(self, rate: float, until: float, tasks: set):
+        # Sessions arrive so that their requests add up to the target rate
+        session_rate = rate / self.session_length
+        planned = time.perf_counter()
+        while True:
+            planned += self.random.expovariate(session_rate)
+            if planned >= until:
+                return
+            await asyncio.sleep(max(0.0, planned - time.perf_counter()))
+            task = asyncio.create_task(self.run_session(planned))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    async def user(self, active_users: List[int], user_index: int):
+        # A closed-loop user runs sessions until fewer users are wanted
+        while active_users[0] > user_index:
+            await self.run_session()
+
+    async def report(self, window: float, timeline: List[Dict[str, Any]], load):
+        reported = 0
+        while True:
+            await asyncio.sleep(window)
+            now = time.perf_counter() - self.started
+            records = self.records[reported:]
+            reported += len(records)
+            entry = {"time": round(now, 1), "load": load(), "in_flight": self.in_flight}
+            answered = sum(record.ok for record in records)
+            entry.update(summarize(records, answered, window))
+            timeline.append(entry)
+            print(
+                f"{entry['time']:7.1f} s  load {entry['load']:7.1f}  "
+                f"{entry['throughput']:7.1f} req/s  p50 {entry['p50'] or 0:6.3f} s  "
+                f"p95 {entry['p95'] or 0:6.3f} s  p99 {entry['p99'] or 0:6.3f} s  "
+                f"errors {entry['error_rate']:6.1%}  in flight {entry['in_flight']}"
+            )
+
+    async def run(
+        self,
+        arrival: str,
+        loads: List[float],
+        step_seconds: float,
+        window: float,
+        max_connections: int,
+    ) -> Dict[str, Any]:
+        limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+        timeline: List[Dict[str, Any]] = []
+        async with httpx.AsyncClient(limits=limits, timeout=self.timeout) as client:
+            self.client = client
+            self.started = time.perf_counter()
+            reporter = asyncio.create_task(
+                self.report(window, timeline, lambda: loads[self.step])
+            )
+            sessions: set = set()
+            users: List[asyncio.Task] = []
+            active_users = [0]
+
+            bounds = []
+            for index, load in enumerate(loads):
+                self.step = index
+                until = time.perf_counter() + step_seconds
+                bounds.append(time.perf_counter() - self.started)
+                if arrival == "open":
+                    await self.open_loop(load, until, sessions)
+                else:
+                    active_users[0] = int(load)
+                    for user_index in range(int(load)):
+                        if user_index == len(users):
+                            users.append(None)
+                        if users[user_index] is None or users[user_index].done():
+                            users[user_index] = asyncio.create_task(
+                                self.user(active_users, user_index)
+                            )
+                    await asyncio.sleep(max(0.0, until - time.perf_counter()))
+            bounds.append(time.perf_counter() - self.started)
+
+            # Let the requests in flight finish, but stop starting new sessions
+            active_users[0] = 0
+            pending = [*sessions, *(user for user in users if user is not None)]
+            if pending:
+                await asyncio.wait(pending, timeout=self.timeout * 2)
+            for task in pending:
+                task.cancel()
+            reporter.cancel()
+
+        steps = []
+        for index, load in enumerate(loads):
+            records = [record for record in self.records if record.step == index]
+            # Throughput counts the answers received during the step
+            answered = sum(
+                record.ok
+                and bounds[index] <= record.started + record.latency < bounds[index + 1]
+                for record in self.records
+            )
+            seconds = bounds[index + 1] - bounds[index]
+            step = {"load": load, "offered": round(len(records) / seconds, 2)}
+            step.update(summarize(records, answered, seconds))
+            steps.append(step)
+        requests = {}
+        for name in self.corpus:
+            records = [record for record in self.records if record.name == name]
+            if records:
+                answered = sum(record.ok for record in records)
+                requests[name] = summarize(records, answered, bounds[-1])
+        return {"steps": steps, "requests": requests, "timeline": timeline}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running skill.")
+    parser.add_argument("--url", default="http://127.0.0.1:8045/")
+    parser.add_argument("--arrival", "-a", choices=("open", "closed"), default="open")
+    parser.add_argument(
+        "--load",
+        "-l",
+        default="5:50",
+        help="Requests per second (open) or users (closed), or a START:END ramp.",
+    )
+    parser.add_argument("--steps", "-s", type=int, default=5)
+    parser.add_argument("--step-seconds", type=float, default=30.0)
+    parser.add_argument("--window", "-w", type=float, default=5.0)
+    parser.add_argument("--intents-per-session", type=int, default=2)
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=8.0)
+    parser.add_argument("--corpus", default=f"{DATA_DIR}/alexa")
+    parser.add_argument(
+        "--only", nargs="*", help="Names of the corpus entries to ask in sessions."
+    )
+    parser.add_argument("--knee-factor", type=float, default=2.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", default="load_test.json")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if args.only:
+        corpus = {
+            name: envelope
+            for name, envelope in corpus.items()
+            if name in args.only or name in (SESSION_START, SESSION_END)
+        }
+    missing = {SESSION_START, SESSION_END} - set(corpus)
+    if missing:
+        parser.error(f"The corpus has no {' or '.join(sorted(missing))} request")
+
+    loads = load_steps(args.load, args.steps)
+    load_test = LoadTest(
+        args.url,
+        corpus,
+        args.intents_per_session,
+        args.think_time,
+        args.timeout,
+        args.seed,
+    )
+    results = asyncio.run(
+        load_test.run(
+            args.arrival, loads, args.step_seconds, args.window, args.max_connections
+        )
+    )
+
+    unit = "req/s" if args.arrival == "open" else "users"
+    print()
+    for step in results["steps"]:
+        print(
+            f"load {step['load']:7.1f} {unit:<5}  sent {step['offered']:7.1f} req/s  "
+            f"answered {step['throughput']:7.1f} req/s  "
+            f"p50 {step['p50'] or 0:6.3f} s  p95 {step['p95'] or 0:6.3f} s  "
+            f"p99 {step['p99'] or 0:6.3f} s  errors {step['error_rate']:6.1%}"
+        )
+    knee = find_knee(
+        results["steps"], args.arrival, args.knee_factor, args.max_error_rate
+    )
+    if knee is None:
+        print("No saturation up to the highest load.")
+    elif knee["sustained_load"] is None:
+        print(f"Saturated from the lowest load ({knee['reason']}).")
+    else:
+        print(
+            f"Saturated at {knee['load']:g} {unit} ({knee['reason']}); "
+            f"sustained {knee['sustained_load']:g} {unit}."
+        )
+
+    results.update(
+        {
+            "url": args.url,
+            "arrival": args.arrival,
+            "unit": unit,
+            "step_seconds": args.step_seconds,
+            "intents_per_session": args.intents_per_session,
+            "think_time": args.think_time,
+            "seed": args.seed,
+            "knee": knee,
+        }
+    )
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+"""
+Local stand-ins for the services the skill calls, so the benchmarks run
+without network access: an OpenAI-compatible chat server, OpenWeatherMap, an
+ipinfo.io-compatible IP lookup, a SearXNG-compatible search endpoint and the
+Alexa directives API for progressive responses.
+
+Every stand-in answers after a configurable latency, with optional jitter,
+and fails a configurable share of the requests with a 500. Latencies and
+failures are drawn from a seeded generator so runs are reproducible.
+
+The OpenWeatherMap stand-in serves the recorded payloads in
+``benchmarks/data/owm``.
+
+Run on their own, the stand-ins write the model configurations and the
+settings that point a skill started with ``run.py`` at them.
+
+Usage:
+    python -m benchmarks.standins --latency chat=0.5 --env-file standins.env
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import uvicorn
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+# Latency in seconds of each stand-in when none is given
+DEFAULT_LATENCIES = {
+    "chat": 0.3,
+    "owm": 0.08,
+    "ip": 0.05,
+    "search": 0.2,
+    "alexa": 0.05,
+}
+
+# A handler receives the request path, query string and JSON body, and returns
+# the status, content type and body of the response
+Handler = Callable[[str, str, Any], Awaitable[Tuple[int, str, bytes]]]
+
+QUERY = re.compile(r"User Query:\s*(.*?)\s*\n")
+
+
+class StandIn:
+    """
+    ASGI app answering requests with a handler after an injected latency.
+
+    Attributes:
+        name (str): Name of the stand-in, e.g. "owm".
+        latency (float): Seconds every request takes.
+        jitter (float): Share of the latency added or removed at random, e.g. 0.2 for +-20%.
+        error_rate (float): Share of the requests answered with a 500.
+        slots (int): Number of requests served at once, like a local inference server, 0 for no limit.
+        requests (int): Number of requests received.
+        errors (int): Number of injected failures.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        latency: float,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        slots: int = 0,
+    ):
+        self.name = name
+        self.handler = handler
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.slots = slots
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.requests = 0
+        self.errors = 0
+        self.random = random.Random(f"{name}:{seed}")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        self.requests += 1
+        delay = self.latency * (1 + self.random.uniform(-self.jitter, self.jitter))
+        failed = self.random.random() < self.error_rate
+        if self.slots:
+            # Created on the server's event loop
+            self._semaphore = self._semaphore or asyncio.Semaphore(self.slots)
+            async with self._semaphore:
+                await asyncio.sleep(max(0.0, delay))
+        else:
+            await asyncio.sleep(max(0.0, delay))
+
+        if failed:
+            self.errors += 1
+            status, content_type, data = (
+                500,
+                "application/json",
+                b'{"error":"injected"}',
+            )
+        else:
+            status, content_type, data = await self.handler(
+                scope["path"],
+                scope["query_string"].decode("latin-1"),
+                json.loads(body) if body else None,
+            )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", content_type.encode("latin-1"))],
+            }
+        )
+        await send({"type": "http.response.body", "body": data})
+
+    def metrics(self) -> Dict[str, Any]:
+        """Returns the settings and request counts of the stand-in."""
+        return {
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "error_rate": self.error_rate,
+            "slots": self.slots,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+def json_response(data: Any, status: int = 200) -> Tuple[int, str, bytes]:
+    return status, "application/json", json.dumps(data).encode()
+
+
+def load_payload(name: str) -> Any:
+    with open(os.path.join(DATA_DIR, "owm", name), encoding="utf-8") as file:
+        return json.load(file)
+
+
+def route_utterance(utterance: str) -> str:
+    """Returns the function call a routing model would pick for the utterance."""
+    lowered = utterance.lower()
+    if "web" in lowered or "internet" in lowered:
+        return f"Call: web_search(search={utterance!r})"
+    if "weather" in lowered or "forecast" in lowered:
+        duration = "tomorrow" if "tomorrow" in lowered else "today"
+        return (
+            f"Call: get_weather_forecast(duration={duration!r}, location='Paris, FR')"
+        )
+    return f"Call: ask_the_ai(query={utterance!r})"
+
+
+async def chat_handler(path: str, _query: str, body: Any) -> Tuple[int, str, bytes]:
+    # OpenAI-compatible chat completions; routing prompts get a function call
+    if not path.endswith("/chat/completions"):
+        return json_response({"error": "Not found"}, 404)
+    content = body["messages"][-1]["content"]
+    match = QUERY.search(content)
+    if match is not None:
+        text = route_utterance(match.group(1))
+    else:
+        text = "Here is a short answer. It has a second sentence as well."
+    prompt_tokens = sum(len(m["content"].split()) for m in body["messages"])
+    completion_tokens = len(text.split())
+
+    if body.get("stream"):
+        chunks = []
+        for index, word in enumerate(text.split(" ")):
+            delta = {"content": word if index == 0 else " " + word}
+            chunks.append(
+                {
+                    "id": "standin",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": body["model"],
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                }
+            )
+        chunks[-1]["choices"][0]["finish_reason"] = "stop"
+        data = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks)
+        return 200, "text/event-stream", (data + "data: [DONE]\n\n").encode()
+
+    return json_response(
+        {
+            "id": "standin",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": text},
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+    )
+
+
+def create_owm_handler() -> Handler:
+    payloads = {
+        "/geo/1.0/direct": load_payload("geocode.json"),
+        "/data/3.0/onecall": load_payload("onecall.json"),
+        "/data/3.0/onecall/overview": load_payload("overview.json"),
+        "/data/3.0/onecall/day_summary": load_payload("day_summary.json"),
+    }
+
+    async def handler(path: str, _query: str, _body: Any) -> Tuple[int, str, bytes]:
+        payload = payloads.get(path)
+        if payload is None:
+            return json_response({"cod": 404, "message": "Not found"}, 404)
+        return json_response(payload)
+
+    return handler
+
+
+async def ip_handler(_path: str, _query: str, _body: Any) -> Tuple[int, str, bytes]:
+    # ipinfo.io format
+    return json_response(
+        {
+            "ip": "203.0.113.7",
+            "hostname": "standin.local",
+            "city": "Paris",
+            "region": "Ile-de-France",
+            "country": "FR",
+            "loc": "48.8534,2.3488",
+            "timezone": "Europe/Paris",
+        }
+    )
+
+
+async def search_handler(_path: str, query: str, _body: Any) -> Tuple[int, str, bytes]:
+    # SearXNG JSON format
+    return json_response(
+        {
+            "query": query,
+            "results": [
+                {
+                    "title": "Tallest buildings in Europe",
+                    "url": "https://example.org/tallest-buildings",
+                    "content": "The Lakhta Center in Saint Petersburg is the tallest "
+                    "building in Europe at 462 metres.",
+                }
+            ],
+        }
+    )
+
+
+async def alexa_handler(_path: str, _query: str, _body: Any) -> Tuple[int, str, bytes]:
+    # Progressive responses are accepted without content
+    return 204, "application/json", b""
+
+
+def create_standins(
+    latencies: Optional[Dict[str, float]] = None,
+    error_rates: Optional[Dict[str, float]] = None,
+    jitter: float = 0.0,
+    seed: int = 0,
+) -> Dict[str, StandIn]:
+    """
+    Creates the stand-ins by name: "chat", "owm", "ip", "search" and "alexa".
+
+    Args:
+        latencies (Optional[Dict[str, float]]): Seconds per request by stand-in, defaults to DEFAULT_LATENCIES.
+        error_rates (Optional[Dict[str, float]]): Share of failed requests by stand-in, defaults to none.
+        jitter (float): Share of the latency added or removed at random.
+        seed (int): Seed of the latencies and failures.
+    """
+    latencies = {**DEFAULT_LATENCIES, **(latencies or {})}
+    error_rates = error_rates or {}
+    handlers = {
+        "chat": chat_handler,
+        "owm": create_owm_handler(),
+        "ip": ip_handler,
+        "search": search_handler,
+        "alexa": alexa_handler,
+    }
+    return {
+        name: StandIn(
+            name,
+            handler,
+            latencies[name],
+            jitter,
+            error_rates.get(name, 0.0),
+            seed,
+        )
+        for name, handler in handlers.items()
+    }
+
+
+def start_server(app, port: int) -> uvicorn.Server:
+    """Serves an ASGI app on 127.0.0.1 from a daemon thread and waits until it is up."""
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def start_standins(
+    standins: Dict[str, StandIn], base_port: int
+) -> Tuple[Dict[str, str], list]:
+    """
+    Serves every stand-in on its own port, from base_port upwards.
+
+    Returns:
+        Tuple[Dict[str, str], list]: The base URL of every stand-in, and the servers.
+    """
+    urls, servers = {}, []
+    for offset, (name, standin) in enumerate(standins.items()):
+        servers.append(start_server(standin, base_port + offset))
+        urls[name] = f"http://127.0.0.1:{base_port + offset}"
+    return urls, servers
+
+
+def standin_environment(
+    urls: Dict[str, str], model_configs_path: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Returns the settings pointing the skill at the stand-ins, with the routing
+    model named "router" and every latency tier using the "chat" model.
+    """
+    environment = {
+        "OPEN_WEATHER_MAP_KEY": "standin",
+        "OWM_BASE_URL": urls["owm"],
+        "IP_INFO_URL": f"{urls['ip']}/json",
+        "SEARCH_URL": f"{urls['search']}/search",
+        "ALEXA_DIRECTIVE_ENDPOINT": urls["alexa"],
+        "ROUTING_LANGUAGE_MODEL": "router",
+        "STANDARD_LANGUAGE_MODEL": "chat",
+        "LARGE_LANGUAGE_MODEL": "chat",
+        "FAST_LANGUAGE_MODEL": "chat",
+    }
+    if model_configs_path is not None:
+        environment["MODEL_CONFIGS_PATH"] = model_configs_path
+    return environment
+
+
+def model_configs(urls: Dict[str, str], models=("router", "chat")) -> list:
+    """Returns model configurations of the chat stand-in, one per model name."""
+    return [
+        {
+            "description": "Benchmark stand-in",
+            "base_url": f"{urls['chat']}/v1",
+            "api_key": "standin",
+            "model": model,
+        }
+        for model in models
+    ]
+
+
+def parse_settings(values, cast=float) -> Dict[str, float]:
+    """Parses NAME=VALUE command line settings, e.g. ["chat=0.5", "owm=0.1"]."""
+    settings = {}
+    for value in values or []:
+        name, _, setting = value.partition("=")
+        if name not in DEFAULT_LATENCIES:
+            raise ValueError(f"Unknown stand-in: {name}")
+        settings[name] = cast(setting)
+    return settings
+
+
+def add_standin_arguments(parser: argparse.ArgumentParser):
+    """Adds the command line options of the stand-ins: port, latencies, failures, jitter and seed."""
+    parser.add_argument("--port", "-p", type=int, default=18100)
+    parser.add_argument(
+        "--latency",
+        action="append",
+        metavar="NAME=SECONDS",
+        help="Latency of a stand-in: chat, owm, ip, search or alexa.",
+    )
+    parser.add_argument(
+        "--errors",
+        action="append",
+        metavar="NAME=RATE",
+        help="Share of the requests a stand-in fails.",
+    )
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def serve_standins(
+    args: argparse.Namespace,
+) -> Tuple[Dict[str, StandIn], Dict[str, str], list]:
+    """
+    Creates the stand-ins with the options added by add_standin_arguments and
+    serves them, from the port upwards.
+
+    Returns:
+        Tuple[Dict[str, StandIn], Dict[str, str], list]: The stand-ins and the base URL of every one, and the servers.
+    """
+    standins = create_standins(
+        parse_settings(args.latency),
+        parse_settings(args.errors),
+        args.jitter,
+        args.seed,
+    )
+    urls, servers = start_standins(standins, args.port)
+    return standins, urls, servers
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve the stand-ins for a skill started with run.py."
+    )
+    add_standin_arguments(parser)
+    parser.add_argument("--model-configs", default="standin_model_configs.json")
+    parser.add_argument("--env-file", default="standins.env")
+    args = parser.parse_args()
+
+    _, urls, _ = serve_standins(args)
+    with open(args.model_configs, "w", encoding="utf-8") as file:
+        json.dump(model_configs(urls), file, indent=2)
+    environment = standin_environment(urls, os.path.abspath(args.model_configs))
+    # The load generator's requests are not signed by Alexa
+    environment["ASK_VERIFY_REQUESTS"] = "false"
+    # The weather answers are rendered in the configured units
+    environment["UNITS"] = os.environ.get("UNITS", "metric")
+    with open(args.env_file, "w", encoding="utf-8") as file:
+        file.writelines(f"{name}={value}\n" for name, value in environment.items())
+
+    for name, url in urls.items():
+        print(f"{name:<7} {url}")
+    print(f"Start the skill with the settings in {args.env_file}, e.g.:")
+    print(f"  env $(cat {args.env_file} | xargs) python run.py --mode async")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import os
+import unittest
+from unittest import mock
+
+from app.config.config import Config
+from app.models.ip_info import IPInfo
+
+
+def use_config(test: unittest.TestCase, **environ: str) -> Config:
+    """
+    Creates the configuration of a test from the given environment variables,
+    with a fixed public location instead of one looked up over the network. The
+    environment and the previous configuration are restored after the test.
+    """
+    patcher = mock.patch.dict(os.environ, environ)
+    patcher.start()
+    test.addCleanup(patcher.stop)
+    Config.reset_instance()
+    test.addCleanup(Config.reset_instance)
+    with mock.patch("app.config.config.IPResolver") as resolver:
+        resolver.return_value.get_public_ip_info.return_value = IPInfo(
+            city="London", region="England", country="GB"
+        )
+        return Config()
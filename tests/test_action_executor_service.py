@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from app.models.deadline import Deadline
+from app.models.function_spec import FunctionSpec
+from app.services.execution.action_executor_service import ActionExecutorService
+from app.services.execution.function_registry import FunctionRegistry
+from tests import use_config
+
+
+class ActionExecutorServiceTest(unittest.TestCase):
+    def setUp(self):
+        use_config(self, EXECUTOR_CALL_TIMEOUT="2", GENERATION_BUDGET="3")
+        self.render_template = self.patch("render_template")
+        self.render_template.side_effect = lambda name, **_: name
+        self.patch("AIServiceSingleton")
+        FunctionRegistry.reset_instance()
+        self.addCleanup(FunctionRegistry.reset_instance)
+        self.executor = ActionExecutorService()
+        self.addCleanup(self.executor.pool.shutdown, wait=False)
+        self.ai_service = self.executor.ai_service
+
+    def patch(self, name: str) -> mock.MagicMock:
+        patcher = mock.patch(f"app.services.execution.action_executor_service.{name}")
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def register(self, name: str, func, async_func=None, **spec):
+        self.executor.registry.register(
+            FunctionSpec(
+                name=name,
+                signature=f"def {name}(city: str) -> str",
+                description=name,
+                loader=lambda: func,
+                async_loader=(lambda: async_func) if async_func else None,
+                **spec,
+            )
+        )
+
+    def register_weather(self, parties: int = 2):
+        # The calls only get past the barrier when they run at the same time
+        barrier = threading.Barrier(parties, timeout=1)
+
+        def weather(city):
+            barrier.wait()
+            return f"Sunny in {city}."
+
+        self.register("weather", weather)
+
+    def test_calls_run_concurrently_and_are_merged(self):
+        self.register_weather()
+        self.ai_service.prompt_the_ai.return_value = "Sunny in Paris and London."
+
+        response = self.executor.execute_function(
+            "Call: weather(city='Paris'); weather(city='London')"
+        )
+
+        self.assertEqual(response.details.status, "success")
+        self.assertEqual(response.details.data, "Sunny in Paris and London.")
+        self.render_template.assert_any_call(
+            "aggregate_prompt", parts=["Sunny in Paris.", "Sunny in London."]
+        )
+
+    def test_parts_are_joined_when_no_generation_fits(self):
+        self.register_weather()
+
+        response = self.executor.execute_function(
+            "Call: weather(city='Paris')\nCall: weather(city='London')",
+            Deadline(1.0),
+        )
+
+        self.assertEqual(response.details.data, "Sunny in Paris. Sunny in London.")
+        self.ai_service.prompt_the_ai.assert_not_called()
+
+    def test_failed_call_leaves_the_other_parts(self):
+        self.register_weather(parties=1)
+
+        response = self.executor.execute_function(
+            "Call: weather(city='Paris'); weather(town='London')", Deadline(1.0)
+        )
+
+        self.assertEqual(response.details.status, "success")
+        self.assertEqual(response.details.data, "Sunny in Paris.")
+
+    def test_unknown_function_is_refused(self):
+        response = self.executor.execute_function("Call: exec(city='Paris')")
+
+        self.assertEqual(response.details.status, "failure")
+        self.assertIn("not allowed", response.details.data)
+
+    def test_async_calls_run_concurrently(self):
+        barrier = None
+
+        async def weather(city):
+            await asyncio.wait_for(barrier.wait(), 1)
+            return f"Sunny in {city}."
+
+        async def execute():
+            nonlocal barrier
+            barrier = asyncio.Barrier(2)
+            return await self.executor.execute_function_async(
+                "Call: weather(city='Paris'); weather(city='London')", Deadline(1.0)
+            )
+
+        self.register("weather", None, weather)
+        response = asyncio.run(execute())
+
+        self.assertEqual(response.details.data, "Sunny in Paris. Sunny in London.")
+
+    def register_hang(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.register("hang", lambda city: release.wait(5), timeout=0.1)
+
+    def test_overrunning_call_is_abandoned(self):
+        self.register_hang()
+
+        started = time.monotonic()
+        response = self.executor.execute_function("Call: hang(city='Paris')")
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(response.details.status, "timeout")
+        self.assertEqual(response.details.data, "function_timeout_message")
+        self.assertEqual(self.executor.get_timeout_counts(), {"hang": 1})
+
+    def test_overrunning_call_leaves_the_other_parts(self):
+        self.register_hang()
+        self.register_weather(parties=1)
+
+        response = self.executor.execute_function(
+            "Call: hang(city='Paris'); weather(city='London')", Deadline(1.0)
+        )
+
+        self.assertEqual(response.details.status, "success")
+        self.assertEqual(response.details.data, "Sunny in London.")
+
+    def test_default_timeout_applies_without_a_function_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.register("hang", lambda city: release.wait(5))
+        self.executor.call_timeout = 0.1
+
+        response = self.executor.execute_function("Call: hang(city='Paris')")
+
+        self.assertEqual(response.details.status, "timeout")
+
+    def test_deadline_caps_the_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.register("hang", lambda city: release.wait(5), timeout=5)
+
+        started = time.monotonic()
+        response = self.executor.execute_function(
+            "Call: hang(city='Paris')", Deadline(0.1)
+        )
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(response.details.status, "timeout")
+
+    def test_overrunning_async_call_is_cancelled(self):
+        cancelled = []
+
+        async def hang(city):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(city)
+                raise
+
+        self.register("hang", None, hang, timeout=0.1)
+        response = asyncio.run(
+            self.executor.execute_function_async("Call: hang(city='Paris')")
+        )
+
+        self.assertEqual(response.details.status, "timeout")
+        self.assertEqual(cancelled, ["Paris"])
+        self.assertEqual(self.executor.get_timeout_counts(), {"hang": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
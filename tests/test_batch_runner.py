@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from app.models.ai.model_configs import ModelConfigs
+from app.models.deadline import Deadline
+from app.services.ai.ai_service import AIService
+from app.services.ai.batch_runner import BatchRunner
+
+LOCAL = "http://localhost:11434/v1"
+REMOTE = "http://gpu:11434/v1"
+
+
+def model_configs(*replicas) -> ModelConfigs:
+    return ModelConfigs(
+        [
+            {
+                "description": model,
+                "base_url": base_url,
+                "api_key": "ollama",
+                "model": model,
+                **limits,
+            }
+            for model, base_url, limits in replicas
+        ]
+    )
+
+
+class BatchRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def create_runner(self, configs: ModelConfigs) -> BatchRunner:
+        return BatchRunner(
+            configs,
+            AIService.create_limiters(configs),
+            self.respond,
+            self.respond_async,
+        )
+
+    def respond(self, prompt, model_config, system_role, deadline, template, **options):
+        self.enter(prompt, model_config, system_role, template)
+        time.sleep(0.02)
+        return self.leave(prompt, deadline, options)
+
+    async def respond_async(
+        self, prompt, model_config, system_role, deadline, template, **options
+    ):
+        self.enter(prompt, model_config, system_role, template)
+        await asyncio.sleep(0.02)
+        return self.leave(prompt, deadline, options)
+
+    def enter(self, prompt, model_config, system_role, template):
+        with self.lock:
+            self.calls.append((prompt, model_config.model, system_role, template))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self, prompt, deadline, options) -> str:
+        with self.lock:
+            self.in_flight -= 1
+        self.assertEqual(options, {"raise_errors": True})
+        self.assertIsInstance(deadline, Deadline)
+        if prompt == "fail":
+            raise TimeoutError("Deadline exceeded before calling chat")
+        return prompt.upper()
+
+    def test_results_keep_the_order_of_the_prompts(self):
+        runner = self.create_runner(model_configs(("chat", LOCAL, {})))
+
+        results = runner.run(
+            ["a", "fail", "c"], "chat", "You are terse.", "query_prompt", Deadline(5)
+        )
+
+        self.assertEqual([result.text for result in results], ["A", None, "C"])
+        self.assertEqual([result.ok for result in results], [True, False, True])
+        self.assertEqual(
+            results[1].error, "TimeoutError: Deadline exceeded before calling chat"
+        )
+        self.assertTrue(all(result.latency > 0 for result in results))
+        self.assertIn(("a", "chat", "You are terse.", "query_prompt"), self.calls)
+
+    def test_prompts_in_flight_are_bounded_by_the_backend_slots(self):
+        runner = self.create_runner(
+            model_configs(("chat", LOCAL, {"max_concurrency": 2, "max_queue": 8}))
+        )
+
+        results = runner.run(
+            [str(index) for index in range(8)], "chat", deadline=Deadline(5)
+        )
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(self.max_in_flight, 2)
+
+    def test_concurrency_adds_up_the_replicas(self):
+        runner = self.create_runner(
+            model_configs(
+                ("chat", LOCAL, {"max_concurrency": 2}),
+                ("chat", REMOTE, {"max_concurrency": 3}),
+                ("large", LOCAL, {"max_concurrency": 2}),
+                ("large", "https://api.example.com/v1", {}),
+            )
+        )
+
+        self.assertEqual(runner.concurrency("chat"), 5)
+        self.assertEqual(runner.concurrency("large"), BatchRunner.MAX_CONCURRENCY)
+
+    def test_empty_batch(self):
+        runner = self.create_runner(model_configs(("chat", LOCAL, {})))
+
+        self.assertEqual(runner.run([], "chat", deadline=Deadline(5)), [])
+
+    def test_unknown_model_is_refused(self):
+        runner = self.create_runner(model_configs(("chat", LOCAL, {})))
+
+        with self.assertRaises(ValueError):
+            runner.run(["a"], "missing", deadline=Deadline(5))
+
+    def test_async_batch_is_bounded_by_the_backend_slots(self):
+        runner = self.create_runner(
+            model_configs(("chat", LOCAL, {"max_concurrency": 3, "max_queue": 8}))
+        )
+
+        results = asyncio.run(
+            runner.run_async(
+                ["a", "fail"] + ["b"] * 6,
+                "chat",
+                template="query_prompt",
+                deadline=Deadline(5),
+            )
+        )
+
+        self.assertEqual(results[0].text, "A")
+        self.assertFalse(results[1].ok)
+        self.assertEqual(len(results), 8)
+        self.assertEqual(self.max_in_flight, 3)
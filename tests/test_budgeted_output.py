@@ -0,0 +1,203 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from app.models.ai.output_budget import OutputBudget
+from app.services.ai.budgeted_output import BudgetedOutput
+from app.services.ai.output_budgets import OutputBudgets
+from app.services.telemetry.llm_telemetry import LLMCall, LLMTelemetry
+
+ANSWER = "It is sunny in Paris. Expect a high of 24 degrees. Bring sunglasses."
+
+
+def completion(content, finish_reason="stop"):
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(
+                message=SimpleNamespace(content=content), finish_reason=finish_reason
+            )
+        ]
+    )
+
+
+def chunk(content, finish_reason=None):
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(
+                delta=SimpleNamespace(content=content), finish_reason=finish_reason
+            )
+        ]
+    )
+
+
+class FakeStream:
+    """A streamed completion that counts the chunks read and whether it was closed."""
+
+    def __init__(self, text: str, finish_reason: str = "stop"):
+        words = text.split(" ")
+        self.chunks = [chunk(words[0])] + [chunk(" " + word) for word in words[1:]]
+        self.chunks.append(chunk(None, finish_reason))
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for item in self.chunks:
+            self.read += 1
+            yield item
+
+    async def __aiter__(self):
+        for item in self.__iter__():
+            yield item
+
+    def close(self):
+        self.closed = True
+
+
+class OutputBudgetTest(unittest.TestCase):
+    def test_max_tokens_leaves_headroom_over_the_smallest_limit(self):
+        self.assertEqual(OutputBudget(max_words=20).max_tokens, 42)
+        self.assertEqual(OutputBudget(max_seconds=4).max_tokens, 21)
+        self.assertEqual(OutputBudget(max_words=20, max_characters=30).max_tokens, 15)
+        self.assertIsNone(OutputBudget(stop=["\n"]).max_tokens)
+
+    def test_answer_is_cut_back_to_whole_sentences(self):
+        budget = OutputBudget(max_words=11)
+
+        self.assertEqual(
+            budget.truncate(ANSWER),
+            "It is sunny in Paris. Expect a high of 24 degrees.",
+        )
+
+    def test_first_sentence_is_always_kept(self):
+        budget = OutputBudget(max_characters=10)
+
+        self.assertEqual(budget.truncate(ANSWER), "It is sunny in Paris.")
+
+    def test_unfinished_sentence_is_dropped_when_cut_off(self):
+        budget = OutputBudget(max_words=50)
+        text = "It is sunny in Paris. Expect a high of"
+
+        self.assertEqual(budget.truncate(text), text)
+        self.assertEqual(budget.truncate(text, cut_off=True), "It is sunny in Paris.")
+
+
+class BudgetedOutputTest(unittest.TestCase):
+    def setUp(self):
+        self.budgets = OutputBudgets()
+        self.budgets.budgets = {
+            "weather_overview": OutputBudget(max_words=11, stop=["\n\n"]),
+        }
+        self.config = SimpleNamespace(streaming_responses=False)
+        self.output = BudgetedOutput(
+            self.config, mock.Mock(spec=LLMTelemetry), self.budgets
+        )
+
+    def test_request_options_follow_the_budget(self):
+        self.assertEqual(
+            self.output.options("weather_overview"),
+            {"max_tokens": 24, "stop": ["\n\n"]},
+        )
+        self.assertEqual(self.output.options("query_prompt"), {})
+        self.assertEqual(self.output.options(None), {})
+
+    def test_only_budgeted_answers_are_streamed(self):
+        self.assertFalse(self.output.should_stream("weather_overview"))
+
+        self.config.streaming_responses = True
+
+        self.assertTrue(self.output.should_stream("weather_overview"))
+        self.assertFalse(self.output.should_stream("query_prompt"))
+
+    def test_answer_is_truncated_and_recorded(self):
+        text = self.output.text(completion(f" {ANSWER} "), "weather_overview")
+
+        self.assertEqual(text, "It is sunny in Paris. Expect a high of 24 degrees.")
+        metrics = self.output.metrics()["weather_overview"]
+        self.assertEqual(metrics["answers"], 1)
+        self.assertEqual(metrics["truncated"], 1)
+        self.assertEqual(metrics["average_generated_words"], 13)
+        self.assertEqual(metrics["average_spoken_words"], 11)
+
+    def test_answer_cut_off_by_max_tokens_loses_its_unfinished_sentence(self):
+        text = self.output.text(
+            completion("It is sunny in Paris. Expect a", "length"), "weather_overview"
+        )
+
+        self.assertEqual(text, "It is sunny in Paris.")
+        self.assertEqual(self.output.metrics()["weather_overview"]["cut_off"], 1)
+
+    def test_answer_without_budget_is_kept(self):
+        self.assertEqual(self.output.text(completion(ANSWER), None), ANSWER)
+        self.assertEqual(self.output.metrics(), {})
+
+    def test_completion_without_content_is_empty(self):
+        self.assertEqual(self.output.text(completion(None), "weather_overview"), "")
+        self.assertEqual(self.output.text(completion(None), None), "")
+
+
+class StreamTest(unittest.TestCase):
+    def setUp(self):
+        budgets = OutputBudgets()
+        budgets.budgets = {"weather_overview": OutputBudget(max_words=11)}
+        self.telemetry = mock.Mock(spec=LLMTelemetry)
+        self.output = BudgetedOutput(
+            SimpleNamespace(streaming_responses=True), self.telemetry, budgets
+        )
+        self.call = LLMCall("chat", "weather_overview", [])
+        self.call.admitted()
+
+    def test_stream_is_closed_once_the_budget_is_met(self):
+        stream = FakeStream(f"{ANSWER} Stay in the shade at noon.")
+        client = mock.Mock()
+        client.chat.completions.create.return_value = stream
+
+        text = self.output.stream(client, self.call)
+
+        self.assertEqual(text, "It is sunny in Paris. Expect a high of 24 degrees.")
+        self.assertTrue(stream.closed)
+        self.assertEqual(stream.read, 12)
+        client.chat.completions.create.assert_called_once_with(
+            model="chat", messages=[], stream=True, max_tokens=24
+        )
+        metrics = self.output.metrics()["weather_overview"]
+        self.assertEqual(metrics["streamed"], 1)
+        self.assertEqual(metrics["stopped_early"], 1)
+        self.assertIsNotNone(metrics["average_time_to_first_token"])
+        self.telemetry.finish.assert_called_once_with(
+            self.call, "It is sunny in Paris. Expect a high of 24 degrees. Bring"
+        )
+
+    def test_short_stream_is_read_to_the_end(self):
+        stream = FakeStream("It is sunny in Paris.")
+        client = mock.Mock()
+        client.chat.completions.create.return_value = stream
+
+        text = self.output.stream(client, self.call)
+
+        self.assertEqual(text, "It is sunny in Paris.")
+        self.assertEqual(stream.read, len(stream.chunks))
+        self.assertTrue(stream.closed)
+        self.assertEqual(self.output.metrics()["weather_overview"]["stopped_early"], 0)
+
+    def test_stream_cut_off_by_max_tokens_loses_its_unfinished_sentence(self):
+        stream = FakeStream("It is sunny in Paris. Expect a", "length")
+        client = mock.Mock()
+        client.chat.completions.create.return_value = stream
+
+        text = self.output.stream(client, self.call)
+
+        self.assertEqual(text, "It is sunny in Paris.")
+        self.assertEqual(self.output.metrics()["weather_overview"]["cut_off"], 1)
+
+    def test_async_stream_is_closed_once_the_budget_is_met(self):
+        stream = FakeStream(f"{ANSWER} Stay in the shade at noon.")
+        stream.close = mock.AsyncMock()
+        client = mock.Mock()
+        client.chat.completions.create = mock.AsyncMock(return_value=stream)
+
+        text = asyncio.run(self.output.stream_async(client, self.call))
+
+        self.assertEqual(text, "It is sunny in Paris. Expect a high of 24 degrees.")
+        self.assertEqual(stream.read, 12)
+        stream.close.assert_awaited_once()
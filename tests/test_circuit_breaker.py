@@ -0,0 +1,89 @@
+import unittest
+from unittest import mock
+
+from app.services.ai.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch("time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker("model", failure_threshold=3, reset_timeout=30)
+
+    def open_breaker(self):
+        for _ in range(3):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_open_breaker_fails_fast(self):
+        self.open_breaker()
+
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        metrics = self.breaker.metrics()
+        self.assertEqual(metrics["opened"], 1)
+        self.assertEqual(metrics["short_circuited"], 1)
+
+    def test_half_open_breaker_admits_a_single_probe(self):
+        self.open_breaker()
+        self.now += 30
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_successful_probe_closes(self):
+        self.open_breaker()
+        self.now += 30
+        self.breaker.before_call()
+        self.breaker.record_success()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.before_call()
+
+    def test_failed_probe_opens_again(self):
+        self.open_breaker()
+        self.now += 30
+        self.breaker.before_call()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.metrics()["opened"], 2)
+        self.now += 29
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_lost_probe_is_replaced(self):
+        self.open_breaker()
+        self.now += 30
+        self.breaker.before_call()
+        self.now += 30
+
+        self.breaker.before_call()
+
+    def test_skipped_probe_is_released(self):
+        self.open_breaker()
+        self.now += 30
+        self.breaker.before_call()
+        self.breaker.record_skipped()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.breaker.before_call()
+
+
+if __name__ == "__main__":
+    unittest.main()
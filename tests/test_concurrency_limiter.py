@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from app.models.ai.model_configs import ModelConfigs
+from app.services.ai.ai_service import AIService
+from app.services.ai.concurrency_limiter import (
+    AdmissionRejectedError,
+    ConcurrencyLimiter,
+)
+
+
+class ConcurrencyLimiterTest(unittest.TestCase):
+    def test_requests_are_admitted_up_to_the_limit(self):
+        limiter = ConcurrencyLimiter("backend", max_concurrency=2)
+
+        limiter.acquire(timeout=0)
+        limiter.acquire(timeout=0)
+
+        metrics = limiter.metrics()
+        self.assertEqual(metrics["in_flight"], 2)
+        self.assertEqual(metrics["admitted"], 2)
+        self.assertEqual(metrics["queued"], 0)
+
+    def test_request_is_rejected_when_the_queue_is_full(self):
+        limiter = ConcurrencyLimiter("backend", max_concurrency=1, max_queue=0)
+        limiter.acquire()
+
+        start = time.monotonic()
+        with self.assertRaises(AdmissionRejectedError):
+            limiter.acquire(timeout=5)
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(limiter.metrics()["rejected"], 1)
+        self.assertEqual(limiter.metrics()["in_flight"], 1)
+
+    def test_waiting_request_gives_up_after_its_timeout(self):
+        limiter = ConcurrencyLimiter("backend", max_concurrency=1, max_queue=1)
+        limiter.acquire()
+
+        with self.assertRaises(AdmissionRejectedError):
+            limiter.acquire(timeout=0.05)
+
+        metrics = limiter.metrics()
+        self.assertEqual(metrics["timed_out"], 1)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertGreaterEqual(metrics["max_wait"], 0.05)
+        # The slot is free again once the request in flight is done
+        limiter.release()
+        limiter.acquire(timeout=0)
+
+    def test_released_slot_goes_to_the_longest_waiting_request(self):
+        limiter = ConcurrencyLimiter("backend", max_concurrency=1, max_queue=2)
+        limiter.acquire()
+        admitted = []
+
+        def wait(name: str):
+            with limiter.slot(timeout=5):
+                admitted.append(name)
+
+        first = threading.Thread(target=wait, args=("first",))
+        first.start()
+        while limiter.metrics()["queue_depth"] < 1:
+            time.sleep(0.01)
+        second = threading.Thread(target=wait, args=("second",))
+        second.start()
+        while limiter.metrics()["queue_depth"] < 2:
+            time.sleep(0.01)
+
+        limiter.release()
+        first.join()
+        second.join()
+
+        self.assertEqual(admitted, ["first", "second"])
+        self.assertEqual(limiter.metrics()["in_flight"], 0)
+        self.assertEqual(limiter.metrics()["admitted"], 3)
+
+    def test_coroutine_is_admitted_when_a_slot_is_released(self):
+        limiter = ConcurrencyLimiter("backend", max_concurrency=1, max_queue=1)
+
+        async def scenario():
+            await limiter.acquire_async()
+            waiting = asyncio.create_task(limiter.acquire_async(timeout=5))
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiting.done())
+            # Released from another thread, like a request finishing on the sync path
+            threading.Thread(target=limiter.release).start()
+            await waiting
+
+        asyncio.run(scenario())
+
+        self.assertEqual(limiter.metrics()["in_flight"], 1)
+        self.assertEqual(limiter.metrics()["admitted"], 2)
+
+    def test_cancelled_coroutine_leaves_the_queue(self):
+        limiter = ConcurrencyLimiter("backend", max_concurrency=1, max_queue=1)
+
+        async def scenario():
+            await limiter.acquire_async()
+            waiting = asyncio.create_task(limiter.acquire_async(timeout=5))
+            await asyncio.sleep(0.01)
+            waiting.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiting
+
+        asyncio.run(scenario())
+
+        self.assertEqual(limiter.metrics()["queue_depth"], 0)
+        limiter.release()
+        self.assertEqual(limiter.metrics()["in_flight"], 0)
+
+    def test_backends_sharing_a_url_share_the_smallest_limits(self):
+        configs = ModelConfigs(
+            [
+                {
+                    "description": model,
+                    "base_url": base_url,
+                    "api_key": "ollama",
+                    "model": model,
+                    **limits,
+                }
+                for model, base_url, limits in [
+                    ("large", "http://gpu:11434/v1", {"max_concurrency": 4}),
+                    (
+                        "small",
+                        "http://gpu:11434/v1",
+                        {"max_concurrency": 2, "max_queue": 8},
+                    ),
+                    ("remote", "https://api.example.com/v1", {}),
+                ]
+            ]
+        )
+
+        limiters = AIService.create_limiters(configs)
+
+        self.assertEqual(list(limiters), ["http://gpu:11434/v1"])
+        limiter = limiters["http://gpu:11434/v1"]
+        self.assertEqual((limiter.max_concurrency, limiter.max_queue), (2, 0))
@@ -0,0 +1,121 @@
+import unittest
+
+from app.models.function_call import FunctionCall
+from app.models.function_spec import FunctionSpec
+from app.services.execution.function_call_parser import (
+    FunctionCallParser,
+    InvalidFunctionCallError,
+)
+
+
+def get_weather_forecast(duration="today", location=None, deadline=None):
+    return duration, location, deadline
+
+
+FORECAST_SPEC = FunctionSpec(
+    name="get_weather_forecast",
+    signature='def get_weather_forecast(duration: str = "today", location: str = None) -> str',
+    description="Fetches the weather forecast.",
+    loader=lambda: get_weather_forecast,
+)
+
+
+class FunctionCallParserTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = FunctionCallParser()
+
+    def test_call_is_parsed(self):
+        call = self.parser.parse(
+            "Call:   get_weather_forecast(duration='week', location='Paris, FR')  <bot_end>"
+        )
+
+        self.assertEqual(call.name, "get_weather_forecast")
+        self.assertEqual(
+            call.keyword_arguments(), {"duration": "week", "location": "Paris, FR"}
+        )
+
+    def test_trailing_text_is_ignored(self):
+        for function_str in (
+            "Call: ask_the_ai(query='who wrote hamlet')<bot_end>\nThought: done",
+            "Call: ask_the_ai(query='who wrote hamlet'). I hope this helps!",
+        ):
+            with self.subTest(function_str=function_str):
+                self.assertEqual(
+                    self.parser.parse(function_str),
+                    FunctionCall("ask_the_ai", kwargs=(("query", "who wrote hamlet"),)),
+                )
+
+    def test_every_call_is_parsed(self):
+        calls = self.parser.parse_all(
+            "Call: get_weather_forecast(location='Paris'); "
+            "get_weather_forecast(location='London')\n"
+            "Call: web_search(search='nexa ai')<bot_end>"
+        )
+
+        self.assertEqual(
+            [(call.name, call.keyword_arguments()) for call in calls],
+            [
+                ("get_weather_forecast", {"location": "Paris"}),
+                ("get_weather_forecast", {"location": "London"}),
+                ("web_search", {"search": "nexa ai"}),
+            ],
+        )
+
+    def test_markers_inside_strings_are_kept(self):
+        for query in ("I Thought: x", "Call: me maybe", "a <bot_end> b", 'say "Call:"'):
+            with self.subTest(query=query):
+                call = self.parser.parse(f"Call: ask_the_ai(query={query!r})<bot_end>")
+                self.assertEqual(call.keyword_arguments(), {"query": query})
+
+    def test_apostrophe_in_thought_does_not_hide_the_call(self):
+        calls = self.parser.parse_all(
+            "Thought: it's raining\nCall: get_weather_forecast(duration='today')"
+        )
+
+        self.assertEqual(len(calls), 1)
+
+    def test_code_is_rejected(self):
+        for function_str in (
+            "Call: ask_the_ai(query=__import__('os').getcwd())",
+            "Call: os.system('ls')",
+            "Call: ask_the_ai(**{'query': 'x'})",
+            "Call: ask_the_ai(query='x' + 'y')",
+            "get_weather_forecast(duration='today')",
+            "",
+        ):
+            with self.subTest(function_str=function_str):
+                with self.assertRaises(InvalidFunctionCallError):
+                    self.parser.parse(function_str)
+
+    def test_parsed_calls_are_cached(self):
+        function_str = "Call: web_search(search='nexa ai')"
+
+        first = self.parser.parse(function_str)
+        second = self.parser.parse(f"  {function_str}\n")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.parser.cache_info().hits, 1)
+        self.parser.cache_clear()
+        self.assertEqual(self.parser.cache_info().currsize, 0)
+
+    def test_declared_arguments_are_bound(self):
+        call = self.parser.parse("Call: get_weather_forecast('week', location='Paris')")
+
+        bound = self.parser.bind(FORECAST_SPEC, get_weather_forecast, call)
+
+        self.assertEqual(bound.arguments, {"duration": "week", "location": "Paris"})
+
+    def test_undeclared_arguments_are_rejected(self):
+        for function_str in (
+            "Call: get_weather_forecast(deadline=5)",
+            "Call: get_weather_forecast('week', 'Paris', 5)",
+            "Call: get_weather_forecast(when='today')",
+        ):
+            call = self.parser.parse(function_str)
+            with self.subTest(function_str=function_str):
+                with self.assertRaises(InvalidFunctionCallError):
+                    self.parser.bind(FORECAST_SPEC, get_weather_forecast, call)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from app.models.function_spec import FunctionSpec
+from app.services.execution.function_registry import FunctionRegistry
+
+
+def web_search(search: str) -> str:
+    return search
+
+
+class FunctionRegistryTest(unittest.TestCase):
+    def setUp(self):
+        FunctionRegistry.reset_instance()
+        self.addCleanup(FunctionRegistry.reset_instance)
+        self.registry = FunctionRegistry()
+        self.loader = mock.Mock(return_value=web_search)
+
+    def register(self, **spec):
+        self.registry.register(
+            FunctionSpec(
+                name="web_search",
+                signature="def web_search(search: str, limit: int = 3) -> str",
+                description="""
+                Searches the web.
+
+                Args:
+                    search (str): The search string.
+                """,
+                loader=self.loader,
+                **spec,
+            )
+        )
+
+    def test_builtin_functions_are_registered(self):
+        self.assertEqual(
+            self.registry.names(),
+            [
+                "ask_the_ai",
+                "web_search",
+                "get_weather_forecast",
+                "get_weather_temperature",
+            ],
+        )
+
+    def test_function_is_loaded_on_first_use_only(self):
+        self.register()
+        self.loader.assert_not_called()
+
+        self.assertIs(self.registry.resolve("web_search"), web_search)
+        self.assertIs(self.registry.resolve("web_search"), web_search)
+        self.loader.assert_called_once_with()
+
+    def test_concurrent_first_uses_load_once(self):
+        def load():
+            time.sleep(0.05)
+            return web_search
+
+        self.loader.side_effect = load
+        self.register()
+        threads = [
+            threading.Thread(target=self.registry.resolve, args=("web_search",))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.loader.assert_called_once_with()
+
+    def test_registering_again_reloads(self):
+        self.register()
+        self.registry.resolve("web_search")
+        self.register()
+
+        self.registry.resolve("web_search")
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_async_implementation_is_optional(self):
+        self.register()
+        self.assertIsNone(self.registry.resolve_async("web_search"))
+
+        async def web_search_async(search: str) -> str:
+            return search
+
+        self.register(async_loader=lambda: web_search_async)
+        self.assertIs(self.registry.resolve_async("web_search"), web_search_async)
+
+    def test_unknown_function_raises(self):
+        with self.assertRaises(KeyError):
+            self.registry.resolve("exec")
+        self.assertNotIn("exec", self.registry)
+
+    def test_prompt_and_schemas_come_from_the_specs(self):
+        self.register()
+
+        self.assertIn(
+            'Function:\ndef web_search(search: str, limit: int = 3) -> str:\n    """\n'
+            "    Searches the web.\n",
+            self.registry.routing_prompt(),
+        )
+        schema = self.registry.tool_schemas()[1]["function"]
+        self.assertEqual(schema["name"], "web_search")
+        self.assertEqual(schema["description"], "Searches the web.")
+        self.assertEqual(
+            schema["parameters"]["properties"],
+            {"search": {"type": "string"}, "limit": {"type": "integer"}},
+        )
+        self.assertEqual(schema["parameters"]["required"], ["search"])
+
+
+if __name__ == "__main__":
+    unittest.main()
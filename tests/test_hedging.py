@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import unittest
+
+from app.models.ai.model_config import ModelConfig
+from app.services.ai.hedging import HedgePolicy, Hedger
+
+PRIMARY = ModelConfig(
+    "Primary", "http://primary:11434/v1", "ollama", "llama3", hedge_to="backup"
+)
+BACKUP = ModelConfig("Backup", "http://backup:11434/v1", "ollama", "backup")
+
+
+class HedgePolicyTest(unittest.TestCase):
+    def test_budget_starts_full(self):
+        policy = HedgePolicy(max_rate=0.1, burst=2)
+
+        self.assertTrue(policy.try_hedge(PRIMARY))
+        self.assertTrue(policy.try_hedge(PRIMARY))
+        self.assertFalse(policy.can_hedge())
+        self.assertFalse(policy.try_hedge(PRIMARY))
+        counters = policy.metrics()["models"]["llama3"]
+        self.assertEqual(counters["hedged"], 2)
+        self.assertEqual(counters["budget_exhausted"], 1)
+
+    def test_budget_grows_with_requests(self):
+        policy = HedgePolicy(max_rate=0.25, burst=2)
+        policy.try_hedge(PRIMARY)
+        policy.try_hedge(PRIMARY)
+
+        for _ in range(3):
+            policy.start(PRIMARY)
+        self.assertFalse(policy.can_hedge())
+        policy.start(PRIMARY)
+        self.assertTrue(policy.can_hedge())
+
+    def test_budget_is_capped_at_burst(self):
+        policy = HedgePolicy(max_rate=0.5, burst=2)
+
+        for _ in range(100):
+            policy.start(PRIMARY)
+        self.assertEqual(policy.metrics()["budget"], 2)
+
+    def test_delay_is_the_p95_latency(self):
+        policy = HedgePolicy(max_rate=0.1, min_samples=20)
+
+        for latency in range(1, 20):
+            policy.record_latency(PRIMARY, latency / 100)
+        self.assertIsNone(policy.hedge_delay(PRIMARY))
+        policy.record_latency(PRIMARY, 0.2)
+        self.assertEqual(policy.hedge_delay(PRIMARY), 0.19)
+
+
+class HedgerTest(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.threads = {}
+
+    def create_hedger(self, burst: float = 5.0) -> Hedger:
+        policy = HedgePolicy(max_rate=0.1, burst=burst, min_samples=1)
+        policy.record_latency(PRIMARY, 0.01)
+        return Hedger(policy, {"backup": BACKUP}.__getitem__)
+
+    def complete(self, model_config, _messages, _deadline, _template):
+        self.threads[model_config.model] = threading.current_thread()
+        if model_config is PRIMARY:
+            self.release.wait(5)
+        return model_config.model
+
+    def test_slow_primary_is_hedged(self):
+        hedger = self.create_hedger()
+
+        self.assertEqual(hedger.complete(self.complete, PRIMARY, []), "backup")
+        counters = hedger.policy.metrics()["models"]["llama3"]
+        self.assertEqual(counters["hedged"], 1)
+        self.assertEqual(counters["hedge_wins"], 1)
+
+    def test_primary_runs_inline_without_budget(self):
+        hedger = self.create_hedger(burst=0)
+        self.release.set()
+
+        self.assertEqual(hedger.complete(self.complete, PRIMARY, []), "llama3")
+        self.assertIs(self.threads["llama3"], threading.current_thread())
+        self.assertNotIn("backup", self.threads)
+
+    def test_slow_async_primary_is_hedged_and_cancelled(self):
+        hedger = self.create_hedger()
+        cancelled = []
+
+        async def complete(model_config, _messages, _deadline, _template):
+            if model_config is PRIMARY:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(model_config.model)
+                    raise
+            return model_config.model
+
+        result = asyncio.run(hedger.complete_async(complete, PRIMARY, []))
+
+        self.assertEqual(result, "backup")
+        self.assertEqual(cancelled, ["llama3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
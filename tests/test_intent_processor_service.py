@@ -0,0 +1,100 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from app.models.deadline import Deadline
+from app.services.intent_processor_service import IntentProcessorService
+from tests import use_config
+
+
+class IntentProcessorServiceTest(unittest.TestCase):
+    def setUp(self):
+        use_config(self, ROUTING_BUDGET="1", GENERATION_BUDGET="2")
+        self.ai_service = self.patch("AIServiceSingleton").get_instance.return_value
+        self.executor = self.patch("ActionExecutorService").return_value
+        self.patch("ActionResponseService")
+        self.patch("render_template").side_effect = lambda name, **_: name
+        IntentProcessorService.reset_instance()
+        self.addCleanup(IntentProcessorService.reset_instance)
+        self.processor = IntentProcessorService()
+        self.processor.system_role = "You are a helpful assistant."
+
+    def patch(self, name: str) -> mock.MagicMock:
+        patcher = mock.patch(f"app.services.intent_processor_service.{name}")
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_response_of_the_selected_model(self):
+        self.ai_service.select_model.return_value = "fast"
+        self.ai_service.get_response_with_model_name.return_value = "Goodbye!"
+        deadline = Deadline(5)
+
+        response = self.processor.get_ai_response(
+            "Say goodbye.", deadline=deadline, prompt_class="acknowledgement"
+        )
+
+        self.assertEqual(response, "Goodbye!")
+        self.ai_service.select_model.assert_called_once_with(
+            "acknowledgement", deadline, None
+        )
+
+    def test_fallback_template_when_no_model_fits(self):
+        self.ai_service.select_model.return_value = None
+
+        response = self.processor.get_ai_response(
+            "Say goodbye.", deadline=Deadline(0.1), fallback_template="goodbye_response"
+        )
+
+        self.assertEqual(response, "goodbye_response")
+        self.ai_service.get_response_with_model_name.assert_not_called()
+
+    def test_unavailable_message_when_the_model_fails(self):
+        self.ai_service.select_model.return_value = "standard"
+        self.ai_service.get_response_with_model_name_async = mock.AsyncMock(
+            return_value=None
+        )
+
+        response = asyncio.run(self.processor.get_ai_response_async("Say hello."))
+
+        self.assertEqual(response, "unavailable_message")
+
+    def test_utterance_is_routed_when_time_allows(self):
+        self.ai_service.get_function_for_utterance.return_value = "Call: f()"
+        deadline = Deadline(5)
+
+        self.processor.process_utterance("what is the weather", deadline)
+
+        self.executor.execute_function.assert_called_once_with("Call: f()", deadline)
+        self.ai_service.ask_the_ai.assert_not_called()
+
+    def test_routing_is_skipped_when_only_a_generation_fits(self):
+        self.ai_service.ask_the_ai.return_value = "It is sunny."
+
+        response = self.processor.process_utterance(
+            "what is the weather", Deadline(2.5)
+        )
+
+        self.assertEqual(response.details.status, "success")
+        self.assertEqual(response.details.data, "It is sunny.")
+        self.ai_service.get_function_for_utterance.assert_not_called()
+
+    def test_canned_answer_when_nothing_fits(self):
+        response = self.processor.process_utterance("what is the weather", Deadline(1))
+
+        self.assertEqual(response.details.status, "timeout")
+        self.assertEqual(response.details.data, "unavailable_message")
+        self.ai_service.ask_the_ai.assert_not_called()
+
+    def test_async_routing_is_skipped_when_only_a_generation_fits(self):
+        self.ai_service.ask_the_ai_async = mock.AsyncMock(return_value="It is sunny.")
+
+        response = asyncio.run(
+            self.processor.process_utterance_async("what is the weather", Deadline(2.5))
+        )
+
+        self.assertEqual(response.details.data, "It is sunny.")
+        self.ai_service.get_function_for_utterance_async.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import functools
+import unittest
+from unittest import mock
+
+from app.helpers.weather_helpers import WeatherHelpers
+from app.models.deadline import Deadline
+from app.services.ai.ai_service import AIService
+from app.services.intents_service import IntentsService
+from tests import use_config
+
+
+class WeatherIntentsTest(unittest.TestCase):
+    def setUp(self):
+        use_config(self)
+        api = self.patch("OpenWeatherMapAPI").return_value
+        api.get_weather_async = mock.AsyncMock(return_value={})
+        api.get_summary_async = mock.AsyncMock(return_value={})
+        self.patch("render_template").side_effect = lambda name, **_: name
+        # The real prompting of the AI service, with no model fitting the deadline
+        self.ai_service = mock.Mock(spec=AIService)
+        self.ai_service.config = mock.Mock(personality=None)
+        self.ai_service.select_model.return_value = None
+        self.ai_service.prompt_the_ai = functools.partial(
+            AIService.prompt_the_ai, self.ai_service
+        )
+        self.ai_service.prompt_the_ai_async = functools.partial(
+            AIService.prompt_the_ai_async, self.ai_service
+        )
+        singleton = self.patch("AIServiceSingleton")
+        singleton.return_value.get_instance.return_value = self.ai_service
+        patcher = mock.patch.object(
+            WeatherHelpers, "generate_temperature_prompt", return_value="prompt"
+        )
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    def patch(self, name: str) -> mock.MagicMock:
+        patcher = mock.patch(f"app.services.weather.weather_service.{name}")
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_temperature_is_answered_when_no_model_fits(self):
+        response = IntentsService.handle_weather_temperature(
+            {"request": {}}, Deadline(0.1)
+        )
+
+        self.assertEqual(
+            response, {"type": "statement", "response": "weather_unavailable"}
+        )
+        self.ai_service.get_response_with_model_name.assert_not_called()
+
+    def test_async_temperature_is_answered_when_no_model_fits(self):
+        response = asyncio.run(
+            IntentsService.handle_weather_temperature_async(
+                {"request": {}}, Deadline(0.1)
+            )
+        )
+
+        self.assertEqual(
+            response, {"type": "statement", "response": "weather_unavailable"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
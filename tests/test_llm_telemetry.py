@@ -0,0 +1,125 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from app.services.telemetry.histogram import TOKEN_BUCKETS, Histogram
+from app.services.telemetry.llm_telemetry import LLMCall, LLMTelemetry
+from app.services.telemetry.token_estimator import TokenEstimator
+
+MESSAGES = [
+    {"role": "system", "content": "You are terse."},
+    {"role": "user", "content": "What is the capital of Luxembourg?"},
+]
+
+
+class TokenEstimatorTest(unittest.TestCase):
+    def test_words_and_punctuation_are_counted(self):
+        self.assertEqual(TokenEstimator.count(""), 0)
+        self.assertEqual(TokenEstimator.count("Hi!"), 2)
+        # "Luxembourg" spans three started blocks of four characters, "please" two
+        self.assertEqual(TokenEstimator.count("Luxembourg, please."), 7)
+
+    def test_messages_include_their_framing(self):
+        self.assertEqual(
+            TokenEstimator.count_messages(MESSAGES),
+            2 + (4 + 5) + (4 + 10),
+        )
+
+
+class HistogramTest(unittest.TestCase):
+    def test_quantiles_interpolate_within_their_bucket(self):
+        histogram = Histogram((1.0, 2.0, 4.0))
+        for value in (0.5, 1.5, 1.5, 3.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [1, 2, 1, 0])
+        self.assertEqual(histogram.quantile(0.5), 1.5)
+        self.assertEqual(histogram.quantile(1.0), 3.0)
+        self.assertEqual(histogram.snapshot()["mean"], 1.625)
+        self.assertIsNone(Histogram().quantile(0.5))
+
+    def test_quantile_above_the_last_bound_is_the_largest_observation(self):
+        histogram = Histogram((1.0,))
+        histogram.observe(0.5)
+        histogram.observe(9.0)
+
+        self.assertEqual(histogram.quantile(0.99), 9.0)
+
+    def test_merge_and_round_trip(self):
+        first, second = Histogram(TOKEN_BUCKETS), Histogram(TOKEN_BUCKETS)
+        first.observe(10)
+        second.observe(300)
+
+        first.merge(second)
+        copy = Histogram.from_dict(first.to_dict())
+
+        self.assertEqual(copy.snapshot(), first.snapshot())
+        self.assertEqual((copy.count, copy.min, copy.max), (2, 10, 300))
+
+
+class LLMTelemetryTest(unittest.TestCase):
+    def setUp(self):
+        self.telemetry = LLMTelemetry()
+        patcher = mock.patch("app.services.telemetry.llm_telemetry.time.monotonic")
+        self.addCleanup(patcher.stop)
+        self.clock = patcher.start()
+
+    def start(self, template="query_prompt") -> LLMCall:
+        self.clock.return_value = 10.0
+        return self.telemetry.start("llama3", template, MESSAGES)
+
+    def test_reported_usage_is_recorded(self):
+        call = self.start()
+        self.clock.return_value = 10.25
+        call.admitted()
+        self.clock.return_value = 11.0
+
+        self.telemetry.finish(
+            call, "Luxembourg.", SimpleNamespace(prompt_tokens=30, completion_tokens=3)
+        )
+
+        metrics = self.telemetry.metrics()
+        model = metrics["models"]["llama3"]
+        self.assertEqual(model["calls"], 1)
+        self.assertEqual(model["estimated_calls"], 0)
+        self.assertEqual((model["prompt_tokens"], model["completion_tokens"]), (30, 3))
+        self.assertEqual(model["latency"]["max"], 1.0)
+        self.assertEqual(model["queue_wait"]["max"], 0.25)
+        self.assertEqual(model["time_to_first_token"]["count"], 0)
+        template = metrics["templates"]["query_prompt"]
+        self.assertEqual(template["prompt_tokens_total"], 30)
+        self.assertEqual(template["completion_tokens_total"], 3)
+
+    def test_tokens_are_estimated_without_usage(self):
+        call = self.start(template=None)
+        self.clock.return_value = 10.5
+
+        self.telemetry.finish(call, "Luxembourg.", SimpleNamespace(prompt_tokens=None))
+        self.telemetry.finish(call, None)
+
+        metrics = self.telemetry.metrics()
+        model = metrics["models"]["llama3"]
+        self.assertEqual(model["estimated_calls"], 2)
+        self.assertEqual(
+            model["prompt_tokens"], 2 * TokenEstimator.count_messages(MESSAGES)
+        )
+        self.assertEqual(model["completion_tokens"], 4)
+        # Not admitted through a limiter: the call did not wait
+        self.assertEqual(model["queue_wait"]["max"], 0.0)
+        self.assertEqual(metrics["templates"]["untemplated"]["calls"], 2)
+
+    def test_time_to_first_token_counts_from_admission(self):
+        call = self.start()
+        self.clock.return_value = 10.5
+        call.admitted()
+        self.clock.return_value = 10.75
+        call.first_token()
+        self.clock.return_value = 12.0
+        call.first_token()
+
+        self.telemetry.finish(call, "Luxembourg.")
+
+        first_token = self.telemetry.metrics()["models"]["llama3"][
+            "time_to_first_token"
+        ]
+        self.assertEqual((first_token["count"], first_token["max"]), (1, 0.25))
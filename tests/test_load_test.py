@@ -0,0 +1,159 @@
+import asyncio
+import socket
+import unittest
+from collections import defaultdict
+
+from benchmarks.load_test import LoadTest, Record, find_knee, load_steps, summarize
+from benchmarks.standins import StandIn, json_response, start_server
+
+CORPUS = {
+    name: {
+        "session": {"sessionId": "recorded", "new": False},
+        "request": {"type": name},
+    }
+    for name in ("launch", "help", "stop")
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def step(load, p95=0.1, error_rate=0.0, throughput=None) -> dict:
+    return {
+        "load": load,
+        "p95": p95,
+        "error_rate": error_rate,
+        "throughput": load if throughput is None else throughput,
+    }
+
+
+class LoadStepsTest(unittest.TestCase):
+    def test_single_load_and_ramp(self):
+        self.assertEqual(load_steps("20", 5), [20.0])
+        self.assertEqual(load_steps("10:10", 3), [10.0])
+        self.assertEqual(load_steps("10:50", 1), [50.0])
+        self.assertEqual(load_steps("10:50", 5), [10.0, 20.0, 30.0, 40.0, 50.0])
+
+    def test_summary_counts_the_failed_requests_without_their_latency(self):
+        records = [
+            Record("help", 0, 0.0, 0.1, True),
+            Record("help", 0, 0.0, 0.3, True),
+            Record("help", 0, 0.0, 8.0, False),
+        ]
+
+        summary = summarize(records, 2, 4.0)
+
+        self.assertEqual(
+            summary,
+            {
+                "requests": 3,
+                "errors": 1,
+                "error_rate": 0.3333,
+                "throughput": 0.5,
+                "p50": 0.1,
+                "p95": 0.3,
+                "p99": 0.3,
+            },
+        )
+        self.assertIsNone(summarize([], 0, 1.0)["p95"])
+
+
+class FindKneeTest(unittest.TestCase):
+    def test_no_knee_while_the_skill_keeps_up(self):
+        steps = [step(10), step(20), step(40)]
+
+        self.assertIsNone(find_knee(steps, "open", 2.0, 0.01))
+        self.assertIsNone(find_knee(steps, "closed", 2.0, 0.01))
+
+    def test_errors_mark_the_knee(self):
+        knee = find_knee([step(10), step(20, error_rate=0.05)], "open", 2.0, 0.01)
+
+        self.assertEqual(
+            knee,
+            {"step": 1, "load": 20, "sustained_load": 10, "reason": "error rate 5.0%"},
+        )
+
+    def test_latency_above_the_knee_factor_marks_the_knee(self):
+        knee = find_knee(
+            [step(10), step(20, p95=0.15), step(30, p95=0.25)], "open", 2.0, 0.01
+        )
+
+        self.assertEqual((knee["step"], knee["sustained_load"]), (2, 20))
+        self.assertTrue(knee["reason"].startswith("p95 0.250 s"))
+
+    def test_closed_loop_throughput_that_stops_growing_marks_the_knee(self):
+        steps = [step(10), step(20, throughput=14)]
+
+        self.assertIsNone(find_knee(steps, "open", 2.0, 0.01))
+        knee = find_knee(steps, "closed", 2.0, 0.01)
+        self.assertEqual(knee["reason"], "throughput stopped growing with the users")
+
+    def test_saturated_from_the_first_step(self):
+        knee = find_knee([step(10, error_rate=0.5)], "open", 2.0, 0.01)
+
+        self.assertIsNone(knee["sustained_load"])
+
+
+class LoadTestTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sessions = defaultdict(list)
+
+        async def handler(_path, _query, body):
+            session = body["session"]
+            cls.sessions[session["sessionId"]].append(
+                (body["request"]["type"], session["new"])
+            )
+            return json_response({"version": "1.0", "response": {}})
+
+        cls.skill = StandIn("skill", handler, 0.01)
+        cls.failing = StandIn("failing", handler, 0.01, error_rate=1.0)
+        cls.servers, cls.urls = [], {}
+        for standin in (cls.skill, cls.failing):
+            port = free_port()
+            cls.servers.append(start_server(standin, port))
+            cls.urls[standin.name] = f"http://127.0.0.1:{port}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers:
+            server.should_exit = True
+
+    def setUp(self):
+        self.sessions.clear()
+
+    def run_load_test(self, url: str, arrival: str, loads) -> dict:
+        load_test = LoadTest(url, CORPUS, 2, 0.0, 5.0, 0)
+        # The window outlasts the test, so no progress is printed
+        return asyncio.run(load_test.run(arrival, loads, 0.3, 60.0, 10))
+
+    def test_closed_loop_sessions_run_from_launch_to_stop(self):
+        results = self.run_load_test(self.urls["skill"], "closed", [1, 2])
+
+        self.assertTrue(self.sessions)
+        for requests in self.sessions.values():
+            self.assertEqual(requests[0], ("launch", True))
+            self.assertTrue(all(not new for _, new in requests[1:]))
+            if len(requests) == 4:
+                self.assertEqual(requests[1:3], [("help", False)] * 2)
+                self.assertEqual(requests[3], ("stop", False))
+        self.assertNotIn("recorded", self.sessions)
+        self.assertEqual([entry["load"] for entry in results["steps"]], [1, 2])
+        for entry in results["steps"]:
+            self.assertGreater(entry["requests"], 0)
+            self.assertEqual(entry["errors"], 0)
+            self.assertGreater(entry["throughput"], 0)
+        self.assertEqual(set(results["requests"]), {"launch", "help", "stop"})
+
+    def test_open_loop_failures_are_counted_as_errors(self):
+        results = self.run_load_test(self.urls["failing"], "open", [100])
+
+        (entry,) = results["steps"]
+        self.assertGreater(entry["requests"], 0)
+        self.assertEqual(entry["error_rate"], 1.0)
+        self.assertEqual(entry["throughput"], 0.0)
+        self.assertIsNone(entry["p95"])
+        self.assertEqual(find_knee(results["steps"], "open", 2.0, 0.01)["step"], 0)
@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from app.services.telemetry.metrics_registry import (
+    REQUEST_ERRORS_TOTAL,
+    REQUESTS_IN_FLIGHT,
+    REQUESTS_TOTAL,
+    STAGE_ROUTING,
+    STAGE_SECONDS,
+    MetricsRegistry,
+)
+
+
+def create_registry() -> MetricsRegistry:
+    # A registry of its own, instead of the one of earlier tests
+    MetricsRegistry.reset_instance()
+    return MetricsRegistry()
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = create_registry()
+        self.addCleanup(MetricsRegistry.reset_instance)
+
+    def test_counters_and_gauges_are_rendered(self):
+        for intent in ("WeatherIntent", "WeatherIntent", "HelpIntent"):
+            with self.registry.request(intent):
+                pass
+        with self.assertRaises(ValueError):
+            with self.registry.request("HelpIntent"):
+                raise ValueError()
+
+        lines = self.registry.render().splitlines()
+        self.assertIn("# TYPE nexa_requests_total counter", lines)
+        self.assertIn('nexa_requests_total{intent="WeatherIntent"} 2', lines)
+        self.assertIn('nexa_requests_total{intent="HelpIntent"} 2', lines)
+        self.assertIn('nexa_request_errors_total{intent="HelpIntent"} 1', lines)
+        self.assertIn("nexa_requests_in_flight 0", lines)
+
+    def test_histograms_are_rendered_cumulatively(self):
+        self.registry.observe(STAGE_SECONDS, 0.2, (STAGE_ROUTING,))
+        self.registry.observe(STAGE_SECONDS, 0.6, (STAGE_ROUTING,))
+        self.registry.observe(STAGE_SECONDS, 60, (STAGE_ROUTING,))
+
+        lines = self.registry.render().splitlines()
+        self.assertIn('nexa_stage_seconds_bucket{stage="routing",le="0.1"} 0', lines)
+        self.assertIn('nexa_stage_seconds_bucket{stage="routing",le="0.25"} 1', lines)
+        self.assertIn('nexa_stage_seconds_bucket{stage="routing",le="0.75"} 2', lines)
+        self.assertIn('nexa_stage_seconds_bucket{stage="routing",le="+Inf"} 3', lines)
+        self.assertIn('nexa_stage_seconds_sum{stage="routing"} 60.8', lines)
+        self.assertIn('nexa_stage_seconds_count{stage="routing"} 3', lines)
+
+    def test_counts_of_finished_threads_are_kept(self):
+        threads = [
+            threading.Thread(
+                target=self.registry.inc, args=(REQUESTS_TOTAL, ("WeatherIntent",))
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.registry.inc(REQUESTS_TOTAL, ("WeatherIntent",))
+
+        self.assertIn(
+            'nexa_requests_total{intent="WeatherIntent"} 5',
+            self.registry.render().splitlines(),
+        )
+        # The shards of the finished threads were retired by the first scrape
+        self.assertIn(
+            'nexa_requests_total{intent="WeatherIntent"} 5',
+            self.registry.render().splitlines(),
+        )
+
+    def test_collected_families_are_rendered(self):
+        self.registry.add_collector(
+            lambda: [
+                (
+                    "nexa_cache_entries",
+                    "gauge",
+                    "Cached answers.",
+                    [({"scope": 'say "hi"'}, 3)],
+                )
+            ]
+        )
+
+        lines = self.registry.render().splitlines()
+        self.assertIn("# TYPE nexa_cache_entries gauge", lines)
+        self.assertIn('nexa_cache_entries{scope="say \\"hi\\""} 3', lines)
+
+
+class SharedMetricsRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.registry = create_registry()
+        self.addCleanup(MetricsRegistry.reset_instance)
+        self.registry.share(self.directory)
+
+    def write_worker_snapshot(self, pid: int, requests: int):
+        worker = create_registry()
+        worker.directory = self.directory
+        worker.add_collector(
+            lambda: [("nexa_cache_entries", "gauge", "Cached answers.", [({}, pid)])]
+        )
+        worker.inc(REQUESTS_TOTAL, ("WeatherIntent",), requests)
+        worker.inc(REQUESTS_IN_FLIGHT)
+        worker.observe(STAGE_SECONDS, 0.2, (STAGE_ROUTING,))
+        with mock.patch("os.getpid", return_value=pid):
+            worker.write_snapshot()
+
+    def test_share_removes_earlier_snapshots(self):
+        self.write_worker_snapshot(1001, 1)
+
+        self.registry.share(self.directory)
+
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_snapshots_of_other_workers_are_added(self):
+        self.registry.inc(REQUESTS_TOTAL, ("WeatherIntent",))
+        self.registry.inc(REQUEST_ERRORS_TOTAL, ("WeatherIntent",))
+        self.write_worker_snapshot(1001, 2)
+        self.write_worker_snapshot(1002, 4)
+
+        with mock.patch.object(
+            MetricsRegistry, "_is_alive", side_effect=lambda pid: pid == 1001
+        ):
+            lines = self.registry.render().splitlines()
+
+        self.assertIn('nexa_requests_total{intent="WeatherIntent"} 7', lines)
+        self.assertIn('nexa_request_errors_total{intent="WeatherIntent"} 1', lines)
+        self.assertIn("nexa_requests_in_flight 1", lines)
+        self.assertIn('nexa_stage_seconds_count{stage="routing"} 2', lines)
+        self.assertIn('nexa_cache_entries{pid="1001"} 1001', lines)
+        self.assertNotIn('nexa_cache_entries{pid="1002"} 1002', lines)
+
+    def test_snapshot_holds_the_live_metrics(self):
+        self.registry.inc(REQUESTS_TOTAL, ("WeatherIntent",))
+
+        self.registry.write_snapshot()
+
+        with open(
+            os.path.join(self.directory, f"metrics-{os.getpid()}.json"),
+            encoding="utf-8",
+        ) as file:
+            snapshot = json.load(file)
+        self.assertEqual(snapshot["values"], [[REQUESTS_TOTAL, ["WeatherIntent"], 1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
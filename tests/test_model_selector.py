@@ -0,0 +1,98 @@
+import unittest
+from types import SimpleNamespace
+
+from app.models.ai.model_configs import ModelConfigs
+from app.models.ai.replica_balancer import ReplicaBalancer
+from app.models.deadline import Deadline
+from app.services.ai.circuit_breaker import CircuitBreaker
+from app.services.ai.model_selector import ModelSelector
+
+
+def model_configs(*models: str) -> ModelConfigs:
+    return ModelConfigs(
+        [
+            {
+                "description": model,
+                "base_url": "http://localhost:11434/v1",
+                "api_key": "ollama",
+                "model": model,
+            }
+            for model in models
+        ]
+    )
+
+
+class ModelSelectorTest(unittest.TestCase):
+    def create_selector(self, fast_model=None) -> ModelSelector:
+        config = SimpleNamespace(
+            large_language_model="large",
+            standard_language_model="standard",
+            fast_language_model=fast_model,
+            routing_language_model="routing",
+            generation_budget=5.0,
+        )
+        models = ["large", "standard", "routing"] + ([fast_model] if fast_model else [])
+        configs = model_configs(*models)
+        breakers = {
+            ReplicaBalancer.replica_id(model_config): CircuitBreaker(
+                model_config.model, failure_threshold=1
+            )
+            for model_config in configs.configs
+        }
+        return ModelSelector(config, configs, breakers)
+
+    @staticmethod
+    def open_circuit(selector: ModelSelector, model: str):
+        model_config = selector.model_configs.get_model_config(model)
+        selector.breakers[ReplicaBalancer.replica_id(model_config)].record_failure()
+
+    def test_tier_model_is_selected(self):
+        selector = self.create_selector(fast_model="fast")
+
+        self.assertEqual(selector.select("open_question"), "large")
+        self.assertEqual(selector.select("summary"), "standard")
+        self.assertEqual(selector.select("acknowledgement"), "fast")
+        self.assertEqual(selector.select("routing"), "routing")
+
+    def test_tier_without_model_falls_back_to_standard(self):
+        selector = self.create_selector()
+
+        self.assertEqual(
+            selector.get_candidates("acknowledgement"), [("standard", "standard")]
+        )
+        self.assertEqual(selector.select("acknowledgement"), "standard")
+
+    def test_open_circuit_falls_back_to_a_faster_tier(self):
+        selector = self.create_selector(fast_model="fast")
+        self.open_circuit(selector, "large")
+
+        self.assertEqual(selector.select("open_question"), "standard")
+
+    def test_every_circuit_open_selects_the_first_model(self):
+        selector = self.create_selector()
+        self.open_circuit(selector, "large")
+        self.open_circuit(selector, "standard")
+
+        self.assertEqual(selector.select("open_question"), "large")
+
+    def test_short_deadline_selects_the_fast_tier(self):
+        selector = self.create_selector(fast_model="fast")
+
+        self.assertEqual(selector.select("open_question", Deadline(1.0)), "fast")
+
+    def test_short_deadline_without_fast_model_selects_nothing(self):
+        selector = self.create_selector()
+
+        self.assertIsNone(selector.select("open_question", Deadline(1.0)))
+
+    def test_known_latency_is_fitted(self):
+        selector = self.create_selector()
+        large = selector.model_configs.get_model_config("large")
+        selector.model_configs.record_result(large, 0.4, True)
+
+        self.assertEqual(selector.select("open_question", Deadline(1.0)), "large")
+        self.assertEqual(selector.metrics(), {"open_question:large": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
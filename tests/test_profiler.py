@@ -0,0 +1,219 @@
+import asyncio
+import glob
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+from app.routes.profiling import ProfilingMiddleware, register_profiling
+from app.runtime.asgi_app import ASGIApp
+from app.services.telemetry.profiler import Profiler
+from tests import use_config
+
+TOKEN = "secret"
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def wait_for_the_model(done: threading.Event):
+    done.wait(5)
+
+
+class ProfilingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def create_profiler(self, **environ) -> Profiler:
+        use_config(
+            self,
+            PROFILING="true",
+            PROFILE_DIR=self.directory,
+            PROFILE_TOKEN=TOKEN,
+            **environ,
+        )
+        Profiler.reset_instance()
+        self.addCleanup(Profiler.reset_instance)
+        profiler = Profiler()
+        self.addCleanup(profiler.stop_capture)
+        return profiler
+
+    def request_profiles(self) -> list:
+        return glob.glob(os.path.join(self.directory, "request-*.prof"))
+
+
+class ProfilerTest(ProfilingTestCase):
+    def test_capture_stops_after_its_requests_and_writes_the_stacks(self):
+        profiler = self.create_profiler()
+        done = threading.Event()
+        worker = threading.Thread(
+            target=wait_for_the_model, args=(done,), name="request-worker"
+        )
+        worker.start()
+        self.addCleanup(worker.join)
+        self.addCleanup(done.set)
+
+        capture = profiler.start_capture(max_requests=2, seconds=10, interval=0.005)
+
+        self.assertIsNone(profiler.start_capture())
+        self.assertTrue(wait_until(lambda: capture.samples >= 3))
+        for _ in range(2):
+            with profiler.profile_request():
+                pass
+        self.assertTrue(wait_until(lambda: not capture.is_running()))
+
+        with open(capture.path, encoding="utf-8") as file:
+            stacks = [line.rsplit(" ", 1) for line in file.read().splitlines()]
+        worker_stacks = [
+            stack for stack, _ in stacks if stack.startswith("request-worker;")
+        ]
+        self.assertTrue(worker_stacks)
+        self.assertIn("wait_for_the_model (test_profiler.py:", worker_stacks[0])
+        self.assertFalse(any("sampling-profiler" in stack for stack, _ in stacks))
+        self.assertEqual(
+            sum(int(count) for stack, count in stacks if stack in worker_stacks),
+            capture.samples,
+        )
+        metrics = profiler.metrics()["capture"]
+        self.assertEqual((metrics["running"], metrics["requests"]), (False, 2))
+
+    def test_capture_stops_after_its_seconds(self):
+        profiler = self.create_profiler()
+
+        capture = profiler.start_capture(seconds=0.05, interval=0.005)
+
+        self.assertTrue(wait_until(lambda: not capture.is_running()))
+        self.assertTrue(os.path.exists(capture.path))
+        self.assertIsNotNone(profiler.start_capture(seconds=0.05))
+
+    def test_request_with_the_token_is_profiled(self):
+        profiler = self.create_profiler()
+
+        with profiler.profile_request("wrong"):
+            pass
+        self.assertEqual(self.request_profiles(), [])
+
+        with profiler.profile_request(TOKEN):
+            wait_until(lambda: True)
+
+        (path,) = self.request_profiles()
+        functions = {name for _, _, name in pstats.Stats(path).stats}
+        self.assertIn("wait_until", functions)
+        self.assertEqual(profiler.metrics()["saved_request_profiles"], 1)
+
+    def test_only_slow_requests_are_kept(self):
+        profiler = self.create_profiler(PROFILE_SLOW_SECONDS="0.05")
+
+        with profiler.profile_request():
+            pass
+        self.assertEqual(self.request_profiles(), [])
+
+        with profiler.profile_request():
+            time.sleep(0.06)
+        self.assertEqual(len(self.request_profiles()), 1)
+
+    def test_one_request_is_profiled_at_a_time(self):
+        profiler = self.create_profiler()
+        capture = profiler.start_capture(seconds=10, interval=1)
+
+        with profiler.profile_request(TOKEN):
+            # Concurrent requests are counted, not profiled
+            with profiler.profile_request(TOKEN):
+                pass
+            self.assertEqual(self.request_profiles(), [])
+
+        self.assertEqual(len(self.request_profiles()), 1)
+        self.assertEqual(capture.requests, 2)
+
+    def test_profiling_off(self):
+        use_config(self, PROFILING="false", PROFILE_TOKEN="")
+        Profiler.reset_instance()
+        self.addCleanup(Profiler.reset_instance)
+
+        self.assertIsNone(Profiler().metrics())
+        self.assertFalse(Profiler().is_authorized(""))
+
+
+class ProfilingHooksTest(ProfilingTestCase):
+    def test_wsgi_skill_requests_are_profiled(self):
+        profiler = self.create_profiler()
+        app = Flask(__name__)
+        register_profiling(app)
+        client = app.test_client()
+
+        self.assertEqual(client.get("/admin/profile").status_code, 403)
+        response = client.post(
+            "/admin/profile?requests=1&seconds=10",
+            headers={"X-Profile-Token": TOKEN},
+        )
+        self.assertEqual(response.status_code, 202)
+        client.post("/", headers={"X-Profile-Token": TOKEN})
+
+        self.assertEqual(len(self.request_profiles()), 1)
+        self.assertTrue(wait_until(lambda: not profiler.capture.is_running()))
+        self.assertEqual(profiler.capture.requests, 1)
+
+    def test_nothing_is_installed_when_profiling_is_off(self):
+        use_config(self, PROFILING="false")
+        Profiler.reset_instance()
+        self.addCleanup(Profiler.reset_instance)
+        app = Flask(__name__)
+
+        register_profiling(app)
+
+        self.assertNotIsInstance(app.wsgi_app, ProfilingMiddleware)
+        self.assertEqual(app.test_client().get("/admin/profile").status_code, 404)
+
+    def test_asgi_skill_requests_are_profiled(self):
+        profiler = self.create_profiler()
+        with mock.patch("app.runtime.asgi_app.AsyncIntentDispatcher"):
+            app = ASGIApp(Flask(__name__))
+        patcher = mock.patch.object(app, "handle_skill_request", mock.AsyncMock())
+        self.addCleanup(patcher.stop)
+        handle_skill_request = patcher.start()
+        capture = profiler.start_capture(seconds=10, interval=1)
+
+        asyncio.run(self.call(app, "POST", "/", TOKEN))
+        asyncio.run(self.call(app, "POST", "/"))
+
+        handle_skill_request.assert_awaited()
+        self.assertEqual(len(self.request_profiles()), 1)
+        self.assertEqual(capture.requests, 2)
+        self.assertEqual(asyncio.run(self.call(app, "GET", "/admin/profile")), 403)
+        self.assertEqual(
+            asyncio.run(self.call(app, "GET", "/admin/profile", TOKEN)), 200
+        )
+
+    @staticmethod
+    async def call(app: ASGIApp, method: str, path: str, token: str = "") -> int:
+        headers = [(b"x-profile-token", token.encode())] if token else []
+        scope = {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "query_string": b"",
+            "headers": headers,
+        }
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"{}", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await app(scope, receive, send)
+        return sent[0]["status"] if sent else None
@@ -0,0 +1,106 @@
+import socket
+import time
+import unittest
+
+from app.services.alexa.progressive_response_service import (
+    ProgressiveResponseService,
+)
+from benchmarks.standins import StandIn, alexa_handler, start_server
+from tests import use_config
+
+# Seconds the directives stand-in takes to answer
+LATENCY = 0.5
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ProgressiveResponseServiceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directives = {}
+
+        async def handler(path, query, body):
+            cls.directives[body["header"]["requestId"]] = (path, body)
+            return await alexa_handler(path, query, body)
+
+        cls.standin = StandIn("alexa", handler, LATENCY)
+        port = free_port()
+        cls.server = start_server(cls.standin, port)
+        cls.endpoint = f"http://127.0.0.1:{port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.should_exit = True
+
+    def setUp(self):
+        ProgressiveResponseService.reset_instance()
+        self.addCleanup(ProgressiveResponseService.reset_instance)
+
+    def test_speech_is_sent_without_blocking(self):
+        use_config(self, PROGRESSIVE_RESPONSES="true")
+        service = ProgressiveResponseService()
+
+        start = time.perf_counter()
+        future = service.send_speech(
+            "sent", self.endpoint, "token", "Checking the forecast & more..."
+        )
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, LATENCY / 5)
+        self.assertFalse(future.done())
+        self.assertTrue(future.result(timeout=5))
+        self.assertEqual(
+            self.directives["sent"],
+            (
+                "/v1/directives",
+                {
+                    "header": {"requestId": "sent"},
+                    "directive": {
+                        "type": "VoicePlayer.Speak",
+                        "speech": "<speak>Checking the forecast &amp; more...</speak>",
+                    },
+                },
+            ),
+        )
+
+    def test_configured_endpoint_overrides_the_request(self):
+        use_config(
+            self, PROGRESSIVE_RESPONSES="true", ALEXA_DIRECTIVE_ENDPOINT=self.endpoint
+        )
+        service = ProgressiveResponseService()
+
+        future = service.send_speech(
+            "overridden", "http://127.0.0.1:9", None, "One moment"
+        )
+
+        self.assertTrue(future.result(timeout=5))
+        self.assertIn("overridden", self.directives)
+
+    def test_failed_post_resolves_false(self):
+        use_config(self, PROGRESSIVE_RESPONSES="true")
+        service = ProgressiveResponseService(timeout=LATENCY / 5)
+
+        future = service.send_speech("timed-out", self.endpoint, None, "One moment")
+
+        self.assertFalse(future.result(timeout=5))
+
+    def test_nothing_is_sent_when_disabled(self):
+        use_config(self, PROGRESSIVE_RESPONSES="false")
+        service = ProgressiveResponseService()
+
+        self.assertIsNone(
+            service.send_speech("disabled", self.endpoint, None, "One moment")
+        )
+        self.assertNotIn("disabled", self.directives)
+
+    def test_nothing_is_sent_without_request_or_endpoint(self):
+        use_config(self, PROGRESSIVE_RESPONSES="true")
+        service = ProgressiveResponseService()
+
+        self.assertIsNone(service.send_speech("", self.endpoint, None, "One moment"))
+        self.assertIsNone(service.send_speech("no-endpoint", None, None, "One moment"))
+        self.assertNotIn("no-endpoint", self.directives)
@@ -0,0 +1,81 @@
+import time
+import unittest
+from unittest import mock
+
+from app.models.ai.model_config import ModelConfig
+from app.models.ai.replica_balancer import ReplicaBalancer
+
+
+def replica(host: str) -> ModelConfig:
+    return ModelConfig("Replica", f"http://{host}:11434/v1", "ollama", "llama3")
+
+
+class ReplicaBalancerTest(unittest.TestCase):
+    def setUp(self):
+        self.balancer = ReplicaBalancer(eject_failures=3, eject_seconds=30)
+        self.first = replica("first")
+        self.second = replica("second")
+        self.replicas = [self.first, self.second]
+
+    def test_untried_replica_is_chosen_first(self):
+        self.balancer.record(self.first, 0.1, True)
+
+        self.assertIs(self.balancer.choose(self.replicas), self.second)
+
+    def test_faster_replica_is_chosen(self):
+        self.balancer.record(self.first, 2.0, True)
+        self.balancer.record(self.second, 0.5, True)
+
+        for _ in range(10):
+            self.assertIs(self.balancer.choose(self.replicas), self.second)
+
+    def test_errors_inflate_the_cost(self):
+        self.balancer.record(self.first, 0.5, True)
+        self.balancer.record(self.second, 0.4, True)
+        self.balancer.record(self.second, 0.4, False)
+
+        self.assertIs(self.balancer.choose(self.replicas), self.first)
+
+    def test_replica_that_never_answered_costs_the_probe_latency(self):
+        self.balancer.record(self.second, 5.0, False)
+        probe_cost = ReplicaBalancer.PROBE_LATENCY / (1 - self.balancer.alpha)
+
+        self.balancer.record(self.first, probe_cost - 0.1, True)
+        self.assertIs(self.balancer.choose(self.replicas), self.first)
+        self.balancer.record(self.first, 10.0, True)
+        self.assertIs(self.balancer.choose(self.replicas), self.second)
+
+    def test_failing_replica_is_ejected(self):
+        self.balancer.record(self.first, 5.0, True)
+        self.balancer.record(self.second, 0.1, True)
+        for _ in range(3):
+            self.balancer.record(self.second, 0.1, False)
+
+        self.assertIs(self.balancer.choose(self.replicas), self.first)
+        self.assertEqual(self.balancer.expected_latency(self.replicas), 5.0)
+        metrics = self.balancer.metrics()["llama3 @ http://second:11434/v1"]
+        self.assertTrue(metrics["ejected"])
+        self.assertEqual(metrics["ejections"], 1)
+
+    def test_ejected_replica_comes_back_with_a_clean_error_rate(self):
+        self.balancer.record(self.first, 5.0, True)
+        self.balancer.record(self.second, 0.1, True)
+        for _ in range(3):
+            self.balancer.record(self.second, 0.1, False)
+
+        later = time.monotonic() + 31
+        with mock.patch("time.monotonic", return_value=later):
+            self.assertIs(self.balancer.choose(self.replicas), self.second)
+        stats = self.balancer.stats[ReplicaBalancer.replica_id(self.second)]
+        self.assertEqual(stats.error_rate, 0.0)
+
+    def test_all_ejected_replicas_are_still_chosen(self):
+        for model_config in self.replicas:
+            for _ in range(3):
+                self.balancer.record(model_config, 0.1, False)
+
+        self.assertIn(self.balancer.choose(self.replicas), self.replicas)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from app.helpers.constants import DEFAULT_SEMANTIC_CACHE_THRESHOLD
+from app.services.ai.semantic_cache import SemanticCache
+
+
+class SemanticCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = SemanticCache(threshold=DEFAULT_SEMANTIC_CACHE_THRESHOLD)
+
+    def test_paraphrase_hits(self):
+        self.cache.put("who wrote hamlet", "William Shakespeare.")
+
+        for question in (
+            "hamlet author",
+            "tell me who wrote hamlet",
+            "who is the author of hamlet",
+        ):
+            with self.subTest(question=question):
+                self.assertEqual(self.cache.get(question), "William Shakespeare.")
+
+    def test_measure_paraphrase_hits(self):
+        self.cache.put("how tall is mount everest", "8,849 metres.")
+
+        self.assertEqual(
+            self.cache.get("what is the height of mount everest"), "8,849 metres."
+        )
+
+    def test_different_numbers_miss(self):
+        self.cache.put("what year did world war 1 start", "1914.")
+        self.cache.put("who won the 1998 world cup", "France.")
+
+        self.assertIsNone(self.cache.get("what year did world war 2 start"))
+        self.assertIsNone(self.cache.get("who won the 1994 world cup"))
+
+    def test_different_subjects_miss(self):
+        self.cache.put("who wrote hamlet", "William Shakespeare.")
+        self.cache.put("who is the president of france", "Emmanuel Macron.")
+
+        self.assertIsNone(self.cache.get("who wrote macbeth"))
+        self.assertIsNone(self.cache.get("who is the president of germany"))
+        self.assertIsNone(self.cache.get("who directed hamlet"))
+
+    def test_different_question_words_miss(self):
+        self.cache.put("when did shakespeare die", "In 1616.")
+
+        self.assertIsNone(self.cache.get("how did shakespeare die"))
+
+    def test_answers_are_scoped(self):
+        self.cache.put("who wrote hamlet", "William Shakespeare.", scope="pirate")
+
+        self.assertIsNone(self.cache.get("who wrote hamlet", scope="butler"))
+        self.assertEqual(
+            self.cache.get("who wrote hamlet", scope="pirate"), "William Shakespeare."
+        )
+
+    def test_time_sensitive_questions_are_not_cached(self):
+        cache = SemanticCache(volatile_ttl=0)
+        cache.put("what is the latest news", "Nothing happened.")
+
+        self.assertIsNone(cache.get("what is the latest news"))
+
+    def test_least_recently_used_entry_is_replaced(self):
+        cache = SemanticCache(max_entries=2)
+        cache.put("who wrote hamlet", "William Shakespeare.")
+        cache.put("who painted the mona lisa", "Leonardo da Vinci.")
+        cache.get("who wrote hamlet")
+        cache.put("what is the capital of france", "Paris.")
+
+        self.assertIsNone(cache.get("who painted the mona lisa"))
+        self.assertEqual(cache.get("who wrote hamlet"), "William Shakespeare.")
+        self.assertEqual(cache.metrics()["evictions"], 1)
+
+
+class SemanticCachePersistenceTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "answers.npz")
+
+    def test_put_does_not_save(self):
+        cache = SemanticCache(path=self.path)
+        with mock.patch.object(cache, "_start_flusher"):
+            cache.put("who wrote hamlet", "William Shakespeare.")
+
+        self.assertEqual(cache.get_files(), [])
+
+    def test_every_process_saves_its_own_file(self):
+        cache = SemanticCache(path=self.path)
+        with mock.patch.object(cache, "_start_flusher"):
+            cache.put("who wrote hamlet", "William Shakespeare.")
+        with mock.patch("os.getpid", return_value=1):
+            cache.save()
+        other = SemanticCache(path=self.path)
+        with mock.patch.object(other, "_start_flusher"):
+            other.put("who painted the mona lisa", "Leonardo da Vinci.")
+        with mock.patch("os.getpid", return_value=2):
+            other.save()
+
+        self.assertEqual(
+            [os.path.basename(path) for path in cache.get_files()],
+            ["answers.1.npz", "answers.2.npz"],
+        )
+        loaded = SemanticCache(path=self.path)
+        self.assertEqual(loaded.get("hamlet author"), "William Shakespeare.")
+        self.assertEqual(loaded.get("mona lisa painter"), "Leonardo da Vinci.")
+
+
+if __name__ == "__main__":
+    unittest.main()
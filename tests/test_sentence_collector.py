@@ -0,0 +1,75 @@
+import unittest
+
+from app.models.ai.output_budget import OutputBudget
+from app.services.ai.sentence_collector import SentenceCollector
+
+
+def feed(collector: SentenceCollector, text: str) -> int:
+    """Feeds the text word by word, like a stream, and returns the words fed."""
+    words = text.split(" ")
+    for index, word in enumerate(words):
+        if collector.feed(word if index == 0 else " " + word):
+            return index + 1
+    return len(words)
+
+
+class SentenceCollectorTest(unittest.TestCase):
+    def test_stops_once_the_next_sentence_cannot_fit(self):
+        collector = SentenceCollector(OutputBudget(max_words=11))
+
+        fed = feed(
+            collector,
+            "It is sunny in Paris. Expect a high of 24 degrees. Bring sunglasses "
+            "and a hat, and drink plenty of water.",
+        )
+
+        self.assertTrue(collector.full)
+        # The third sentence is abandoned as soon as its first word is over budget
+        self.assertEqual(fed, 12)
+        self.assertEqual(
+            collector.finish(), "It is sunny in Paris. Expect a high of 24 degrees."
+        )
+
+    def test_keeps_every_sentence_that_fits(self):
+        collector = SentenceCollector(OutputBudget(max_words=50))
+
+        feed(collector, "It is sunny in Paris. Expect a high of 24 degrees.")
+
+        self.assertFalse(collector.full)
+        self.assertEqual(
+            collector.finish(), "It is sunny in Paris. Expect a high of 24 degrees."
+        )
+
+    def test_first_sentence_is_always_kept(self):
+        collector = SentenceCollector(OutputBudget(max_characters=10))
+
+        feed(collector, "It is sunny in Paris. Expect a high of 24 degrees.")
+
+        self.assertTrue(collector.full)
+        self.assertEqual(collector.finish(), "It is sunny in Paris.")
+
+    def test_unfinished_sentence_is_dropped_when_cut_off(self):
+        text = "It is sunny in Paris. Expect a high of"
+
+        kept = SentenceCollector(OutputBudget(max_words=50))
+        feed(kept, text)
+        dropped = SentenceCollector(OutputBudget(max_words=50))
+        feed(dropped, text)
+
+        self.assertEqual(kept.finish(), text)
+        self.assertEqual(dropped.finish(cut_off=True), "It is sunny in Paris.")
+
+    def test_unfinished_first_sentence_is_kept_when_cut_off(self):
+        collector = SentenceCollector(OutputBudget(max_words=50))
+
+        feed(collector, "It is sunny in")
+
+        self.assertEqual(collector.finish(cut_off=True), "It is sunny in")
+
+    def test_more_text_after_the_budget_is_ignored(self):
+        collector = SentenceCollector(OutputBudget(max_words=5))
+        feed(collector, "It is sunny in Paris. Expect")
+
+        self.assertTrue(collector.feed(" a high."))
+        self.assertEqual(collector.generated, "It is sunny in Paris. Expect")
+        self.assertEqual(collector.finish(), "It is sunny in Paris.")
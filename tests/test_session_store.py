@@ -0,0 +1,122 @@
+import threading
+import unittest
+from unittest import mock
+
+from app.models.session_state import SessionState
+from app.services.intent_processor_service import IntentProcessorService
+from app.services.session.session_store import SessionStore
+from tests import use_config
+
+
+class SessionStoreTest(unittest.TestCase):
+    def setUp(self):
+        use_config(
+            self,
+            SESSION_MAX_COUNT="2",
+            SESSION_IDLE_TIMEOUT="60",
+            SESSION_CONTEXT_TURNS="2",
+        )
+        for name in (
+            "AIServiceSingleton",
+            "ActionExecutorService",
+            "ActionResponseService",
+            "MetricsRegistry",
+        ):
+            patcher = mock.patch(f"app.services.intent_processor_service.{name}")
+            self.addCleanup(patcher.stop)
+            patcher.start()
+        for singleton in (SessionStore, IntentProcessorService):
+            singleton.reset_instance()
+            self.addCleanup(singleton.reset_instance)
+        self.store = SessionStore()
+        self.processor = IntentProcessorService()
+
+    def test_sessions_keep_their_own_personality(self):
+        with self.store.session("alice"):
+            self.processor.set_personality("You are a pirate.")
+        with self.store.session("bob"):
+            self.processor.set_personality("You are a poet.")
+
+        with self.store.session("alice"):
+            self.assertEqual(self.processor.get_system_role(), "You are a pirate.")
+        with self.store.session("bob"):
+            self.assertEqual(self.processor.get_system_role(), "You are a poet.")
+        self.assertIsNone(self.processor.system_role)
+        self.assertIsNone(SessionState.current())
+
+    def test_concurrent_sessions_do_not_see_each_other(self):
+        barrier = threading.Barrier(2)
+        seen = {}
+
+        def handle(session_id: str):
+            with self.store.session(session_id):
+                self.processor.set_personality(f"You are {session_id}.")
+                barrier.wait(timeout=5)
+                seen[session_id] = self.processor.get_system_role()
+
+        threads = [
+            threading.Thread(target=handle, args=(session_id,))
+            for session_id in ("alice", "bob")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(seen, {"alice": "You are alice.", "bob": "You are bob."})
+
+    def test_default_personality_outside_of_a_session(self):
+        self.processor.set_personality("You are calm.")
+
+        self.assertEqual(self.processor.system_role, "You are calm.")
+        with self.store.session("alice"):
+            self.assertEqual(self.processor.get_system_role(), "You are calm.")
+            self.assertIsNone(self.store.get("alice").personality)
+
+    def test_recent_turns_are_kept(self):
+        with self.store.session("alice") as session:
+            for turn in range(3):
+                session.add_turn(f"question {turn}", f"answer {turn}")
+
+            self.assertEqual(
+                SessionState.current_context(),
+                [("question 1", "answer 1"), ("question 2", "answer 2")],
+            )
+        self.assertEqual(SessionState.current_context(), [])
+
+    def test_least_recently_used_session_is_evicted(self):
+        alice = self.store.get("alice")
+        self.store.get("bob")
+        self.assertIs(self.store.get("alice"), alice)
+
+        self.store.get("carol")
+
+        self.assertEqual(len(self.store), 2)
+        self.assertIs(self.store.get("alice"), alice)
+        self.assertIsNone(self.store.sessions.get("bob"))
+
+    def test_idle_session_expires(self):
+        with mock.patch("app.helpers.ttl_cache.time.monotonic") as monotonic:
+            monotonic.return_value = 100.0
+            alice = self.store.get("alice")
+            monotonic.return_value = 150.0
+            self.assertIs(self.store.get("alice"), alice)
+            monotonic.return_value = 200.0
+            self.assertIs(self.store.get("alice"), alice)
+
+            monotonic.return_value = 261.0
+            self.assertIsNot(self.store.get("alice"), alice)
+
+    def test_ended_session_is_dropped(self):
+        self.store.get("alice").personality = "You are a pirate."
+
+        self.store.end("alice")
+
+        self.assertEqual(len(self.store), 0)
+        self.assertIsNone(self.store.get("alice").personality)
+
+    def test_no_state_without_a_session_id(self):
+        with self.store.session(None) as session:
+            self.assertIsNone(session)
+            self.assertIsNone(SessionState.current())
+        self.assertEqual(len(self.store), 0)
@@ -0,0 +1,60 @@
+import threading
+import time
+import unittest
+
+from app.models.singleton import SingletonMeta
+
+# pylint: disable=too-few-public-methods
+
+
+class SlowSingleton(metaclass=SingletonMeta):
+    initializations = 0
+
+    def __init__(self):
+        # Widens the window in which a second thread could create another instance
+        time.sleep(0.05)
+        SlowSingleton.initializations += 1
+        self.dependency = DependentSingleton()
+
+
+class DependentSingleton(metaclass=SingletonMeta):
+    pass
+
+
+class SingletonMetaTest(unittest.TestCase):
+    def setUp(self):
+        SlowSingleton.initializations = 0
+        for singleton in (SlowSingleton, DependentSingleton):
+            singleton.reset_instance()
+            self.addCleanup(singleton.reset_instance)
+
+    def test_concurrent_first_calls_share_one_instance(self):
+        barrier = threading.Barrier(20)
+        instances = []
+
+        def construct():
+            barrier.wait(timeout=5)
+            instances.append(SlowSingleton())
+
+        threads = [threading.Thread(target=construct) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(instances), 20)
+        self.assertTrue(all(instance is instances[0] for instance in instances))
+        self.assertEqual(SlowSingleton.initializations, 1)
+
+    def test_initializer_can_construct_other_singletons(self):
+        instance = SlowSingleton()
+
+        self.assertIs(instance.dependency, DependentSingleton())
+
+    def test_reset_instance_creates_a_new_instance(self):
+        instance = SlowSingleton()
+
+        SlowSingleton.reset_instance()
+
+        self.assertIsNot(SlowSingleton(), instance)
+        self.assertEqual(SlowSingleton.initializations, 2)
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from app.helpers.thread_helpers import ThreadHelpers
+from app.services.telemetry.span_exporter import JsonlSpanExporter, SpanExporter
+from app.services.telemetry.tracer import NO_SPAN, Tracer, traced
+from tests import use_config
+
+
+@traced("test.lookup")
+def lookup():
+    return Tracer.current_span().name
+
+
+@traced("test.lookup_async")
+async def lookup_async():
+    return Tracer.current_span().name
+
+
+class TracerTest(unittest.TestCase):
+    def create_tracer(self, **environ) -> Tracer:
+        use_config(self, TRACE_EXPORTER="jsonl", **environ)
+        Tracer.reset_instance()
+        self.addCleanup(Tracer.reset_instance)
+        tracer = Tracer()
+        tracer.exporter = mock.Mock(spec=SpanExporter)
+        return tracer
+
+    def exported(self, tracer: Tracer) -> list:
+        return [
+            span
+            for call in tracer.exporter.export.call_args_list
+            for span in call.args[0]
+        ]
+
+    def test_child_spans_nest_under_the_current_span(self):
+        tracer = self.create_tracer(TRACE_SAMPLE_RATE="1")
+
+        with tracer.start_trace("WeatherIntent", "request-1", locale="en-GB"):
+            with Tracer.span("weather.get_overview", location="Paris") as span:
+                self.assertEqual(lookup(), "test.lookup")
+                span.set_attribute("cached", False)
+            self.assertEqual(asyncio.run(lookup_async()), "test.lookup_async")
+        self.assertIsNone(Tracer.current_span())
+
+        spans = {span["name"]: span for span in self.exported(tracer)}
+        self.assertEqual(tracer.exporter.export.call_count, 1)
+        root = spans["WeatherIntent"]
+        overview = spans["weather.get_overview"]
+        self.assertIsNone(root["parent_id"])
+        self.assertEqual(
+            root["attributes"], {"locale": "en-GB", "alexa.request_id": "request-1"}
+        )
+        self.assertEqual(overview["parent_id"], root["span_id"])
+        self.assertEqual(spans["test.lookup"]["parent_id"], overview["span_id"])
+        self.assertEqual(spans["test.lookup_async"]["parent_id"], root["span_id"])
+        self.assertEqual(overview["attributes"], {"location": "Paris", "cached": False})
+        self.assertEqual(
+            {span["trace_id"] for span in spans.values()}, {root["trace_id"]}
+        )
+        self.assertEqual({span["request_id"] for span in spans.values()}, {"request-1"})
+
+    def test_span_follows_the_request_into_worker_threads(self):
+        tracer = self.create_tracer(TRACE_SAMPLE_RATE="1")
+
+        with tracer.start_trace("QueryIntent") as root:
+            worker = threading.Thread(target=ThreadHelpers.with_context(lookup))
+            worker.start()
+            worker.join()
+
+        spans = {span["name"]: span for span in self.exported(tracer)}
+        self.assertEqual(spans["test.lookup"]["parent_id"], root.span_id)
+
+    def test_error_is_recorded_on_the_span(self):
+        tracer = self.create_tracer(TRACE_SAMPLE_RATE="1")
+
+        with self.assertRaises(ValueError):
+            with tracer.start_trace("QueryIntent"):
+                with Tracer.span("function.call"):
+                    raise ValueError("bad city")
+
+        errors = {span["name"]: span["error"] for span in self.exported(tracer)}
+        self.assertEqual(
+            errors,
+            {
+                "function.call": "ValueError: bad city",
+                "QueryIntent": "ValueError: bad city",
+            },
+        )
+
+    def test_unsampled_request_is_not_recorded(self):
+        tracer = self.create_tracer(TRACE_SAMPLE_RATE="0", TRACE_SLOW_SECONDS="0")
+
+        with tracer.start_trace("QueryIntent") as root:
+            self.assertIs(root, NO_SPAN)
+            self.assertIs(Tracer.span("ai.ask_the_ai"), NO_SPAN)
+            self.assertEqual(lookup.__wrapped__.__name__, "lookup")
+
+        tracer.exporter.export.assert_not_called()
+
+    def test_slow_or_failed_unsampled_requests_are_kept(self):
+        tracer = self.create_tracer(TRACE_SAMPLE_RATE="0", TRACE_SLOW_SECONDS="0.05")
+
+        with tracer.start_trace("FastIntent"):
+            pass
+        with tracer.start_trace("SlowIntent"):
+            time.sleep(0.06)
+        with self.assertRaises(RuntimeError):
+            with tracer.start_trace("FailedIntent"):
+                raise RuntimeError("down")
+
+        names = [span["name"] for span in self.exported(tracer)]
+        self.assertEqual(names, ["SlowIntent", "FailedIntent"])
+        metrics = tracer.metrics()
+        self.assertEqual(metrics["recorded_traces"], 3)
+        self.assertEqual(metrics["exported_traces"], 2)
+
+    def test_span_ending_after_its_request_is_exported_alone(self):
+        tracer = self.create_tracer(TRACE_SAMPLE_RATE="1")
+
+        opened, request_done = threading.Event(), threading.Event()
+
+        def call_function():
+            with Tracer.span("function.call"):
+                opened.set()
+                request_done.wait(5)
+
+        with tracer.start_trace("QueryIntent"):
+            worker = threading.Thread(target=ThreadHelpers.with_context(call_function))
+            worker.start()
+            opened.wait(5)
+        request_done.set()
+        worker.join()
+
+        self.assertEqual(tracer.exporter.export.call_count, 2)
+        self.assertEqual(
+            [span["name"] for span in tracer.exporter.export.call_args.args[0]],
+            ["function.call"],
+        )
+
+    def test_tracing_off(self):
+        use_config(self, TRACE_EXPORTER="none")
+        Tracer.reset_instance()
+        self.addCleanup(Tracer.reset_instance)
+
+        self.assertIs(Tracer().start_trace("QueryIntent"), NO_SPAN)
+        self.assertIsNone(Tracer().metrics())
+
+
+class JsonlSpanExporterTest(unittest.TestCase):
+    def test_spans_are_appended_as_json_lines(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "traces", "spans.jsonl")
+        exporter = JsonlSpanExporter(path)
+
+        # Written from the calling thread, without starting the exporter thread
+        with mock.patch.object(JsonlSpanExporter, "_ensure_running"):
+            exporter.export([{"name": "a"}, {"name": "b"}])
+        exporter.flush()
+
+        with open(path, encoding="utf-8") as file:
+            self.assertEqual(
+                [json.loads(line) for line in file], [{"name": "a"}, {"name": "b"}]
+            )
+        self.assertEqual(exporter.metrics(), {"exported": 2, "dropped": 0, "queued": 0})
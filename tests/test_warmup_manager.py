@@ -0,0 +1,163 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+from app.models.ai.model_config import ModelConfig
+from app.models.ai.replica_balancer import ReplicaBalancer
+from app.routes.status import status_bp
+from app.services.ai.warmup_manager import WarmupManager
+
+
+def model_config(model: str, base_url: str, **options) -> ModelConfig:
+    return ModelConfig(model, base_url, "key", model, **options)
+
+
+ROUTER = model_config("router", "http://localhost:11434/v1")
+CHAT = model_config("chat", "https://api.example.com/v1")
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class WarmupManagerTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("app.services.ai.warmup_manager.OpenAI")
+        self.addCleanup(patcher.stop)
+        self.create = patcher.start().return_value.chat.completions.create
+        patcher = mock.patch.object(WarmupManager, "CHECK_INTERVAL", 0.01)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.manager = WarmupManager(
+            [ROUTER, CHAT], {"router": [ROUTER], "chat": [CHAT]}
+        )
+        self.addCleanup(self.manager.stop)
+
+    def state(self, config: ModelConfig):
+        return self.manager.states[ReplicaBalancer.replica_id(config)]
+
+    def test_only_local_models_are_primed(self):
+        cases = {
+            "http://localhost:11434/v1": True,
+            "http://127.0.0.1:11434/v1": True,
+            "http://192.168.1.20:11434/v1": True,
+            "http://ollama:11434/v1": True,
+            "https://api.openai.com/v1": False,
+            "https://8.8.8.8/v1": False,
+        }
+        for base_url, primed in cases.items():
+            with self.subTest(base_url=base_url):
+                self.assertEqual(
+                    WarmupManager.should_prime(model_config("model", base_url)), primed
+                )
+        self.assertTrue(
+            WarmupManager.should_prime(
+                model_config("model", "https://api.openai.com/v1", keep_alive=300)
+            )
+        )
+
+    def test_ready_when_models_are_not_kept_warm(self):
+        self.assertTrue(self.manager.is_ready())
+        self.assertEqual(self.manager.get_cold_models(), ["router"])
+
+    def test_not_ready_until_the_local_required_model_is_primed(self):
+        loaded = threading.Event()
+        self.create.side_effect = lambda **_: loaded.wait(5)
+
+        self.manager.start()
+
+        self.assertTrue(wait_until(lambda: self.create.called))
+        self.assertFalse(self.manager.is_ready())
+        self.assertEqual(self.manager.get_cold_models(), ["router"])
+
+        loaded.set()
+
+        self.assertTrue(wait_until(self.manager.is_ready))
+        self.create.assert_called_once_with(
+            model="router", messages=[{"role": "user", "content": "Hi"}], max_tokens=1
+        )
+        self.assertEqual(self.state(ROUTER).primes, 1)
+        # The priming request loaded the model, which is a cold start
+        self.assertEqual(self.state(ROUTER).cold_starts, 1)
+        self.assertEqual(self.state(CHAT).primes, 0)
+
+    def test_failed_priming_backs_off(self):
+        self.create.side_effect = ConnectionError("refused")
+
+        self.manager.prime(ROUTER)
+
+        state = self.state(ROUTER)
+        self.assertEqual((state.primes, state.prime_failures), (1, 1))
+        self.assertFalse(state.priming)
+        self.assertAlmostEqual(
+            state.next_prime - time.monotonic(), WarmupManager.CHECK_INTERVAL, 1
+        )
+        first_retry = state.next_prime
+
+        self.manager.prime(ROUTER)
+
+        self.assertGreater(state.next_prime - first_retry, 0)
+        self.assertEqual(state.consecutive_failures, 2)
+
+        self.create.side_effect = None
+        self.manager.prime(ROUTER)
+
+        self.assertEqual(state.consecutive_failures, 0)
+        self.assertEqual(self.manager.get_cold_models(), [])
+
+    def test_backing_off_model_is_not_due(self):
+        replica_id = ReplicaBalancer.replica_id(ROUTER)
+        self.assertTrue(self.manager.is_due(replica_id))
+
+        self.state(ROUTER).next_prime = time.monotonic() + 60
+
+        self.assertFalse(self.manager.is_due(replica_id))
+
+    def test_idle_model_with_keep_alive_is_cold_again(self):
+        local = model_config("local", "http://localhost:11434/v1", keep_alive=60)
+        manager = WarmupManager([local], {"local": [local]})
+        state = manager.states[ReplicaBalancer.replica_id(local)]
+
+        manager.record(local, 100.0, 2.0)
+        manager.record(local, 130.0, 0.5)
+        manager.record(local, 200.0, 3.0)
+
+        self.assertEqual(state.cold_starts, 2)
+        self.assertEqual(state.last_cold_start, 3.0)
+        self.assertEqual(state.max_cold_start, 3.0)
+        self.assertEqual(state.last_used, 203.0)
+
+
+class ReadyRouteTest(unittest.TestCase):
+    def setUp(self):
+        app = Flask(__name__)
+        app.register_blueprint(status_bp)
+        self.client = app.test_client()
+        patcher = mock.patch("app.routes.status.AIServiceSingleton")
+        self.addCleanup(patcher.stop)
+        self.warmup = patcher.start().get_instance.return_value.warmup
+
+    def test_cold_instance_is_not_ready(self):
+        self.warmup.is_ready.return_value = False
+        self.warmup.get_cold_models.return_value = ["router"]
+
+        response = self.client.get("/status/ready")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json, {"ready": False, "cold_models": ["router"]})
+
+    def test_warm_instance_is_ready(self):
+        self.warmup.is_ready.return_value = True
+
+        response = self.client.get("/status/ready")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {"ready": True})
@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from app.services.weather.weather_service import WeatherService
+from tests import use_config
+
+
+class WeatherServiceTest(unittest.TestCase):
+    def setUp(self):
+        use_config(self, OPEN_WEATHER_MAP_KEY="key")
+        self.api = self.patch("OpenWeatherMapAPI").return_value
+        self.api.get_overview_async = mock.AsyncMock(return_value={})
+        self.helpers = self.patch("WeatherHelpers")
+        self.helpers.generate_overview_prompt.return_value = "prompt"
+        self.helpers.geocode_location_async = mock.AsyncMock(return_value={})
+        self.ai_service = mock.Mock()
+        self.ai_service.prompt_the_ai.return_value = " Snow tonight. "
+        self.ai_service.prompt_the_ai_async = mock.AsyncMock(
+            return_value=" Snow tonight. "
+        )
+        singleton = self.patch("AIServiceSingleton")
+        singleton.return_value.get_instance.return_value = self.ai_service
+        self.service = WeatherService()
+
+    def patch(self, name: str) -> mock.MagicMock:
+        patcher = mock.patch(f"app.services.weather.weather_service.{name}")
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_arguments_are_validated(self):
+        cases = [
+            ("get_weather_forecast", {"duration": "month"}, "Unsupported duration"),
+            ("get_weather_forecast", {"start_date": "14/07/2023"}, "Invalid date"),
+            ("get_weather_temperature", {"when": "month"}, "Unsupported when"),
+            ("get_weather_temperature", {"start_date": "2023-14-07"}, "Invalid date"),
+        ]
+        for method, arguments, message in cases:
+            for variant in ("sync", "async"):
+                with self.subTest(method=method, arguments=arguments, variant=variant):
+                    if variant == "sync":
+                        response = getattr(self.service, method)(**arguments)
+                    else:
+                        response = asyncio.run(
+                            getattr(self.service, f"{method}_async")(**arguments)
+                        )
+
+                    self.assertEqual(response.request, method)
+                    self.assertEqual(response.details.status, "error")
+                    self.assertTrue(response.details.data.startswith(message))
+        self.api.get_overview.assert_not_called()
+        self.ai_service.prompt_the_ai.assert_not_called()
+
+    def test_forecast_asks_about_the_weather_condition(self):
+        response = self.service.get_weather_forecast(
+            "week", "Paris, FR", "2023-07-14", "snow"
+        )
+
+        self.assertEqual(response.details.status, "success")
+        self.assertEqual(response.details.data, "Snow tonight.")
+        self.helpers.generate_overview_prompt.assert_called_once_with(
+            overview_data=self.api.get_overview.return_value, weather_condition="snow"
+        )
+
+    def test_async_forecast_asks_about_the_weather_condition(self):
+        response = asyncio.run(
+            self.service.get_weather_forecast_async(
+                "week", "Paris, FR", "2023-07-14", "snow"
+            )
+        )
+
+        self.assertEqual(response.details.status, "success")
+        self.assertEqual(response.details.data, "Snow tonight.")
+        self.helpers.generate_overview_prompt.assert_called_once_with(
+            overview_data={}, weather_condition="snow"
+        )
+
+    def test_forecast_is_answered_when_no_model_answers(self):
+        render_template = self.patch("render_template")
+        render_template.return_value = "The forecast is unavailable right now."
+        self.ai_service.prompt_the_ai.return_value = None
+        self.ai_service.prompt_the_ai_async.return_value = None
+
+        responses = [
+            self.service.get_weather_forecast("today", "Paris, FR"),
+            asyncio.run(self.service.get_weather_forecast_async("today", "Paris, FR")),
+        ]
+
+        for response in responses:
+            self.assertEqual(response.request, "get_weather_forecast")
+            self.assertEqual(response.details.status, "timeout")
+            self.assertEqual(
+                response.details.data, "The forecast is unavailable right now."
+            )
+        render_template.assert_called_with("weather_unavailable")